@@ -11,6 +11,7 @@ from lightrag.base import QueryParam
 from lightrag.utils import logger
 from lightrag.query_logger import get_query_logger, LogLevel, QueryLogger
 from lightrag.advanced_operate import advanced_semantic_chunking
+from lightrag.operate import EdgeCollector
 
 try:
     from lightrag.constants import (
@@ -330,15 +331,15 @@ class AdvancedLightRAG(LightRAG):
 
     async def _process_entity_relation_graph(
         self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
-    ) -> list:
+    ) -> EdgeCollector:
         """
         Override the base method to use advanced entity extraction with relationship types.
         """
         try:
             # Use the advanced extraction instead of base extraction
-            from lightrag.advanced_operate import extract_entities_with_types
+            from lightrag.advanced_operate import collect_entities_with_types
 
-            chunk_results = await extract_entities_with_types(
+            chunk_results = await collect_entities_with_types(
                 chunk,
                 global_config=self._get_enhanced_config(),
                 pipeline_status=pipeline_status,
@@ -56,6 +56,8 @@ from lightrag.operate import (
     _get_edge_data_global,
     get_keywords_from_query,
     extract_entities as base_extract_entities,
+    collect_entities as base_collect_entities,
+    EdgeCollector,
     compute_args_hash,
     handle_cache,
     save_to_cache,
@@ -1810,6 +1812,36 @@ async def query_with_keywords_and_details(
         raise ValueError(f"Unknown mode {param.mode}")
 
 
+def _standardize_edge_types(edges: list[dict]) -> None:
+    """Format the relationship types of extracted edges for Neo4j in place"""
+    for edge in edges:
+        # Get original relationship type from LLM
+        original_rel_type = edge.get("relationship_type", "related")
+
+        # Apply enhanced Neo4j standardization from registry
+        neo4j_type = standardize_relationship_type(original_rel_type)
+
+        # Log the transformation for transparency
+        if original_rel_type != neo4j_type.lower().replace("_", " "):
+            logger.debug(
+                f"Standardized relationship: '{original_rel_type}' -> Neo4j: '{neo4j_type}'"
+            )
+
+        # Update edge with formatted types
+        edge["relationship_type"] = neo4j_type.lower().replace(
+            "_", " "
+        )  # Human-readable for compatibility
+        edge["original_type"] = original_rel_type  # Preserve original LLM output
+        edge["neo4j_type"] = neo4j_type  # Neo4j label format
+        edge["formatting_confidence"] = (
+            1.0  # Always high confidence for enhanced standardization
+        )
+
+        logger.debug(
+            f"Enhanced standardization: '{original_rel_type}' -> Neo4j: '{neo4j_type}'"
+        )
+
+
 async def extract_entities_with_types(
     chunks: dict[str, Any],
     global_config: dict[str, str],
@@ -1834,38 +1866,38 @@ async def extract_entities_with_types(
 
     # Post-process to standardize relationship types for Neo4j
     for maybe_nodes, maybe_edges in chunk_results:
-        # Process edges to format relationship types for Neo4j
-        for edge_key, edges in maybe_edges.items():
-            for edge in edges:
-                # Get original relationship type from LLM
-                original_rel_type = edge.get("relationship_type", "related")
-
-                # Apply enhanced Neo4j standardization from registry
-                neo4j_type = standardize_relationship_type(original_rel_type)
-
-                # Log the transformation for transparency
-                if original_rel_type != neo4j_type.lower().replace("_", " "):
-                    logger.debug(
-                        f"Standardized relationship: '{original_rel_type}' -> Neo4j: '{neo4j_type}'"
-                    )
+        for edges in maybe_edges.values():
+            _standardize_edge_types(edges)
 
-                # Update edge with formatted types
-                edge["relationship_type"] = neo4j_type.lower().replace(
-                    "_", " "
-                )  # Human-readable for compatibility
-                edge["original_type"] = (
-                    original_rel_type  # Preserve original LLM output
-                )
-                edge["neo4j_type"] = neo4j_type  # Neo4j label format
-                edge["formatting_confidence"] = (
-                    1.0  # Always high confidence for enhanced standardization
-                )
+    return chunk_results
 
-                logger.debug(
-                    f"Enhanced standardization: '{original_rel_type}' -> Neo4j: '{neo4j_type}'"
-                )
 
-    return chunk_results
+async def collect_entities_with_types(
+    chunks: dict[str, Any],
+    global_config: dict[str, str],
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> EdgeCollector:
+    """
+    extract_entities_with_types folding the chunks into an EdgeCollector as they
+    finish, see collect_entities.
+    """
+    logger.info("Using enhanced relationship type standardization from registry")
+
+    collector = await base_collect_entities(
+        chunks,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+    )
+
+    # Post-process to standardize relationship types for Neo4j
+    for edges in collector.edges.values():
+        _standardize_edge_types(edges)
+
+    return collector
 
 
 def find_closest_relationship_type(rel_type: str) -> str:
@@ -594,6 +594,10 @@ def create_app(args):
             else:
                 auth_mode = "enabled"
 
+            embedding_cache = getattr(
+                rag.chunk_entity_relation_graph, "embedding_cache", None
+            )
+
             return {
                 "status": "healthy",
                 "working_directory": str(args.working_dir),
@@ -617,6 +621,9 @@ def create_app(args):
                 },
                 "auth_mode": auth_mode,
                 "pipeline_busy": pipeline_status.get("busy", False),
+                "graph_embedding_cache": embedding_cache.stats()
+                if embedding_cache is not None
+                else None,
                 "core_version": core_version,
                 "api_version": __api_version__,
                 "webui_title": webui_title,
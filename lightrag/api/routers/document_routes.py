@@ -12,11 +12,20 @@ import pipmaster as pm
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Literal
-from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, UploadFile
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    UploadFile,
+)
 from pydantic import BaseModel, Field, validator
 
 from lightrag import LightRAG
 from lightrag.base import DocProcessingStatus, DocStatus
+from lightrag.constants import DEFAULT_DOC_STATUS_PAGE_SIZE
 from lightrag.api.utils_api import get_combined_auth_dependency
 from ..config import global_args
 
@@ -415,6 +424,22 @@ class DocStatusResponse(BaseModel):
         }
 
 
+class DocsPageResponse(BaseModel):
+    """Response model for one page of documents with the same status
+
+    Attributes:
+        documents: Documents of the page, ordered by document id
+        next_cursor: Cursor of the next page, None on the last page
+    """
+
+    documents: List[DocStatusResponse] = Field(
+        default_factory=list, description="Documents of the page, ordered by id"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor of the next page, None on the last page"
+    )
+
+
 class DocsStatusesResponse(BaseModel):
     """Response model for document statuses
 
@@ -459,6 +484,23 @@ class DocsStatusesResponse(BaseModel):
         }
 
 
+def to_doc_status_response(
+    doc_id: str, doc_status: DocProcessingStatus
+) -> DocStatusResponse:
+    return DocStatusResponse(
+        id=doc_id,
+        content_summary=doc_status.content_summary,
+        content_length=doc_status.content_length,
+        status=doc_status.status,
+        created_at=format_datetime(doc_status.created_at),
+        updated_at=format_datetime(doc_status.updated_at),
+        chunks_count=doc_status.chunks_count,
+        error=doc_status.error,
+        metadata=doc_status.metadata,
+        file_path=doc_status.file_path,
+    )
+
+
 class PipelineStatusResponse(BaseModel):
     """Response model for pipeline status
 
@@ -474,6 +516,7 @@ class PipelineStatusResponse(BaseModel):
         latest_message: Latest message from pipeline processing
         history_messages: List of history messages
         update_status: Status of update flags for all namespaces
+        stages: Queue depth, running count and throughput of each pipeline stage
     """
 
     autoscanned: bool = False
@@ -487,6 +530,7 @@ class PipelineStatusResponse(BaseModel):
     latest_message: str = ""
     history_messages: Optional[List[str]] = None
     update_status: Optional[dict] = None
+    stages: Optional[dict] = None
 
     @validator("job_start", pre=True)
     def parse_job_start(cls, value):
@@ -868,79 +912,45 @@ async def run_scanning_process(rag: LightRAG, doc_manager: DocumentManager):
         logger.error(traceback.format_exc())
 
 
-async def execute_neo4j_cascade_delete(neo4j_storage, file_name: str) -> Dict[str, int]:
+def get_graph_file_name(doc_status: Any, file_name: Optional[str]) -> Optional[str]:
     """
-    Execute Neo4j cascade delete queries for a specific document file.
+    Get the name a document's graph data is stored under.
+
+    The graph's file_path properties hold the document's file_path exactly as
+    enqueued, so it is preferred over the file name given in a delete request.
 
     Args:
-        neo4j_storage: Neo4j storage instance with _driver attribute
-        file_name: Name of the file to delete from the graph
+        doc_status: Document status record (dict or DocProcessingStatus)
+        file_name: File name given in the request
 
     Returns:
-        Dictionary with counts of updated/deleted entities and relationships
+        The stored file_path, or file_name if the status has none
     """
-    try:
-        async with neo4j_storage._driver.session() as session:
-            # 1. Update multi-file entities (remove file from path)
-            update_query = """
-            MATCH (n)
-            WHERE n.file_path CONTAINS $file_name
-              AND n.file_path <> $file_name
-            SET n.file_path =
-                CASE
-                    WHEN n.file_path STARTS WITH $file_name + '<SEP>'
-                    THEN substring(n.file_path, size($file_name + '<SEP>'))
-
-                    WHEN n.file_path ENDS WITH '<SEP>' + $file_name
-                    THEN substring(n.file_path, 0, size(n.file_path) - size('<SEP>' + $file_name))
-
-                    WHEN n.file_path CONTAINS '<SEP>' + $file_name + '<SEP>'
-                    THEN replace(n.file_path, '<SEP>' + $file_name + '<SEP>', '<SEP>')
-
-                    ELSE n.file_path
-                END
-            RETURN count(n) as entities_updated
-            """
-
-            update_result = await session.run(update_query, file_name=file_name)
-            entities_updated = (await update_result.single())["entities_updated"]
-
-            # 2. Delete single-file entities
-            delete_entities_query = """
-            MATCH (n)
-            WHERE n.file_path = $file_name
-            DETACH DELETE n
-            RETURN count(n) as entities_deleted
-            """
-
-            delete_entities_result = await session.run(
-                delete_entities_query, file_name=file_name
-            )
-            entities_deleted = (await delete_entities_result.single())[
-                "entities_deleted"
-            ]
+    if isinstance(doc_status, dict):
+        stored_path = doc_status.get("file_path")
+    else:
+        stored_path = getattr(doc_status, "file_path", None)
+    return stored_path or file_name
 
-            # 3. Delete relationships
-            delete_relationships_query = """
-            MATCH ()-[r]->()
-            WHERE r.file_path CONTAINS $file_name
-            DELETE r
-            RETURN count(r) as relationships_deleted
-            """
 
-            delete_relationships_result = await session.run(
-                delete_relationships_query, file_name=file_name
-            )
-            relationships_deleted = (await delete_relationships_result.single())[
-                "relationships_deleted"
-            ]
+async def execute_neo4j_cascade_delete(neo4j_storage, file_name: str) -> Dict[str, int]:
+    """
+    Execute Neo4j cascade delete for a specific document file.
 
-            return {
-                "entities_updated": entities_updated,
-                "entities_deleted": entities_deleted,
-                "relationships_deleted": relationships_deleted,
-            }
+    Args:
+        neo4j_storage: Neo4j storage instance providing cascade_delete_files
+        file_name: File path as stored in the graph's file_path properties,
+            matched exactly (see get_graph_file_name)
 
+    Returns:
+        Dictionary with counts of updated/deleted entities and relationships
+    """
+    try:
+        file_counts = await neo4j_storage.cascade_delete_files([file_name])
+        return file_counts.get(
+            file_name,
+            {"entities_updated": 0, "entities_deleted": 0, "relationships_deleted": 0},
+        )
     except Exception as e:
         logger.error(f"Error executing Neo4j cascade delete for {file_name}: {str(e)}")
         raise
@@ -1542,36 +1552,78 @@ def create_document_routes(
                 DocStatus.FAILED,
             )
 
-            tasks = [rag.get_docs_by_status(status) for status in statuses]
-            results: List[Dict[str, DocProcessingStatus]] = await asyncio.gather(*tasks)
+            async def collect(status: DocStatus) -> List[DocStatusResponse]:
+                # Page through the status index, document content is never loaded
+                docs: List[DocStatusResponse] = []
+                cursor = None
+                while True:
+                    page, cursor = await rag.iter_docs_by_status(status, cursor=cursor)
+                    docs.extend(
+                        to_doc_status_response(doc_id, doc_status)
+                        for doc_id, doc_status in page.items()
+                    )
+                    if cursor is None:
+                        return docs
 
-            response = DocsStatusesResponse()
+            results = await asyncio.gather(*(collect(status) for status in statuses))
 
-            for idx, result in enumerate(results):
-                status = statuses[idx]
-                for doc_id, doc_status in result.items():
-                    if status not in response.statuses:
-                        response.statuses[status] = []
-                    response.statuses[status].append(
-                        DocStatusResponse(
-                            id=doc_id,
-                            content_summary=doc_status.content_summary,
-                            content_length=doc_status.content_length,
-                            status=doc_status.status,
-                            created_at=format_datetime(doc_status.created_at),
-                            updated_at=format_datetime(doc_status.updated_at),
-                            chunks_count=doc_status.chunks_count,
-                            error=doc_status.error,
-                            metadata=doc_status.metadata,
-                            file_path=doc_status.file_path,
-                        )
-                    )
+            response = DocsStatusesResponse()
+            for status, docs in zip(statuses, results):
+                if docs:
+                    response.statuses[status] = docs
             return response
         except Exception as e:
             logger.error(f"Error GET /documents: {str(e)}")
             logger.error(traceback.format_exc())
             raise HTTPException(status_code=500, detail=str(e))
 
+    @router.get(
+        "/status/{status}",
+        response_model=DocsPageResponse,
+        dependencies=[Depends(combined_auth)],
+    )
+    async def documents_by_status(
+        status: DocStatus,
+        limit: int = Query(
+            DEFAULT_DOC_STATUS_PAGE_SIZE, ge=1, le=10000, description="Page size"
+        ),
+        cursor: Optional[str] = Query(
+            None, description="next_cursor of the previous page"
+        ),
+    ) -> DocsPageResponse:
+        """
+        Get one page of the documents with a given status.
+
+        Documents are ordered by id and returned without their content. Pass the
+        next_cursor of a response as cursor to get the following page.
+
+        Args:
+            status (DocStatus): Status of the documents to list
+            limit (int): Maximum number of documents in the page
+            cursor (str, optional): Cursor returned with the previous page
+
+        Returns:
+            DocsPageResponse: The documents of the page and the cursor of the next page
+
+        Raises:
+            HTTPException: If an error occurs while retrieving the documents (500).
+        """
+        try:
+            page, next_cursor = await rag.iter_docs_by_status(
+                status, limit=limit, cursor=cursor
+            )
+            return DocsPageResponse(
+                documents=[
+                    to_doc_status_response(doc_id, doc_status)
+                    for doc_id, doc_status in page.items()
+                ],
+                next_cursor=next_cursor,
+            )
+        except Exception as e:
+            logger.error(f"Error GET /documents/status/{status}: {str(e)}")
+            logger.error(traceback.format_exc())
+            raise HTTPException(status_code=500, detail=str(e))
+
     @router.post(
         "/clear_cache",
         response_model=ClearCacheResponse,
@@ -1681,7 +1733,6 @@ def create_document_routes(
                     failed_count=len(request.documents),
                 )
 
-        results = []
         deleted_count = 0
         failed_count = 0
 
@@ -1715,21 +1766,30 @@ def create_document_routes(
                     neo4j_storage = storage
 
         try:
+            doc_statuses = {
+                doc["doc_id"]: await rag.doc_status.get_by_id(doc["doc_id"])
+                for doc in request.documents
+            }
+
+            # Results by request position, documents are finished in two passes
+            results_by_index = {}
+            # (index, doc_id, graph file, postgres cleanup) of documents whose
+            # per-document deletes succeeded
+            pending = []
+
             # Process each document individually
-            for doc in request.documents:
+            for index, doc in enumerate(request.documents):
                 doc_id = doc.get("doc_id")
                 file_name = doc.get("file_name")
 
                 try:
                     # Check if document exists
-                    doc_status = await rag.doc_status.get_by_id(doc_id)
+                    doc_status = doc_statuses.get(doc_id)
                     if not doc_status:
-                        results.append(
-                            DeleteDocumentResponse(
-                                status="not_found",
-                                message=f"Document with ID '{doc_id}' not found",
-                                doc_id=doc_id,
-                            )
+                        results_by_index[index] = DeleteDocumentResponse(
+                            status="not_found",
+                            message=f"Document with ID '{doc_id}' not found",
+                            doc_id=doc_id,
                         )
                         failed_count += 1
                         continue
@@ -1766,15 +1826,8 @@ def create_document_routes(
                             f"Could not find or delete any input file for document {doc_id} (tried: {file_names_to_try})"
                         )
 
-                    # Execute database-specific cascade delete if available, otherwise use regular delete
-                    database_cleanup = None
-                    deleted_via_db_function = False
-
-                    # Execute database-specific cascade deletes for all available backends
-                    postgres_cleanup = None
-                    neo4j_cleanup = None
-
                     # Try PostgreSQL cascade delete if PostgreSQL is active
+                    postgres_cleanup = None
                     if (
                         postgres_storage
                         and hasattr(postgres_storage, "db")
@@ -1795,7 +1848,6 @@ def create_document_routes(
                                 logger.info(
                                     f"PostgreSQL cascade delete completed for doc {doc_id}: {postgres_cleanup}"
                                 )
-                                deleted_via_db_function = True
                         except Exception as e:
                             logger.warning(
                                 f"Failed to execute PostgreSQL cascade delete for {doc_id}: {str(e)}"
@@ -1805,27 +1857,44 @@ def create_document_routes(
                             f"PostgreSQL not configured/active, skipping PostgreSQL deletion for doc {doc_id}"
                         )
 
-                    # Try Neo4j cascade delete if Neo4j is active
-                    if (
-                        neo4j_storage
-                        and hasattr(neo4j_storage, "_driver")
-                        and neo4j_storage._driver is not None
-                    ):
-                        try:
-                            neo4j_cleanup = await execute_neo4j_cascade_delete(
-                                neo4j_storage, file_name
-                            )
-                            logger.info(
-                                f"Neo4j cascade delete completed for doc {doc_id}: {neo4j_cleanup}"
-                            )
-                            deleted_via_db_function = True
-                        except Exception as e:
-                            logger.warning(
-                                f"Failed to execute Neo4j cascade delete for {doc_id}: {str(e)}"
-                            )
-                    else:
+                    graph_file = get_graph_file_name(doc_status, file_name)
+                    pending.append((index, doc_id, graph_file, postgres_cleanup))
+
+                except Exception as e:
+                    logger.error(f"Error deleting document {doc_id}: {str(e)}")
+                    results_by_index[index] = DeleteDocumentResponse(
+                        status="error",
+                        message=f"Failed to delete document: {str(e)}",
+                        doc_id=doc_id,
+                    )
+                    failed_count += 1
+
+            # Remove the graph data of the documents deleted so far in one Neo4j
+            # transaction, so a failed document keeps its graph data
+            neo4j_cleanups = None
+            if neo4j_storage and pending:
+                file_names = [graph_file for _, _, graph_file, _ in pending]
+                try:
+                    neo4j_cleanups = await neo4j_storage.cascade_delete_files(
+                        file_names
+                    )
+                    logger.info(
+                        f"Neo4j cascade delete completed for {len(file_names)} files"
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to execute Neo4j cascade delete for {len(file_names)} files: {str(e)}"
+                    )
+            elif not neo4j_storage:
+                logger.info("Neo4j not configured/active, skipping Neo4j deletion")
+
+            for index, doc_id, graph_file, postgres_cleanup in pending:
+                try:
+                    neo4j_cleanup = None
+                    if neo4j_cleanups is not None:
+                        neo4j_cleanup = neo4j_cleanups.get(graph_file)
                         logger.info(
-                            f"Neo4j not configured/active, skipping Neo4j deletion for doc {doc_id}"
+                            f"Neo4j cascade delete completed for doc {doc_id}: {neo4j_cleanup}"
                         )
 
                     # Combine cleanup results from both databases
@@ -1836,30 +1905,28 @@ def create_document_routes(
                         database_cleanup["neo4j"] = neo4j_cleanup
 
                     # Fall back to regular delete if no database-specific deletion succeeded
-                    if not deleted_via_db_function:
+                    if postgres_cleanup is None and neo4j_cleanups is None:
                         await rag.adelete_by_doc_id(doc_id)
 
-                    results.append(
-                        DeleteDocumentResponse(
-                            status="success",
-                            message=f"Document '{doc_id}' deleted successfully",
-                            doc_id=doc_id,
-                            database_cleanup=database_cleanup,
-                        )
+                    results_by_index[index] = DeleteDocumentResponse(
+                        status="success",
+                        message=f"Document '{doc_id}' deleted successfully",
+                        doc_id=doc_id,
+                        database_cleanup=database_cleanup,
                     )
                     deleted_count += 1
 
                 except Exception as e:
                     logger.error(f"Error deleting document {doc_id}: {str(e)}")
-                    results.append(
-                        DeleteDocumentResponse(
-                            status="error",
-                            message=f"Failed to delete document: {str(e)}",
-                            doc_id=doc_id,
-                        )
+                    results_by_index[index] = DeleteDocumentResponse(
+                        status="error",
+                        message=f"Failed to delete document: {str(e)}",
+                        doc_id=doc_id,
                     )
                     failed_count += 1
 
+            results = [results_by_index[index] for index in sorted(results_by_index)]
+
             # Determine overall status
             if deleted_count == len(request.documents):
                 overall_status = "success"
@@ -2096,7 +2163,8 @@ def create_document_routes(
                 ):
                     try:
                         neo4j_cleanup = await execute_neo4j_cascade_delete(
-                            neo4j_storage, request.file_name
+                            neo4j_storage,
+                            get_graph_file_name(doc_status, request.file_name),
                         )
                         logger.info(
                             f"Neo4j cascade delete completed for doc {doc_id}: {neo4j_cleanup}"
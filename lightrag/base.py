@@ -14,6 +14,7 @@ from typing import (
 )
 from .utils import EmbeddingFunc
 from .types import KnowledgeGraph
+from .constants import DEFAULT_DOC_STATUS_PAGE_SIZE
 
 # use the .env that is inside the current folder
 # allows to use different .env file for each lightrag instance
@@ -98,6 +99,11 @@ class QueryParam:
     If proivded, this will be use instead of the default vaulue from prompt template.
     """
 
+    context_metadata: dict[str, Any] = field(default_factory=dict)
+    """Diagnostics filled in while the query context is built, e.g. "branch_timings"
+    with the wall time in seconds of each retrieval branch.
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -263,6 +269,62 @@ class BaseKVStorage(StorageNameSpace, ABC):
             None
         """
 
+    async def get_by_mode_and_id(self, mode: str, id: str) -> dict[str, Any] | None:
+        """Get a single LLM cache entry, returned as {id: entry}
+
+        Default implementation reads the whole mode dict.
+        Override this method in storage backends that can address
+        cache entries by (mode, id) directly.
+        """
+        mode_cache = await self.get_by_id(mode) or {}
+        if id in mode_cache:
+            return {id: mode_cache[id]}
+        return None
+
+    async def upsert_cache_entry(
+        self, mode: str, id: str, entry: dict[str, Any]
+    ) -> None:
+        """Insert or update a single LLM cache entry
+
+        Default implementation rewrites the whole mode dict.
+        Override this method in storage backends that can address
+        cache entries by (mode, id) directly.
+
+        Importance notes for in-memory storage:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. update flags to notify other processes that data persistence is needed
+        """
+        mode_cache = await self.get_by_id(mode) or {}
+        mode_cache[id] = entry
+        await self.upsert({mode: mode_cache})
+
+    async def get_cache_embeddings_since(
+        self, mode: str, watermark: Any = None
+    ) -> tuple[dict[str, dict[str, Any]], Any]:
+        """Get the LLM cache entries of a mode that carry a quantized embedding
+
+        Only entries written since the watermark returned by the previous call are
+        returned, so keeping the semantic cache index current costs as much as the
+        entries added in the meantime. Entries written just before the watermark
+        may be returned again. Pass None to get every entry.
+
+        Default implementation reads the whole mode dict on the first call and
+        returns nothing afterwards. Override this method in storage backends shared
+        between processes or hosts, so that entries saved elsewhere are picked up.
+
+        Returns:
+            The entries as {id: entry} and the watermark for the next call
+        """
+        if watermark is not None:
+            return {}, watermark
+        mode_cache = await self.get_by_id(mode) or {}
+        entries = {
+            cache_id: entry
+            for cache_id, entry in mode_cache.items()
+            if isinstance(entry, dict) and entry.get("embedding")
+        }
+        return entries, True
+
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
         """Delete specific records from storage by cache mode
 
@@ -472,6 +534,34 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             edge_data: A dictionary of edge properties
         """
 
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """Insert or update nodes as a batch
+
+        Default implementation loops over the single-node upsert, one call per
+        node. Storage backends that support bulk writes (e.g. Neo4j with UNWIND)
+        override this method.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        for node_id, node_data in nodes:
+            await self.upsert_node(node_id, node_data)
+
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, str]]]
+    ) -> None:
+        """Insert or update edges as a batch
+
+        Default implementation loops over the single-edge upsert, one call per
+        edge. Storage backends that support bulk writes (e.g. Neo4j with UNWIND)
+        override this method.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        for source_node_id, target_node_id, edge_data in edges:
+            await self.upsert_edge(source_node_id, target_node_id, edge_data)
+
     @abstractmethod
     async def delete_node(self, node_id: str) -> None:
         """Delete a node from the graph.
@@ -550,8 +640,8 @@ class DocStatus(str, Enum):
 class DocProcessingStatus:
     """Document processing status data structure"""
 
-    content: str
-    """Original content of the document"""
+    content: str | None
+    """Original content of the document, None when it was not requested"""
     content_summary: str
     """First 100 chars of document content, used for preview"""
     content_length: int
@@ -586,6 +676,39 @@ class DocStatusStorage(BaseKVStorage, ABC):
     ) -> dict[str, DocProcessingStatus]:
         """Get all documents with a specific status"""
 
+    async def iter_docs_by_status(
+        self,
+        status: DocStatus,
+        limit: int = DEFAULT_DOC_STATUS_PAGE_SIZE,
+        cursor: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[dict[str, DocProcessingStatus], str | None]:
+        """Get one page of the documents with a specific status, ordered by document id
+
+        Backends with a status index should override this fallback, which loads
+        every document of the status.
+
+        Args:
+            status: Status of the documents to list
+            limit: Maximum number of documents in the page
+            cursor: Cursor returned with the previous page, None for the first page
+            include_content: Load the document content, otherwise content is None
+
+        Returns:
+            The documents of the page and the cursor of the next page (None on the last page)
+        """
+        docs = await self.get_docs_by_status(status)
+        doc_ids = sorted(doc_id for doc_id in docs if cursor is None or doc_id > cursor)
+        page_ids = doc_ids[:limit]
+        page = {}
+        for doc_id in page_ids:
+            doc = docs[doc_id]
+            if not include_content:
+                doc.content = None
+            page[doc_id] = doc
+        next_cursor = page_ids[-1] if len(doc_ids) > limit else None
+        return page, next_cursor
+
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
         """Drop cache is not supported for Doc Status storage"""
         return False
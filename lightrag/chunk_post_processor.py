@@ -236,103 +236,83 @@ def merge_validated_relationships(
     return result_edges
 
 
-async def _post_process_chunk_relationships(
+def _chunk_entity_names(chunk_entities: Dict[str, Any]) -> set:
+    """Names of the entities extracted from a chunk, empty if there is no entity data"""
+    chunk_entity_names = set()
+    if isinstance(chunk_entities, dict):
+        for entity_list in chunk_entities.values():
+            if isinstance(entity_list, list):
+                for entity in entity_list:
+                    if isinstance(entity, dict) and "entity_name" in entity:
+                        chunk_entity_names.add(entity["entity_name"])
+    return chunk_entity_names
+
+
+async def _validate_relationship_batch(
     chunk_content: str,
-    maybe_edges: defaultdict,
-    chunk_entities: Dict[str, Any],
+    batch_edges: defaultdict,
+    chunk_entity_names: set,
     llm_func: callable,
-    chunk_key: str,
+    batch_key: str,
     global_config: Dict[str, Any],
-) -> defaultdict:
+) -> defaultdict | None:
     """
-    Post-process relationships for a single chunk using LLM validation.
+    Validate one batch of a chunk's relationships with a single LLM call.
 
-    This function validates relationships immediately after extraction from a chunk,
-    using the chunk content as context for accurate validation.
+    The prompt only holds the relationships of this batch, so every batch has its own
+    LLM cache entry and re-running a chunk only calls the LLM for batches not cached yet.
 
     Args:
         chunk_content: The text content of the chunk
-        maybe_edges: defaultdict containing extracted relationships
-        chunk_entities: Dictionary of entities extracted from this chunk
+        batch_edges: defaultdict with the relationships of this batch
+        chunk_entity_names: Entities extracted from the chunk, see _chunk_entity_names
         llm_func: LLM function for validation
-        chunk_key: Unique identifier for the chunk
+        batch_key: Chunk identifier (with batch number) for logging
         global_config: Configuration dictionary
 
     Returns:
-        defaultdict with validated relationships (same structure as input)
+        defaultdict with the validated relationships of this batch, None if validation failed
     """
-    logger.info(f"DEBUG: _post_process_chunk_relationships called for {chunk_key}")
-    
-    # Check if chunk post-processing is enabled
-    chunk_processing_enabled = global_config.get("enable_chunk_post_processing", False)
-    logger.info(f"DEBUG: Chunk post-processing enabled check: {chunk_processing_enabled}")
-    
-    if not chunk_processing_enabled:
-        logger.info(f"DEBUG: Chunk post-processing disabled, returning original edges")
-        return maybe_edges
-
-    # Check if there are relationships to process
-    if not maybe_edges:
-        logger.debug(f"Chunk {chunk_key}: No relationships to validate")
-        return maybe_edges
-
-    total_relationships = sum(len(edge_list) for edge_list in maybe_edges.values())
-    max_batch_size = global_config.get("chunk_validation_batch_size", 50)
+    relationships_list = []
+    for edge_key, edge_list in batch_edges.items():
+        for rel in edge_list:
+            relationships_list.append(
+                {
+                    "src_id": rel["src_id"],
+                    "tgt_id": rel["tgt_id"],
+                    "rel_type": rel["rel_type"],
+                    "weight": rel["weight"],
+                    "description": rel["description"],
+                    "keywords": rel.get("keywords", ""),
+                }
+            )
 
-    # Skip processing if too many relationships for single batch
-    if total_relationships > max_batch_size:
-        logger.warning(
-            f"Chunk {chunk_key}: {total_relationships} relationships exceed batch size {max_batch_size}, skipping validation"
-        )
-        return maybe_edges
+    # Prepare prompt
+    relationships_json = json.dumps(relationships_list, indent=2)
+    validation_prompt = CHUNK_RELATIONSHIP_VALIDATION_PROMPT.format(
+        chunk_content=chunk_content[:2000],  # Limit chunk content size
+        relationships_json=relationships_json,
+    )
 
-    logger.info(f"Chunk {chunk_key}: Validating {total_relationships} relationships")
+    # Call LLM with timeout
+    timeout = global_config.get("chunk_validation_timeout", 30)
+    llm_response = None
 
     try:
-        # Convert relationships to list format for LLM processing
-        relationships_list = []
-        for edge_key, edge_list in maybe_edges.items():
-            for rel in edge_list:
-                relationships_list.append(
-                    {
-                        "src_id": rel["src_id"],
-                        "tgt_id": rel["tgt_id"],
-                        "rel_type": rel["rel_type"],
-                        "weight": rel["weight"],
-                        "description": rel["description"],
-                        "keywords": rel.get("keywords", ""),
-                    }
-                )
-
-        # Prepare prompt
-        relationships_json = json.dumps(relationships_list, indent=2)
-        validation_prompt = CHUNK_RELATIONSHIP_VALIDATION_PROMPT.format(
-            chunk_content=chunk_content[:2000],  # Limit chunk content size
-            relationships_json=relationships_json,
-        )
-
-        # Call LLM with timeout
-        timeout = global_config.get("chunk_validation_timeout", 30)
-
         # Check if post-processing cache is enabled
         llm_response_cache = global_config.get("llm_response_cache")
         enable_cache = global_config.get("enable_llm_cache_for_post_process", True)
 
-        # Diagnostic logging
-        logger.info(
-            f"Chunk {chunk_key}: Cache diagnostic - llm_response_cache exists: {llm_response_cache is not None}, enable_cache: {enable_cache}"
-        )
         if llm_response_cache is None:
             logger.warning(
-                f"Chunk {chunk_key}: llm_response_cache is None - cache disabled"
+                f"Chunk {batch_key}: llm_response_cache is None - cache disabled"
             )
 
         if llm_response_cache and enable_cache:
             # Use cached LLM call
             logger.info(
-                f"Chunk {chunk_key}: Checking post-processing cache for {total_relationships} relationships"
+                f"Chunk {batch_key}: Checking post-processing cache for {len(relationships_list)} relationships"
             )
-            logger.info(f"DEBUG: Using cached LLM call - cache_type=post_process, enable_cache={enable_cache}")
             llm_response = await asyncio.wait_for(
                 use_llm_func_with_cache(
                     validation_prompt,
@@ -342,14 +322,11 @@ async def _post_process_chunk_relationships(
                 ),
                 timeout=timeout,
             )
-            logger.info(f"DEBUG: LLM response received for {chunk_key} (cached call)")
         else:
             # Direct LLM call without caching
-            logger.info(f"DEBUG: Using direct LLM call (no cache) for {chunk_key}")
             llm_response = await asyncio.wait_for(
                 llm_func(validation_prompt), timeout=timeout
             )
-            logger.info(f"DEBUG: LLM response received for {chunk_key} (direct call)")
 
         # Parse and validate LLM response
         cleaned_response = clean_llm_response(llm_response)
@@ -363,15 +340,6 @@ async def _post_process_chunk_relationships(
 
         # Validate each relationship
         valid_relationships = []
-        # Create a set of entity names from chunk_entities for faster lookup
-        chunk_entity_names = set()
-        if isinstance(chunk_entities, dict):
-            for entity_list in chunk_entities.values():
-                if isinstance(entity_list, list):
-                    for entity in entity_list:
-                        if isinstance(entity, dict) and "entity_name" in entity:
-                            chunk_entity_names.add(entity["entity_name"])
-
         for rel in validated_relationships:
             if validate_relationship_schema(rel):
                 # Check that entities exist in chunk (if we have entity data)
@@ -382,42 +350,132 @@ async def _post_process_chunk_relationships(
                     valid_relationships.append(rel)
                 else:
                     logger.debug(
-                        f"Chunk {chunk_key}: Skipping relationship with unknown entities: {rel['src_id']} -> {rel['tgt_id']}"
+                        f"Chunk {batch_key}: Skipping relationship with unknown entities: {rel['src_id']} -> {rel['tgt_id']}"
                     )
             else:
-                logger.debug(f"Chunk {chunk_key}: Skipping invalid relationship: {rel}")
+                logger.debug(f"Chunk {batch_key}: Skipping invalid relationship: {rel}")
 
         # Merge validated relationships back
         log_changes = global_config.get("log_validation_changes", False)
         validated_edges = merge_validated_relationships(
-            maybe_edges, valid_relationships, chunk_key, log_changes
+            batch_edges, valid_relationships, batch_key, log_changes
         )
 
         # Log summary
         if "summary" in validation_result:
             summary = validation_result["summary"]
-            logger.info(f"Chunk {chunk_key}: LLM summary - {summary}")
+            logger.info(f"Chunk {batch_key}: LLM summary - {summary}")
 
-        logger.info(f"DEBUG: Chunk post-processing completed successfully for {chunk_key}")
         return validated_edges
 
     except asyncio.TimeoutError:
         logger.warning(
-            f"Chunk {chunk_key}: Validation timed out after {timeout}s, using original relationships"
+            f"Chunk {batch_key}: Validation timed out after {timeout}s, using original relationships"
         )
-        return maybe_edges
+        return None
 
     except json.JSONDecodeError as e:
-        logger.warning(f"Chunk {chunk_key}: Failed to parse LLM response as JSON: {e}")
+        logger.warning(f"Chunk {batch_key}: Failed to parse LLM response as JSON: {e}")
         if global_config.get("log_validation_changes", False):
-            logger.debug(f"Chunk {chunk_key}: Raw LLM response: {llm_response}")
-        return maybe_edges
+            logger.debug(f"Chunk {batch_key}: Raw LLM response: {llm_response}")
+        return None
 
     except Exception as e:
-        logger.warning(f"Chunk {chunk_key}: Validation failed with error: {e}")
+        logger.warning(f"Chunk {batch_key}: Validation failed with error: {e}")
         if global_config.get("log_validation_changes", False):
-            logger.debug(f"Chunk {chunk_key}: Full error details", exc_info=True)
+            logger.debug(f"Chunk {batch_key}: Full error details", exc_info=True)
+        return None
+
+
+async def _post_process_chunk_relationships(
+    chunk_content: str,
+    maybe_edges: defaultdict,
+    chunk_entities: Dict[str, Any],
+    llm_func: callable,
+    chunk_key: str,
+    global_config: Dict[str, Any],
+) -> defaultdict:
+    """
+    Post-process relationships for a single chunk using LLM validation.
+
+    This function validates relationships immediately after extraction from a chunk,
+    using the chunk content as context for accurate validation. Chunks with more than
+    chunk_validation_batch_size relationships are split into batches that are
+    validated concurrently, a batch whose validation fails keeps its original
+    relationships.
+
+    Args:
+        chunk_content: The text content of the chunk
+        maybe_edges: defaultdict containing extracted relationships
+        chunk_entities: Dictionary of entities extracted from this chunk
+        llm_func: LLM function for validation
+        chunk_key: Unique identifier for the chunk
+        global_config: Configuration dictionary
+
+    Returns:
+        defaultdict with validated relationships (same structure as input)
+    """
+    # Check if chunk post-processing is enabled
+    if not global_config.get("enable_chunk_post_processing", False):
+        logger.debug(f"Chunk {chunk_key}: Chunk post-processing disabled")
+        return maybe_edges
+
+    # Check if there are relationships to process
+    if not maybe_edges:
+        logger.debug(f"Chunk {chunk_key}: No relationships to validate")
+        return maybe_edges
+
+    total_relationships = sum(len(edge_list) for edge_list in maybe_edges.values())
+    max_batch_size = max(1, global_config.get("chunk_validation_batch_size", 50))
+
+    if total_relationships <= max_batch_size:
+        # A single batch is the chunk's own edges, its prompt (and cache entry) is the
+        # one of an unbatched validation
+        batches = [maybe_edges]
+    else:
+        # Consecutive slices of the chunk's relationships, in extraction order
+        batches = []
+        batch_size = max_batch_size
+        for edge_key, edge_list in maybe_edges.items():
+            for rel in edge_list:
+                if batch_size >= max_batch_size:
+                    batches.append(defaultdict(list))
+                    batch_size = 0
+                batches[-1][edge_key].append(rel)
+                batch_size += 1
+        logger.info(
+            f"Chunk {chunk_key}: {total_relationships} relationships exceed batch size {max_batch_size}, validating {len(batches)} batches concurrently"
+        )
+
+    logger.info(f"Chunk {chunk_key}: Validating {total_relationships} relationships")
+
+    chunk_entity_names = _chunk_entity_names(chunk_entities)
+    batch_results = await asyncio.gather(
+        *(
+            _validate_relationship_batch(
+                chunk_content,
+                batch_edges,
+                chunk_entity_names,
+                llm_func,
+                chunk_key
+                if len(batches) == 1
+                else f"{chunk_key} [batch {index + 1}/{len(batches)}]",
+                global_config,
+            )
+            for index, batch_edges in enumerate(batches)
+        )
+    )
+
+    if all(result is None for result in batch_results):
         return maybe_edges
+    if len(batches) == 1:
+        return batch_results[0]
+
+    validated_edges = defaultdict(list)
+    for batch_edges, result in zip(batches, batch_results):
+        for edge_key, edge_list in (batch_edges if result is None else result).items():
+            validated_edges[edge_key].extend(edge_list)
+    return validated_edges
 
 
 def cleanup_orphaned_entities(
@@ -13,6 +13,20 @@ DEFAULT_WOKERS = 2
 DEFAULT_TIMEOUT = 150
 DEFAULT_ENABLE_CHUNK_POST_PROCESSING = True
 DEFAULT_ENABLE_ENTITY_CLEANUP = False
+DEFAULT_MERGE_BATCH_SIZE = 500
+DEFAULT_GRAPH_WRITE_MAX_ASYNC = 16
+DEFAULT_CHUNK_CONTENT_CACHE_SIZE = 10000
+DEFAULT_TOKEN_COUNT_CACHE_SIZE = 100000
+DEFAULT_PIPELINE_QUEUE_SIZE = 2
+DEFAULT_EXTRACTION_WINDOW_SIZE = 64
+DEFAULT_VECTOR_DB_UPSERT_BATCH_SIZE = 256
+DEFAULT_VECTOR_DB_MAX_ASYNC = 8
+DEFAULT_JSON_JOURNAL_COMPACT_RATIO = 0.5
+DEFAULT_JSON_JOURNAL_COMPACT_MIN_BYTES = 8388608  # 8MB
+DEFAULT_DOC_STATUS_PAGE_SIZE = 1000
+DEFAULT_RELATIONSHIP_TYPE_CACHE_SIZE = 50000
+DEFAULT_NEO4J_EMBEDDING_CACHE_SIZE = 10000
+DEFAULT_CACHE_EMBEDDING_WATERMARK_OVERLAP = 5  # seconds
 
 # Logging configuration defaults
 DEFAULT_LOG_MAX_BYTES = 10485760  # Default 10MB
@@ -28,6 +28,7 @@ STORAGE_IMPLEMENTATIONS = {
             "ChromaVectorDBStorage",
             "PGVectorStorage",
             "FaissVectorDBStorage",
+            "MmapVectorDBStorage",
             "QdrantVectorDBStorage",
             "MongoVectorDBStorage",
             # "TiDBVectorDBStorage",
@@ -75,6 +76,7 @@ STORAGE_ENV_REQUIREMENTS: dict[str, list[str]] = {
     # "TiDBVectorDBStorage": ["TIDB_USER", "TIDB_PASSWORD", "TIDB_DATABASE"],
     "PGVectorStorage": ["POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_DATABASE"],
     "FaissVectorDBStorage": [],
+    "MmapVectorDBStorage": [],
     "QdrantVectorDBStorage": ["QDRANT_URL"],  # QDRANT_API_KEY has default value None
     "MongoVectorDBStorage": [],
     # Document Status Storage Implementations
@@ -107,6 +109,7 @@ STORAGES = {
     # "GremlinStorage": ".kg.gremlin_impl",
     "PGDocStatusStorage": ".kg.postgres_impl",
     "FaissVectorDBStorage": ".kg.faiss_impl",
+    "MmapVectorDBStorage": ".kg.mmap_vector_impl",
     "QdrantVectorDBStorage": ".kg.qdrant_impl",
 }
 
@@ -5,7 +5,12 @@ from typing import Any, final
 import numpy as np
 
 from lightrag.base import BaseVectorStorage
-from lightrag.utils import logger
+from lightrag.utils import (
+    logger,
+    BlockingClientExecutor,
+    get_vector_db_io_settings,
+    run_in_batches,
+)
 import pipmaster as pm
 
 if not pm.is_installed("chromadb"):
@@ -18,7 +23,11 @@ from chromadb.config import Settings  # type: ignore
 @final
 @dataclass
 class ChromaVectorDBStorage(BaseVectorStorage):
-    """ChromaDB vector storage implementation."""
+    """ChromaDB vector storage implementation.
+
+    The chromadb clients are synchronous, every call runs on a dedicated bounded
+    thread pool so requests do not block the event loop.
+    """
 
     def __post_init__(self):
         try:
@@ -93,21 +102,38 @@ class ChromaVectorDBStorage(BaseVectorStorage):
                     ),
                 )
 
-            self._collection = self._client.get_or_create_collection(
+            self._collection_settings = collection_settings
+            self._collection = None
+            # Use batch size from collection settings if specified
+            self._max_batch_size = self.global_config.get(
+                "embedding_batch_num", collection_settings.get("hnsw:batch_size", 32)
+            )
+            self._upsert_batch_size, self._max_async = get_vector_db_io_settings(config)
+            self._executor = BlockingClientExecutor(
+                self._max_async, f"chroma-{self.namespace}"
+            )
+        except Exception as e:
+            logger.error(f"ChromaDB initialization failed: {str(e)}")
+            raise
+
+    async def initialize(self):
+        """Create the collection on first use"""
+        try:
+            self._collection = await self._executor.run(
+                self._client.get_or_create_collection,
                 name=self.namespace,
                 metadata={
-                    **collection_settings,
+                    **self._collection_settings,
                     "dimension": self.embedding_func.embedding_dim,
                 },
             )
-            # Use batch size from collection settings if specified
-            self._max_batch_size = self.global_config.get(
-                "embedding_batch_num", collection_settings.get("hnsw:batch_size", 32)
-            )
         except Exception as e:
             logger.error(f"ChromaDB initialization failed: {str(e)}")
             raise
 
+    async def finalize(self):
+        self._executor.shutdown()
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.info(f"Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -147,17 +173,26 @@ class ChromaVectorDBStorage(BaseVectorStorage):
 
             embeddings = np.concatenate(embeddings_list)
 
-            # Upsert in batches
-            for i in range(0, len(ids), self._max_batch_size):
-                batch_slice = slice(i, i + self._max_batch_size)
-
-                self._collection.upsert(
-                    ids=ids[batch_slice],
-                    embeddings=embeddings[batch_slice].tolist(),
-                    documents=documents[batch_slice],
-                    metadatas=metadatas[batch_slice],
+            # Upsert in batches, a bounded number of them at a time
+            async def _upsert_batch(rows: list[tuple]):
+                batch_ids, batch_embeddings, batch_documents, batch_metadatas = zip(
+                    *rows
+                )
+                await self._executor.run(
+                    self._collection.upsert,
+                    ids=list(batch_ids),
+                    embeddings=list(batch_embeddings),
+                    documents=list(batch_documents),
+                    metadatas=list(batch_metadatas),
                 )
 
+            await run_in_batches(
+                list(zip(ids, embeddings.tolist(), documents, metadatas)),
+                self._upsert_batch_size,
+                _upsert_batch,
+                self._max_async,
+            )
+
             return ids
 
         except Exception as e:
@@ -172,7 +207,8 @@ class ChromaVectorDBStorage(BaseVectorStorage):
                 [query], _priority=5
             )  # higher priority for query
 
-            results = self._collection.query(
+            results = await self._executor.run(
+                self._collection.query,
                 query_embeddings=(
                     embedding.tolist() if not isinstance(embedding, list) else embedding
                 ),
@@ -213,7 +249,7 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             logger.info(f"Deleting entity with ID {entity_name} from {self.namespace}")
-            self._collection.delete(ids=[entity_name])
+            await self._executor.run(self._collection.delete, ids=[entity_name])
         except Exception as e:
             logger.error(f"Error during entity deletion: {str(e)}")
             raise
@@ -235,7 +271,7 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             logger.info(f"Deleting {len(ids)} vectors from {self.namespace}")
-            self._collection.delete(ids=ids)
+            await self._executor.run(self._collection.delete, ids=ids)
             logger.debug(
                 f"Successfully deleted {len(ids)} vectors from {self.namespace}"
             )
@@ -258,8 +294,10 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Query the collection for a single vector by ID
-            result = self._collection.get(
-                ids=[id], include=["metadatas", "embeddings", "documents"]
+            result = await self._executor.run(
+                self._collection.get,
+                ids=[id],
+                include=["metadatas", "embeddings", "documents"],
             )
 
             if not result or not result["ids"] or len(result["ids"]) == 0:
@@ -291,8 +329,10 @@ class ChromaVectorDBStorage(BaseVectorStorage):
 
         try:
             # Query the collection for multiple vectors by IDs
-            result = self._collection.get(
-                ids=ids, include=["metadatas", "embeddings", "documents"]
+            result = await self._executor.run(
+                self._collection.get,
+                ids=ids,
+                include=["metadatas", "embeddings", "documents"],
             )
 
             if not result or not result["ids"] or len(result["ids"]) == 0:
@@ -325,10 +365,10 @@ class ChromaVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Get all IDs in the collection
-            result = self._collection.get(include=[])
+            result = await self._executor.run(self._collection.get, include=[])
             if result and result["ids"] and len(result["ids"]) > 0:
                 # Delete all documents
-                self._collection.delete(ids=result["ids"])
+                await self._executor.run(self._collection.delete, ids=result["ids"])
 
             logger.info(
                 f"Process {os.getpid()} drop ChromaDB collection {self.namespace}"
@@ -26,12 +26,62 @@ if not pm.is_installed(FAISS_PACKAGE):
     pm.install(FAISS_PACKAGE)
 
 
+# Marks a metadata field that a record does not have
+_MISSING = object()
+
+# Per-row kinds of a metadata column
+_KIND_MISSING, _KIND_STR, _KIND_JSON = 0, 1, 2
+
+
+def _encode_column(prefix: str, values: list[Any]) -> dict[str, np.ndarray]:
+    """Encode one metadata column as a UTF-8 blob plus offsets, without pickling"""
+    kinds = np.zeros(len(values), dtype=np.int8)
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    chunks = []
+    position = 0
+    for i, value in enumerate(values):
+        if value is _MISSING:
+            encoded = b""
+        elif isinstance(value, str):
+            kinds[i] = _KIND_STR
+            encoded = value.encode("utf-8")
+        else:
+            kinds[i] = _KIND_JSON
+            encoded = json.dumps(value).encode("utf-8")
+        chunks.append(encoded)
+        position += len(encoded)
+        offsets[i + 1] = position
+    return {
+        f"{prefix}_kinds": kinds,
+        f"{prefix}_offsets": offsets,
+        f"{prefix}_blob": np.frombuffer(b"".join(chunks), dtype=np.uint8),
+    }
+
+
+def _decode_column(prefix: str, data) -> list[Any]:
+    kinds = data[f"{prefix}_kinds"]
+    offsets = data[f"{prefix}_offsets"]
+    blob = data[f"{prefix}_blob"].tobytes()
+    values = []
+    for i, kind in enumerate(kinds.tolist()):
+        if kind == _KIND_MISSING:
+            values.append(_MISSING)
+            continue
+        text = blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+        values.append(text if kind == _KIND_STR else json.loads(text))
+    return values
+
+
 @final
 @dataclass
 class FaissVectorDBStorage(BaseVectorStorage):
     """
     A Faiss-based Vector DB Storage for LightRAG.
     Uses cosine similarity by storing normalized vectors in a Faiss index with inner product search.
+
+    Vectors are addressed through an IndexIDMap2, so upserts and deletes look ids up in
+    a dict and remove vectors in place instead of rebuilding the index. Collections
+    above faiss_index_settings["threshold"] can switch to an IVF or HNSW index.
     """
 
     def __post_init__(self):
@@ -44,24 +94,48 @@ class FaissVectorDBStorage(BaseVectorStorage):
             )
         self.cosine_better_than_threshold = cosine_threshold
 
+        user_index_settings = kwargs.get("faiss_index_settings", {})
+        default_index_settings = {
+            # Index used once the collection reaches "threshold" vectors:
+            # "flat" (exact search), "ivf" or "hnsw" (approximate search)
+            "index_type": "flat",
+            # Collections smaller than this always use an exact flat index
+            "threshold": 50000,
+            # Number of IVF clusters, 0 derives it from the collection size
+            "ivf_nlist": 0,
+            # Number of IVF clusters visited per query
+            # Higher values = better recall but slower search
+            "ivf_nprobe": 16,
+            # Number of connections per node in the HNSW graph
+            # Higher values = better recall but more memory usage
+            "hnsw_m": 32,
+            # Number of nearest neighbors to explore during index construction
+            "hnsw_ef_construction": 128,
+            # Number of nearest neighbors to explore during search
+            "hnsw_ef_search": 128,
+            # HNSW cannot remove vectors in place, deleted vectors are skipped at
+            # query time and the graph is rebuilt once they exceed this ratio
+            "hnsw_compact_ratio": 0.2,
+        }
+        self._index_settings = {**default_index_settings, **user_index_settings}
+        if self._index_settings["index_type"] not in ("flat", "ivf", "hnsw"):
+            raise ValueError(
+                f"Unsupported faiss index_type: {self._index_settings['index_type']}"
+            )
+
         # Where to save index file if you want persistent storage
         self._faiss_index_file = os.path.join(
             self.global_config["working_dir"], f"faiss_index_{self.namespace}.index"
         )
-        self._meta_file = self._faiss_index_file + ".meta.json"
+        self._meta_file = self._faiss_index_file + ".meta.npz"
+        # Metadata file written before vectors moved out of the metadata
+        self._legacy_meta_file = self._faiss_index_file + ".meta.json"
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
-        # Keep a local store for metadata, IDs, etc.
-        # Maps <int faiss_id> → metadata (including your original ID).
-        self._id_to_meta = {}
-
+        self._reset_index()
         self._load_faiss_index()
 
     async def initialize(self):
@@ -81,8 +155,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -142,29 +215,29 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.normalize_L2(embeddings)
 
         # Upsert logic:
-        # 1. Identify which vectors to remove if they exist
-        # 2. Remove them
-        # 3. Add the new vectors
-        existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
-            faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
-            if faiss_internal_id is not None:
-                existing_ids_to_remove.append(faiss_internal_id)
-
+        # 1. Remove the vectors of ids that already exist
+        # 2. Add the new vectors under fresh Faiss ids
+        existing_ids_to_remove = [
+            self._custom_id_to_fid[meta["__id__"]]
+            for meta in list_data
+            if meta["__id__"] in self._custom_id_to_fid
+        ]
         if existing_ids_to_remove:
             await self._remove_faiss_ids(existing_ids_to_remove)
 
-        # Step 2: Add new vectors
         index = await self._get_index()
-        start_idx = index.ntotal
-        index.add(embeddings)
+        async with self._storage_lock:
+            fids = np.arange(
+                self._next_fid, self._next_fid + len(list_data), dtype=np.int64
+            )
+            self._next_fid += len(list_data)
+            index.add_with_ids(embeddings, fids)
+
+            for fid, meta in zip(fids.tolist(), list_data):
+                self._id_to_meta[fid] = meta
+                self._custom_id_to_fid[meta["__id__"]] = fid
 
-        # Step 3: Store metadata + vector for each new ID
-        for i, meta in enumerate(list_data):
-            fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+            self._maybe_upgrade_index()
 
         logger.info(f"Upserted {len(list_data)} vectors into Faiss index.")
         return [m["__id__"] for m in list_data]
@@ -186,9 +259,13 @@ class FaissVectorDBStorage(BaseVectorStorage):
             f"Query: {query}, top_k: {top_k}, threshold: {self.cosine_better_than_threshold}"
         )
 
-        # Perform the similarity search
+        # Perform the similarity search, asking for extra results to make up for
+        # deleted vectors still present in an HNSW graph
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        search_k = min(top_k + self._tombstones, index.ntotal)
+        if search_k <= 0:
+            return []
+        distances, indices = index.search(embedding, search_k)
 
         distances = distances[0]
         indices = indices[0]
@@ -203,7 +280,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if dist < self.cosine_better_than_threshold:
                 continue
 
-            meta = self._id_to_meta.get(idx, {})
+            meta = self._id_to_meta.get(int(idx))
+            if meta is None:
+                # Deleted vector that has not been compacted away yet
+                continue
             results.append(
                 {
                     **meta,
@@ -213,6 +293,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 }
             )
 
+            if len(results) >= top_k:
+                break
+
         return results
 
     @property
@@ -230,11 +313,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
            KG-storage-log should be used to avoid data corruption
         """
         logger.info(f"Deleting {len(ids)} vectors from {self.namespace}")
-        to_remove = []
-        for cid in ids:
-            fid = self._find_faiss_id_by_custom_id(cid)
-            if fid is not None:
-                to_remove.append(fid)
+        to_remove = [
+            self._custom_id_to_fid[cid] for cid in ids if cid in self._custom_id_to_fid
+        ]
 
         if to_remove:
             await self._remove_faiss_ids(to_remove)
@@ -275,55 +356,195 @@ class FaissVectorDBStorage(BaseVectorStorage):
     # Internal helper methods
     # --------------------------------------------------------------------------------
 
-    def _find_faiss_id_by_custom_id(self, custom_id: str):
+    def _reset_index(self):
+        """Start over with an empty exact index"""
+        self._index = self._build_index("flat")
+        # Maps <int faiss_id> → metadata (including your original ID)
+        self._id_to_meta: dict[int, dict[str, Any]] = {}
+        # Maps original ID → <int faiss_id>
+        self._custom_id_to_fid: dict[str, int] = {}
+        self._next_fid = 0
+        # Deleted vectors still stored in an HNSW graph
+        self._tombstones = 0
+
+    def _build_index(self, index_type: str, ntotal: int = 0):
+        """Create an empty inner-product index addressed by our own int64 ids
+
+        IVF indexes store ids natively; wrapping them in an IndexIDMap2 would break
+        remove_ids, which compacts the id map but not the inverted lists.
         """
-        Return the Faiss internal ID for a given custom ID, or None if not found.
-        """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        settings = self._index_settings
+        if index_type == "ivf":
+            nlist = settings["ivf_nlist"] or int(4 * np.sqrt(max(ntotal, 1)))
+            # Faiss wants roughly 39 training points per cluster
+            nlist = max(1, min(nlist, ntotal // 39 if ntotal else 1))
+            quantizer = faiss.IndexFlatIP(self._dim)
+            base = faiss.IndexIVFFlat(
+                quantizer, self._dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+            base.nprobe = min(settings["ivf_nprobe"], nlist)
+            return base
+        if index_type == "hnsw":
+            base = faiss.IndexHNSWFlat(
+                self._dim, settings["hnsw_m"], faiss.METRIC_INNER_PRODUCT
+            )
+            base.hnsw.efConstruction = settings["hnsw_ef_construction"]
+            base.hnsw.efSearch = settings["hnsw_ef_search"]
+            return faiss.IndexIDMap2(base)
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(self._dim))
+
+    def _index_type(self) -> str:
+        if isinstance(self._index, faiss.IndexIVF):
+            return "ivf"
+        if isinstance(faiss.downcast_index(self._index.index), faiss.IndexHNSW):
+            return "hnsw"
+        return "flat"
+
+    def _apply_search_settings(self):
+        """Search parameters follow the current settings, not the saved index"""
+        index_type = self._index_type()
+        if index_type == "ivf":
+            self._index.nprobe = min(
+                self._index_settings["ivf_nprobe"], self._index.nlist
+            )
+        elif index_type == "hnsw":
+            base = faiss.downcast_index(self._index.index)
+            base.hnsw.efSearch = self._index_settings["hnsw_ef_search"]
+
+    def _all_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return (faiss_ids, vectors) stored in a flat or HNSW index"""
+        ids = faiss.vector_to_array(self._index.id_map).astype(np.int64)
+        if len(ids) == 0:
+            return ids, np.empty((0, self._dim), dtype=np.float32)
+        return ids, self._index.index.reconstruct_n(0, len(ids))
+
+    def _rebuild_index(self, index_type: str):
+        """Move the live vectors into a new index of the given type"""
+        ids, vectors = self._all_vectors()
+        if len(ids):
+            alive = np.fromiter(
+                (int(fid) in self._id_to_meta for fid in ids),
+                dtype=bool,
+                count=len(ids),
+            )
+            ids, vectors = ids[alive], vectors[alive]
+        index = self._build_index(index_type, len(ids))
+        if index_type == "ivf" and len(ids):
+            index.train(vectors)
+        if len(ids):
+            index.add_with_ids(vectors, ids)
+        self._index = index
+        self._tombstones = 0
+        logger.info(
+            f"Faiss {self.namespace}: rebuilt {index_type} index with {len(ids)} vectors"
+        )
+
+    def _maybe_upgrade_index(self):
+        """Switch from the exact index once the collection is large enough"""
+        target = self._index_settings["index_type"]
+        if (
+            target != "flat"
+            and self._index_type() == "flat"
+            and len(self._id_to_meta) >= self._index_settings["threshold"]
+        ):
+            self._rebuild_index(target)
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Flat and IVF indexes drop the vectors in place, an HNSW graph keeps them as
+        tombstones until enough of them accumulate to rebuild it.
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
-
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
-
         async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
-
-            self._id_to_meta = new_id_to_meta
+            removed = []
+            for fid in fid_list:
+                meta = self._id_to_meta.pop(fid, None)
+                if meta is None:
+                    continue
+                removed.append(fid)
+                if self._custom_id_to_fid.get(meta.get("__id__")) == fid:
+                    del self._custom_id_to_fid[meta["__id__"]]
+            if not removed:
+                return
+
+            if self._index_type() == "hnsw":
+                self._tombstones += len(removed)
+                if (
+                    self._tombstones
+                    > self._index.ntotal * self._index_settings["hnsw_compact_ratio"]
+                ):
+                    self._rebuild_index("hnsw")
+            else:
+                self._index.remove_ids(np.array(removed, dtype=np.int64))
 
     def _save_faiss_index(self):
         """
         Save the current Faiss index + metadata to disk so it can persist across runs.
+        Vectors only live in the Faiss file, metadata goes to a columnar .npz sidecar.
         """
         faiss.write_index(self._index, self._faiss_index_file)
 
-        # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
-        # We'll keep the int -> dict, but JSON requires string keys.
-        serializable_dict = {}
-        for fid, meta in self._id_to_meta.items():
-            serializable_dict[str(fid)] = meta
-
-        with open(self._meta_file, "w", encoding="utf-8") as f:
-            json.dump(serializable_dict, f)
+        fids = np.fromiter(self._id_to_meta.keys(), dtype=np.int64)
+        metas = list(self._id_to_meta.values())
+        columns = {
+            "fid": fids,
+            "created_at": np.array(
+                [meta.get("__created_at__", 0) for meta in metas], dtype=np.int64
+            ),
+        }
+        fields = {k for meta in metas for k in meta} - {"__id__", "__created_at__"}
+        names = ["__id__", *sorted(fields)]
+        for i, name in enumerate(names):
+            columns.update(
+                _encode_column(f"col{i}", [meta.get(name, _MISSING) for meta in metas])
+            )
+        columns["names"] = np.array(names, dtype=np.str_)
+
+        tmp_file = self._meta_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp_file, self._meta_file)
+        if os.path.exists(self._legacy_meta_file):
+            os.remove(self._legacy_meta_file)
+
+    def _load_meta(self) -> dict[int, dict[str, Any]]:
+        with np.load(self._meta_file, allow_pickle=False) as data:
+            fids = data["fid"].tolist()
+            created_at = data["created_at"].tolist()
+            names = data["names"].tolist()
+            id_to_meta = {fid: {} for fid in fids}
+            for i, name in enumerate(names):
+                values = _decode_column(f"col{i}", data)
+                for fid, value in zip(fids, values):
+                    if value is not _MISSING:
+                        id_to_meta[fid][name] = value
+            for fid, ts in zip(fids, created_at):
+                id_to_meta[fid]["__created_at__"] = ts
+        return id_to_meta
+
+    def _load_legacy_index(self) -> dict[int, dict[str, Any]]:
+        """Read an IndexFlatIP + JSON metadata pair and move it to an IndexIDMap2"""
+        with open(self._legacy_meta_file, "r", encoding="utf-8") as f:
+            stored_dict = json.load(f)
+        old_index = self._index
+        ntotal = old_index.ntotal
+        vectors = (
+            old_index.reconstruct_n(0, ntotal)
+            if ntotal
+            else np.empty((0, self._dim), dtype=np.float32)
+        )
+        self._index = self._build_index("flat")
+        if ntotal:
+            self._index.add_with_ids(vectors, np.arange(ntotal, dtype=np.int64))
+
+        id_to_meta = {}
+        for fid_str, meta in stored_dict.items():
+            meta.pop("__vector__", None)
+            id_to_meta[int(fid_str)] = meta
+        logger.info(
+            f"Faiss {self.namespace}: converted legacy index with {ntotal} vectors"
+        )
+        return id_to_meta
 
     def _load_faiss_index(self):
         """
@@ -337,15 +558,23 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             # Load the Faiss index
             self._index = faiss.read_index(self._faiss_index_file)
-            # Load metadata
-            with open(self._meta_file, "r", encoding="utf-8") as f:
-                stored_dict = json.load(f)
-
-            # Convert string keys back to int
-            self._id_to_meta = {}
-            for fid_str, meta in stored_dict.items():
-                fid = int(fid_str)
-                self._id_to_meta[fid] = meta
+            if isinstance(self._index, (faiss.IndexIDMap2, faiss.IndexIVF)):
+                self._id_to_meta = self._load_meta()
+            else:
+                self._id_to_meta = self._load_legacy_index()
+            self._apply_search_settings()
+
+            self._custom_id_to_fid = {
+                meta["__id__"]: fid for fid, meta in self._id_to_meta.items()
+            }
+            # Tombstoned HNSW ids must not be handed out again
+            stored_ids = (
+                list(self._id_to_meta)
+                if isinstance(self._index, faiss.IndexIVF)
+                else faiss.vector_to_array(self._index.id_map).tolist()
+            )
+            self._next_fid = max(stored_ids) + 1 if stored_ids else 0
+            self._tombstones = max(0, self._index.ntotal - len(self._id_to_meta))
 
             logger.info(
                 f"Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
@@ -353,8 +582,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
         except Exception as e:
             logger.error(f"Failed to load Faiss index or metadata: {e}")
             logger.warning("Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
-            self._id_to_meta = {}
+            self._reset_index()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -364,8 +592,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -395,7 +622,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
             The vector data if found, or None if not found
         """
         # Find the Faiss internal ID for the custom ID
-        fid = self._find_faiss_id_by_custom_id(id)
+        fid = self._custom_id_to_fid.get(id)
         if fid is None:
             return None
 
@@ -424,7 +651,7 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         results = []
         for id in ids:
-            fid = self._find_faiss_id_by_custom_id(id)
+            fid = self._custom_id_to_fid.get(id)
             if fid is not None:
                 metadata = self._id_to_meta.get(fid, {})
                 if metadata:
@@ -457,17 +684,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
         try:
             async with self._storage_lock:
                 # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
+                self._reset_index()
 
                 # Remove storage files if they exist
-                if os.path.exists(self._faiss_index_file):
-                    os.remove(self._faiss_index_file)
-                if os.path.exists(self._meta_file):
-                    os.remove(self._meta_file)
-
-                self._id_to_meta = {}
-                self._load_faiss_index()
+                for path in (
+                    self._faiss_index_file,
+                    self._meta_file,
+                    self._legacy_meta_file,
+                ):
+                    if os.path.exists(path):
+                        os.remove(path)
 
                 # Notify other processes
                 await set_all_update_flags(self.namespace)
@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from dataclasses import dataclass
 import os
 from typing import Any, Union, final
@@ -7,11 +8,9 @@ from lightrag.base import (
     DocStatus,
     DocStatusStorage,
 )
-from lightrag.utils import (
-    load_json,
-    logger,
-    write_json,
-)
+from lightrag.constants import DEFAULT_DOC_STATUS_PAGE_SIZE
+from lightrag.utils import logger
+from .json_journal import WriteBehindPersister
 from .shared_storage import (
     get_namespace_data,
     get_storage_lock,
@@ -23,6 +22,61 @@ from .shared_storage import (
 )
 
 
+def _status_value(status: Any) -> str:
+    return status.value if isinstance(status, DocStatus) else status
+
+
+class _StatusIndex:
+    """Process-local status -> doc ids index with id-sorted views for paging"""
+
+    def __init__(self):
+        self._ids: dict[str, set[str]] = {}
+        self._status_of: dict[str, str] = {}
+        # Sorted ids of a status, rebuilt lazily after the status changed
+        self._sorted: dict[str, list[str]] = {}
+
+    def rebuild(self, status_map: dict[str, str]) -> None:
+        self._ids = {}
+        self._status_of = dict(status_map)
+        self._sorted = {}
+        for doc_id, status in self._status_of.items():
+            self._ids.setdefault(status, set()).add(doc_id)
+
+    def assign(self, doc_id: str, status: str) -> None:
+        old_status = self._status_of.get(doc_id)
+        if old_status == status:
+            return
+        if old_status is not None:
+            self._ids[old_status].discard(doc_id)
+            self._sorted.pop(old_status, None)
+        self._status_of[doc_id] = status
+        self._ids.setdefault(status, set()).add(doc_id)
+        self._sorted.pop(status, None)
+
+    def remove(self, doc_id: str) -> None:
+        old_status = self._status_of.pop(doc_id, None)
+        if old_status is not None:
+            self._ids[old_status].discard(doc_id)
+            self._sorted.pop(old_status, None)
+
+    def counts(self) -> dict[str, int]:
+        return {status: len(ids) for status, ids in self._ids.items()}
+
+    def ids(self, status: str) -> set[str]:
+        return self._ids.get(status, set())
+
+    def page(
+        self, status: str, limit: int, cursor: str | None
+    ) -> tuple[list[str], str | None]:
+        sorted_ids = self._sorted.get(status)
+        if sorted_ids is None:
+            sorted_ids = self._sorted[status] = sorted(self.ids(status))
+        start = bisect_right(sorted_ids, cursor) if cursor is not None else 0
+        page_ids = sorted_ids[start : start + limit]
+        next_cursor = page_ids[-1] if start + limit < len(sorted_ids) else None
+        return page_ids, next_cursor
+
+
 @final
 @dataclass
 class JsonDocStatusStorage(DocStatusStorage):
@@ -34,19 +88,37 @@ class JsonDocStatusStorage(DocStatusStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Status changes are journaled next to the snapshot instead of rewriting it
+        self._persister = WriteBehindPersister(self.namespace, self._file_name)
+        # doc_id -> status shared by all workers, grouped by status in each process
+        self._index_namespace = f"{self.namespace}_status_index"
+        self._status_map = None
+        self._status_index = _StatusIndex()
+        self._index_stale = None
 
     async def initialize(self):
         """Initialize storage data"""
         self._storage_lock = get_storage_lock()
         self.storage_updated = await get_update_flag(self.namespace)
+        self._index_stale = await get_update_flag(self._index_namespace)
+        # Build the local index on first use
+        self._index_stale.value = True
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(self.namespace)
             self._data = await get_namespace_data(self.namespace)
+            self._status_map = await get_namespace_data(self._index_namespace)
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                loaded_data = await self._persister.load()
                 async with self._storage_lock:
                     self._data.update(loaded_data)
+                    self._status_map.clear()
+                    self._status_map.update(
+                        {
+                            doc_id: _status_value(doc.get("status"))
+                            for doc_id, doc in loaded_data.items()
+                        }
+                    )
                     logger.info(
                         f"Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
                     )
@@ -65,12 +137,56 @@ class JsonDocStatusStorage(DocStatusStorage):
                     result.append(data)
         return result
 
+    def _sync_status_index(self) -> None:
+        """Rebuild the local index after other workers changed statuses, under the storage lock"""
+        if self._index_stale.value:
+            self._status_index.rebuild(self._status_map)
+            self._index_stale.value = False
+
+    async def _index_changes(
+        self, upserted: dict[str, dict[str, Any]], deleted: list[str]
+    ) -> None:
+        """Record status changes in the shared map and the local index, under the storage lock"""
+        self._sync_status_index()
+        statuses = {
+            doc_id: _status_value(doc.get("status")) for doc_id, doc in upserted.items()
+        }
+        self._status_map.update(statuses)
+        for doc_id in deleted:
+            self._status_map.pop(doc_id, None)
+        for doc_id, status in statuses.items():
+            self._status_index.assign(doc_id, status)
+        for doc_id in deleted:
+            self._status_index.remove(doc_id)
+        # Other workers rebuild their index, this one is already up to date
+        await set_all_update_flags(self._index_namespace)
+        self._index_stale.value = False
+
+    def _to_doc_status(
+        self, doc_id: str, doc: dict[str, Any], include_content: bool = True
+    ) -> DocProcessingStatus | None:
+        try:
+            # Make a copy of the data to avoid modifying the original
+            data = doc.copy()
+            if not include_content:
+                data["content"] = None
+            # If content is missing, use content_summary as content
+            elif "content" not in data and "content_summary" in data:
+                data["content"] = data["content_summary"]
+            # If file_path is not in data, use document id as file path
+            if "file_path" not in data:
+                data["file_path"] = "no-file-path"
+            return DocProcessingStatus(**data)
+        except (KeyError, TypeError) as e:
+            logger.error(f"Missing required field for document {doc_id}: {e}")
+            return None
+
     async def get_status_counts(self) -> dict[str, int]:
         """Get counts of documents in each status"""
         counts = {status.value: 0 for status in DocStatus}
         async with self._storage_lock:
-            for doc in self._data.values():
-                counts[doc["status"]] += 1
+            self._sync_status_index()
+            counts.update(self._status_index.counts())
         return counts
 
     async def get_docs_by_status(
@@ -79,34 +195,41 @@ class JsonDocStatusStorage(DocStatusStorage):
         """Get all documents with a specific status"""
         result = {}
         async with self._storage_lock:
-            for k, v in self._data.items():
-                if v["status"] == status.value:
-                    try:
-                        # Make a copy of the data to avoid modifying the original
-                        data = v.copy()
-                        # If content is missing, use content_summary as content
-                        if "content" not in data and "content_summary" in data:
-                            data["content"] = data["content_summary"]
-                        # If file_path is not in data, use document id as file path
-                        if "file_path" not in data:
-                            data["file_path"] = "no-file-path"
-                        result[k] = DocProcessingStatus(**data)
-                    except KeyError as e:
-                        logger.error(f"Missing required field for document {k}: {e}")
-                        continue
+            self._sync_status_index()
+            for doc_id in self._status_index.ids(status.value):
+                doc = self._data.get(doc_id)
+                if doc is None:
+                    continue
+                doc_status = self._to_doc_status(doc_id, doc)
+                if doc_status is not None:
+                    result[doc_id] = doc_status
         return result
 
-    async def index_done_callback(self) -> None:
+    async def iter_docs_by_status(
+        self,
+        status: DocStatus,
+        limit: int = DEFAULT_DOC_STATUS_PAGE_SIZE,
+        cursor: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[dict[str, DocProcessingStatus], str | None]:
+        """Get one page of the documents with a specific status, ordered by document id"""
+        result = {}
         async with self._storage_lock:
-            if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
-                logger.debug(
-                    f"Process {os.getpid()} doc status writting {len(data_dict)} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
-                await clear_all_update_flags(self.namespace)
+            self._sync_status_index()
+            page_ids, next_cursor = self._status_index.page(status.value, limit, cursor)
+            for doc_id in page_ids:
+                doc = self._data.get(doc_id)
+                if doc is None:
+                    continue
+                doc_status = self._to_doc_status(doc_id, doc, include_content)
+                if doc_status is not None:
+                    result[doc_id] = doc_status
+        return result, next_cursor
+
+    async def index_done_callback(self) -> None:
+        """Journal the status records changed by this process, off the event loop"""
+        if await self._persister.flush(self._data, self._storage_lock):
+            await clear_all_update_flags(self.namespace)
 
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         """
@@ -119,6 +242,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         logger.debug(f"Inserting {len(data)} records to {self.namespace}")
         async with self._storage_lock:
             self._data.update(data)
+            await self._index_changes(data, [])
+            self._persister.mark_dirty(data.keys())
             await set_all_update_flags(self.namespace)
 
         await self.index_done_callback()
@@ -141,13 +266,13 @@ class JsonDocStatusStorage(DocStatusStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
-            for doc_id in doc_ids:
-                result = self._data.pop(doc_id, None)
-                if result is not None:
-                    any_deleted = True
+            deleted = [
+                doc_id for doc_id in doc_ids if self._data.pop(doc_id, None) is not None
+            ]
+            self._persister.mark_dirty(deleted)
 
-            if any_deleted:
+            if deleted:
+                await self._index_changes({}, deleted)
                 await set_all_update_flags(self.namespace)
 
     async def drop(self) -> dict[str, str]:
@@ -166,6 +291,11 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._status_map.clear()
+                self._status_index.rebuild({})
+                await set_all_update_flags(self._index_namespace)
+                self._index_stale.value = False
+                self._persister.request_snapshot()
                 await set_all_update_flags(self.namespace)
 
             await self.index_done_callback()
@@ -174,3 +304,9 @@ class JsonDocStatusStorage(DocStatusStorage):
         except Exception as e:
             logger.error(f"Error dropping {self.namespace}: {e}")
             return {"status": "error", "message": str(e)}
+
+    async def finalize(self):
+        """Finalize storage resources
+        Persistence pending changes to disk before exiting
+        """
+        await self.index_done_callback()
@@ -0,0 +1,265 @@
+"""
+Write-behind persistence for the JSON key-value storages.
+
+Instead of rewriting the whole kv_store_{namespace}.json after every document, the
+JSON storages record the keys they touch and append only those records to a
+journal file next to the snapshot (kv_store_{namespace}.journal). Journal lines are
+JSON arrays, ["u", key, value] for an upsert and ["d", key] for a delete. Once the
+journal grows past a fraction of the snapshot size it is compacted: a fresh
+snapshot is written and the journal truncated.
+
+All file I/O runs in a worker thread. The storage lock is only held while the
+dirty records are captured from the shared data, so readers in other workers are
+not blocked while a flush or a compaction is written. Flushes of all processes are
+serialized by an advisory file lock, which keeps the journal order identical to
+the order in which records were captured.
+
+Loading replays the journal on top of the snapshot. A torn last line left by a
+crash is dropped, so the recovered state holds the last flushed value of every key.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import Any, Iterable
+
+from lightrag.constants import (
+    DEFAULT_JSON_JOURNAL_COMPACT_MIN_BYTES,
+    DEFAULT_JSON_JOURNAL_COMPACT_RATIO,
+)
+from lightrag.utils import get_env_value, load_json, logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    # Multi-worker deployments (gunicorn) are POSIX only, a process-local lock is enough
+    fcntl = None
+
+JOURNAL_UPSERT = "u"
+JOURNAL_DELETE = "d"
+
+
+class JsonJournal:
+    """Snapshot and journal files of one namespace, all methods are blocking"""
+
+    def __init__(self, file_name: str):
+        base, _ = os.path.splitext(file_name)
+        self.snapshot_file = file_name
+        self.journal_file = f"{base}.journal"
+        self.lock_file = f"{base}.journal.lock"
+        self._lock_fd: int | None = None
+
+    def acquire(self) -> None:
+        """Take the cross-process flush lock"""
+        fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(fd)
+                raise
+        self._lock_fd = fd
+
+    def release(self) -> None:
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+    def journal_size(self) -> int:
+        try:
+            return os.path.getsize(self.journal_file)
+        except FileNotFoundError:
+            return 0
+
+    def snapshot_size(self) -> int:
+        try:
+            return os.path.getsize(self.snapshot_file)
+        except FileNotFoundError:
+            return 0
+
+    def append(self, payload: str) -> None:
+        """Append serialized journal lines and make them durable"""
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def write_snapshot(self, serialized: str) -> None:
+        """Atomically replace the snapshot, then drop the journal it covers
+
+        A crash between the two steps only replays records that are already in
+        the new snapshot, which leaves every key at its last flushed value.
+        """
+        tmp_file = f"{self.snapshot_file}.tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(serialized)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.snapshot_file)
+        with open(self.journal_file, "w", encoding="utf-8") as f:
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> tuple[dict[str, Any], int]:
+        """Read the snapshot and replay the journal on top of it
+
+        Returns:
+            The recovered data and the number of journal records replayed
+        """
+        data = load_json(self.snapshot_file) or {}
+        if not os.path.exists(self.journal_file):
+            return data, 0
+
+        replayed = 0
+        valid_bytes = 0
+        with open(self.journal_file, "rb") as f:
+            for raw_line in f:
+                try:
+                    record = json.loads(raw_line)
+                    op, key = record[0], record[1]
+                    if op == JOURNAL_UPSERT:
+                        data[key] = record[2]
+                    elif op == JOURNAL_DELETE:
+                        data.pop(key, None)
+                    else:
+                        raise ValueError(f"unknown journal op {op!r}")
+                except (ValueError, IndexError, TypeError) as e:
+                    # Only the last line can be torn, nothing after it was flushed
+                    logger.warning(
+                        f"Dropping unreadable journal tail of {self.journal_file} at byte {valid_bytes}: {e}"
+                    )
+                    break
+                replayed += 1
+                valid_bytes += len(raw_line)
+
+        if valid_bytes < os.path.getsize(self.journal_file):
+            # Cut the torn tail so later appends start on a clean line
+            with open(self.journal_file, "r+b") as f:
+                f.truncate(valid_bytes)
+        return data, replayed
+
+
+def serialize_snapshot(data: dict[str, Any]) -> str:
+    """Same layout as write_json, so snapshots stay readable by load_json"""
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def serialize_records(data: dict[str, Any], keys: Iterable[str]) -> str:
+    """Journal lines holding the current value (or deletion) of each key"""
+    lines = []
+    for key in keys:
+        if key in data:
+            record = [JOURNAL_UPSERT, key, data[key]]
+        else:
+            record = [JOURNAL_DELETE, key]
+        lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+    return "".join(lines)
+
+
+class WriteBehindPersister:
+    """Track dirty keys of a JSON storage and flush them to its journal off-thread"""
+
+    def __init__(self, namespace: str, file_name: str):
+        self.namespace = namespace
+        self.journal = JsonJournal(file_name)
+        self.compact_ratio = get_env_value(
+            "JSON_JOURNAL_COMPACT_RATIO", DEFAULT_JSON_JOURNAL_COMPACT_RATIO, float
+        )
+        self.compact_min_bytes = get_env_value(
+            "JSON_JOURNAL_COMPACT_MIN_BYTES",
+            DEFAULT_JSON_JOURNAL_COMPACT_MIN_BYTES,
+            int,
+        )
+        # Keys changed by this process since its last flush
+        self._dirty: set[str] = set()
+        self._snapshot_requested = False
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._dirty) or self._snapshot_requested
+
+    def mark_dirty(self, keys: Iterable[str]) -> None:
+        self._dirty.update(keys)
+
+    def request_snapshot(self) -> None:
+        """Rewrite the whole snapshot on the next flush (after drop or migration)"""
+        self._snapshot_requested = True
+
+    async def load(self) -> dict[str, Any]:
+        data, replayed = await asyncio.to_thread(self.journal.load)
+        if replayed:
+            logger.info(
+                f"Process {os.getpid()} replayed {replayed} journal records into {self.namespace}"
+            )
+        return data
+
+    def _should_compact(self) -> bool:
+        journal_size = self.journal.journal_size()
+        threshold = max(
+            self.compact_min_bytes, self.journal.snapshot_size() * self.compact_ratio
+        )
+        return journal_size > threshold
+
+    async def flush(self, data: dict[str, Any], storage_lock) -> bool:
+        """Persist the dirty keys of data, compacting the journal when it is due
+
+        Returns:
+            True if anything was written
+        """
+        if not self.has_pending:
+            return False
+
+        async with self._flush_lock:
+            # Marks made while this flush is in flight go to the next one
+            keys, self._dirty = self._dirty, set()
+            snapshot_requested, self._snapshot_requested = (
+                self._snapshot_requested,
+                False,
+            )
+            if not keys and not snapshot_requested:
+                return False
+
+            await asyncio.to_thread(self.journal.acquire)
+            try:
+                compact = snapshot_requested or await asyncio.to_thread(
+                    self._should_compact
+                )
+                async with storage_lock:
+                    if compact:
+                        snapshot = dict(data)
+                    else:
+                        payload = serialize_records(data, keys)
+
+                if compact:
+                    try:
+                        serialized = await asyncio.to_thread(
+                            serialize_snapshot, snapshot
+                        )
+                    except RuntimeError:
+                        # A nested value was mutated while serializing, retry under the lock
+                        async with storage_lock:
+                            serialized = serialize_snapshot(dict(data))
+                    await asyncio.to_thread(self.journal.write_snapshot, serialized)
+                    logger.debug(
+                        f"Process {os.getpid()} compacted {self.namespace} into a snapshot of {len(snapshot)} records"
+                    )
+                else:
+                    await asyncio.to_thread(self.journal.append, payload)
+                    logger.debug(
+                        f"Process {os.getpid()} journaled {len(keys)} records of {self.namespace}"
+                    )
+            except BaseException:
+                self._dirty.update(keys)
+                self._snapshot_requested = (
+                    self._snapshot_requested or snapshot_requested
+                )
+                raise
+            finally:
+                await asyncio.to_thread(self.journal.release)
+        return True
@@ -5,11 +5,14 @@ from typing import Any, final
 from lightrag.base import (
     BaseKVStorage,
 )
+from lightrag.namespace import NameSpace, is_namespace
 from lightrag.utils import (
-    load_json,
+    clear_cache_embedding_indexes,
+    flatten_llm_cache,
     logger,
-    write_json,
+    make_llm_cache_key,
 )
+from .json_journal import WriteBehindPersister
 from .shared_storage import (
     get_namespace_data,
     get_storage_lock,
@@ -30,6 +33,14 @@ class JsonKVStorage(BaseKVStorage):
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
+        # Changes are journaled next to the snapshot instead of rewriting it
+        self._persister = WriteBehindPersister(self.namespace, self._file_name)
+        # LLM cache entries are stored flat under "{mode}:{args_hash}" keys
+        self._is_llm_cache = is_namespace(
+            self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE
+        )
+        # Semantic cache embeddings are kept in binary sidecars next to the file
+        self.cache_embedding_sidecar = self._is_llm_cache
 
     async def initialize(self):
         """Initialize storage data"""
@@ -40,50 +51,30 @@ class JsonKVStorage(BaseKVStorage):
             need_init = await try_initialize_namespace(self.namespace)
             self._data = await get_namespace_data(self.namespace)
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                loaded_data = await self._persister.load()
+                migrated = 0
+                if self._is_llm_cache:
+                    # Upgrade files written with the legacy mode-keyed layout
+                    loaded_data, migrated = flatten_llm_cache(loaded_data)
                 async with self._storage_lock:
                     self._data.update(loaded_data)
-
-                    # Calculate data count based on namespace
-                    if self.namespace.endswith("cache"):
-                        # For cache namespaces, sum the cache entries across all cache types
-                        data_count = sum(
-                            len(first_level_dict)
-                            for first_level_dict in loaded_data.values()
-                            if isinstance(first_level_dict, dict)
+                    if migrated:
+                        logger.info(
+                            f"Converted {migrated} legacy LLM cache entries to per-entry keys"
                         )
-                    else:
-                        # For non-cache namespaces, use the original count method
-                        data_count = len(loaded_data)
+                        self._persister.request_snapshot()
+                        await set_all_update_flags(self.namespace)
+
+                    data_count = len(loaded_data)
 
                     logger.info(
                         f"Process {os.getpid()} KV load {self.namespace} with {data_count} records"
                     )
 
     async def index_done_callback(self) -> None:
-        async with self._storage_lock:
-            if self.storage_updated.value:
-                data_dict = (
-                    dict(self._data) if hasattr(self._data, "_getvalue") else self._data
-                )
-
-                # Calculate data count based on namespace
-                if self.namespace.endswith("cache"):
-                    # # For cache namespaces, sum the cache entries across all cache types
-                    data_count = sum(
-                        len(first_level_dict)
-                        for first_level_dict in data_dict.values()
-                        if isinstance(first_level_dict, dict)
-                    )
-                else:
-                    # For non-cache namespaces, use the original count method
-                    data_count = len(data_dict)
-
-                logger.debug(
-                    f"Process {os.getpid()} KV writting {data_count} records to {self.namespace}"
-                )
-                write_json(data_dict, self._file_name)
-                await clear_all_update_flags(self.namespace)
+        """Journal the records changed by this process, off the event loop"""
+        if await self._persister.flush(self._data, self._storage_lock):
+            await clear_all_update_flags(self.namespace)
 
     async def get_all(self) -> dict[str, Any]:
         """Get all data from storage
@@ -96,8 +87,36 @@ class JsonKVStorage(BaseKVStorage):
 
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         async with self._storage_lock:
+            if self._is_llm_cache and ":" not in id:
+                # Mode lookup: assemble the {args_hash: entry} dict of that mode
+                prefix = make_llm_cache_key(id, "")
+                mode_cache = {
+                    key[len(prefix) :]: value
+                    for key, value in self._data.items()
+                    if key.startswith(prefix)
+                }
+                return mode_cache or None
             return self._data.get(id)
 
+    async def get_by_mode_and_id(self, mode: str, id: str) -> dict[str, Any] | None:
+        async with self._storage_lock:
+            entry = self._data.get(make_llm_cache_key(mode, id))
+            return {id: entry} if entry is not None else None
+
+    async def upsert_cache_entry(
+        self, mode: str, id: str, entry: dict[str, Any]
+    ) -> None:
+        """
+        Importance notes for in-memory storage:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. update flags to notify other processes that data persistence is needed
+        """
+        key = make_llm_cache_key(mode, id)
+        async with self._storage_lock:
+            self._data[key] = entry
+            self._persister.mark_dirty([key])
+            await set_all_update_flags(self.namespace)
+
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         async with self._storage_lock:
             return [
@@ -122,8 +141,11 @@ class JsonKVStorage(BaseKVStorage):
         if not data:
             return
         logger.debug(f"Inserting {len(data)} records to {self.namespace}")
+        if self._is_llm_cache:
+            data, _ = flatten_llm_cache(data)
         async with self._storage_lock:
             self._data.update(data)
+            self._persister.mark_dirty(data.keys())
             await set_all_update_flags(self.namespace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -140,13 +162,12 @@ class JsonKVStorage(BaseKVStorage):
             None
         """
         async with self._storage_lock:
-            any_deleted = False
-            for doc_id in ids:
-                result = self._data.pop(doc_id, None)
-                if result is not None:
-                    any_deleted = True
+            deleted = [
+                doc_id for doc_id in ids if self._data.pop(doc_id, None) is not None
+            ]
+            self._persister.mark_dirty(deleted)
 
-            if any_deleted:
+            if deleted:
                 await set_all_update_flags(self.namespace)
 
     async def drop_cache_by_modes(self, modes: list[str] | None = None) -> bool:
@@ -167,7 +188,15 @@ class JsonKVStorage(BaseKVStorage):
             return False
 
         try:
-            await self.delete(modes)
+            prefixes = tuple(make_llm_cache_key(mode, "") for mode in modes)
+            async with self._storage_lock:
+                keys = [
+                    key
+                    for key in self._data.keys()
+                    if key in modes or key.startswith(prefixes)
+                ]
+            await self.delete(keys)
+            clear_cache_embedding_indexes(self, modes)
             return True
         except Exception:
             return False
@@ -189,7 +218,10 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                self._persister.request_snapshot()
                 await set_all_update_flags(self.namespace)
+            if self._is_llm_cache:
+                clear_cache_embedding_indexes(self)
 
             await self.index_done_callback()
             logger.info(f"Process {os.getpid()} drop {self.namespace}")
@@ -200,7 +232,6 @@ class JsonKVStorage(BaseKVStorage):
 
     async def finalize(self):
         """Finalize storage resources
-        Persistence cache data to disk before exiting
+        Persistence pending changes to disk before exiting
         """
-        if self.namespace.endswith("cache"):
-            await self.index_done_callback()
+        await self.index_done_callback()
@@ -3,7 +3,13 @@ import os
 from typing import Any, final
 from dataclasses import dataclass
 import numpy as np
-from lightrag.utils import logger, compute_mdhash_id
+from lightrag.utils import (
+    logger,
+    compute_mdhash_id,
+    BlockingClientExecutor,
+    get_vector_db_io_settings,
+    run_in_batches,
+)
 from ..base import BaseVectorStorage
 import pipmaster as pm
 
@@ -24,6 +30,12 @@ config.read("config.ini", "utf-8")
 @final
 @dataclass
 class MilvusVectorDBStorage(BaseVectorStorage):
+    """Milvus vector storage
+
+    MilvusClient is synchronous, every call runs on a dedicated bounded thread pool
+    so network round trips do not block the event loop.
+    """
+
     @staticmethod
     def create_collection_if_not_exist(
         client: MilvusClient, collection_name: str, **kwargs
@@ -68,12 +80,23 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             ),
         )
         self._max_batch_size = self.global_config["embedding_batch_num"]
-        MilvusVectorDBStorage.create_collection_if_not_exist(
+        self._upsert_batch_size, self._max_async = get_vector_db_io_settings(kwargs)
+        self._executor = BlockingClientExecutor(
+            self._max_async, f"milvus-{self.namespace}"
+        )
+
+    async def initialize(self):
+        """Create the collection on first use"""
+        await self._executor.run(
+            MilvusVectorDBStorage.create_collection_if_not_exist,
             self._client,
             self.namespace,
             dimension=self.embedding_func.embedding_dim,
         )
 
+    async def finalize(self):
+        self._executor.shutdown()
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.info(f"Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -103,8 +126,16 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["vector"] = embeddings[i]
-        results = self._client.upsert(collection_name=self.namespace, data=list_data)
-        return results
+
+        async def _upsert_batch(batch: list[dict[str, Any]]):
+            return await self._executor.run(
+                self._client.upsert, collection_name=self.namespace, data=batch
+            )
+
+        results = await run_in_batches(
+            list_data, self._upsert_batch_size, _upsert_batch, self._max_async
+        )
+        return results[-1] if results else None
 
     async def query(
         self, query: str, top_k: int, ids: list[str] | None = None
@@ -112,7 +143,8 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         embedding = await self.embedding_func(
             [query], _priority=5
         )  # higher priority for query
-        results = self._client.search(
+        results = await self._executor.run(
+            self._client.search,
             collection_name=self.namespace,
             data=embedding,
             limit=top_k,
@@ -122,7 +154,7 @@ class MilvusVectorDBStorage(BaseVectorStorage):
                 "params": {"radius": self.cosine_better_than_threshold},
             },
         )
-        print(results)
+        logger.debug(f"query result: {results}")
         return [
             {
                 **dp["entity"],
@@ -152,8 +184,8 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             )
 
             # Delete the entity from Milvus collection
-            result = self._client.delete(
-                collection_name=self.namespace, pks=[entity_id]
+            result = await self._executor.run(
+                self._client.delete, collection_name=self.namespace, pks=[entity_id]
             )
 
             if result and result.get("delete_count", 0) > 0:
@@ -175,8 +207,11 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             expr = f'src_id == "{entity_name}" or tgt_id == "{entity_name}"'
 
             # Find all relations involving this entity
-            results = self._client.query(
-                collection_name=self.namespace, filter=expr, output_fields=["id"]
+            results = await self._executor.run(
+                self._client.query,
+                collection_name=self.namespace,
+                filter=expr,
+                output_fields=["id"],
             )
 
             if not results or len(results) == 0:
@@ -191,8 +226,10 @@ class MilvusVectorDBStorage(BaseVectorStorage):
 
             # Delete the relations
             if relation_ids:
-                delete_result = self._client.delete(
-                    collection_name=self.namespace, pks=relation_ids
+                delete_result = await self._executor.run(
+                    self._client.delete,
+                    collection_name=self.namespace,
+                    pks=relation_ids,
                 )
 
                 logger.debug(
@@ -210,7 +247,9 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Delete vectors by IDs
-            result = self._client.delete(collection_name=self.namespace, pks=ids)
+            result = await self._executor.run(
+                self._client.delete, collection_name=self.namespace, pks=ids
+            )
 
             if result and result.get("delete_count", 0) > 0:
                 logger.debug(
@@ -233,7 +272,8 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Query Milvus for a specific ID
-            result = self._client.query(
+            result = await self._executor.run(
+                self._client.query,
                 collection_name=self.namespace,
                 filter=f'id == "{id}"',
                 output_fields=list(self.meta_fields) + ["id", "created_at"],
@@ -269,7 +309,8 @@ class MilvusVectorDBStorage(BaseVectorStorage):
             filter_expr = f'id in ["{id_list}"]'
 
             # Query Milvus with the filter
-            result = self._client.query(
+            result = await self._executor.run(
+                self._client.query,
                 collection_name=self.namespace,
                 filter=filter_expr,
                 output_fields=list(self.meta_fields) + ["id", "created_at"],
@@ -297,11 +338,12 @@ class MilvusVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Drop the collection and recreate it
-            if self._client.has_collection(self.namespace):
-                self._client.drop_collection(self.namespace)
+            if await self._executor.run(self._client.has_collection, self.namespace):
+                await self._executor.run(self._client.drop_collection, self.namespace)
 
             # Recreate the collection
-            MilvusVectorDBStorage.create_collection_if_not_exist(
+            await self._executor.run(
+                MilvusVectorDBStorage.create_collection_if_not_exist,
                 self._client,
                 self.namespace,
                 dimension=self.embedding_func.embedding_dim,
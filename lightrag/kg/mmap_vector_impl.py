@@ -0,0 +1,593 @@
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, final
+
+import numpy as np
+
+from lightrag.utils import logger, compute_mdhash_id
+from lightrag.base import BaseVectorStorage
+
+from .shared_storage import (
+    get_storage_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+_STATE_FILE = "state.json"
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    Local vector storage for large single-node namespaces.
+
+    Normalized vectors live in a memory-mapped .npy segment and metadata in an
+    append-only JSON-lines log, so startup maps the vectors instead of parsing them
+    and persisting an insert batch only appends to the log. A small state file records
+    the committed segment, log and row count; rows written after the last commit are
+    ignored after a crash. Deleted and superseded rows are masked out of queries until
+    a compaction rewrites the segment, and an src_id/tgt_id inverted index serves
+    delete_entity_relation.
+    """
+
+    def __post_init__(self):
+        self._storage_lock = None
+        self.storage_updated = None
+
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+
+        user_settings = kwargs.get("mmap_settings", {})
+        default_settings = {
+            # Precision of the vectors on disk, "float16" halves the segment size
+            "dtype": "float32",
+            # Rows scored per block at query time, bounds the temporary memory of a query
+            "query_block_rows": 262144,
+            # Rewrite the segment once this ratio of its rows is deleted or superseded...
+            "compact_ratio": 0.25,
+            # ...and at least this many rows are dead
+            "compact_min_rows": 10000,
+            # Rows allocated for a new segment, it doubles whenever it runs full
+            "initial_capacity": 1024,
+        }
+        self._settings = {**default_settings, **user_settings}
+        if self._settings["dtype"] not in ("float32", "float16"):
+            raise ValueError(
+                f"Unsupported mmap vector dtype: {self._settings['dtype']}"
+            )
+        self._dtype = np.dtype(self._settings["dtype"])
+
+        self._dir = os.path.join(
+            self.global_config["working_dir"], f"mmap_vdb_{self.namespace}"
+        )
+        os.makedirs(self._dir, exist_ok=True)
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        self._load()
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(self.namespace)
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_storage_lock(enable_logging=False)
+
+    async def _check_reload(self):
+        """Check if the storage should be reloaded"""
+        async with self._storage_lock:
+            if self.storage_updated.value:
+                logger.info(
+                    f"Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._load()
+                self.storage_updated.value = False
+
+    # --------------------------------------------------------------------------------
+    # In-memory state
+    # --------------------------------------------------------------------------------
+
+    def _reset(self):
+        self._vectors: np.ndarray | None = None
+        self._vectors_file: str | None = None
+        self._log_file: str | None = None
+        self._count = 0
+        self._log_size = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._row_ids: list[str | None] = []
+        self._row_meta: list[dict[str, Any] | None] = []
+        self._id_to_row: dict[str, int] = {}
+        # entity name -> rows whose src_id or tgt_id is that entity
+        self._entity_rows: dict[str, set[int]] = defaultdict(set)
+        self._dead = 0
+        self._pending_log: list[bytes] = []
+        # Files replaced since the last commit, removed once the new state is written
+        self._stale_files: list[str] = []
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._dir, name)
+
+    def _index_row(self, row: int, meta: dict[str, Any]):
+        for key in ("src_id", "tgt_id"):
+            name = meta.get(key)
+            if name:
+                self._entity_rows[name].add(row)
+
+    def _kill_row(self, row: int):
+        meta = self._row_meta[row]
+        if meta is None:
+            return
+        for key in ("src_id", "tgt_id"):
+            name = meta.get(key)
+            if name and name in self._entity_rows:
+                self._entity_rows[name].discard(row)
+                if not self._entity_rows[name]:
+                    del self._entity_rows[name]
+        self._alive[row] = False
+        self._row_meta[row] = None
+        self._row_ids[row] = None
+        self._dead += 1
+
+    def _put_row(self, row: int, custom_id: str, meta: dict[str, Any]):
+        old_row = self._id_to_row.get(custom_id)
+        if old_row is not None:
+            self._kill_row(old_row)
+        while len(self._row_ids) <= row:
+            self._row_ids.append(None)
+            self._row_meta.append(None)
+        self._row_ids[row] = custom_id
+        self._row_meta[row] = meta
+        self._alive[row] = True
+        self._id_to_row[custom_id] = row
+        self._index_row(row, meta)
+
+    def _delete_id(self, custom_id: str) -> bool:
+        row = self._id_to_row.pop(custom_id, None)
+        if row is None:
+            return False
+        self._kill_row(row)
+        return True
+
+    # --------------------------------------------------------------------------------
+    # Segment files
+    # --------------------------------------------------------------------------------
+
+    def _new_segment(self, capacity: int) -> tuple[np.ndarray, str]:
+        name = f"vectors-{time.time_ns()}.npy"
+        vectors = np.lib.format.open_memmap(
+            self._path(name), mode="w+", dtype=self._dtype, shape=(capacity, self._dim)
+        )
+        return vectors, name
+
+    def _retire_file(self, name: str | None):
+        """Delete a replaced file once the next commit no longer references it"""
+        if name:
+            self._stale_files.append(name)
+
+    def _ensure_capacity(self, needed: int):
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, self._settings["initial_capacity"])
+        vectors, name = self._new_segment(new_capacity)
+        block = self._settings["query_block_rows"]
+        for start in range(0, self._count, block):
+            end = min(start + block, self._count)
+            vectors[start:end] = self._vectors[start:end]
+
+        self._retire_file(self._vectors_file)
+        self._vectors, self._vectors_file = vectors, name
+
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[: len(self._alive)] = self._alive
+        self._alive = alive
+
+    def _load(self):
+        """Map the committed segment and replay the committed part of the metadata log"""
+        self._reset()
+        state_path = self._path(_STATE_FILE)
+        if not os.path.exists(state_path):
+            logger.info(f"No existing mmap vector storage for {self.namespace}")
+            return
+
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        if state["dim"] != self._dim:
+            raise ValueError(
+                f"Vector dimension of {self.namespace} is {state['dim']}, "
+                f"embedding function returns {self._dim}"
+            )
+
+        self._vectors = np.load(self._path(state["vectors_file"]), mmap_mode="r+")
+        self._vectors_file = state["vectors_file"]
+        self._log_file = state["log_file"]
+        self._count = state["count"]
+        self._log_size = state["log_size"]
+        self._alive = np.zeros(self._vectors.shape[0], dtype=bool)
+
+        with open(self._path(self._log_file), "rb") as f:
+            log_data = f.read(self._log_size)
+        for line in log_data.splitlines():
+            record = json.loads(line)
+            if record[0] == "p":
+                _, row, custom_id, meta = record
+                if row < self._count:
+                    self._put_row(row, custom_id, meta)
+            else:
+                self._delete_id(record[1])
+
+        logger.info(
+            f"Mmap vector storage {self.namespace} loaded {len(self._id_to_row)} vectors "
+            f"({self._count} rows, {self._dead} dead)"
+        )
+
+    def _needs_compaction(self) -> bool:
+        return (
+            self._dead >= self._settings["compact_min_rows"]
+            and self._dead > self._count * self._settings["compact_ratio"]
+        )
+
+    def _compact(self):
+        """Rewrite live rows into a new segment and a new log holding one entry per row"""
+        live_rows = np.flatnonzero(self._alive[: self._count])
+        vectors, vectors_name = self._new_segment(
+            max(len(live_rows) * 2, self._settings["initial_capacity"])
+        )
+        block = self._settings["query_block_rows"]
+        for start in range(0, len(live_rows), block):
+            rows = live_rows[start : start + block]
+            vectors[start : start + len(rows)] = self._vectors[rows]
+        vectors.flush()
+
+        log_name = f"meta-{time.time_ns()}.log"
+        entries = []
+        for new_row, old_row in enumerate(live_rows.tolist()):
+            entries.append((new_row, self._row_ids[old_row], self._row_meta[old_row]))
+        with open(self._path(log_name), "wb") as f:
+            for new_row, custom_id, meta in entries:
+                f.write(_encode_record(["p", new_row, custom_id, meta]))
+            f.flush()
+            os.fsync(f.fileno())
+            log_size = f.tell()
+
+        self._retire_file(self._vectors_file)
+        self._retire_file(self._log_file)
+
+        self._reset_rows(vectors, len(live_rows))
+        self._vectors_file, self._log_file, self._log_size = (
+            vectors_name,
+            log_name,
+            log_size,
+        )
+        for new_row, custom_id, meta in entries:
+            self._put_row(new_row, custom_id, meta)
+        logger.info(
+            f"Mmap vector storage {self.namespace} compacted to {len(live_rows)} rows"
+        )
+
+    def _reset_rows(self, vectors: np.ndarray, count: int):
+        stale_files = self._stale_files
+        self._reset()
+        self._stale_files = stale_files
+        self._vectors = vectors
+        self._count = count
+        self._alive = np.zeros(vectors.shape[0], dtype=bool)
+
+    def _commit(self):
+        """Flush vectors, append pending log records and point the state at them"""
+        if self._vectors is None:
+            return
+        if self._needs_compaction():
+            self._compact()
+        else:
+            self._vectors.flush()
+            if self._log_file is None:
+                self._log_file = f"meta-{time.time_ns()}.log"
+            with open(self._path(self._log_file), "ab") as f:
+                # Drop records written after the last commit by a crashed process
+                f.truncate(self._log_size)
+                f.seek(self._log_size)
+                for record in self._pending_log:
+                    f.write(record)
+                f.flush()
+                os.fsync(f.fileno())
+                self._log_size = f.tell()
+        self._pending_log = []
+
+        state = {
+            "vectors_file": self._vectors_file,
+            "log_file": self._log_file,
+            "count": self._count,
+            "log_size": self._log_size,
+            "dim": self._dim,
+            "dtype": str(self._vectors.dtype),
+        }
+        tmp_path = self._path(_STATE_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path(_STATE_FILE))
+
+        for name in self._stale_files:
+            if name not in (self._vectors_file, self._log_file) and os.path.exists(
+                self._path(name)
+            ):
+                os.remove(self._path(name))
+        self._stale_files = []
+
+    # --------------------------------------------------------------------------------
+    # BaseVectorStorage
+    # --------------------------------------------------------------------------------
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        logger.debug(f"Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        list_data = [
+            {
+                "__id__": k,
+                "__created_at__": current_time,
+                **{k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+            }
+            for k, v in data.items()
+        ]
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(list_data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"embedding is not 1-1 with data, {len(embeddings)} != {len(list_data)}"
+            )
+            return
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+
+        await self._check_reload()
+        async with self._storage_lock:
+            start = self._count
+            self._ensure_capacity(start + len(list_data))
+            self._vectors[start : start + len(list_data)] = embeddings
+            for offset, meta in enumerate(list_data):
+                row = start + offset
+                self._put_row(row, meta["__id__"], meta)
+                self._pending_log.append(
+                    _encode_record(["p", row, meta["__id__"], meta])
+                )
+            self._count = start + len(list_data)
+
+        return [meta["__id__"] for meta in list_data]
+
+    async def query(
+        self, query: str, top_k: int, ids: list[str] | None = None
+    ) -> list[dict[str, Any]]:
+        # Execute embedding outside of lock to avoid improve cocurrent
+        embedding = await self.embedding_func(
+            [query], _priority=5
+        )  # higher priority for query
+        query_vector = np.asarray(embedding[0], dtype=np.float32)
+        norm = np.linalg.norm(query_vector)
+        if norm > 0:
+            query_vector = query_vector / norm
+
+        await self._check_reload()
+        if self._vectors is None or self._count == 0 or top_k <= 0:
+            return []
+
+        # Score block by block, keeping the best top_k candidates of each block
+        block = self._settings["query_block_rows"]
+        best_rows: list[np.ndarray] = []
+        best_scores: list[np.ndarray] = []
+        for start in range(0, self._count, block):
+            end = min(start + block, self._count)
+            scores = (
+                self._vectors[start:end].astype(np.float32, copy=False) @ query_vector
+            )
+            scores[~self._alive[start:end]] = -np.inf
+            if len(scores) > top_k:
+                candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+            else:
+                candidates = np.arange(len(scores))
+            best_rows.append(candidates + start)
+            best_scores.append(scores[candidates])
+
+        rows = np.concatenate(best_rows)
+        scores = np.concatenate(best_scores)
+        order = np.argsort(-scores)[:top_k]
+
+        results = []
+        for row, score in zip(rows[order].tolist(), scores[order].tolist()):
+            if score < self.cosine_better_than_threshold:
+                break
+            meta = self._row_meta[row]
+            if meta is None:
+                continue
+            results.append(
+                {
+                    **meta,
+                    "id": meta["__id__"],
+                    "distance": score,
+                    "created_at": meta.get("__created_at__"),
+                }
+            )
+        return results
+
+    @property
+    async def client_storage(self):
+        await self._check_reload()
+        return {"data": [dict(meta) for meta in self._row_meta if meta is not None]}
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        await self._check_reload()
+        async with self._storage_lock:
+            deleted = 0
+            for custom_id in ids:
+                if self._delete_id(custom_id):
+                    self._pending_log.append(_encode_record(["d", custom_id]))
+                    deleted += 1
+        logger.debug(f"Successfully deleted {deleted} vectors from {self.namespace}")
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+        logger.debug(f"Attempting to delete entity {entity_name} with ID {entity_id}")
+        await self.delete([entity_id])
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        await self._check_reload()
+        ids_to_delete = [
+            self._row_ids[row] for row in self._entity_rows.get(entity_name, ())
+        ]
+        logger.debug(f"Found {len(ids_to_delete)} relations for entity {entity_name}")
+        if ids_to_delete:
+            await self.delete(ids_to_delete)
+
+    async def index_done_callback(self) -> bool:
+        """Append pending changes to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._load()
+                self.storage_updated.value = False
+                return False  # Return error
+
+        async with self._storage_lock:
+            try:
+                self._commit()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(f"Error saving data for {self.namespace}: {e}")
+                return False  # Return error
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        await self._check_reload()
+        row = self._id_to_row.get(id)
+        if row is None:
+            return None
+        meta = self._row_meta[row]
+        return {**meta, "id": meta["__id__"], "created_at": meta.get("__created_at__")}
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+        await self._check_reload()
+        results = []
+        for id in ids:
+            row = self._id_to_row.get(id)
+            if row is None:
+                continue
+            meta = self._row_meta[row]
+            results.append(
+                {**meta, "id": meta["__id__"], "created_at": meta.get("__created_at__")}
+            )
+        return results
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove the segment, metadata log and state files
+        2. Reset the in-memory storage
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                # Release the memory map before its file is removed
+                self._reset()
+                for name in os.listdir(self._dir):
+                    os.remove(self._path(name))
+                self._load()
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"Process {os.getpid()} drop {self.namespace}(dir:{self._dir})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
+
+
+def _encode_record(record: list[Any]) -> bytes:
+    return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
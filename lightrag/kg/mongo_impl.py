@@ -1,4 +1,6 @@
 import os
+import re
+import datetime
 from dataclasses import dataclass, field
 import numpy as np
 import configparser
@@ -14,6 +16,10 @@ from ..base import (
     DocStatus,
     DocStatusStorage,
 )
+from ..constants import (
+    DEFAULT_CACHE_EMBEDDING_WATERMARK_OVERLAP,
+    DEFAULT_DOC_STATUS_PAGE_SIZE,
+)
 from ..namespace import NameSpace, is_namespace
 from ..utils import logger, compute_mdhash_id
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
@@ -30,6 +36,7 @@ from motor.motor_asyncio import (  # type: ignore
     AsyncIOMotorDatabase,
     AsyncIOMotorCollection,
 )
+from pymongo import ASCENDING  # type: ignore
 from pymongo.operations import SearchIndexModel  # type: ignore
 from pymongo.errors import PyMongoError  # type: ignore
 
@@ -87,6 +94,11 @@ class MongoKVStorage(BaseKVStorage):
         if self.db is None:
             self.db = await ClientManager.get_client()
             self._data = await get_or_create_collection(self.db, self._collection_name)
+            if is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+                # New cache embeddings are read by update_time
+                await self._data.create_index(
+                    [("update_time", ASCENDING)], name="update_time_index"
+                )
             logger.debug(f"Use MongoDB as KV {self._collection_name}")
 
     async def finalize(self):
@@ -120,7 +132,12 @@ class MongoKVStorage(BaseKVStorage):
                     data[mode][k]["_id"] = f"{mode}_{k}"
                     update_tasks.append(
                         self._data.update_one(
-                            {"_id": key}, {"$setOnInsert": v}, upsert=True
+                            {"_id": key},
+                            {
+                                "$setOnInsert": v,
+                                "$currentDate": {"update_time": True},
+                            },
+                            upsert=True,
                         )
                     )
             await asyncio.gather(*update_tasks)
@@ -146,6 +163,56 @@ class MongoKVStorage(BaseKVStorage):
         else:
             return None
 
+    async def upsert_cache_entry(
+        self, mode: str, id: str, entry: dict[str, Any]
+    ) -> None:
+        if not is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            await super().upsert_cache_entry(mode, id, entry)
+            return
+        key = f"{mode}_{id}"
+        await self._data.update_one(
+            {"_id": key},
+            {"$set": {**entry, "_id": key}, "$currentDate": {"update_time": True}},
+            upsert=True,
+        )
+
+    async def get_cache_embeddings_since(
+        self, mode: str, watermark: Any = None
+    ) -> tuple[dict[str, dict[str, Any]], Any]:
+        """Cache embeddings of a mode written since the update_time watermark
+
+        The watermark is moved back by a few seconds, so writes that landed after a
+        later one was read are not missed.
+        """
+        if not is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            return await super().get_cache_embeddings_since(mode, watermark)
+        query = {
+            "_id": {"$regex": f"^{re.escape(mode)}_"},
+            "embedding": {"$nin": [None, ""]},
+        }
+        if watermark is not None:
+            query["update_time"] = {
+                "$gte": watermark
+                - datetime.timedelta(seconds=DEFAULT_CACHE_EMBEDDING_WATERMARK_OVERLAP)
+            }
+        cursor = self._data.find(
+            query,
+            {
+                "cache_type": 1,
+                "embedding": 1,
+                "embedding_shape": 1,
+                "embedding_min": 1,
+                "embedding_max": 1,
+                "update_time": 1,
+            },
+        ).sort("update_time", ASCENDING)
+        entries = {}
+        async for doc in cursor:
+            entries[doc["_id"][len(mode) + 1 :]] = doc
+            watermark = doc.get("update_time") or watermark
+        # Entries saved before update_time was recorded are only read by the first call
+        return entries, watermark or datetime.datetime(1970, 1, 1)
+
     async def index_done_callback(self) -> None:
         # Mongo handles persistence automatically
         pass
@@ -224,6 +291,10 @@ class MongoDocStatusStorage(DocStatusStorage):
         if self.db is None:
             self.db = await ClientManager.get_client()
             self._data = await get_or_create_collection(self.db, self._collection_name)
+            # Status listing and counting are served from the index without a collection scan
+            await self._data.create_index(
+                [("status", ASCENDING), ("_id", ASCENDING)], name="status_id_index"
+            )
             logger.debug(f"Use MongoDB as DocStatus {self._collection_name}")
 
     async def finalize(self):
@@ -272,19 +343,41 @@ class MongoDocStatusStorage(DocStatusStorage):
         """Get all documents with a specific status"""
         cursor = self._data.find({"status": status.value})
         result = await cursor.to_list()
-        return {
-            doc["_id"]: DocProcessingStatus(
-                content=doc["content"],
-                content_summary=doc.get("content_summary"),
-                content_length=doc["content_length"],
-                status=doc["status"],
-                created_at=doc.get("created_at"),
-                updated_at=doc.get("updated_at"),
-                chunks_count=doc.get("chunks_count", -1),
-                file_path=doc.get("file_path", doc["_id"]),
-            )
-            for doc in result
-        }
+        return {doc["_id"]: self._to_doc_status(doc) for doc in result}
+
+    async def iter_docs_by_status(
+        self,
+        status: DocStatus,
+        limit: int = DEFAULT_DOC_STATUS_PAGE_SIZE,
+        cursor: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[dict[str, DocProcessingStatus], str | None]:
+        """One page of documents with a specific status, keyset-paginated by _id"""
+        query: dict[str, Any] = {"status": status.value}
+        if cursor is not None:
+            query["_id"] = {"$gt": cursor}
+        projection = None if include_content else {"content": 0}
+        # One extra document tells whether another page follows
+        find_cursor = (
+            self._data.find(query, projection).sort("_id", ASCENDING).limit(limit + 1)
+        )
+        result = await find_cursor.to_list(length=limit + 1)
+        page = {doc["_id"]: self._to_doc_status(doc) for doc in result[:limit]}
+        next_cursor = result[limit - 1]["_id"] if len(result) > limit else None
+        return page, next_cursor
+
+    @staticmethod
+    def _to_doc_status(doc: dict[str, Any]) -> DocProcessingStatus:
+        return DocProcessingStatus(
+            content=doc.get("content"),
+            content_summary=doc.get("content_summary"),
+            content_length=doc["content_length"],
+            status=doc["status"],
+            created_at=doc.get("created_at"),
+            updated_at=doc.get("updated_at"),
+            chunks_count=doc.get("chunks_count", -1),
+            file_path=doc.get("file_path", doc["_id"]),
+        )
 
     async def index_done_callback(self) -> None:
         # Mongo handles persistence automatically
@@ -1,7 +1,8 @@
 import os
 import re
+import json
 import asyncio
-import asyncpg
+from collections import OrderedDict
 from threading import Lock
 from dataclasses import dataclass
 from datetime import datetime  # Added missing import
@@ -20,6 +21,10 @@ import logging
 import numpy as np
 from .. import utils
 from ..base import BaseGraphStorage
+from ..constants import DEFAULT_NEO4J_EMBEDDING_CACHE_SIZE
+from ..monitoring import get_query_template_monitor
+from ..namespace import NameSpace
+from ..prompt import GRAPH_FIELD_SEP
 from ..types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
 from ..validation import (
     DatabaseValidator,
@@ -34,6 +39,7 @@ from .utils.threshold_manager import ThresholdManager
 from .utils.relationship_registry import (
     RelationshipTypeRegistry,
 )
+from .utils.neo4j_edge_utils import CHUNK_EDGE_KEY_SEP, cypher_template
 import pipmaster as pm
 
 if not pm.is_installed("neo4j"):
@@ -63,6 +69,19 @@ config.read("config.ini", "utf-8")
 # Set neo4j logger level to ERROR to suppress warning logs
 logging.getLogger("neo4j").setLevel(logging.ERROR)
 
+# Full-text index over the searchable properties of entity nodes, used by search_entities
+ENTITY_FULLTEXT_INDEX = "base_entity_fulltext"
+
+# Characters with a meaning in Lucene query syntax
+_LUCENE_SPECIAL_CHARS = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def _split_provenance(value) -> list[str]:
+    """Distinct non-empty ids of a GRAPH_FIELD_SEP joined source_id/file_path"""
+    return [
+        item for item in dict.fromkeys(str(value or "").split(GRAPH_FIELD_SEP)) if item
+    ]
+
 
 class ConnectionHealthMonitor:
     """Monitor database connection health and manage reconnection"""
@@ -138,29 +157,42 @@ class ConnectionHealthMonitor:
 
 
 class EmbeddingCache:
-    """Simple cache for entity embeddings to improve performance"""
+    """LRU cache of entity embeddings, held as float32 arrays"""
 
-    def __init__(self, max_size=1000):
-        self.cache = {}
-        self.max_size = max_size
+    def __init__(self, max_size: int | None = None):
+        if max_size is None:
+            max_size = utils.get_env_value(
+                "NEO4J_EMBEDDING_CACHE_SIZE", DEFAULT_NEO4J_EMBEDDING_CACHE_SIZE, int
+            )
+        self.cache: OrderedDict[Any, np.ndarray] = OrderedDict()
+        self.max_size = max(1, max_size)
+        self.nbytes = 0
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
 
-    def get(self, entity_id):
+    def get(self, key):
         """Get embedding from cache if available"""
-        result = self.cache.get(entity_id)
-        if result is not None:
-            self.hits += 1
-        else:
+        result = self.cache.get(key)
+        if result is None:
             self.misses += 1
+            return None
+        self.cache.move_to_end(key)
+        self.hits += 1
         return result
 
-    def set(self, entity_id, embedding):
-        """Store embedding in cache, implementing simple LRU if full"""
-        if len(self.cache) >= self.max_size:
-            # Simple LRU: remove a random item if cache is full
-            self.cache.pop(next(iter(self.cache)))
-        self.cache[entity_id] = embedding
+    def set(self, key, embedding):
+        """Store embedding in cache, evicting the least recently used ones if full"""
+        embedding = np.asarray(embedding, dtype=np.float32)
+        previous = self.cache.pop(key, None)
+        if previous is not None:
+            self.nbytes -= previous.nbytes
+        self.cache[key] = embedding
+        self.nbytes += embedding.nbytes
+        while len(self.cache) > self.max_size:
+            _, evicted = self.cache.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
 
     def stats(self):
         """Return cache hit/miss statistics"""
@@ -169,16 +201,27 @@ class EmbeddingCache:
         return {
             "size": len(self.cache),
             "max_size": self.max_size,
+            "memory_bytes": self.nbytes,
             "hits": self.hits,
             "misses": self.misses,
+            "evictions": self.evictions,
             "hit_rate_percent": hit_rate,
         }
 
     def clear(self):
         """Clear the cache"""
         self.cache.clear()
+        self.nbytes = 0
         self.hits = 0
         self.misses = 0
+        self.evictions = 0
+
+
+def _to_embedding(content_vector) -> np.ndarray:
+    """pgvector values arrive as "[x, y, ...]" text without a registered codec"""
+    if isinstance(content_vector, str):
+        content_vector = json.loads(content_vector)
+    return np.asarray(content_vector, dtype=np.float32)
 
 
 @final
@@ -228,8 +271,10 @@ class Neo4JStorage(BaseGraphStorage):
             "yes",
         ]
 
-        # PostgreSQL connection parameters for retrieving embeddings
-        self.pg_connection_params = None
+        # Shared PostgreSQL client for retrieving embeddings, acquired on first use
+        self._pg_db = None
+        self._pg_db_lock = asyncio.Lock()
+        self._pg_retry_at = 0.0
         self.embedding_dim = int(kwargs.get("embedding_dim", 1536))
 
         # Initialize threshold manager
@@ -265,6 +310,9 @@ class Neo4JStorage(BaseGraphStorage):
         )
         self.operation_timeout = kwargs.get("operation_timeout", 30)  # seconds
 
+        # Set by initialize once the entity full-text index exists
+        self._fulltext_index_available = False
+
     async def initialize(self):
         # Get Neo4j connection details
         URI = os.environ.get("NEO4J_URI", config.get("neo4j", "uri", fallback=None))
@@ -301,6 +349,16 @@ class Neo4JStorage(BaseGraphStorage):
         DATABASE = os.environ.get(
             "NEO4J_DATABASE", re.sub(r"[^a-zA-Z0-9-]", "-", self.namespace)
         )
+        # Maximum rows per UNWIND transaction in upsert_nodes_batch / upsert_edges_batch
+        self._upsert_batch_size = max(
+            1,
+            int(
+                os.environ.get(
+                    "NEO4J_UPSERT_BATCH_SIZE",
+                    config.get("neo4j", "upsert_batch_size", fallback=1000),
+                )
+            ),
+        )
 
         self._driver: AsyncDriver = AsyncGraphDatabase.driver(
             URI,
@@ -311,28 +369,6 @@ class Neo4JStorage(BaseGraphStorage):
             max_transaction_retry_time=MAX_TRANSACTION_RETRY_TIME,
         )
 
-        # Initialize PostgreSQL connection parameters for embedding retrieval
-        self.pg_connection_params = {
-            "host": os.environ.get(
-                "POSTGRES_HOST", config.get("postgres", "host", fallback="localhost")
-            ),
-            "port": int(
-                os.environ.get(
-                    "POSTGRES_PORT", config.get("postgres", "port", fallback="5432")
-                )
-            ),
-            "user": os.environ.get(
-                "POSTGRES_USER", config.get("postgres", "user", fallback="postgres")
-            ),
-            "password": os.environ.get(
-                "POSTGRES_PASSWORD", config.get("postgres", "password", fallback="")
-            ),
-            "database": os.environ.get(
-                "POSTGRES_DATABASE",
-                config.get("postgres", "database", fallback="postgres"),
-            ),
-        }
-
         # Try to connect to the database and create it if it doesn't exist
         for database in (DATABASE, None):
             self._DATABASE = database
@@ -418,6 +454,35 @@ class Neo4JStorage(BaseGraphStorage):
                             await result.consume()
                 except Exception as e:
                     utils.logger.warning(f"Failed to create index: {str(e)}")
+
+                # Indexes of the Chunk and File nodes behind get_edges_by_chunk_ids
+                # and cascade_delete_files
+                try:
+                    async with self._driver.session(database=database) as session:
+                        for index_query in (
+                            "CREATE INDEX IF NOT EXISTS FOR (c:Chunk) ON (c.chunk_id)",
+                            "CREATE INDEX IF NOT EXISTS FOR (f:File) ON (f.file_path)",
+                        ):
+                            result = await session.run(index_query)
+                            await result.consume()
+                except Exception as e:
+                    utils.logger.warning(f"Failed to create provenance index: {str(e)}")
+
+                # Full-text index behind search_entities, kept up to date by Neo4j
+                try:
+                    async with self._driver.session(database=database) as session:
+                        result = await session.run(
+                            f"""
+                            CREATE FULLTEXT INDEX {ENTITY_FULLTEXT_INDEX} IF NOT EXISTS
+                            FOR (n:base) ON EACH [n.entity_id, n.description, n.entity_type]
+                            """
+                        )
+                        await result.consume()
+                    self._fulltext_index_available = True
+                except Exception as e:
+                    utils.logger.warning(
+                        f"Failed to create entity full-text index, entity search falls back to substring matching: {str(e)}"
+                    )
                 break
 
         # Relationship type system is already initialized in __init__ method
@@ -431,6 +496,11 @@ class Neo4JStorage(BaseGraphStorage):
             await self._driver.close()
             self._driver = None
             self._is_connected = False
+        if self._pg_db is not None:
+            from .postgres_impl import ClientManager
+
+            await ClientManager.release_client(self._pg_db)
+            self._pg_db = None
 
     async def __aexit__(self, exc_type, exc, tb):
         """Ensure driver is closed when context manager exits"""
@@ -663,78 +733,68 @@ class Neo4JStorage(BaseGraphStorage):
         # Noe4J handles persistence automatically
         pass
 
-    async def get_entity_embedding(self, entity_id: str) -> Optional[np.ndarray]:
+    async def _get_pg_db(self):
+        """PostgreSQL client shared through postgres_impl.ClientManager
+
+        Returns:
+            The client, or None if PostgreSQL is unavailable (retried after 60s)
+        """
+        if self._pg_db is not None:
+            return self._pg_db
+        async with self._pg_db_lock:
+            if self._pg_db is None and time.time() >= self._pg_retry_at:
+                try:
+                    from .postgres_impl import ClientManager
+
+                    self._pg_db = await ClientManager.get_client()
+                except Exception as e:
+                    self._pg_retry_at = time.time() + 60
+                    utils.logger.warning(
+                        f"PostgreSQL unavailable for entity embeddings: {str(e)}"
+                    )
+        return self._pg_db
+
+    async def get_entity_embedding(
+        self, entity_id: str, workspace: str = None
+    ) -> Optional[np.ndarray]:
         """
         Retrieve entity embedding from PostgreSQL vector storage
         Uses caching to avoid repeated database queries
 
         Args:
             entity_id: The entity ID to retrieve embedding for
+            workspace: PostgreSQL workspace, defaults to the one of the shared client
 
         Returns:
-            np.ndarray or None: The embedding vector if found, None otherwise
+            np.ndarray or None: The float32 embedding vector if found, None otherwise
         """
-        # Check cache first
-        cached_embedding = self.embedding_cache.get(entity_id)
-        if cached_embedding is not None:
-            return cached_embedding
-
-        # If not in cache, try to retrieve from PostgreSQL
-        try:
-            import asyncpg
-
-            # Connect to PostgreSQL
-            conn = await asyncpg.connect(**self.pg_connection_params)
-
-            # Query for entity embedding - Using the correct table
-            table_name = "lightrag_vdb_entity"
-            query = f"""
-            SELECT content_vector FROM {table_name}
-            WHERE id = $1 AND workspace = $2
-            LIMIT 1
-            """
-
-            row = await conn.fetchrow(query, entity_id, self.namespace)
-            await conn.close()
-
-            if row:
-                # Convert the embedding to numpy array
-                embedding = np.array(row["content_vector"])
-
-                # Cache the result
-                self.embedding_cache.set(entity_id, embedding)
-
-                return embedding
-
-            utils.logger.debug(
-                f"No embedding found for entity {entity_id} in workspace {self.namespace}"
-            )
-            return None
-
-        except Exception as e:
-            utils.logger.warning(
-                f"Error retrieving embedding for {entity_id}: {str(e)}"
-            )
-            return None
+        embeddings = await self.batch_get_entity_embeddings([entity_id], workspace)
+        return embeddings.get(entity_id)
 
     async def batch_get_entity_embeddings(
-        self, entity_ids: List[str]
+        self, entity_ids: List[str], workspace: str = None
     ) -> Dict[str, np.ndarray]:
         """
         Retrieve embeddings for multiple entities in a single query
 
         Args:
             entity_ids: List of entity IDs to retrieve embeddings for
+            workspace: PostgreSQL workspace, defaults to the one of the shared client
 
         Returns:
-            dict: Dictionary mapping entity IDs to embedding vectors
+            dict: Dictionary mapping entity IDs to float32 embedding vectors
         """
+        db = await self._get_pg_db()
+        if db is None:
+            return {}
+        workspace = workspace or db.workspace
+
         # Check which entities we need to fetch (not in cache)
         to_fetch = []
         results = {}
 
-        for entity_id in entity_ids:
-            cached = self.embedding_cache.get(entity_id)
+        for entity_id in dict.fromkeys(entity_ids):
+            cached = self.embedding_cache.get((workspace, entity_id))
             if cached is not None:
                 results[entity_id] = cached
             else:
@@ -746,38 +806,36 @@ class Neo4JStorage(BaseGraphStorage):
 
         # Fetch remaining embeddings from PostgreSQL
         try:
-            import asyncpg
+            from .postgres_impl import namespace_to_table_name
 
-            # Connect to PostgreSQL
-            conn = await asyncpg.connect(**self.pg_connection_params)
-
-            # Query for multiple embeddings at once - Using the correct table
-            table_name = "lightrag_vdb_entity"
+            # Entity vectors are keyed by the hashed entity name, a primary key lookup
+            ids = {
+                utils.compute_mdhash_id(entity_id, prefix="ent-"): entity_id
+                for entity_id in to_fetch
+            }
+            table_name = namespace_to_table_name(NameSpace.VECTOR_STORE_ENTITIES)
             query = f"""
             SELECT id, content_vector FROM {table_name}
-            WHERE id = ANY($1) AND workspace = $2
+            WHERE workspace = $1 AND id = ANY($2)
             """
 
-            rows = await conn.fetch(query, to_fetch, self.namespace)
-            await conn.close()
+            async with db.pool.acquire() as conn:
+                rows = await conn.fetch(query, workspace, list(ids))
 
             # Process results
             for row in rows:
-                entity_id = row["id"]
-                embedding = np.array(row["content_vector"])
+                entity_id = ids[row["id"]]
+                embedding = _to_embedding(row["content_vector"])
 
                 # Add to results and cache
                 results[entity_id] = embedding
-                self.embedding_cache.set(entity_id, embedding)
-
-                # Remove from to_fetch list
-                if entity_id in to_fetch:
-                    to_fetch.remove(entity_id)
+                self.embedding_cache.set((workspace, entity_id), embedding)
 
             # Log any entities we couldn't find
-            if to_fetch:
+            missing = len(to_fetch) - len(rows)
+            if missing:
                 utils.logger.debug(
-                    f"Could not find embeddings for {len(to_fetch)} entities in workspace {self.namespace}"
+                    f"Could not find embeddings for {missing} entities in workspace {workspace}"
                 )
 
             return results
@@ -1285,9 +1343,9 @@ class Neo4JStorage(BaseGraphStorage):
                 # Get current timestamp for consistency
                 current_time = datetime.now().isoformat()
 
-                for src, tgt in missing_pairs:
-                    # Get relationship type from pair if specified
-                    rel_type = next(
+                # Get relationship type from pair if specified
+                missing_rel_types = {
+                    (src, tgt): next(
                         (
                             p.get("rel_type", "related")
                             for p in params
@@ -1295,9 +1353,16 @@ class Neo4JStorage(BaseGraphStorage):
                         ),
                         "related",
                     )
+                    for src, tgt in missing_pairs
+                }
+                # Get standardized Neo4j types, fuzzy matched in one batch
+                neo4j_types = self.rel_registry.get_neo4j_types(
+                    missing_rel_types.values()
+                )
 
-                    # Get standardized Neo4j type
-                    neo4j_type = self.rel_registry.get_neo4j_type(rel_type)
+                for src, tgt in missing_pairs:
+                    rel_type = missing_rel_types[(src, tgt)]
+                    neo4j_type = neo4j_types[rel_type]
 
                     # Get threshold based on relationship type
                     threshold = self.threshold_manager.get_threshold(rel_type)
@@ -1475,6 +1540,30 @@ class Neo4JStorage(BaseGraphStorage):
             await result.consume()  # Ensure results are fully consumed
             return edges_dict
 
+    @staticmethod
+    def _validate_node_for_upsert(node_id: str, node_data: dict[str, str]) -> None:
+        """Validate node data before a database write, raising ValueError on errors"""
+        validation_result = DatabaseValidator.validate_node_data(node_data)
+        if validation_result.has_errors():
+            error_messages = [e.message for e in validation_result.errors]
+            utils.logger.error(
+                f"Node validation failed for '{node_id}': {error_messages}"
+            )
+            log_validation_errors(validation_result.errors, f"upsert_node({node_id})")
+            raise ValueError(
+                f"Node data validation failed for '{node_id}': {error_messages}"
+            )
+
+        if validation_result.has_warnings():
+            warning_messages = [w.message for w in validation_result.warnings]
+            utils.logger.warning(
+                f"Node validation warnings for '{node_id}': {warning_messages}"
+            )
+            log_validation_errors(validation_result.warnings, f"upsert_node({node_id})")
+
+        if "entity_id" not in node_data:
+            raise ValueError("Neo4j: node properties must contain an 'entity_id' field")
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -1495,54 +1584,32 @@ class Neo4JStorage(BaseGraphStorage):
             node_id: The unique identifier for the node (used as label)
             node_data: Dictionary of node properties
         """
-        # Validate node data before database operation
-        validation_result = DatabaseValidator.validate_node_data(node_data)
-        if validation_result.has_errors():
-            error_messages = [e.message for e in validation_result.errors]
-            utils.logger.error(
-                f"Node validation failed for '{node_id}': {error_messages}"
-            )
-            log_validation_errors(validation_result.errors, f"upsert_node({node_id})")
-            raise ValueError(
-                f"Node data validation failed for '{node_id}': {error_messages}"
-            )
-
-        if validation_result.has_warnings():
-            warning_messages = [w.message for w in validation_result.warnings]
-            utils.logger.warning(
-                f"Node validation warnings for '{node_id}': {warning_messages}"
-            )
-            log_validation_errors(validation_result.warnings, f"upsert_node({node_id})")
+        self._validate_node_for_upsert(node_id, node_data)
 
         properties = node_data
         entity_type = properties["entity_type"]
-        if "entity_id" not in properties:
-            raise ValueError("Neo4j: node properties must contain an 'entity_id' field")
 
         try:
             async with self._driver.session(database=self._DATABASE) as session:
 
                 async def execute_upsert(tx: AsyncManagedTransaction):
-                    query = (
-                        """
-                    MERGE (n:base {entity_id: $entity_id})
-                    SET n += $properties
-                    SET n:`%s`
-                    """
-                        % entity_type
-                    )
+                    query = cypher_template("upsert_node", label=entity_type)
                     utils.logger.debug(
                         f"Executing Cypher query in upsert_node: {query} with params: {{'entity_id': '{node_id}', 'properties': {properties}}}"
                     )
                     result = await tx.run(
-                        query, entity_id=node_id, properties=properties
+                        query,
+                        entity_id=node_id,
+                        properties=properties,
+                        file_paths=_split_provenance(properties.get("file_path")),
                     )
                     utils.logger.debug(
                         f"Upserted node with entity_id '{node_id}' and properties: {properties}"
                     )
                     await result.consume()  # Ensure result is fully consumed
 
-                await session.execute_write(execute_upsert)
+                with get_query_template_monitor().measure("upsert_node"):
+                    await session.execute_write(execute_upsert)
         except Exception as e:
             utils.logger.error(f"Error during upsert: {str(e)}")
             raise
@@ -1572,6 +1639,15 @@ class Neo4JStorage(BaseGraphStorage):
             target_node_id: The ID of the target node
             edge_data: A dictionary of edge properties
         """
+        await self.upsert_edge_detailed(
+            source_id=source_node_id,
+            target_id=target_node_id,
+            **self._edge_data_to_detailed_args(edge_data),
+        )
+
+    @staticmethod
+    def _edge_data_to_detailed_args(edge_data: dict[str, Any]) -> dict[str, Any]:
+        """Map base class edge_data onto the upsert_edge_detailed keyword arguments"""
         # edge_data comes from _merge_edges_then_upsert and should contain:
         # "original_type", "rel_type" (human-readable std), "neo4j_type" (Neo4j label)
         # "weight", "description", "keywords" (list of strings), "source_id" (string), "file_path" (string)
@@ -1595,9 +1671,7 @@ class Neo4JStorage(BaseGraphStorage):
         elif not isinstance(keywords_param_for_detailed, list):
             keywords_param_for_detailed = [str(keywords_param_for_detailed)]
 
-        await self.upsert_edge_detailed(
-            source_id=source_node_id,
-            target_id=target_node_id,
+        return dict(
             rel_type=rel_type_param_for_detailed,  # Pass human-readable std type
             weight=weight_param_for_detailed,
             properties=edge_data.copy(),  # Pass the whole merged dict
@@ -1607,54 +1681,25 @@ class Neo4JStorage(BaseGraphStorage):
             file_paths=edge_data.get("file_path"),  # These are strings from merge step
         )
 
-    async def upsert_edge_detailed(
+    def _build_edge_properties(
         self,
         source_id: str,
         target_id: str,
         rel_type: str = "related",
         weight: float = 0.2,
-        merge_strategy: str = "max",
         properties: Optional[Dict[str, Any]] = None,
         description: Optional[str] = None,
         source_ids: Optional[Union[str, List[str]]] = None,
         file_paths: Optional[Union[str, List[str]]] = None,
         keywords: Optional[List[str]] = None,
-    ) -> bool:
+    ) -> tuple[str, Dict[str, Any]] | None:
         """
-        Upsert an edge between two nodes.
-
-        Args:
-            source_id: Source entity ID
-            target_id: Target entity ID
-            rel_type: Relationship type
-            weight: Edge weight
-            merge_strategy: Strategy for merging properties if edge exists
-            properties: Additional edge properties
-            description: Edge description
-            source_ids: Source IDs for content provenance
-            file_paths: File paths for content provenance
-            keywords: Keywords associated with the edge
+        Build the relationship label and the property map stored for an edge.
 
         Returns:
-            True if the edge was successfully upserted, False otherwise
+            A (neo4j_label, properties_for_db) tuple, or None if the edge data
+            fails database validation
         """
-        # Ensure both nodes exist but don't overwrite existing entity_type
-        # Only create nodes if they don't exist, without setting entity_type to UNKNOWN
-        async with self._driver.session(database=self._DATABASE) as session:
-            # Check and create source node if it doesn't exist
-            source_check_query = """
-            MERGE (n:base {entity_id: $entity_id})
-            ON CREATE SET n.entity_type = COALESCE(n.entity_type, "UNKNOWN")
-            """
-            await session.run(source_check_query, entity_id=source_id)
-
-            # Check and create target node if it doesn't exist
-            target_check_query = """
-            MERGE (n:base {entity_id: $entity_id})
-            ON CREATE SET n.entity_type = COALESCE(n.entity_type, "UNKNOWN")
-            """
-            await session.run(target_check_query, entity_id=target_id)
-
         # Normalize properties input
         if properties is None:
             properties = {}
@@ -1822,7 +1867,7 @@ class Neo4JStorage(BaseGraphStorage):
             log_validation_errors(
                 validation_result.errors, f"upsert_edge({source_id}->{target_id})"
             )
-            return False
+            return None
 
         if validation_result.has_warnings():
             warning_messages = [w.message for w in validation_result.warnings]
@@ -1833,33 +1878,227 @@ class Neo4JStorage(BaseGraphStorage):
                 validation_result.warnings, f"upsert_edge({source_id}->{target_id})"
             )
 
-        # Create Cypher query for upserting edge - Use the standardized relationship type
-        query = f"""
-        MATCH (src:base {{entity_id: $source_id}}), (tgt:base {{entity_id: $target_id}})
-        MERGE (src)-[r:{neo4j_label_to_use}]->(tgt)
-        ON CREATE SET r = $properties_for_db
-        ON MATCH SET r += $properties_for_db
-        RETURN r
+        return neo4j_label_to_use, final_properties_for_db
+
+    async def upsert_edge_detailed(
+        self,
+        source_id: str,
+        target_id: str,
+        rel_type: str = "related",
+        weight: float = 0.2,
+        merge_strategy: str = "max",
+        properties: Optional[Dict[str, Any]] = None,
+        description: Optional[str] = None,
+        source_ids: Optional[Union[str, List[str]]] = None,
+        file_paths: Optional[Union[str, List[str]]] = None,
+        keywords: Optional[List[str]] = None,
+    ) -> bool:
         """
+        Upsert an edge between two nodes.
+
+        Args:
+            source_id: Source entity ID
+            target_id: Target entity ID
+            rel_type: Relationship type
+            weight: Edge weight
+            merge_strategy: Strategy for merging properties if edge exists
+            properties: Additional edge properties
+            description: Edge description
+            source_ids: Source IDs for content provenance
+            file_paths: File paths for content provenance
+            keywords: Keywords associated with the edge
+
+        Returns:
+            True if the edge was successfully upserted, False otherwise
+        """
+        # Ensure both nodes exist but don't overwrite existing entity_type
+        # Only create nodes if they don't exist, without setting entity_type to UNKNOWN
+        async with self._driver.session(database=self._DATABASE) as session:
+            # Check and create source node if it doesn't exist
+            source_check_query = """
+            MERGE (n:base {entity_id: $entity_id})
+            ON CREATE SET n.entity_type = COALESCE(n.entity_type, "UNKNOWN")
+            """
+            await session.run(source_check_query, entity_id=source_id)
+
+            # Check and create target node if it doesn't exist
+            target_check_query = """
+            MERGE (n:base {entity_id: $entity_id})
+            ON CREATE SET n.entity_type = COALESCE(n.entity_type, "UNKNOWN")
+            """
+            await session.run(target_check_query, entity_id=target_id)
+
+        prepared = self._build_edge_properties(
+            source_id,
+            target_id,
+            rel_type=rel_type,
+            weight=weight,
+            properties=properties,
+            description=description,
+            source_ids=source_ids,
+            file_paths=file_paths,
+            keywords=keywords,
+        )
+        if prepared is None:
+            return False
+        neo4j_label_to_use, final_properties_for_db = prepared
+
+        # Create Cypher query for upserting edge - Use the standardized relationship type
+        query = cypher_template("upsert_edge", rel_type=neo4j_label_to_use)
 
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 utils.logger.debug(
                     f"Executing Cypher query in upsert_edge (main upsert): {query} with params: {{'source_id': '{source_id}', 'target_id': '{target_id}', 'properties_for_db': {final_properties_for_db}}}"
                 )
-                result = await session.run(
-                    query,
-                    source_id=source_id,
-                    target_id=target_id,
-                    properties_for_db=final_properties_for_db,  # Pass the cleaned properties
-                )
-                record = await result.single()
-                await result.consume()
+                with get_query_template_monitor().measure("upsert_edge"):
+                    result = await session.run(
+                        query,
+                        source_id=source_id,
+                        target_id=target_id,
+                        properties_for_db=final_properties_for_db,  # Pass the cleaned properties
+                        **self._provenance_index_params(
+                            source_id, target_id, final_properties_for_db
+                        ),
+                    )
+                    record = await result.single()
+                    await result.consume()
                 return record is not None
         except Exception as e:
             utils.logger.error(f"Error upserting edge: {str(e)}")
             return False
 
+    @staticmethod
+    def _provenance_index_params(
+        source_id: str, target_id: str, properties_for_db: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Chunk ids, file paths and edge key an upserted edge adds to the indexes"""
+        return {
+            "chunk_ids": _split_provenance(properties_for_db.get("source_id")),
+            "file_paths": _split_provenance(properties_for_db.get("file_path")),
+            "edge_key": f"{source_id}{CHUNK_EDGE_KEY_SEP}{target_id}",
+        }
+
+    @staticmethod
+    def _chunk_rows(rows: list[dict], batch_size: int):
+        """Yield successive slices of rows with at most batch_size items"""
+        for start in range(0, len(rows), batch_size):
+            yield rows[start : start + batch_size]
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_nodes_batch(self, nodes: list[tuple[str, dict[str, str]]]) -> None:
+        """
+        Upsert nodes with one UNWIND transaction per entity type and chunk.
+
+        Nodes are validated up front; an invalid node raises ValueError before
+        anything is written.
+
+        Args:
+            nodes: List of (node_id, node_data) tuples
+        """
+        rows_by_type: dict[str, list[dict]] = {}
+        for node_id, node_data in nodes:
+            self._validate_node_for_upsert(node_id, node_data)
+            rows_by_type.setdefault(node_data["entity_type"], []).append(
+                {
+                    "entity_id": node_id,
+                    "properties": node_data,
+                    "file_paths": _split_provenance(node_data.get("file_path")),
+                }
+            )
+
+        async def execute_upsert(tx: AsyncManagedTransaction, query: str, rows):
+            result = await tx.run(query, rows=rows)
+            await result.consume()  # Ensure result is fully consumed
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                for entity_type, rows in rows_by_type.items():
+                    query = cypher_template("upsert_nodes_batch", label=entity_type)
+                    for chunk in self._chunk_rows(rows, self._upsert_batch_size):
+                        with get_query_template_monitor().measure("upsert_nodes_batch"):
+                            await session.execute_write(execute_upsert, query, chunk)
+                        utils.logger.debug(
+                            f"Upserted {len(chunk)} nodes of type '{entity_type}'"
+                        )
+        except Exception as e:
+            utils.logger.error(f"Error during batch node upsert: {str(e)}")
+            raise
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type(
+            (
+                neo4jExceptions.ServiceUnavailable,
+                neo4jExceptions.TransientError,
+                neo4jExceptions.WriteServiceUnavailable,
+                neo4jExceptions.ClientError,
+            )
+        ),
+    )
+    async def upsert_edges_batch(
+        self, edges: list[tuple[str, str, dict[str, Any]]]
+    ) -> None:
+        """
+        Upsert edges with one UNWIND transaction per relationship type and chunk.
+
+        Edge properties are built exactly as in upsert_edge; edges failing
+        validation are skipped, matching upsert_edge_detailed. Missing endpoint
+        nodes are created with entity_type UNKNOWN and the chunk and file indexes
+        are updated in the same transaction.
+
+        Args:
+            edges: List of (source_node_id, target_node_id, edge_data) tuples
+        """
+        rows_by_label: dict[str, list[dict]] = {}
+        for source_id, target_id, edge_data in edges:
+            prepared = self._build_edge_properties(
+                source_id, target_id, **self._edge_data_to_detailed_args(edge_data)
+            )
+            if prepared is None:
+                continue
+            neo4j_label, properties_for_db = prepared
+            rows_by_label.setdefault(neo4j_label, []).append(
+                {
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    "properties": properties_for_db,
+                    **self._provenance_index_params(
+                        source_id, target_id, properties_for_db
+                    ),
+                }
+            )
+
+        async def execute_upsert(tx: AsyncManagedTransaction, query: str, rows):
+            result = await tx.run(query, rows=rows)
+            await result.consume()  # Ensure result is fully consumed
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                for neo4j_label, rows in rows_by_label.items():
+                    query = cypher_template("upsert_edges_batch", rel_type=neo4j_label)
+                    for chunk in self._chunk_rows(rows, self._upsert_batch_size):
+                        with get_query_template_monitor().measure("upsert_edges_batch"):
+                            await session.execute_write(execute_upsert, query, chunk)
+                        utils.logger.debug(
+                            f"Upserted {len(chunk)} edges of type '{neo4j_label}'"
+                        )
+        except Exception as e:
+            utils.logger.error(f"Error during batch edge upsert: {str(e)}")
+            raise
+
     async def enhance_edge_weight_with_embeddings(
         self,
         source_id: str,
@@ -1879,48 +2118,88 @@ class Neo4JStorage(BaseGraphStorage):
         Returns:
             Enhanced weight based on semantic similarity, or None if enhancement fails
         """
-        if not self.pg_connection_params:
-            return None
+        weights = await self.enhance_edge_weights_with_embeddings(
+            [(source_id, target_id, rel_type)], workspace=workspace
+        )
+        return weights.get((source_id, target_id, rel_type))
 
-        try:
-            # Connect to PostgreSQL
-            async with await asyncpg.connect(**self.pg_connection_params) as conn:
-                # Get source and target embeddings
-                src_embedding = await self._get_entity_embedding(
-                    conn, source_id, workspace
-                )
-                tgt_embedding = await self._get_entity_embedding(
-                    conn, target_id, workspace
-                )
+    async def enhance_edge_weights_with_embeddings(
+        self,
+        edges: List[tuple[str, str, str]],
+        workspace: str = None,
+    ) -> Dict[tuple[str, str, str], float]:
+        """
+        Enhance the weights of many edges using embeddings for semantic similarity.
 
-                if src_embedding is None or tgt_embedding is None:
-                    utils.logger.warning(
-                        f"Missing embedding for edge {source_id}->{target_id}"
-                    )
-                    return None
+        The embeddings of all endpoints are fetched in one query and all weights
+        are written in one UNWIND statement.
+
+        Args:
+            edges: (source_id, target_id, rel_type) of the edges to enhance
+            workspace: Optional workspace filter
 
-                # Convert to numpy arrays
-                src_embedding = np.array(src_embedding)
-                tgt_embedding = np.array(tgt_embedding)
+        Returns:
+            Enhanced weight of each edge whose endpoint embeddings were found
+        """
+        if not edges:
+            return {}
+
+        embeddings = await self.batch_get_entity_embeddings(
+            [entity_id for src, tgt, _ in edges for entity_id in (src, tgt)],
+            workspace,
+        )
+
+        weights = {}
+        rows = []
+        for source_id, target_id, rel_type in dict.fromkeys(edges):
+            src_embedding = embeddings.get(source_id)
+            tgt_embedding = embeddings.get(target_id)
+            if src_embedding is None or tgt_embedding is None:
+                utils.logger.warning(
+                    f"Missing embedding for edge {source_id}->{target_id}"
+                )
+                continue
 
-                # Calculate semantic weight with threshold manager
-                new_weight = calculate_semantic_weight(
+            # Calculate semantic weight with threshold manager, as a plain float for
+            # the driver since float32 embeddings yield numpy scalars
+            new_weight = float(
+                calculate_semantic_weight(
                     src_embedding,
                     tgt_embedding,
                     relationship_type=rel_type,
                     threshold_manager=self.threshold_manager,
                 )
+            )
+            weights[(source_id, target_id, rel_type)] = new_weight
+            rows.append(
+                {
+                    "source_id": source_id,
+                    "target_id": target_id,
+                    # Convert relationship type for Neo4j
+                    "neo4j_type": rel_type.upper().replace(" ", "_").replace("-", "_"),
+                    "weight": new_weight,
+                }
+            )
 
-                # Update edge weight in Neo4j with proper relationship type
-                await self._update_edge_weight(
-                    source_id, target_id, rel_type, new_weight
-                )
-
-                return new_weight
+        if not rows:
+            return weights
 
+        # Relationship types are dynamic, so they are matched as a value here
+        query = """
+        UNWIND $rows AS row
+        MATCH (src:base {entity_id: row.source_id})-[r]->(tgt:base {entity_id: row.target_id})
+        WHERE type(r) = row.neo4j_type
+        SET r.weight = row.weight
+        """
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                result = await session.run(query, rows=rows)
+                await result.consume()
         except Exception as e:
-            utils.logger.error(f"Error enhancing edge weight: {str(e)}")
-            return None
+            utils.logger.error(f"Error updating edge weights: {str(e)}")
+            return {}
+
+        return weights
 
     async def get_edge(
         self, source_id: str, target_id: str, rel_type: str = "related"
@@ -1937,21 +2216,19 @@ class Neo4JStorage(BaseGraphStorage):
             Dictionary with edge properties
         """
         # Use actual relationship type in query instead of generic "related"
-        query = """
-        MATCH (src:base {entity_id: $source_id})-[r:%s]->(tgt:base {entity_id: $target_id})
-        RETURN properties(r) as properties
-        """ % rel_type.upper()  # Note: rel_type is directly embedded here.
+        query = cypher_template("get_edge", rel_type=rel_type.upper())
 
         try:
             async with self._driver.session(database=self._DATABASE) as session:
                 utils.logger.debug(
                     f"Executing Cypher query in get_edge (typed): {query} with params: {{'source_id': '{source_id}', 'target_id': '{target_id}'}}"
                 )
-                result = await session.run(
-                    query, source_id=source_id, target_id=target_id
-                )
-                record = await result.single()
-                await result.consume()
+                with get_query_template_monitor().measure("get_edge"):
+                    result = await session.run(
+                        query, source_id=source_id, target_id=target_id
+                    )
+                    record = await result.single()
+                    await result.consume()
 
                 # If no edge is found, return default properties using threshold manager
                 if not record or not record.get("properties"):
@@ -1991,6 +2268,101 @@ class Neo4JStorage(BaseGraphStorage):
                 "keywords": None,
             }
 
+    async def get_edges_by_chunk_ids(self, chunk_ids: list[str]) -> list[dict]:
+        """
+        Get the relationships extracted from the given chunks.
+
+        Candidate edges come from the Chunk nodes written by the edge upserts, each
+        is then matched between its endpoints and checked against its source_id,
+        which drops index entries left behind by deleted or rewritten edges.
+
+        Chunks without a Chunk node (edges written before the chunk index existed,
+        see migrate_chunk_relationship_index) are looked up by scanning every
+        relationship instead, and a warning is logged when that finds edges.
+
+        Args:
+            chunk_ids: Chunk identifiers
+
+        Returns:
+            One record per (chunk_id, relationship) with chunk_id, properties,
+            neo4j_type, original_type, rel_type, src_id and tgt_id
+        """
+        if not chunk_ids:
+            return []
+
+        indexed_chunks_query = """
+        UNWIND $chunk_ids AS chunk_id
+        OPTIONAL MATCH (c:Chunk {chunk_id: chunk_id})
+        RETURN chunk_id, count(c) > 0 AS indexed
+        """
+        # Candidate edges, either through the Chunk nodes or by scanning every
+        # relationship, each re-checked against its source_id
+        indexed_edges = """
+        UNWIND $chunk_ids AS chunk_id
+        MATCH (c:Chunk {chunk_id: chunk_id})
+        UNWIND c.edge_keys AS edge_key
+        WITH DISTINCT chunk_id, split(edge_key, $key_sep) AS pair
+        MATCH (s:base {entity_id: pair[0]})-[r]->(t:base {entity_id: pair[1]})
+        """
+        scanned_edges = """
+        UNWIND $chunk_ids AS chunk_id
+        MATCH (s:base)-[r]->(t:base)
+        """
+        return_edges = """
+        WHERE r.source_id = chunk_id
+           OR r.source_id CONTAINS (chunk_id + $sep)
+           OR r.source_id CONTAINS ($sep + chunk_id)
+        RETURN chunk_id,
+               properties(r) AS properties,
+               type(r) AS neo4j_type,
+               r.original_type AS original_type,
+               r.rel_type AS rel_type,
+               s.entity_name AS src_id,
+               t.entity_name AS tgt_id
+        """
+        chunk_ids = list(dict.fromkeys(chunk_ids))
+        records = []
+        async with self._driver.session(
+            database=self._DATABASE, default_access_mode="READ"
+        ) as session:
+            result = await session.run(indexed_chunks_query, chunk_ids=chunk_ids)
+            indexed = {record["chunk_id"]: record["indexed"] async for record in result}
+            batches = (
+                (
+                    [chunk_id for chunk_id in chunk_ids if indexed.get(chunk_id)],
+                    indexed_edges,
+                ),
+                (
+                    [chunk_id for chunk_id in chunk_ids if not indexed.get(chunk_id)],
+                    scanned_edges,
+                ),
+            )
+            for batch, edges_query in batches:
+                if not batch:
+                    continue
+                result = await session.run(
+                    edges_query + return_edges,
+                    chunk_ids=batch,
+                    key_sep=CHUNK_EDGE_KEY_SEP,
+                    sep=GRAPH_FIELD_SEP,
+                )
+                records.extend(await result.data())
+
+        unindexed_chunks = set(batches[1][0])
+        scanned_chunks = {
+            record["chunk_id"]
+            for record in records
+            if record["chunk_id"] in unindexed_chunks
+        }
+        if scanned_chunks:
+            utils.logger.warning(
+                f"{len(scanned_chunks)} chunks had relationships but no Chunk node, "
+                "found them by scanning the whole graph. Run "
+                "lightrag.kg.utils.migrate_chunk_index.migrate_chunk_relationship_index "
+                "to index existing data."
+            )
+        return records
+
     async def query_graph(
         self,
         query_str: str,
@@ -2105,57 +2477,33 @@ class Neo4JStorage(BaseGraphStorage):
         if not seed_entities:
             return result
 
-        # Construct relationship type filter
-        rel_type_filter = ""
-        if filter_relationship_types and len(filter_relationship_types) > 0:
-            # Format the relationship types for Neo4j
-            neo4j_rel_types = [
-                rel_type.upper().replace(" ", "_").replace("-", "_")
-                for rel_type in filter_relationship_types
-            ]
-            rel_type_list = "|".join(neo4j_rel_types)
-            rel_type_filter = f"type(r) =~ '{rel_type_list}'"
-
-        # Construct node type filter
-        node_type_filter = ""
-        if filter_entity_types and len(filter_entity_types) > 0:
-            entity_types_str = "', '".join(filter_entity_types)
-            node_type_filter = f"target.entity_type IN ['{entity_types_str}']"
-
-        # Build combined filter
-        combined_filters = []
-        if rel_type_filter:
-            combined_filters.append(rel_type_filter)
-        if node_type_filter:
-            combined_filters.append(node_type_filter)
-        if min_weight > 0:
-            combined_filters.append(f"r.weight >= {min_weight}")
-
-        filter_clause = ""
-        if combined_filters:
-            filter_clause = "WHERE " + " AND ".join(combined_filters)
+        # Format the relationship types for Neo4j
+        neo4j_rel_types = [
+            rel_type.upper().replace(" ", "_").replace("-", "_")
+            for rel_type in filter_relationship_types or []
+        ]
 
         # Construct the query to expand from seeds with typed relationships
-        query = f"""
-        MATCH (source:base)
-        WHERE source.entity_id IN $seed_entities
-        MATCH path = (source)-[r*1..{max_hops}]-(target:base)
-        {filter_clause}
-        UNWIND relationships(path) as rel
-        RETURN nodes(path) as path_nodes, startNode(rel) as start_node, endNode(rel) as end_node, rel, type(rel) as rel_type
-        LIMIT $max_nodes
-        """
+        query = cypher_template("expand_from_seeds", max_hops=max(1, int(max_hops)))
 
+        start_time = time.perf_counter()
         try:
             async with self._driver.session(database=self._DATABASE) as session:
-                result = await session.run(
-                    query, seed_entities=seed_entities, max_nodes=max_nodes
+                query_result = await session.run(
+                    query,
+                    seed_entities=seed_entities,
+                    max_nodes=max_nodes,
+                    rel_types=neo4j_rel_types or None,
+                    entity_types=list(filter_entity_types)
+                    if filter_entity_types
+                    else None,
+                    min_weight=min_weight,
                 )
 
                 seen_nodes = set()
                 seen_edges = set()
 
-                async for record in result:
+                async for record in query_result:
                     if "path_nodes" in record:
                         path_nodes = record["path_nodes"]
 
@@ -2262,20 +2610,67 @@ class Neo4JStorage(BaseGraphStorage):
                                         )
                                     )
 
-                await result.consume()
+                await query_result.consume()
 
+            get_query_template_monitor().record(
+                "expand_from_seeds", time.perf_counter() - start_time
+            )
             return result
 
         except Exception as e:
+            get_query_template_monitor().record(
+                "expand_from_seeds", time.perf_counter() - start_time, success=False
+            )
             utils.logger.error(f"Error expanding graph from seeds: {str(e)}")
             return result
 
+    @staticmethod
+    def _fulltext_search_query(query_str: str) -> str:
+        """Lucene query matching every term of query_str, the last one as a prefix"""
+        # Lowercased since wildcard terms bypass the analyzer, which also keeps
+        # words like AND/OR from being read as operators
+        terms = [
+            _LUCENE_SPECIAL_CHARS.sub(r"\\\1", term)
+            for term in query_str.lower().split()
+        ]
+        if not terms:
+            return ""
+        # Prefix match on the term being typed, for autocomplete
+        terms[-1] = f"{terms[-1]}*"
+        return " AND ".join(terms)
+
+    @staticmethod
+    def _search_result_node(node, score: float | None = None) -> KnowledgeGraphNode:
+        node_dict = dict(node)
+        properties = {
+            "name": node.get("entity_id", ""),
+            "description": node.get("description", ""),
+            "entity_type": node.get("entity_type", "unknown"),
+            **{
+                k: v
+                for k, v in node_dict.items()
+                if k not in ["entity_id", "entity_type", "description"]
+            },
+        }
+        if score is not None:
+            properties["score"] = score
+        return KnowledgeGraphNode(
+            id=node.get("entity_id", ""),
+            label=node.get("entity_type", "unknown"),
+            labels=[node.get("entity_type", "unknown")],
+            properties=properties,
+        )
+
     async def search_entities(
         self, query_str: str, limit: int = 20, entity_types: list[str] = None
     ) -> list[KnowledgeGraphNode]:
         """
         Search for entities using text matching and optional type filtering.
 
+        Uses the entity full-text index, ranked by relevance score (returned as the
+        "score" property), and falls back to substring matching when the index is
+        unavailable or cannot serve the query.
+
         Args:
             query_str: Search query string
             limit: Maximum number of results
@@ -2284,51 +2679,57 @@ class Neo4JStorage(BaseGraphStorage):
         Returns:
             List of KnowledgeGraphNode objects
         """
-        # Build the query with optional entity type filtering
-        type_filter = ""
-        if entity_types and len(entity_types) > 0:
-            entity_types_str = "', '".join(entity_types)
-            type_filter = f"AND n.entity_type IN ['{entity_types_str}']"
+        entity_types = list(entity_types) if entity_types else None
 
-        query = f"""
-        MATCH (n:base)
-        WHERE (toLower(n.entity_id) CONTAINS toLower($query_str)
-               OR toLower(n.description) CONTAINS toLower($query_str))
-              {type_filter}
-        RETURN n
-        LIMIT $limit
-        """
+        fulltext_query = self._fulltext_search_query(query_str)
+        if self._fulltext_index_available and fulltext_query:
+            try:
+                async with self._driver.session(
+                    database=self._DATABASE, default_access_mode="READ"
+                ) as session:
+                    with get_query_template_monitor().measure(
+                        "search_entities_fulltext"
+                    ):
+                        result = await session.run(
+                            cypher_template("search_entities_fulltext"),
+                            index_name=ENTITY_FULLTEXT_INDEX,
+                            search=fulltext_query,
+                            entity_types=entity_types,
+                            limit=limit,
+                        )
+                        result_nodes = [
+                            self._search_result_node(record["n"], record["score"])
+                            async for record in result
+                        ]
+                        await result.consume()
+                return result_nodes
+            except neo4jExceptions.ClientError as e:
+                # Index missing, not yet online, or an unparsable query
+                utils.logger.warning(
+                    f"Full-text entity search failed, falling back to substring matching: {str(e)}"
+                )
+            except Exception as e:
+                utils.logger.error(f"Error searching entities: {str(e)}")
+                return []
 
         result_nodes = []
 
         try:
-            async with self._driver.session(database=self._DATABASE) as session:
-                result = await session.run(query, query_str=query_str, limit=limit)
-
-                async for record in result:
-                    node = record["n"]
-                    node_dict = dict(node)
-
-                    result_nodes.append(
-                        KnowledgeGraphNode(
-                            id=node.get("entity_id", ""),
-                            label=node.get("entity_type", "unknown"),
-                            labels=[node.get("entity_type", "unknown")],
-                            properties={
-                                "name": node.get("entity_id", ""),
-                                "description": node.get("description", ""),
-                                "entity_type": node.get("entity_type", "unknown"),
-                                **{
-                                    k: v
-                                    for k, v in node_dict.items()
-                                    if k
-                                    not in ["entity_id", "entity_type", "description"]
-                                },
-                            },
-                        )
+            async with self._driver.session(
+                database=self._DATABASE, default_access_mode="READ"
+            ) as session:
+                with get_query_template_monitor().measure("search_entities_contains"):
+                    result = await session.run(
+                        cypher_template("search_entities_contains"),
+                        query_str=query_str,
+                        entity_types=entity_types,
+                        limit=limit,
                     )
 
-                await result.consume()
+                    async for record in result:
+                        result_nodes.append(self._search_result_node(record["n"]))
+
+                    await result.consume()
 
         except Exception as e:
             utils.logger.error(f"Error searching entities: {str(e)}")
@@ -2487,17 +2888,19 @@ class Neo4JStorage(BaseGraphStorage):
                 # If we have nodes, get their relationships within max_depth
                 if node_ids and max_depth > 0:
                     # Modified query to return nodes and relationships separately
-                    edge_query = f"""
+                    edge_query = """
                     MATCH (source:base)-[rel]->(target:base)
                     WHERE source.entity_id IN $node_ids AND target.entity_id IN $node_ids
                     RETURN source as start_node, target as end_node, rel, type(rel) as rel_type, elementId(rel) as rel_id
-                    LIMIT {max_nodes * 5}
+                    LIMIT $limit
                     """
 
                     utils.logger.debug(
                         f"Executing Cypher query in get_knowledge_graph (edges): {edge_query} with params: {{'node_ids': {node_ids}}}"
                     )
-                    edge_result = await session.run(edge_query, node_ids=node_ids)
+                    edge_result = await session.run(
+                        edge_query, node_ids=node_ids, limit=max_nodes * 5
+                    )
 
                     seen_edges = set()
                     async for record in edge_result:
@@ -2633,6 +3036,177 @@ class Neo4JStorage(BaseGraphStorage):
             utils.logger.error(f"Error removing nodes: {str(e)}")
             raise
 
+    async def cascade_delete_files(
+        self, file_names: list[str]
+    ) -> dict[str, dict[str, int]]:
+        """
+        Remove the graph data of source files in one transaction.
+
+        Relationships citing a file are deleted. Entities lose the file from their
+        file_path and are deleted once no file is left. Entities and relationships
+        are found through the File nodes written by the upserts and re-checked
+        against their file_path, so repeating a deletion changes nothing.
+
+        File names are matched exactly against the GRAPH_FIELD_SEP-separated
+        entries of file_path, i.e. they must be the file_path stored with the
+        document (DocProcessingStatus.file_path), not a substring or basename of it.
+
+        Files without a File node (data written before the file index existed,
+        see migrate_file_path_index) are found by scanning every entity and
+        relationship instead, and a warning is logged when that finds data.
+
+        Args:
+            file_names: File paths as stored in the file_path properties
+
+        Returns:
+            Per file: entities_updated, entities_deleted and relationships_deleted
+        """
+        file_names = list(dict.fromkeys(name for name in file_names if name))
+        counts = {
+            file_name: {
+                "entities_updated": 0,
+                "entities_deleted": 0,
+                "relationships_deleted": 0,
+            }
+            for file_name in file_names
+        }
+        if not file_names:
+            return counts
+
+        indexed_files_query = """
+        UNWIND $file_names AS file_name
+        OPTIONAL MATCH (f:File {file_path: file_name})
+        RETURN file_name, count(f) > 0 AS indexed
+        """
+        # Candidate relationships and entities, either through the File nodes or
+        # by scanning file_path, each yielding the matched files per element
+        indexed_relationships = """
+        UNWIND $file_names AS file_name
+        MATCH (f:File {file_path: file_name})
+        UNWIND coalesce(f.edge_keys, []) AS edge_key
+        WITH DISTINCT file_name, split(edge_key, $key_sep) AS pair
+        MATCH (:base {entity_id: pair[0]})-[r]->(:base {entity_id: pair[1]})
+        WHERE file_name IN split(r.file_path, $sep)
+        WITH r, collect(DISTINCT file_name) AS files
+        """
+        scanned_relationships = """
+        MATCH (:base)-[r]->(:base)
+        WHERE r.file_path IS NOT NULL
+        WITH r, split(r.file_path, $sep) AS paths
+        WITH r, [file_name IN $file_names WHERE file_name IN paths] AS files
+        WHERE size(files) > 0
+        """
+        delete_relationships = """
+        DELETE r
+        WITH files
+        UNWIND files AS file_name
+        RETURN file_name, count(*) AS relationships_deleted
+        """
+        indexed_entities = """
+        UNWIND $file_names AS file_name
+        MATCH (f:File {file_path: file_name})
+        UNWIND coalesce(f.entity_ids, []) AS entity_id
+        MATCH (n:base {entity_id: entity_id})
+        WITH n, collect(DISTINCT file_name) AS candidate_files
+        WITH n, candidate_files, split(coalesce(n.file_path, ''), $sep) AS paths
+        WITH n, paths, [file_name IN candidate_files WHERE file_name IN paths] AS files
+        WHERE size(files) > 0
+        """
+        scanned_entities = """
+        MATCH (n:base)
+        WHERE n.file_path IS NOT NULL
+        WITH n, split(n.file_path, $sep) AS paths
+        WITH n, paths, [file_name IN $file_names WHERE file_name IN paths] AS files
+        WHERE size(files) > 0
+        """
+        update_entities = """
+        WITH n, files,
+             [path IN paths WHERE path <> '' AND NOT path IN $file_names] AS remaining
+        FOREACH (_ IN CASE WHEN size(remaining) > 0 THEN [1] ELSE [] END |
+            SET n.file_path = reduce(
+                joined = head(remaining), path IN tail(remaining) | joined + $sep + path
+            )
+        )
+        FOREACH (_ IN CASE WHEN size(remaining) = 0 THEN [1] ELSE [] END |
+            DETACH DELETE n
+        )
+        WITH files, size(remaining) = 0 AS deleted
+        UNWIND files AS file_name
+        RETURN file_name,
+               sum(CASE WHEN deleted THEN 0 ELSE 1 END) AS entities_updated,
+               sum(CASE WHEN deleted THEN 1 ELSE 0 END) AS entities_deleted
+        """
+        delete_files_query = """
+        UNWIND $file_names AS file_name
+        MATCH (f:File {file_path: file_name})
+        DETACH DELETE f
+        """
+
+        async def execute_delete(tx: AsyncManagedTransaction):
+            file_counts = {}
+            result = await tx.run(indexed_files_query, file_names=file_names)
+            indexed = {
+                record["file_name"]: record["indexed"] async for record in result
+            }
+            batches = (
+                (
+                    [name for name in file_names if indexed.get(name)],
+                    indexed_relationships,
+                    indexed_entities,
+                ),
+                (
+                    [name for name in file_names if not indexed.get(name)],
+                    scanned_relationships,
+                    scanned_entities,
+                ),
+            )
+            for batch, relationships_query, entities_query in batches:
+                if not batch:
+                    continue
+                params = {
+                    "file_names": batch,
+                    "sep": GRAPH_FIELD_SEP,
+                    "key_sep": CHUNK_EDGE_KEY_SEP,
+                }
+                result = await tx.run(
+                    relationships_query + delete_relationships, **params
+                )
+                async for record in result:
+                    file_counts.setdefault(record["file_name"], {})[
+                        "relationships_deleted"
+                    ] = record["relationships_deleted"]
+                result = await tx.run(entities_query + update_entities, **params)
+                async for record in result:
+                    file_counts.setdefault(record["file_name"], {}).update(
+                        entities_updated=record["entities_updated"],
+                        entities_deleted=record["entities_deleted"],
+                    )
+            result = await tx.run(delete_files_query, file_names=batches[0][0])
+            await result.consume()
+            return file_counts, batches[1][0]
+
+        try:
+            async with self._driver.session(database=self._DATABASE) as session:
+                file_counts, unindexed_files = await session.execute_write(
+                    execute_delete
+                )
+        except Exception as e:
+            utils.logger.error(f"Error deleting graph data of files: {str(e)}")
+            raise
+
+        for file_name, file_count in file_counts.items():
+            counts[file_name].update(file_count)
+        scanned_files = [name for name in unindexed_files if name in file_counts]
+        if scanned_files:
+            utils.logger.warning(
+                f"{len(scanned_files)} files had graph data but no File node, "
+                f"found it by scanning the whole graph: {scanned_files}. "
+                "Run lightrag.kg.utils.migrate_file_index.migrate_file_path_index "
+                "to index existing data."
+            )
+        utils.logger.debug(f"Removed graph data of {len(file_names)} files: {counts}")
+        return counts
+
     async def run_cypher_query(
         self, query: str, max_results: int = 50
     ) -> KnowledgeGraph:
@@ -2741,78 +3315,3 @@ class Neo4JStorage(BaseGraphStorage):
             utils.logger.error(f"Error running Cypher query: {str(e)}")
 
         return result
-
-    async def _get_entity_embedding(
-        self, conn, entity_id: str, workspace: str = None
-    ) -> Optional[list]:
-        """
-        Helper method to get entity embedding from PostgreSQL.
-
-        Args:
-            conn: PostgreSQL connection
-            entity_id: Entity ID to get embedding for
-            workspace: Optional workspace filter
-
-        Returns:
-            Embedding vector as list or None if not found
-        """
-        try:
-            table_name = "lightrag_vdb_entity"
-            workspace_filter = ""
-            params = [entity_id]
-
-            if workspace:
-                workspace_filter = " AND workspace = $2"
-                params.append(workspace)
-
-            query = f"""
-            SELECT content_vector FROM {table_name}
-            WHERE id = $1{workspace_filter}
-            LIMIT 1
-            """
-
-            row = await conn.fetchrow(query, *params)
-
-            if row:
-                return row["content_vector"]
-            return None
-
-        except Exception as e:
-            utils.logger.warning(
-                f"Error getting entity embedding for {entity_id}: {str(e)}"
-            )
-            return None
-
-    async def _update_edge_weight(
-        self, source_id: str, target_id: str, rel_type: str, weight: float
-    ) -> None:
-        """
-        Helper method to update edge weight in Neo4j.
-
-        Args:
-            source_id: Source entity ID
-            target_id: Target entity ID
-            rel_type: Relationship type
-            weight: New weight value
-        """
-        try:
-            # Convert relationship type for Neo4j
-            neo4j_rel_type = rel_type.upper().replace(" ", "_").replace("-", "_")
-
-            query = f"""
-            MATCH (src:base {{entity_id: $source_id}})-[r:{neo4j_rel_type}]->(tgt:base {{entity_id: $target_id}})
-            SET r.weight = $weight
-            RETURN r
-            """
-
-            async with self._driver.session(database=self._DATABASE) as session:
-                utils.logger.debug(
-                    f"Executing Cypher query in _update_edge_weight: {query} with params: {{'source_id': '{source_id}', 'target_id': '{target_id}', 'weight': {weight}}}"
-                )
-                result = await session.run(
-                    query, source_id=source_id, target_id=target_id, weight=weight
-                )
-                await result.consume()
-
-        except Exception as e:
-            utils.logger.error(f"Error updating edge weight: {str(e)}")
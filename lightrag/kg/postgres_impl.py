@@ -26,6 +26,10 @@ from ..base import (
     DocStatus,
     DocStatusStorage,
 )
+from ..constants import (
+    DEFAULT_CACHE_EMBEDDING_WATERMARK_OVERLAP,
+    DEFAULT_DOC_STATUS_PAGE_SIZE,
+)
 from ..namespace import NameSpace, is_namespace
 from ..utils import logger
 
@@ -160,6 +164,19 @@ class PostgreSQLDB:
                     # Log error but don't interrupt the process
                     logger.warning(f"Failed to migrate {table_name}.{column_name}: {e}")
 
+    async def _migrate_llm_cache_embedding_columns(self):
+        """Add the cache embedding columns to LLM cache tables created before them"""
+        for column_name, column_type in (
+            ("cache_type", "VARCHAR(32)"),
+            ("embedding", "TEXT"),
+            ("embedding_shape", "JSONB"),
+            ("embedding_min", "DOUBLE PRECISION"),
+            ("embedding_max", "DOUBLE PRECISION"),
+        ):
+            await self.execute(
+                f"ALTER TABLE TLL_LIGHTRAG_LLM_CACHE ADD COLUMN IF NOT EXISTS {column_name} {column_type} NULL"
+            )
+
     async def check_tables(self):
         # First create all tables
         for k, v in TABLES.items():
@@ -197,6 +214,26 @@ class PostgreSQLDB:
                     f"PostgreSQL, Failed to create index on table {k}, Got: {e}"
                 )
 
+            # Secondary indexes declared with the table
+            for index_name, columns in v.get("indexes", {}).items():
+                try:
+                    check_index_sql = f"""
+                    SELECT 1 FROM pg_indexes
+                    WHERE indexname = '{index_name}'
+                    AND tablename = '{k.lower()}'
+                    """
+                    if not await self.query(check_index_sql):
+                        logger.info(
+                            f"PostgreSQL, Creating index {index_name} on table {k}"
+                        )
+                        await self.execute(
+                            f"CREATE INDEX {index_name} ON {k}({columns})"
+                        )
+                except Exception as e:
+                    logger.error(
+                        f"PostgreSQL, Failed to create index {index_name} on table {k}, Got: {e}"
+                    )
+
         # After all tables are created, attempt to migrate timestamp fields
         try:
             await self._migrate_timestamp_columns()
@@ -204,6 +241,11 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL, Failed to migrate timestamp columns: {e}")
             # Don't throw an exception, allow the initialization process to continue
 
+        try:
+            await self._migrate_llm_cache_embedding_columns()
+        except Exception as e:
+            logger.error(f"PostgreSQL, Failed to migrate LLM cache columns: {e}")
+
     async def query(
         self,
         sql: str,
@@ -414,6 +456,8 @@ class PGKVStorage(BaseKVStorage):
             response = await self.db.query(sql, params)
             if self.namespace == "text_chunks":
                 logger.info(f"PG get_by_id: Chunk '{id}' found: {response is not None}")
+            if response and is_namespace(self.namespace, NameSpace.KV_STORE_DOC_PROVENANCE):
+                response = _decode_json_columns(response, PROVENANCE_JSON_COLUMNS)
             return response if response else None
 
     async def get_by_mode_and_id(self, mode: str, id: str) -> Union[dict, None]:
@@ -429,6 +473,54 @@ class PGKVStorage(BaseKVStorage):
         else:
             return None
 
+    async def upsert_cache_entry(
+        self, mode: str, id: str, entry: dict[str, Any]
+    ) -> None:
+        """Specifically for llm_response_cache."""
+        if not is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            await super().upsert_cache_entry(mode, id, entry)
+            return
+        await self.db.execute(
+            SQL_TEMPLATES["upsert_llm_response_cache"],
+            _llm_cache_params(self.db.workspace, mode, id, entry),
+        )
+
+    async def get_cache_embeddings_since(
+        self, mode: str, watermark: Any = None
+    ) -> tuple[dict[str, dict[str, Any]], Any]:
+        """Cache embeddings of a mode written since the update_time watermark
+
+        The watermark is moved back by a few seconds, so rows of transactions that
+        committed after a later row was read are not missed.
+        """
+        if not is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            return await super().get_cache_embeddings_since(mode, watermark)
+        since = (
+            watermark
+            - datetime.timedelta(seconds=DEFAULT_CACHE_EMBEDDING_WATERMARK_OVERLAP)
+            if watermark is not None
+            else datetime.datetime(1970, 1, 1, tzinfo=timezone.utc)
+        )
+        rows = await self.db.query(
+            SQL_TEMPLATES["get_cache_embeddings_since_" + self.namespace],
+            {"workspace": self.db.workspace, "mode": mode, "since": since},
+            multirows=True,
+        )
+        entries = {}
+        for row in rows or []:
+            shape = row["embedding_shape"]
+            if isinstance(shape, str):
+                shape = json.loads(shape)
+            entries[row["id"]] = {
+                "cache_type": row["cache_type"],
+                "embedding": row["embedding"],
+                "embedding_shape": shape,
+                "embedding_min": row["embedding_min"],
+                "embedding_max": row["embedding_max"],
+            }
+            watermark = row["update_time"]
+        return entries, watermark or since
+
     # Query by id
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         """Get doc_chunks data by id"""
@@ -448,6 +540,14 @@ class PGKVStorage(BaseKVStorage):
             for row in array_res:
                 dict_res[row["mode"]][row["id"]] = row
             return [{k: v} for k, v in dict_res.items()]
+        elif is_namespace(self.namespace, NameSpace.KV_STORE_DOC_PROVENANCE):
+            rows = await self.db.query(sql, params, multirows=True)
+            # Positional like the other KV storages, None for missing records
+            records = {
+                row["id"]: _decode_json_columns(row, PROVENANCE_JSON_COLUMNS)
+                for row in rows or []
+            }
+            return [records.get(id) for id in ids]
         else:
             return await self.db.query(sql, params, multirows=True)
 
@@ -504,15 +604,24 @@ class PGKVStorage(BaseKVStorage):
             for mode, items in data.items():
                 for k, v in items.items():
                     upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
-                    _data = {
-                        "workspace": self.db.workspace,
-                        "id": k,
-                        "original_prompt": v["original_prompt"],
-                        "return_value": v["return"],
-                        "mode": mode,
-                    }
+                    _data = _llm_cache_params(self.db.workspace, mode, k, v)
 
                     await self.db.execute(upsert_sql, _data)
+        elif is_namespace(self.namespace, NameSpace.KV_STORE_DOC_PROVENANCE):
+            cst = pytz.timezone('US/Central')
+            current_time = datetime.datetime.now(cst).replace(tzinfo=None)
+            for k, v in data.items():
+                _data = {
+                    "workspace": self.db.workspace,
+                    "id": k,
+                    "chunk_ids": json.dumps(v.get("chunk_ids", [])),
+                    "entities": json.dumps(v.get("entities", [])),
+                    "relations": json.dumps(v.get("relations", [])),
+                    "doc_ids": json.dumps(v.get("doc_ids", [])),
+                    "create_time": current_time,
+                    "update_time": current_time,
+                }
+                await self.db.execute(SQL_TEMPLATES["upsert_doc_provenance"], _data)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -1008,6 +1117,41 @@ class PGDocStatusStorage(DocStatusStorage):
         }
         return docs_by_status
 
+    async def iter_docs_by_status(
+        self,
+        status: DocStatus,
+        limit: int = DEFAULT_DOC_STATUS_PAGE_SIZE,
+        cursor: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[dict[str, DocProcessingStatus], str | None]:
+        """One page of documents with a specific status, keyset-paginated by id"""
+        sql = SQL_TEMPLATES["page_doc_status_by_status"].format(
+            content_column="content" if include_content else "NULL AS content"
+        )
+        params = {
+            "workspace": self.db.workspace,
+            "status": status.value,
+            "cursor": cursor or "",
+            # One extra row tells whether another page follows
+            "limit": limit + 1,
+        }
+        result = await self.db.query(sql, params, True) or []
+        page = {
+            element["id"]: DocProcessingStatus(
+                content=element["content"],
+                content_summary=element["content_summary"],
+                content_length=element["content_length"],
+                status=element["status"],
+                created_at=element["created_at"],
+                updated_at=element["updated_at"],
+                chunks_count=element["chunks_count"],
+                file_path=element["file_path"],
+            )
+            for element in result[:limit]
+        }
+        next_cursor = result[limit - 1]["id"] if len(result) > limit else None
+        return page, next_cursor
+
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
         pass
@@ -2336,9 +2480,46 @@ NAMESPACE_TABLE_MAP = {
     NameSpace.VECTOR_STORE_RELATIONSHIPS: "TLL_LIGHTRAG_VDB_RELATION",
     NameSpace.DOC_STATUS: "TLL_LIGHTRAG_DOC_STATUS",
     NameSpace.KV_STORE_LLM_RESPONSE_CACHE: "TLL_LIGHTRAG_LLM_CACHE",
+    NameSpace.KV_STORE_DOC_PROVENANCE: "TLL_LIGHTRAG_DOC_PROVENANCE",
 }
 
 
+PROVENANCE_JSON_COLUMNS = ("chunk_ids", "entities", "relations", "doc_ids")
+
+
+def _llm_cache_params(
+    workspace: str, mode: str, id: str, entry: dict[str, Any]
+) -> dict[str, Any]:
+    """Parameters of upsert_llm_response_cache for one cache entry"""
+    shape = entry.get("embedding_shape")
+    return {
+        "workspace": workspace,
+        "id": id,
+        "original_prompt": entry["original_prompt"],
+        "return_value": entry["return"],
+        "mode": mode,
+        "cache_type": entry.get("cache_type"),
+        "embedding": entry.get("embedding"),
+        "embedding_shape": json.dumps(list(shape)) if shape is not None else None,
+        "embedding_min": entry.get("embedding_min"),
+        "embedding_max": entry.get("embedding_max"),
+    }
+
+
+def _decode_json_columns(
+    row: dict[str, Any], columns: tuple[str, ...]
+) -> dict[str, Any]:
+    """asyncpg returns JSONB columns as strings unless a codec is registered"""
+    row = dict(row)
+    for column in columns:
+        value = row.get(column)
+        if isinstance(value, str):
+            row[column] = json.loads(value)
+        elif value is None:
+            row[column] = []
+    return row
+
+
 def namespace_to_table_name(namespace: str) -> str:
     for k, v in NAMESPACE_TABLE_MAP.items():
         if is_namespace(namespace, k):
@@ -2409,10 +2590,19 @@ TABLES = {
 	                mode varchar(32) NOT NULL,
                     original_prompt TEXT,
                     return_value TEXT,
+                    cache_type VARCHAR(32) NULL,
+                    embedding TEXT NULL,
+                    embedding_shape JSONB NULL,
+                    embedding_min DOUBLE PRECISION NULL,
+                    embedding_max DOUBLE PRECISION NULL,
                     create_time TIMESTAMP(0) WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
                     update_time TIMESTAMP(0) WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
 	                CONSTRAINT TLL_LIGHTRAG_LLM_CACHE_PK PRIMARY KEY (workspace, mode, id)
-                    )"""
+                    )""",
+        # New cache embeddings are read by update_time, see get_cache_embeddings_since
+        "indexes": {
+            "idx_tll_lightrag_llm_cache_mode_update_time": "workspace, mode, update_time"
+        },
     },
     "TLL_LIGHTRAG_DOC_STATUS": {
         "ddl": """CREATE TABLE TLL_LIGHTRAG_DOC_STATUS (
@@ -2427,6 +2617,23 @@ TABLES = {
 	               created_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NULL,
 	               updated_at timestamp with time zone DEFAULT CURRENT_TIMESTAMP NULL,
 	               CONSTRAINT TLL_LIGHTRAG_DOC_STATUS_PK PRIMARY KEY (workspace, id)
+	              )""",
+        # Status listing and counting are served from the index without a table scan
+        "indexes": {
+            "idx_tll_lightrag_doc_status_status": "workspace, status, id",
+        },
+    },
+    "TLL_LIGHTRAG_DOC_PROVENANCE": {
+        "ddl": """CREATE TABLE TLL_LIGHTRAG_DOC_PROVENANCE (
+	               workspace varchar(255) NOT NULL,
+	               id varchar(255) NOT NULL,
+	               chunk_ids JSONB NULL,
+	               entities JSONB NULL,
+	               relations JSONB NULL,
+	               doc_ids JSONB NULL,
+	               create_time TIMESTAMP(0) WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+	               update_time TIMESTAMP(0) WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+	               CONSTRAINT TLL_LIGHTRAG_DOC_PROVENANCE_PK PRIMARY KEY (workspace, id)
 	              )"""
     },
 }
@@ -2450,6 +2657,12 @@ SQL_TEMPLATES = {
     "get_by_ids_full_docs": """SELECT id, COALESCE(content, '') as content
                                  FROM TLL_LIGHTRAG_DOC_FULL WHERE workspace=$1 AND id IN ({ids})
                             """,
+    "get_by_id_doc_provenance": """SELECT id, chunk_ids, entities, relations, doc_ids
+                                FROM TLL_LIGHTRAG_DOC_PROVENANCE WHERE workspace=$1 AND id=$2
+                            """,
+    "get_by_ids_doc_provenance": """SELECT id, chunk_ids, entities, relations, doc_ids
+                                 FROM TLL_LIGHTRAG_DOC_PROVENANCE WHERE workspace=$1 AND id IN ({ids})
+                            """,
     "get_by_ids_text_chunks": """SELECT id, tokens, COALESCE(content, '') as content,
                                   chunk_order_index, full_doc_id, file_path
                                    FROM tll_lightrag_doc_chunks WHERE workspace=$1 AND id IN ({ids})
@@ -2458,19 +2671,43 @@ SQL_TEMPLATES = {
                                  FROM TLL_LIGHTRAG_LLM_CACHE WHERE workspace=$1 AND mode= IN ({ids})
                                 """,
     "filter_keys": "SELECT id FROM {table_name} WHERE workspace=$1 AND id IN ({ids})",
+    "page_doc_status_by_status": """SELECT id, {content_column}, content_summary, content_length,
+                                  chunks_count, status, file_path, created_at, updated_at
+                                   FROM TLL_LIGHTRAG_DOC_STATUS
+                                  WHERE workspace=$1 AND status=$2 AND id > $3
+                                  ORDER BY id LIMIT $4
+                                """,
     "upsert_doc_full": """INSERT INTO TLL_LIGHTRAG_DOC_FULL (id, content, workspace, create_time, update_time)
                         VALUES ($1, $2, $3, $4, $5)
                         ON CONFLICT (workspace,id) DO UPDATE
                            SET content = $2, update_time = $5
                        """,
-    "upsert_llm_response_cache": """INSERT INTO TLL_LIGHTRAG_LLM_CACHE(workspace,id,original_prompt,return_value,mode)
-                                      VALUES ($1, $2, $3, $4, $5)
+    "upsert_doc_provenance": """INSERT INTO TLL_LIGHTRAG_DOC_PROVENANCE (workspace, id, chunk_ids, entities, relations, doc_ids, create_time, update_time)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                        ON CONFLICT (workspace,id) DO UPDATE
+                           SET chunk_ids = $3, entities = $4, relations = $5, doc_ids = $6, update_time = $8
+                       """,
+    "upsert_llm_response_cache": """INSERT INTO TLL_LIGHTRAG_LLM_CACHE(workspace,id,original_prompt,return_value,mode,
+                                      cache_type,embedding,embedding_shape,embedding_min,embedding_max)
+                                      VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
                                       ON CONFLICT (workspace,mode,id) DO UPDATE
                                       SET original_prompt = EXCLUDED.original_prompt,
                                       return_value=EXCLUDED.return_value,
                                       mode=EXCLUDED.mode,
+                                      cache_type=EXCLUDED.cache_type,
+                                      embedding=EXCLUDED.embedding,
+                                      embedding_shape=EXCLUDED.embedding_shape,
+                                      embedding_min=EXCLUDED.embedding_min,
+                                      embedding_max=EXCLUDED.embedding_max,
                                       update_time = CURRENT_TIMESTAMP
                                      """,
+    "get_cache_embeddings_since_llm_response_cache": """SELECT id, cache_type, embedding, embedding_shape,
+                                      embedding_min, embedding_max, update_time
+                                      FROM TLL_LIGHTRAG_LLM_CACHE
+                                      WHERE workspace=$1 AND mode=$2 AND embedding IS NOT NULL
+                                      AND update_time >= $3
+                                      ORDER BY update_time
+                                     """,
     "upsert_chunk": """INSERT INTO tll_lightrag_doc_chunks (workspace, id, tokens,
                       chunk_order_index, full_doc_id, content, content_vector, file_path,
                       create_time, update_time)
@@ -5,7 +5,7 @@ from dataclasses import dataclass
 import numpy as np
 import hashlib
 import uuid
-from ..utils import logger
+from ..utils import logger, get_vector_db_io_settings, run_in_batches
 from ..base import BaseVectorStorage
 import configparser
 import pipmaster as pm
@@ -13,7 +13,7 @@ import pipmaster as pm
 if not pm.is_installed("qdrant-client"):
     pm.install("qdrant-client")
 
-from qdrant_client import QdrantClient, models  # type: ignore
+from qdrant_client import AsyncQdrantClient, models  # type: ignore
 
 config = configparser.ConfigParser()
 config.read("config.ini", "utf-8")
@@ -50,13 +50,15 @@ def compute_mdhash_id_for_qdrant(
 @final
 @dataclass
 class QdrantVectorDBStorage(BaseVectorStorage):
+    """Qdrant vector storage, talking to the server through AsyncQdrantClient"""
+
     @staticmethod
-    def create_collection_if_not_exist(
-        client: QdrantClient, collection_name: str, **kwargs
+    async def create_collection_if_not_exist(
+        client: AsyncQdrantClient, collection_name: str, **kwargs
     ):
-        if client.collection_exists(collection_name):
+        if await client.collection_exists(collection_name):
             return
-        client.create_collection(collection_name, **kwargs)
+        await client.create_collection(collection_name, **kwargs)
 
     def __post_init__(self):
         kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
@@ -67,7 +69,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
         self.cosine_better_than_threshold = cosine_threshold
 
-        self._client = QdrantClient(
+        self._client = AsyncQdrantClient(
             url=os.environ.get(
                 "QDRANT_URL", config.get("qdrant", "uri", fallback=None)
             ),
@@ -76,7 +78,11 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             ),
         )
         self._max_batch_size = self.global_config["embedding_batch_num"]
-        QdrantVectorDBStorage.create_collection_if_not_exist(
+        self._upsert_batch_size, self._max_async = get_vector_db_io_settings(kwargs)
+
+    async def initialize(self):
+        """Create the collection on first use"""
+        await QdrantVectorDBStorage.create_collection_if_not_exist(
             self._client,
             self.namespace,
             vectors_config=models.VectorParams(
@@ -84,6 +90,9 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             ),
         )
 
+    async def finalize(self):
+        await self._client.close()
+
     async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
         logger.info(f"Inserting {len(data)} to {self.namespace}")
         if not data:
@@ -122,10 +131,15 @@ class QdrantVectorDBStorage(BaseVectorStorage):
                 )
             )
 
-        results = self._client.upsert(
-            collection_name=self.namespace, points=list_points, wait=True
+        async def _upsert_batch(points: list[models.PointStruct]):
+            return await self._client.upsert(
+                collection_name=self.namespace, points=points, wait=True
+            )
+
+        results = await run_in_batches(
+            list_points, self._upsert_batch_size, _upsert_batch, self._max_async
         )
-        return results
+        return results[-1] if results else None
 
     async def query(
         self, query: str, top_k: int, ids: list[str] | None = None
@@ -133,13 +147,14 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         embedding = await self.embedding_func(
             [query], _priority=5
         )  # higher priority for query
-        results = self._client.search(
+        response = await self._client.query_points(
             collection_name=self.namespace,
-            query_vector=embedding[0],
+            query=embedding[0],
             limit=top_k,
             with_payload=True,
             score_threshold=self.cosine_better_than_threshold,
         )
+        results = response.points
 
         logger.debug(f"query result: {results}")
 
@@ -166,7 +181,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             # Convert regular ids to Qdrant compatible ids
             qdrant_ids = [compute_mdhash_id_for_qdrant(id) for id in ids]
             # Delete points from the collection
-            self._client.delete(
+            await self._client.delete(
                 collection_name=self.namespace,
                 points_selector=models.PointIdsList(
                     points=qdrant_ids,
@@ -193,7 +208,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             )
 
             # Delete the entity point from the collection
-            self._client.delete(
+            await self._client.delete(
                 collection_name=self.namespace,
                 points_selector=models.PointIdsList(
                     points=[entity_id],
@@ -212,7 +227,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Find relations where the entity is either source or target
-            results = self._client.scroll(
+            results = await self._client.scroll(
                 collection_name=self.namespace,
                 scroll_filter=models.Filter(
                     should=[
@@ -234,7 +249,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
 
             if ids_to_delete:
                 # Delete the relations
-                self._client.delete(
+                await self._client.delete(
                     collection_name=self.namespace,
                     points_selector=models.PointIdsList(
                         points=ids_to_delete,
@@ -263,7 +278,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             qdrant_id = compute_mdhash_id_for_qdrant(id)
 
             # Retrieve the point by ID
-            result = self._client.retrieve(
+            result = await self._client.retrieve(
                 collection_name=self.namespace,
                 ids=[qdrant_id],
                 with_payload=True,
@@ -299,7 +314,7 @@ class QdrantVectorDBStorage(BaseVectorStorage):
             qdrant_ids = [compute_mdhash_id_for_qdrant(id) for id in ids]
 
             # Retrieve the points by IDs
-            results = self._client.retrieve(
+            results = await self._client.retrieve(
                 collection_name=self.namespace,
                 ids=qdrant_ids,
                 with_payload=True,
@@ -330,11 +345,11 @@ class QdrantVectorDBStorage(BaseVectorStorage):
         """
         try:
             # Delete the collection and recreate it
-            if self._client.collection_exists(self.namespace):
-                self._client.delete_collection(self.namespace)
+            if await self._client.collection_exists(self.namespace):
+                await self._client.delete_collection(self.namespace)
 
             # Recreate the collection
-            QdrantVectorDBStorage.create_collection_if_not_exist(
+            await QdrantVectorDBStorage.create_collection_if_not_exist(
                 self._client,
                 self.namespace,
                 vectors_config=models.VectorParams(
@@ -14,6 +14,7 @@ from redis.exceptions import RedisError, ConnectionError  # type: ignore
 from lightrag.utils import logger
 
 from lightrag.base import BaseKVStorage
+from lightrag.namespace import NameSpace, is_namespace
 import json
 
 
@@ -45,6 +46,11 @@ class RedisKVStorage(BaseKVStorage):
         logger.info(
             f"Initialized Redis connection pool for {self.namespace} with max {MAX_CONNECTIONS} connections"
         )
+        # LLM cache modes are stored as one Redis hash per mode (field = args_hash)
+        self._is_llm_cache = is_namespace(
+            self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE
+        )
+        self._hash_layout_modes: set[str] = set()
 
     @asynccontextmanager
     async def _get_redis_connection(self):
@@ -78,8 +84,104 @@ class RedisKVStorage(BaseKVStorage):
         """Ensure Redis resources are cleaned up when exiting context."""
         await self.close()
 
+    async def _ensure_hash_layout(self, redis, mode: str) -> None:
+        """Convert a legacy JSON blob of a cache mode into a Redis hash, once per mode"""
+        if mode in self._hash_layout_modes:
+            return
+        key = f"{self.namespace}:{mode}"
+        if await redis.type(key) == "string":
+            blob = await redis.get(key)
+            mode_cache = json.loads(blob) if blob else {}
+            pipe = redis.pipeline(transaction=True)
+            pipe.delete(key)
+            if mode_cache:
+                pipe.hset(
+                    key,
+                    mapping={k: json.dumps(v) for k, v in mode_cache.items()},
+                )
+            await pipe.execute()
+            logger.info(
+                f"Converted {len(mode_cache)} legacy LLM cache entries of mode {mode} to a hash"
+            )
+        self._hash_layout_modes.add(mode)
+
+    async def _get_mode_cache(self, redis, mode: str) -> dict[str, Any] | None:
+        await self._ensure_hash_layout(redis, mode)
+        entries = await redis.hgetall(f"{self.namespace}:{mode}")
+        return {k: json.loads(v) for k, v in entries.items()} if entries else None
+
+    async def get_by_mode_and_id(self, mode: str, id: str) -> dict[str, Any] | None:
+        if not self._is_llm_cache:
+            return None
+        async with self._get_redis_connection() as redis:
+            await self._ensure_hash_layout(redis, mode)
+            entry = await redis.hget(f"{self.namespace}:{mode}", id)
+            return {id: json.loads(entry)} if entry else None
+
+    async def upsert_cache_entry(
+        self, mode: str, id: str, entry: dict[str, Any]
+    ) -> None:
+        if not self._is_llm_cache:
+            await super().upsert_cache_entry(mode, id, entry)
+            return
+        async with self._get_redis_connection() as redis:
+            await self._ensure_hash_layout(redis, mode)
+            pipe = redis.pipeline()
+            pipe.hset(f"{self.namespace}:{mode}", id, json.dumps(entry))
+            self._add_cache_embedding(pipe, mode, id, entry)
+            await pipe.execute()
+
+    def _add_cache_embedding(self, pipe, mode: str, id: str, entry: dict) -> None:
+        """Append the embedding of a cache entry to the mode's embedding stream"""
+        if not entry.get("embedding"):
+            return
+        record = {
+            field: entry.get(field)
+            for field in (
+                "cache_type",
+                "embedding",
+                "embedding_shape",
+                "embedding_min",
+                "embedding_max",
+            )
+        }
+        pipe.xadd(
+            f"{self.namespace}:{mode}:embeddings",
+            {"id": id, "entry": json.dumps(record)},
+        )
+
+    async def get_cache_embeddings_since(
+        self, mode: str, watermark: Any = None
+    ) -> tuple[dict[str, dict[str, Any]], Any]:
+        """Cache embeddings of a mode appended to its stream after the watermark
+
+        The first call reads the whole mode hash, covering entries saved before
+        the embedding stream existed, and starts the watermark at the stream's tail.
+        """
+        if not self._is_llm_cache:
+            return await super().get_cache_embeddings_since(mode, watermark)
+        stream = f"{self.namespace}:{mode}:embeddings"
+        async with self._get_redis_connection() as redis:
+            if watermark is None:
+                tail = await redis.xrevrange(stream, count=1)
+                mode_cache = await self._get_mode_cache(redis, mode) or {}
+                entries = {
+                    cache_id: entry
+                    for cache_id, entry in mode_cache.items()
+                    if isinstance(entry, dict) and entry.get("embedding")
+                }
+                return entries, tail[0][0] if tail else "0-0"
+            records = await redis.xrange(stream, min=f"({watermark}")
+        entries = {}
+        for record_id, fields in records:
+            entries[fields["id"]] = json.loads(fields["entry"])
+            watermark = record_id
+        return entries, watermark
+
     async def get_by_id(self, id: str) -> dict[str, Any] | None:
         async with self._get_redis_connection() as redis:
+            if self._is_llm_cache:
+                return await self._get_mode_cache(redis, id)
             try:
                 data = await redis.get(f"{self.namespace}:{id}")
                 return json.loads(data) if data else None
@@ -89,6 +191,8 @@ class RedisKVStorage(BaseKVStorage):
 
     async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
         async with self._get_redis_connection() as redis:
+            if self._is_llm_cache:
+                return [await self._get_mode_cache(redis, id) for id in ids]
             try:
                 pipe = redis.pipeline()
                 for id in ids:
@@ -115,6 +219,20 @@ class RedisKVStorage(BaseKVStorage):
 
         logger.info(f"Inserting {len(data)} items to {self.namespace}")
         async with self._get_redis_connection() as redis:
+            if self._is_llm_cache:
+                for mode in data:
+                    await self._ensure_hash_layout(redis, mode)
+                pipe = redis.pipeline()
+                for mode, items in data.items():
+                    if items:
+                        pipe.hset(
+                            f"{self.namespace}:{mode}",
+                            mapping={k: json.dumps(v) for k, v in items.items()},
+                        )
+                        for k, v in items.items():
+                            self._add_cache_embedding(pipe, mode, k, v)
+                await pipe.execute()
+                return
             try:
                 pipe = redis.pipeline()
                 for k, v in data.items():
@@ -140,9 +258,12 @@ class RedisKVStorage(BaseKVStorage):
             pipe = redis.pipeline()
             for id in ids:
                 pipe.delete(f"{self.namespace}:{id}")
+                if self._is_llm_cache:
+                    # Ids of the LLM cache are modes, drop their embedding streams too
+                    pipe.delete(f"{self.namespace}:{id}:embeddings")
 
             results = await pipe.execute()
-            deleted_count = sum(results)
+            deleted_count = sum(results[:: 2 if self._is_llm_cache else 1])
             logger.info(
                 f"Deleted {deleted_count} of {len(ids)} entries from {self.namespace}"
             )
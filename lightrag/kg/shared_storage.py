@@ -44,6 +44,14 @@ _data_init_lock: Optional[LockType] = None
 # async locks for coroutine synchronization in multiprocess mode
 _async_locks: Optional[Dict[str, asyncio.Lock]] = None
 
+# per-key graph locks (entity / edge keys), single process mode only
+_graph_db_keyed_locks: Dict[str, asyncio.Lock] = {}
+# number of keyed sections holding or waiting for each per-key lock
+_graph_db_keyed_lock_refs: Dict[str, int] = {}
+# keyed sections in flight, exclusive graph operations wait until there are none
+_graph_db_keyed_sections = 0
+_graph_db_keyed_idle: Optional[asyncio.Event] = None
+
 
 class UnifiedLock(Generic[T]):
     """Provide a unified lock interface type for asyncio.Lock and multiprocessing.Lock"""
@@ -247,10 +255,38 @@ def get_pipeline_status_lock(enable_logging: bool = False) -> UnifiedLock:
     )
 
 
+def _get_graph_db_keyed_idle() -> asyncio.Event:
+    global _graph_db_keyed_idle
+    if _graph_db_keyed_idle is None:
+        _graph_db_keyed_idle = asyncio.Event()
+        _graph_db_keyed_idle.set()
+    return _graph_db_keyed_idle
+
+
+class GraphDbLock(UnifiedLock):
+    """The global graph_db_lock, held exclusively against keyed graph sections
+
+    Keyed sections only register while holding graph_db_lock, so once it is held no
+    new keyed section can start; the holder then waits for the running ones to
+    finish before entering. In multiprocess mode keyed sections hold graph_db_lock
+    themselves and there is nothing to wait for.
+    """
+
+    async def __aenter__(self) -> "GraphDbLock":
+        await super().__aenter__()
+        if self._is_async:
+            try:
+                await _get_graph_db_keyed_idle().wait()
+            except BaseException:
+                await super().__aexit__(None, None, None)
+                raise
+        return self
+
+
 def get_graph_db_lock(enable_logging: bool = False) -> UnifiedLock:
     """return unified graph database lock for ensuring atomic operations"""
     async_lock = _async_locks.get("graph_db_lock") if _is_multiprocess else None
-    return UnifiedLock(
+    return GraphDbLock(
         lock=_graph_db_lock,
         is_async=not _is_multiprocess,
         name="graph_db_lock",
@@ -271,6 +307,102 @@ def get_data_init_lock(enable_logging: bool = False) -> UnifiedLock:
     )
 
 
+class KeyedGraphLock:
+    """Lock a set of graph keys (entity names / edge keys) instead of the whole graph
+
+    Merges that touch disjoint entities can then proceed concurrently, while merges
+    sharing a key are serialized. Keys are acquired in sorted order so overlapping
+    key sets cannot deadlock each other.
+
+    Keyed sections act as shared holders of the graph: they register under the
+    global graph_db_lock, and an exclusive graph operation (entity edit, merge,
+    delete) holding graph_db_lock waits until every registered keyed section has
+    exited. A keyed section therefore never overlaps an exclusive operation. In
+    multiprocess mode per-key locks are not shared between workers, so the global
+    graph_db_lock is held for the whole section instead.
+    """
+
+    def __init__(self, keys: list[str], enable_logging: bool = False):
+        self._keys = sorted(set(keys))
+        self._enable_logging = enable_logging
+        self._acquired: list[asyncio.Lock] = []
+        self._registered = False
+        self._global_lock: Optional[UnifiedLock] = None
+
+    async def __aenter__(self) -> "KeyedGraphLock":
+        global _graph_db_keyed_sections
+        if _is_multiprocess:
+            self._global_lock = get_graph_db_lock(enable_logging=self._enable_logging)
+            await self._global_lock.__aenter__()
+            return self
+
+        # Register while holding the raw global lock: an exclusive holder of
+        # graph_db_lock blocks new keyed sections until it is done
+        async with _graph_db_lock:
+            _graph_db_keyed_sections += 1
+            _get_graph_db_keyed_idle().clear()
+            for key in self._keys:
+                if key not in _graph_db_keyed_locks:
+                    _graph_db_keyed_locks[key] = asyncio.Lock()
+                _graph_db_keyed_lock_refs[key] = (
+                    _graph_db_keyed_lock_refs.get(key, 0) + 1
+                )
+            self._registered = True
+
+        try:
+            for key in self._keys:
+                lock = _graph_db_keyed_locks[key]
+                await lock.acquire()
+                self._acquired.append(lock)
+        except BaseException:
+            self._release_keys()
+            raise
+
+        direct_log(
+            f"== Lock == Process {os.getpid()}: Keyed graph lock acquired for {len(self._keys)} keys",
+            enable_output=self._enable_logging,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._global_lock is not None:
+            await self._global_lock.__aexit__(exc_type, exc_val, exc_tb)
+            self._global_lock = None
+            return
+        self._release_keys()
+        direct_log(
+            f"== Lock == Process {os.getpid()}: Keyed graph lock released for {len(self._keys)} keys",
+            enable_output=self._enable_logging,
+        )
+
+    def _release_keys(self):
+        global _graph_db_keyed_sections
+        for lock in self._acquired:
+            lock.release()
+        self._acquired = []
+        if not self._registered:
+            return
+        self._registered = False
+        for key in self._keys:
+            refs = _graph_db_keyed_lock_refs[key] - 1
+            if refs:
+                _graph_db_keyed_lock_refs[key] = refs
+            else:
+                # Drop idle locks so the registry does not grow with the graph
+                del _graph_db_keyed_lock_refs[key]
+                _graph_db_keyed_locks.pop(key, None)
+        _graph_db_keyed_sections -= 1
+        if _graph_db_keyed_sections == 0:
+            _get_graph_db_keyed_idle().set()
+
+
+def get_graph_db_keyed_lock(
+    keys: list[str], enable_logging: bool = False
+) -> KeyedGraphLock:
+    """return a graph database lock scoped to the given entity/edge keys"""
+    return KeyedGraphLock(keys, enable_logging=enable_logging)
+
+
 def initialize_share_data(workers: int = 1):
     """
     Initialize shared storage data for single or multi-process mode.
@@ -380,6 +512,7 @@ async def initialize_pipeline_status():
                 "request_pending": False,  # Flag for pending request for processing
                 "latest_message": "",  # Latest message from pipeline processing
                 "history_messages": history_messages,  # 使用共享列表对象
+                "stages": {},  # Queue depth and throughput of each pipeline stage
             }
         )
         direct_log(f"Process {os.getpid()} Pipeline namespace initialized")
@@ -535,7 +668,9 @@ def finalize_share_data():
         _init_flags, \
         _initialized, \
         _update_flags, \
-        _async_locks
+        _async_locks, \
+        _graph_db_keyed_sections, \
+        _graph_db_keyed_idle
 
     # Check if already initialized
     if not _initialized:
@@ -601,5 +736,9 @@ def finalize_share_data():
     _data_init_lock = None
     _update_flags = None
     _async_locks = None
+    _graph_db_keyed_locks.clear()
+    _graph_db_keyed_lock_refs.clear()
+    _graph_db_keyed_sections = 0
+    _graph_db_keyed_idle = None
 
     direct_log(f"Process {os.getpid()} storage data finalization complete")
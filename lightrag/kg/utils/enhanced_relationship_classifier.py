@@ -3,11 +3,169 @@ Enhanced Relationship Classifier for Type-Specific Validation
 Based on actual Neo4j relationship data patterns and existing registry infrastructure.
 """
 
-from typing import Dict, List, Optional, Any
-from collections import defaultdict
+import re
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from collections import OrderedDict, defaultdict
 
+from ...constants import DEFAULT_RELATIONSHIP_TYPE_CACHE_SIZE
 from .relationship_registry import RelationshipTypeRegistry
 
+# Debugging verbs forced into troubleshooting_support whatever the registry says
+_CRITICAL_DEBUG_VERBS = {
+    "TROUBLESHOOTS": "troubleshooting_support",
+    "DEBUGS": "troubleshooting_support",
+    "FIXES": "troubleshooting_support",
+    "RESOLVES": "troubleshooting_support",
+    "ASSISTS": "troubleshooting_support",
+    "DIAGNOSES": "troubleshooting_support",
+    "REPAIRS": "troubleshooting_support",
+    "HANDLES_ERROR": "troubleshooting_support",
+    "INVESTIGATES": "troubleshooting_support",
+    "ADDRESSES": "troubleshooting_support",
+}
+
+_DEBUG_PATTERNS = (
+    "troubleshoot",
+    "debug",
+    "fix",
+    "resolve",
+    "assist",
+    "diagnose",
+    "repair",
+)
+
+# Checked in order, the first pattern found decides the category
+_TECHNICAL_PATTERNS = (
+    "run",
+    "host",
+    "call",
+    "use",
+    "integrate",
+    "configure",
+    "deploy",
+    "process",
+    "manage",
+    "operate",
+    "connect",
+    "access",
+    "execute",
+    "control",
+    "store",
+    "edit",
+    "extract",
+    "return",
+    "affect",
+    "trigger",
+)
+
+# Expanded technical entity indicators
+_TECHNICAL_INDICATORS = (
+    "api",
+    "database",
+    "server",
+    "service",
+    "component",
+    "system",
+    "docker",
+    "redis",
+    "postgres",
+    "nginx",
+    "kubernetes",
+    "n8n",
+    "workflow",
+    "automation",
+    "bot",
+    "assistant",
+    "ai",
+    "ml",
+    "application",
+    "app",
+    "platform",
+    "tool",
+    "framework",
+    "google",
+    "drive",
+    "content",
+    "video",
+    "tagger",
+    "processor",
+    "node",
+    "code",
+    "error",
+    "developer",
+    "claude",
+    "model",  # Added debugging entities
+)
+
+_DEBUG_ENTITIES = (
+    "developer",
+    "claude",
+    "ai",
+    "assistant",
+    "error",
+    "issue",
+    "problem",
+)
+
+_ERROR_KEYWORDS = ("error", "issue", "problem", "bug", "failure", "exception")
+
+_ACTION_RELATIONSHIP_TYPES = (
+    "runs_on",
+    "integrates_with",
+    "uses",
+    "troubleshoots",
+    "accesses",
+    "connects_to",
+    "calls_api",
+    "hosts",
+    "deploys",
+    "processes",
+    "runs",
+    "operates",
+    "configured_by",
+    "hosted_on",
+    "supports",
+    "configures",
+    "creates",
+    "builds",
+    "debugs",
+    "fixes",
+    "assists",
+    "evolved_from",
+    "derived_from",
+    "based_on",
+    "improved_from",
+    "replaces",
+)
+
+_NEVER_FILTER_VERBS = ("troubleshoots", "debugs", "fixes", "resolves", "assists")
+
+# Technical words in a description, one regex search instead of a scan per word
+_TECH_WORDS_RE = re.compile(
+    "configure|deploy|install|setup|run|execute|integrate|connect|process|manage|host|operate"
+)
+
+# BALANCED: Calibrated minimums for 85-95% retention target
+_CATEGORY_MINIMUMS = {
+    "technical_core": 0.25,  # Preserve technical relationships
+    "troubleshooting_support": 0.80,  # NEVER filter debugging - force high confidence
+    "development_operations": 0.25,  # Development operations flexible
+    "system_interactions": 0.20,  # System operations very flexible
+    "data_flow": 0.25,  # Data operations moderate
+    "abstract_conceptual": 0.15,  # Allow filtering only very weak abstracts
+    "structural_composition": 0.20,  # Structural relationships flexible
+}
+
+
+def _entity_flags(entity: str) -> Tuple[bool, bool, bool]:
+    """Whether an entity name looks like debugging, technical and error context"""
+    name = entity.lower()
+    return (
+        any(indicator in name for indicator in _DEBUG_ENTITIES),
+        any(indicator in name for indicator in _TECHNICAL_INDICATORS),
+        any(keyword in name for keyword in _ERROR_KEYWORDS),
+    )
+
 
 class EnhancedRelationshipClassifier:
     """
@@ -20,6 +178,8 @@ class EnhancedRelationshipClassifier:
         self.registry = RelationshipTypeRegistry()
         self._initialize_data_driven_categories()
         self._initialize_confidence_thresholds()
+        # Per-type classification profiles, LRU keyed on the raw relationship type
+        self._type_profiles: OrderedDict[str, Dict[str, Any]] = OrderedDict()
 
     def _initialize_data_driven_categories(self):
         """
@@ -298,65 +458,179 @@ class EnhancedRelationshipClassifier:
         Returns:
             Dictionary with classification results
         """
-        if not relationship_type:
-            return self._create_classification_result(
-                "abstract_conceptual", 0.1, "RELATED"
-            )
+        return self.classify_batch(
+            [
+                {
+                    "rel_type": relationship_type,
+                    "src_id": src_entity,
+                    "tgt_id": tgt_entity,
+                    "description": description,
+                }
+            ]
+        )[0]
 
-        # Normalize the relationship type
-        normalized_type = relationship_type.upper().replace(" ", "_")
+    def classify_batch(self, edges: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Classify many relationships at once.
 
-        # Store current relationship type for confidence scoring
-        self._current_rel_type = normalized_type
+        Everything that depends only on the relationship type (overrides, registry
+        fuzzy matching, base confidence) is computed once per type and cached across
+        calls, registry matches of all unseen types are scored in one batch. Edges of
+        the same type whose entities and descriptions score alike share one result
+        dict, which callers must not modify.
 
-        # EMERGENCY FIX: Force classification for critical debugging verbs
-        CRITICAL_DEBUG_VERBS = {
-            "TROUBLESHOOTS": "troubleshooting_support",
-            "DEBUGS": "troubleshooting_support",
-            "FIXES": "troubleshooting_support",
-            "RESOLVES": "troubleshooting_support",
-            "ASSISTS": "troubleshooting_support",
-            "DIAGNOSES": "troubleshooting_support",
-            "REPAIRS": "troubleshooting_support",
-            "HANDLES_ERROR": "troubleshooting_support",
-            "INVESTIGATES": "troubleshooting_support",
-            "ADDRESSES": "troubleshooting_support",
-        }
+        Args:
+            edges: Relationship dictionaries with 'rel_type', 'src_id', 'tgt_id' and
+                'description' fields
 
-        # Force debug verb classification (emergency override)
-        if normalized_type in CRITICAL_DEBUG_VERBS:
-            category = CRITICAL_DEBUG_VERBS[normalized_type]
-            confidence = 0.90  # High confidence for critical verbs
-            return self._create_classification_result(
-                category,
-                confidence,
-                normalized_type,
-                message="Emergency debug verb override",
+        Returns:
+            Classification results in the order of edges
+        """
+        edges = list(edges)
+        profiles = self._get_type_profiles([edge.get("rel_type", "") for edge in edges])
+
+        results = []
+        classified = {}
+        entity_flags = {}
+        for edge in edges:
+            rel_type = edge.get("rel_type", "")
+            profile = profiles[rel_type]
+            if not profile["adjust"]:
+                result = classified.get(rel_type)
+                if result is None:
+                    result = classified[rel_type] = self._profile_result(
+                        profile, profile["confidence"]
+                    )
+                results.append(result)
+                continue
+
+            src_entity = edge.get("src_id", "")
+            tgt_entity = edge.get("tgt_id", "")
+            description = edge.get("description", "")
+            description_length = len(description) if description else 0
+            if description_length > 100:
+                length_bucket = 4
+            elif description_length > 50:
+                length_bucket = 3
+            elif description_length > 20:
+                length_bucket = 2
+            elif description_length >= 10:
+                length_bucket = 1
+            else:
+                length_bucket = 0
+            technical_context = (
+                profile["technical_inference"]
+                and description_length > 0
+                and _TECH_WORDS_RE.search(description.lower()) is not None
             )
 
+            if src_entity and tgt_entity:
+                src_flags = entity_flags.get(src_entity)
+                if src_flags is None:
+                    src_flags = entity_flags[src_entity] = _entity_flags(src_entity)
+                tgt_flags = entity_flags.get(tgt_entity)
+                if tgt_flags is None:
+                    tgt_flags = entity_flags[tgt_entity] = _entity_flags(tgt_entity)
+                pair_flags = (src_flags, tgt_flags)
+            else:
+                pair_flags = None
+
+            # The confidence depends on the entities only through their flags
+            key = (rel_type, pair_flags, length_bucket, technical_context)
+            result = classified.get(key)
+            if result is None:
+                confidence = self._adjust_confidence(
+                    profile, pair_flags, length_bucket, technical_context
+                )
+                result = classified[key] = self._profile_result(profile, confidence)
+            results.append(result)
+        return results
+
+    def _get_type_profiles(
+        self, relationship_types: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Profiles of the given types, unseen types are fuzzy matched in one registry batch"""
+        profiles = {}
+        pending = []
+        for rel_type in dict.fromkeys(relationship_types):
+            profile = self._type_profiles.get(rel_type)
+            if profile is None:
+                pending.append(rel_type)
+            else:
+                self._type_profiles.move_to_end(rel_type)
+                profiles[rel_type] = profile
+        if not pending:
+            return profiles
+        fuzzy = [
+            rel_type
+            for rel_type in pending
+            if rel_type
+            and self._direct_category(rel_type.upper().replace(" ", "_")) is None
+        ]
+        matches = (
+            self.registry.find_best_matches_with_confidence(fuzzy) if fuzzy else {}
+        )
+        for rel_type in pending:
+            profile = self._build_type_profile(rel_type, matches.get(rel_type))
+            profiles[rel_type] = self._type_profiles[rel_type] = profile
+            if len(self._type_profiles) > DEFAULT_RELATIONSHIP_TYPE_CACHE_SIZE:
+                self._type_profiles.popitem(last=False)
+        return profiles
+
+    def _direct_category(self, normalized_type: str) -> Optional[str]:
+        """Category of a type known without fuzzy matching, None if there is none"""
+        if normalized_type in _CRITICAL_DEBUG_VERBS:
+            return _CRITICAL_DEBUG_VERBS[normalized_type]
         # CRITICAL FIX: Check classification overrides first
-        category = self.classification_overrides.get(normalized_type)
+        return self.classification_overrides.get(
+            normalized_type
+        ) or self.type_to_category.get(normalized_type)
+
+    def _build_type_profile(
+        self,
+        relationship_type: str,
+        registry_match: Optional[Tuple[Optional[str], float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Everything about a classification that depends only on the relationship type.
 
-        if not category:
-            # Direct category lookup
-            category = self.type_to_category.get(normalized_type)
+        Args:
+            relationship_type: The relationship type to classify
+            registry_match: Prefetched registry (best_match, confidence), looked up if None
 
-        if category:
-            # Direct match found
-            confidence = self._calculate_base_confidence(category, True)
+        Returns:
+            Profile with the category, the confidence before context adjustments and
+            the type-level flags the adjustments use
+        """
+        if not relationship_type:
+            return self._type_profile("abstract_conceptual", 0.1, "RELATED")
+
+        # Normalize the relationship type
+        normalized_type = relationship_type.upper().replace(" ", "_")
 
-            # Apply context-based adjustments
-            confidence = self._apply_context_adjustments(
-                confidence, category, src_entity, tgt_entity, description
+        # EMERGENCY FIX: Force classification for critical debugging verbs
+        if normalized_type in _CRITICAL_DEBUG_VERBS:
+            return self._type_profile(
+                _CRITICAL_DEBUG_VERBS[normalized_type],
+                0.90,  # High confidence for critical verbs
+                normalized_type,
+                message="Emergency debug verb override",
             )
 
-            return self._create_classification_result(
-                category, confidence, normalized_type
+        category = self._direct_category(normalized_type)
+        if category:
+            # Direct match found, context adjustments are applied per edge
+            return self._type_profile(
+                category,
+                self._calculate_base_confidence(category, True),
+                normalized_type,
+                adjusted_type=normalized_type,
             )
 
         # No direct match - use registry fuzzy matching
-        best_match, registry_confidence = self.registry.find_best_match_with_confidence(
-            relationship_type
+        best_match, registry_confidence = (
+            registry_match
+            or self.registry.find_best_match_with_confidence(relationship_type)
         )
 
         if best_match and registry_confidence >= 0.4:
@@ -368,35 +642,20 @@ class EnhancedRelationshipClassifier:
 
             # Combine registry confidence with category confidence
             base_confidence = self._calculate_base_confidence(matched_category, False)
-            final_confidence = base_confidence * registry_confidence
-
-            # Apply context adjustments
-            final_confidence = self._apply_context_adjustments(
-                final_confidence, matched_category, src_entity, tgt_entity, description
-            )
-
-            return self._create_classification_result(
+            return self._type_profile(
                 matched_category,
-                final_confidence,
+                base_confidence * registry_confidence,
                 matched_normalized,
+                adjusted_type=normalized_type,
                 best_match=best_match,
                 registry_confidence=registry_confidence,
             )
 
         # EMERGENCY: Check for debug patterns if nothing matched
-        debug_patterns = [
-            "troubleshoot",
-            "debug",
-            "fix",
-            "resolve",
-            "assist",
-            "diagnose",
-            "repair",
-        ]
         normalized_lower = normalized_type.lower()
-        for pattern in debug_patterns:
+        for pattern in _DEBUG_PATTERNS:
             if pattern in normalized_lower:
-                return self._create_classification_result(
+                return self._type_profile(
                     "troubleshooting_support",
                     0.85,
                     normalized_type,
@@ -405,30 +664,7 @@ class EnhancedRelationshipClassifier:
 
         # No good match found - check if it's a technical pattern before defaulting to abstract
         # CRITICAL FIX: Many technical relationships were being misclassified as abstract
-        technical_patterns = [
-            "run",
-            "host",
-            "call",
-            "use",
-            "integrate",
-            "configure",
-            "deploy",
-            "process",
-            "manage",
-            "operate",
-            "connect",
-            "access",
-            "execute",
-            "control",
-            "store",
-            "edit",
-            "extract",
-            "return",
-            "affect",
-            "trigger",
-        ]
-
-        for pattern in technical_patterns:
+        for pattern in _TECHNICAL_PATTERNS:
             if pattern in normalized_lower:
                 # This is likely a technical relationship - determine category by pattern
                 if pattern in ["control", "store", "manage", "process", "operate"]:
@@ -440,22 +676,75 @@ class EnhancedRelationshipClassifier:
                 else:
                     category = "technical_core"
 
-                confidence = 0.45  # Give technical patterns good confidence
-                return self._create_classification_result(
+                return self._type_profile(
                     category,
-                    confidence,
+                    0.45,  # Give technical patterns good confidence
                     normalized_type,
                     message="Matched technical pattern",
                 )
 
         # Only classify as abstract if no technical patterns found
-        return self._create_classification_result(
+        return self._type_profile(
             "abstract_conceptual",
             0.35,
             normalized_type,
             message="No registry match found",
         )
 
+    def _type_profile(
+        self,
+        category: str,
+        confidence: float,
+        normalized_type: str,
+        adjusted_type: Optional[str] = None,
+        **result_fields,
+    ) -> Dict[str, Any]:
+        """
+        Build a type profile.
+
+        Args:
+            adjusted_type: Normalized input type when the confidence still gets
+                context adjustments, None for a final confidence
+        """
+        profile = {
+            "category": category,
+            "confidence": confidence,
+            "normalized_type": normalized_type,
+            "result_fields": result_fields,
+            "adjust": adjusted_type is not None,
+        }
+        if adjusted_type is not None:
+            current_rel_type = adjusted_type.lower()
+            category_metadata = self.categories.get(category, {})
+            profile.update(
+                {
+                    "action_boost": any(
+                        action_type in current_rel_type
+                        for action_type in _ACTION_RELATIONSHIP_TYPES
+                    ),
+                    "never_filter": any(
+                        verb in current_rel_type for verb in _NEVER_FILTER_VERBS
+                    ),
+                    "require_explicit_mention": category_metadata.get(
+                        "require_explicit_mention", False
+                    ),
+                    "technical_inference": category_metadata.get(
+                        "allow_technical_inference", False
+                    ),
+                }
+            )
+        return profile
+
+    def _profile_result(
+        self, profile: Dict[str, Any], confidence: float
+    ) -> Dict[str, Any]:
+        return self._create_classification_result(
+            profile["category"],
+            confidence,
+            profile["normalized_type"],
+            **profile["result_fields"],
+        )
+
     def _calculate_base_confidence(self, category: str, is_direct_match: bool) -> float:
         """
         Calculate base confidence score for a category.
@@ -478,28 +767,28 @@ class EnhancedRelationshipClassifier:
             # Fuzzy matches get base threshold confidence
             return threshold
 
-    def _apply_context_adjustments(
+    def _adjust_confidence(
         self,
-        base_confidence: float,
-        category: str,
-        src_entity: str,
-        tgt_entity: str,
-        description: str,
+        profile: Dict[str, Any],
+        pair_flags: Optional[Tuple[Tuple[bool, bool, bool], Tuple[bool, bool, bool]]],
+        length_bucket: int,
+        technical_context: bool,
     ) -> float:
         """
         Apply context-based confidence adjustments.
 
         Args:
-            base_confidence: Base confidence score
-            category: Relationship category
-            src_entity: Source entity
-            tgt_entity: Target entity
-            description: Relationship description
+            profile: Type profile holding the base confidence
+            pair_flags: _entity_flags of source and target, None unless both are set
+            length_bucket: 4 for descriptions over 100 chars, 3 over 50, 2 over 20,
+                1 from 10, 0 below 10 or without description
+            technical_context: The description mentions technical work and the
+                category allows technical inference
 
         Returns:
             Adjusted confidence score
         """
-        confidence = base_confidence
+        confidence = profile["confidence"]
 
         # EMERGENCY FIX: Remove problematic confidence floor that was causing 0.350 defaults
         # Let confidence calculation work naturally without artificial floors
@@ -507,177 +796,52 @@ class EnhancedRelationshipClassifier:
             confidence = 0.20  # Lower floor to prevent over-filtering
 
         # MODERATE context length boost (prevent over-inflation)
-        if description and len(description) > 100:
+        if length_bucket == 4:
             confidence += 0.15  # Reduced boost for detailed descriptions
-        elif description and len(description) > 50:
+        elif length_bucket == 3:
             confidence += 0.1  # Smaller boost
-        elif description and len(description) > 20:
+        elif length_bucket == 2:
             confidence += 0.05  # Minimal boost for short descriptions
 
         # Enhanced entity specificity boost
-        if src_entity and tgt_entity:
-            # Expanded technical entity indicators
-            technical_indicators = [
-                "api",
-                "database",
-                "server",
-                "service",
-                "component",
-                "system",
-                "docker",
-                "redis",
-                "postgres",
-                "nginx",
-                "kubernetes",
-                "n8n",
-                "workflow",
-                "automation",
-                "bot",
-                "assistant",
-                "ai",
-                "ml",
-                "application",
-                "app",
-                "platform",
-                "tool",
-                "framework",
-                "google",
-                "drive",
-                "content",
-                "video",
-                "tagger",
-                "processor",
-                "node",
-                "code",
-                "error",
-                "developer",
-                "claude",
-                "model",  # Added debugging entities
-            ]
+        if pair_flags:
+            (src_debug, src_technical, _), (tgt_debug, tgt_technical, _) = pair_flags
 
             # Special boost for debugging/assistance relationships
-            debug_entities = [
-                "developer",
-                "claude",
-                "ai",
-                "assistant",
-                "error",
-                "issue",
-                "problem",
-            ]
-            src_debug = any(entity in src_entity.lower() for entity in debug_entities)
-            tgt_debug = any(entity in tgt_entity.lower() for entity in debug_entities)
-
             if src_debug or tgt_debug:
                 confidence += 0.15  # Moderate boost for debugging context
 
-            src_technical = any(
-                indicator in src_entity.lower() for indicator in technical_indicators
-            )
-            tgt_technical = any(
-                indicator in tgt_entity.lower() for indicator in technical_indicators
-            )
-
             if src_technical and tgt_technical:
                 confidence += 0.10  # Moderate boost for technical entity pairs
             elif src_technical or tgt_technical:
                 confidence += 0.08  # Small boost for partial technical context
 
         # Action verb boost with expanded patterns
-        action_relationship_types = [
-            "runs_on",
-            "integrates_with",
-            "uses",
-            "troubleshoots",
-            "accesses",
-            "connects_to",
-            "calls_api",
-            "hosts",
-            "deploys",
-            "processes",
-            "runs",
-            "operates",
-            "configured_by",
-            "hosted_on",
-            "supports",
-            "configures",
-            "creates",
-            "builds",
-            "debugs",
-            "fixes",
-            "assists",
-            "evolved_from",
-            "derived_from",
-            "based_on",
-            "improved_from",
-            "replaces",
-        ]
-
-        current_rel_type = getattr(self, "_current_rel_type", "").lower()
-        if any(
-            action_type in current_rel_type for action_type in action_relationship_types
-        ):
+        if profile["action_boost"]:
             confidence += (
                 0.15  # Moderate boost for action verbs - concrete relationships
             )
 
-        # Category-specific adjustments (more permissive)
-        category_metadata = self.categories.get(category, {})
-
         # Remove harsh penalties for explicit mention requirement
-        if category_metadata.get("require_explicit_mention", False):
-            if not description or len(description) < 10:  # Much more lenient
+        if profile["require_explicit_mention"]:
+            if length_bucket == 0:  # Much more lenient
                 confidence -= 0.05  # Smaller penalty
 
         # Enhanced technical inference boost
-        if category_metadata.get("allow_technical_inference", False):
-            tech_words = [
-                "configure",
-                "deploy",
-                "install",
-                "setup",
-                "run",
-                "execute",
-                "integrate",
-                "connect",
-                "process",
-                "manage",
-                "host",
-                "operate",
-            ]
-            if any(
-                tech_word in (description or "").lower() for tech_word in tech_words
-            ):
-                confidence += 0.1  # Bigger boost for technical context
+        if technical_context:
+            confidence += 0.1  # Bigger boost for technical context
 
         # NEVER-FILTER rules for critical relationships
-        never_filter_verbs = ["troubleshoots", "debugs", "fixes", "resolves", "assists"]
-        if any(verb in current_rel_type for verb in never_filter_verbs):
+        if profile["never_filter"]:
             confidence = max(
                 confidence, 0.6
             )  # Ensure debugging relationships pass threshold
 
         # Error/problem entity boost
-        error_keywords = ["error", "issue", "problem", "bug", "failure", "exception"]
-        if src_entity and tgt_entity:
-            if any(
-                keyword in (src_entity + " " + tgt_entity).lower()
-                for keyword in error_keywords
-            ):
-                confidence += 0.20  # Boost relationships involving errors
-
-        # BALANCED: Calibrated minimums for 85-95% retention target
-        category_minimums = {
-            "technical_core": 0.25,  # Preserve technical relationships
-            "troubleshooting_support": 0.80,  # NEVER filter debugging - force high confidence
-            "development_operations": 0.25,  # Development operations flexible
-            "system_interactions": 0.20,  # System operations very flexible
-            "data_flow": 0.25,  # Data operations moderate
-            "abstract_conceptual": 0.15,  # Allow filtering only very weak abstracts
-            "structural_composition": 0.20,  # Structural relationships flexible
-        }
+        if pair_flags and (pair_flags[0][2] or pair_flags[1][2]):
+            confidence += 0.20  # Boost relationships involving errors
 
-        min_confidence = category_minimums.get(category, 0.25)
+        min_confidence = _CATEGORY_MINIMUMS.get(profile["category"], 0.25)
         confidence = max(min_confidence, confidence)
 
         return max(0.0, min(confidence, 1.0))  # Clamp to [0.0, 1.0]
@@ -750,14 +914,10 @@ class EnhancedRelationshipClassifier:
 
         total_relationships = len(relationships)
 
-        for rel in relationships:
+        for rel, classification in zip(
+            relationships, self.classify_batch(relationships)
+        ):
             rel_type = rel.get("rel_type", "")
-            classification = self.classify_relationship(
-                rel_type,
-                rel.get("src_id", ""),
-                rel.get("tgt_id", ""),
-                rel.get("description", ""),
-            )
 
             category = classification["category"]
             confidence = classification["confidence"]
@@ -906,6 +1066,27 @@ class EnhancedRelationshipClassifier:
             return "Poor - Low retention or confidence, needs attention"
 
 
+_global_classifier_instance = None
+
+
+def get_relationship_classifier() -> EnhancedRelationshipClassifier:
+    """
+    Get or create the process-wide relationship classifier.
+
+    Its per-type profiles and registry matches are shared by every caller, so
+    repeated merges do not rebuild the categories or re-score known types.
+
+    Returns:
+        EnhancedRelationshipClassifier instance
+    """
+    global _global_classifier_instance
+
+    if _global_classifier_instance is None:
+        _global_classifier_instance = EnhancedRelationshipClassifier()
+
+    return _global_classifier_instance
+
+
 # Convenience function for backward compatibility
 def classify_relationship_type(
     relationship_type: str,
@@ -925,7 +1106,7 @@ def classify_relationship_type(
     Returns:
         Classification result dictionary
     """
-    classifier = EnhancedRelationshipClassifier()
+    classifier = get_relationship_classifier()
     return classifier.classify_relationship(
         relationship_type, src_entity, tgt_entity, description
     )
@@ -0,0 +1,132 @@
+"""
+Migration script to build the chunk index of existing Neo4j relationships.
+Edges upserted before the index existed have no (:Chunk) entries, so
+get_edges_by_chunk_ids cannot find them until this script has run once.
+"""
+
+import time
+from typing import Dict, Any
+
+from ...prompt import GRAPH_FIELD_SEP
+from ...utils import logger
+from .neo4j_edge_utils import CHUNK_EDGE_KEY_SEP, CHUNK_INDEX_UPDATE
+
+
+async def migrate_chunk_relationship_index(
+    driver,
+    database: str,
+    dry_run: bool = True,
+    batch_size: int = 1000,
+    rebuild: bool = False,
+) -> Dict[str, Any]:
+    """
+    Index the source chunks of all relationships as (:Chunk) nodes.
+
+    Args:
+        driver: Neo4j AsyncDriver instance
+        database: Neo4j database name
+        dry_run: If True, only report what would be done without making changes
+        batch_size: Number of relationships indexed per transaction
+        rebuild: If True, delete all Chunk nodes first, dropping stale entries
+
+    Returns:
+        Dict with migration statistics
+    """
+    start_time = time.time()
+
+    stats = {
+        "total_relationships": 0,
+        "existing_chunks": 0,
+        "indexed_chunks": 0,
+        "errors": 0,
+        "execution_time": 0,
+    }
+
+    try:
+        async with driver.session(database=database) as session:
+            count_query = """
+            MATCH (:base)-[r]->(:base)
+            WHERE r.source_id IS NOT NULL
+            RETURN COUNT(r) AS count
+            """
+            count_result = await session.run(count_query)
+            count_record = await count_result.single()
+            await count_result.consume()
+            stats["total_relationships"] = count_record["count"] if count_record else 0
+
+            chunk_result = await session.run("MATCH (c:Chunk) RETURN COUNT(c) AS count")
+            chunk_record = await chunk_result.single()
+            await chunk_result.consume()
+            stats["existing_chunks"] = chunk_record["count"] if chunk_record else 0
+
+            logger.info(
+                f"Found {stats['total_relationships']} relationships with source chunks "
+                f"and {stats['existing_chunks']} indexed chunks"
+            )
+
+            if dry_run:
+                stats["execution_time"] = time.time() - start_time
+                logger.info(
+                    f"Dry run completed. Would index {stats['total_relationships']} relationships"
+                    f"{' after dropping the existing index' if rebuild else ''}"
+                )
+                return stats
+
+            result = await session.run(
+                "CREATE INDEX IF NOT EXISTS FOR (c:Chunk) ON (c.chunk_id)"
+            )
+            await result.consume()
+
+            if rebuild:
+                result = await session.run(
+                    """
+                    MATCH (c:Chunk)
+                    CALL { WITH c DETACH DELETE c } IN TRANSACTIONS OF $batch_size ROWS
+                    """,
+                    batch_size=batch_size,
+                )
+                await result.consume()
+                logger.info(f"Dropped {stats['existing_chunks']} indexed chunks")
+
+            # CALL ... IN TRANSACTIONS needs an auto-commit transaction, which
+            # session.run provides
+            index_query = (
+                """
+            MATCH (s:base)-[r]->(t:base)
+            WHERE r.source_id IS NOT NULL
+            CALL {
+                WITH s, r, t
+                WITH [chunk_id IN split(r.source_id, $sep) WHERE chunk_id <> ''] AS chunk_ids,
+                     s.entity_id + $key_sep + t.entity_id AS edge_key
+                """
+                + CHUNK_INDEX_UPDATE
+                % {"chunk_ids": "chunk_ids", "edge_key": "edge_key"}
+                + """
+            } IN TRANSACTIONS OF $batch_size ROWS
+            """
+            )
+            result = await session.run(
+                index_query,
+                sep=GRAPH_FIELD_SEP,
+                key_sep=CHUNK_EDGE_KEY_SEP,
+                batch_size=batch_size,
+            )
+            await result.consume()
+
+            chunk_result = await session.run("MATCH (c:Chunk) RETURN COUNT(c) AS count")
+            chunk_record = await chunk_result.single()
+            await chunk_result.consume()
+            stats["indexed_chunks"] = chunk_record["count"] if chunk_record else 0
+
+            stats["execution_time"] = time.time() - start_time
+            logger.info(
+                f"Migration completed. Indexed {stats['total_relationships']} relationships "
+                f"into {stats['indexed_chunks']} chunks in {stats['execution_time']:.2f} seconds"
+            )
+            return stats
+
+    except Exception as e:
+        logger.error(f"Error building chunk index: {str(e)}")
+        stats["errors"] += 1
+        stats["execution_time"] = time.time() - start_time
+        return stats
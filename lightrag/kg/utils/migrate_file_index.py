@@ -0,0 +1,161 @@
+"""
+Migration script to build the file index of existing Neo4j entities and relationships.
+Data upserted before the index existed has no (:File) entries, so
+cascade_delete_files leaves it in place until this script has run once.
+"""
+
+import time
+from typing import Dict, Any
+
+from ...prompt import GRAPH_FIELD_SEP
+from ...utils import logger
+from .neo4j_edge_utils import CHUNK_EDGE_KEY_SEP, FILE_INDEX_UPDATE
+
+
+async def migrate_file_path_index(
+    driver,
+    database: str,
+    dry_run: bool = True,
+    batch_size: int = 1000,
+    rebuild: bool = False,
+) -> Dict[str, Any]:
+    """
+    Index the source files of all entities and relationships as (:File) nodes.
+
+    Args:
+        driver: Neo4j AsyncDriver instance
+        database: Neo4j database name
+        dry_run: If True, only report what would be done without making changes
+        batch_size: Number of entities or relationships indexed per transaction
+        rebuild: If True, delete all File nodes first, dropping stale entries
+
+    Returns:
+        Dict with migration statistics
+    """
+    start_time = time.time()
+
+    stats = {
+        "total_entities": 0,
+        "total_relationships": 0,
+        "existing_files": 0,
+        "indexed_files": 0,
+        "errors": 0,
+        "execution_time": 0,
+    }
+
+    async def count(session, query: str) -> int:
+        result = await session.run(query)
+        record = await result.single()
+        await result.consume()
+        return record["count"] if record else 0
+
+    try:
+        async with driver.session(database=database) as session:
+            stats["total_entities"] = await count(
+                session,
+                "MATCH (n:base) WHERE n.file_path IS NOT NULL RETURN COUNT(n) AS count",
+            )
+            stats["total_relationships"] = await count(
+                session,
+                """
+                MATCH (:base)-[r]->(:base)
+                WHERE r.file_path IS NOT NULL
+                RETURN COUNT(r) AS count
+                """,
+            )
+            stats["existing_files"] = await count(
+                session, "MATCH (f:File) RETURN COUNT(f) AS count"
+            )
+
+            logger.info(
+                f"Found {stats['total_entities']} entities and {stats['total_relationships']} "
+                f"relationships with source files, and {stats['existing_files']} indexed files"
+            )
+
+            if dry_run:
+                stats["execution_time"] = time.time() - start_time
+                logger.info(
+                    f"Dry run completed. Would index {stats['total_entities']} entities and "
+                    f"{stats['total_relationships']} relationships"
+                    f"{' after dropping the existing index' if rebuild else ''}"
+                )
+                return stats
+
+            result = await session.run(
+                "CREATE INDEX IF NOT EXISTS FOR (f:File) ON (f.file_path)"
+            )
+            await result.consume()
+
+            if rebuild:
+                result = await session.run(
+                    """
+                    MATCH (f:File)
+                    CALL { WITH f DETACH DELETE f } IN TRANSACTIONS OF $batch_size ROWS
+                    """,
+                    batch_size=batch_size,
+                )
+                await result.consume()
+                logger.info(f"Dropped {stats['existing_files']} indexed files")
+
+            # CALL ... IN TRANSACTIONS needs an auto-commit transaction, which
+            # session.run provides
+            entity_query = (
+                """
+            MATCH (n:base)
+            WHERE n.file_path IS NOT NULL
+            CALL {
+                WITH n
+                WITH n.entity_id AS entity_id,
+                     [file_path IN split(n.file_path, $sep) WHERE file_path <> ''] AS file_paths
+                """
+                + FILE_INDEX_UPDATE
+                % {"file_paths": "file_paths", "keys": "entity_ids", "key": "entity_id"}
+                + """
+            } IN TRANSACTIONS OF $batch_size ROWS
+            """
+            )
+            result = await session.run(
+                entity_query, sep=GRAPH_FIELD_SEP, batch_size=batch_size
+            )
+            await result.consume()
+
+            relationship_query = (
+                """
+            MATCH (s:base)-[r]->(t:base)
+            WHERE r.file_path IS NOT NULL
+            CALL {
+                WITH s, r, t
+                WITH [file_path IN split(r.file_path, $sep) WHERE file_path <> ''] AS file_paths,
+                     s.entity_id + $key_sep + t.entity_id AS edge_key
+                """
+                + FILE_INDEX_UPDATE
+                % {"file_paths": "file_paths", "keys": "edge_keys", "key": "edge_key"}
+                + """
+            } IN TRANSACTIONS OF $batch_size ROWS
+            """
+            )
+            result = await session.run(
+                relationship_query,
+                sep=GRAPH_FIELD_SEP,
+                key_sep=CHUNK_EDGE_KEY_SEP,
+                batch_size=batch_size,
+            )
+            await result.consume()
+
+            stats["indexed_files"] = await count(
+                session, "MATCH (f:File) RETURN COUNT(f) AS count"
+            )
+
+            stats["execution_time"] = time.time() - start_time
+            logger.info(
+                f"Migration completed. Indexed {stats['total_entities']} entities and "
+                f"{stats['total_relationships']} relationships into {stats['indexed_files']} "
+                f"files in {stats['execution_time']:.2f} seconds"
+            )
+            return stats
+
+    except Exception as e:
+        logger.error(f"Error building file index: {str(e)}")
+        stats["errors"] += 1
+        stats["execution_time"] = time.time() - start_time
+        return stats
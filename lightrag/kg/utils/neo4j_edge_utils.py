@@ -4,6 +4,7 @@ This module provides helper functions for edge operations in Neo4j.
 """
 
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Union
 
 
@@ -327,3 +328,140 @@ def parse_relationship_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
         "neo4j_type": neo4j_type,
         "weight": props.get("weight", 0.5),
     }
+
+
+# Source chunks of relationships are indexed as (:Chunk {chunk_id, edge_keys}) nodes,
+# edge_keys holding "<src entity_id>\x1f<tgt entity_id>" of every edge the chunk
+# produced. Relationship property indexes need a fixed relationship type, which the
+# typed relationships of Neo4JStorage do not have.
+CHUNK_EDGE_KEY_SEP = "\x1f"
+
+# Appends %(edge_key)s to the Chunk nodes of %(chunk_ids)s, used inside edge upserts
+CHUNK_INDEX_UPDATE = """
+FOREACH (chunk_id IN %(chunk_ids)s |
+    MERGE (c:Chunk {chunk_id: chunk_id})
+    SET c.edge_keys = CASE
+        WHEN %(edge_key)s IN coalesce(c.edge_keys, []) THEN c.edge_keys
+        ELSE coalesce(c.edge_keys, []) + %(edge_key)s
+    END
+)
+"""
+
+# Source files are indexed the same way as (:File {file_path, entity_ids, edge_keys})
+# nodes, which cascade_delete_files starts from. Appends %(key)s to the %(keys)s list
+# (entity_ids or edge_keys) of the File nodes of %(file_paths)s.
+FILE_INDEX_UPDATE = """
+FOREACH (file_path IN %(file_paths)s |
+    MERGE (f:File {file_path: file_path})
+    SET f.%(keys)s = CASE
+        WHEN %(key)s IN coalesce(f.%(keys)s, []) THEN f.%(keys)s
+        ELSE coalesce(f.%(keys)s, []) + %(key)s
+    END
+)
+"""
+
+# Cypher statements of Neo4JStorage by template name. Values are always passed as
+# parameters, so a template compiles to one cached plan. Labels, relationship types
+# and hop counts cannot be parameters; they are rendered in by cypher_template, which
+# keeps one statement per (template, entity type / relationship type / hop count).
+CYPHER_TEMPLATES: Dict[str, str] = {
+    "upsert_node": """
+    MERGE (n:base {entity_id: $entity_id})
+    SET n += $properties
+    SET n:%(label)s
+    """
+    + FILE_INDEX_UPDATE
+    % {"file_paths": "$file_paths", "keys": "entity_ids", "key": "$entity_id"},
+    "upsert_nodes_batch": """
+    UNWIND $rows AS row
+    MERGE (n:base {entity_id: row.entity_id})
+    SET n += row.properties
+    SET n:%(label)s
+    """
+    + FILE_INDEX_UPDATE
+    % {"file_paths": "row.file_paths", "keys": "entity_ids", "key": "row.entity_id"},
+    "upsert_edge": """
+    MATCH (src:base {entity_id: $source_id}), (tgt:base {entity_id: $target_id})
+    MERGE (src)-[r:%(rel_type)s]->(tgt)
+    ON CREATE SET r = $properties_for_db
+    ON MATCH SET r += $properties_for_db
+    """
+    + CHUNK_INDEX_UPDATE % {"chunk_ids": "$chunk_ids", "edge_key": "$edge_key"}
+    + FILE_INDEX_UPDATE
+    % {"file_paths": "$file_paths", "keys": "edge_keys", "key": "$edge_key"}
+    + "RETURN r",
+    "upsert_edges_batch": """
+    UNWIND $rows AS row
+    MERGE (src:base {entity_id: row.source_id})
+    ON CREATE SET src.entity_type = "UNKNOWN"
+    MERGE (tgt:base {entity_id: row.target_id})
+    ON CREATE SET tgt.entity_type = "UNKNOWN"
+    MERGE (src)-[r:%(rel_type)s]->(tgt)
+    ON CREATE SET r = row.properties
+    ON MATCH SET r += row.properties
+    """
+    + CHUNK_INDEX_UPDATE % {"chunk_ids": "row.chunk_ids", "edge_key": "row.edge_key"}
+    + FILE_INDEX_UPDATE
+    % {"file_paths": "row.file_paths", "keys": "edge_keys", "key": "row.edge_key"},
+    "get_edge": """
+    MATCH (src:base {entity_id: $source_id})-[r:%(rel_type)s]->(tgt:base {entity_id: $target_id})
+    RETURN properties(r) as properties
+    """,
+    # Filters are disabled by passing null ($rel_types, $entity_types) or 0 ($min_weight)
+    "expand_from_seeds": """
+    MATCH (source:base)
+    WHERE source.entity_id IN $seed_entities
+    MATCH path = (source)-[r*1..%(max_hops)s]-(target:base)
+    WHERE ($rel_types IS NULL OR all(rel IN r WHERE type(rel) IN $rel_types))
+      AND ($entity_types IS NULL OR target.entity_type IN $entity_types)
+      AND ($min_weight <= 0 OR all(rel IN r WHERE rel.weight >= $min_weight))
+    UNWIND relationships(path) as rel
+    RETURN nodes(path) as path_nodes, startNode(rel) as start_node, endNode(rel) as end_node, rel, type(rel) as rel_type
+    LIMIT $max_nodes
+    """,
+    "search_entities_fulltext": """
+    CALL db.index.fulltext.queryNodes($index_name, $search) YIELD node AS n, score
+    WHERE $entity_types IS NULL OR n.entity_type IN $entity_types
+    RETURN n, score
+    ORDER BY score DESC
+    LIMIT $limit
+    """,
+    "search_entities_contains": """
+    MATCH (n:base)
+    WHERE (toLower(n.entity_id) CONTAINS toLower($query_str)
+           OR toLower(n.description) CONTAINS toLower($query_str))
+          AND ($entity_types IS NULL OR n.entity_type IN $entity_types)
+    RETURN n
+    LIMIT $limit
+    """,
+}
+
+
+def _render_identifier(value: Union[str, int]) -> str:
+    """Hop counts as integers, labels and relationship types as quoted names"""
+    if isinstance(value, int):
+        if value < 1:
+            raise ValueError(f"Invalid hop count {value}")
+        return str(value)
+    return "`" + str(value).replace("`", "``") + "`"
+
+
+@lru_cache(maxsize=4096)
+def _render_template(name: str, identifiers: tuple) -> str:
+    return CYPHER_TEMPLATES[name] % {
+        key: _render_identifier(value) for key, value in identifiers
+    }
+
+
+def cypher_template(name: str, **identifiers: Union[str, int]) -> str:
+    """
+    Render a Cypher template of CYPHER_TEMPLATES.
+
+    Args:
+        name: Template name
+        **identifiers: label, rel_type or max_hops parts of the template
+
+    Returns:
+        Statement text, identical for identical identifiers
+    """
+    return _render_template(name, tuple(sorted(identifiers.items())))
@@ -4,12 +4,42 @@ This module provides a registry for all supported relationship types for tech/de
 """
 
 import re
-from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 
-from fuzzywuzzy import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 
+from ...constants import DEFAULT_RELATIONSHIP_TYPE_CACHE_SIZE
 from ...utils import logger
 
+# Patterns of standardize_relationship_type, compiled once
+_CAMEL_BOUNDARY_RE = re.compile(r"([a-z0-9])([A-Z])")
+_ACRONYM_BOUNDARY_RE = re.compile(r"([A-Z])([A-Z][a-z])")
+_SEPARATORS_RE = re.compile(r"[\s-]+")
+_INVALID_CHARS_RE = re.compile(r"[^a-z0-9_]")
+_REPEATED_UNDERSCORES_RE = re.compile(r"_+")
+
+# Raw relationship type -> standardized type, least recently used first
+_standardized_types: OrderedDict[str, str] = OrderedDict()
+
+# Domain keyword mappings used to boost relationship suggestions
+_DOMAIN_KEYWORDS = {
+    "api": ["call", "request", "endpoint", "webhook", "subscribe", "publish"],
+    "ai": ["train", "model", "embed", "generate", "llm", "prompt", "vector"],
+    "data": ["read", "write", "stream", "batch", "aggregate", "filter", "map"],
+    "frontend": ["render", "display", "route", "event", "style", "animate"],
+    "backend": [
+        "process",
+        "query",
+        "cache",
+        "validate",
+        "transform",
+        "schedule",
+    ],
+    "infra": ["deploy", "container", "scale", "host", "replicate", "monitor"],
+}
+
 
 def standardize_relationship_type(rel_type: str) -> str:
     """
@@ -26,6 +56,19 @@ def standardize_relationship_type(rel_type: str) -> str:
     if not rel_type or not isinstance(rel_type, str):
         return "RELATED"
 
+    result = _standardized_types.get(rel_type)
+    if result is not None:
+        _standardized_types.move_to_end(rel_type)
+        return result
+
+    result = _standardize_uncached(rel_type)
+    _standardized_types[rel_type] = result
+    if len(_standardized_types) > DEFAULT_RELATIONSHIP_TYPE_CACHE_SIZE:
+        _standardized_types.popitem(last=False)
+    return result
+
+
+def _standardize_uncached(rel_type: str) -> str:
     # Convert to lowercase for processing
     processed_type = rel_type.strip().lower()
 
@@ -46,19 +89,17 @@ def standardize_relationship_type(rel_type: str) -> str:
     ):
         # Use regex to handle camelCase/PascalCase properly
         # This handles consecutive capitals better (e.g., APICall -> API_Call -> api_call)
-        processed_type = re.sub(r"([a-z0-9])([A-Z])", r"\1_\2", rel_type)
-        processed_type = re.sub(
-            r"([A-Z])([A-Z][a-z])", r"\1_\2", processed_type
-        ).lower()
+        processed_type = _CAMEL_BOUNDARY_RE.sub(r"\1_\2", rel_type)
+        processed_type = _ACRONYM_BOUNDARY_RE.sub(r"\1_\2", processed_type).lower()
 
     # Step 2: Replace spaces and hyphens with underscores
-    processed_type = re.sub(r"[\s-]+", "_", processed_type)
+    processed_type = _SEPARATORS_RE.sub("_", processed_type)
 
     # Step 3: Remove any characters that are not alphanumeric or underscore
-    processed_type = re.sub(r"[^a-z0-9_]", "", processed_type)
+    processed_type = _INVALID_CHARS_RE.sub("", processed_type)
 
     # Step 4: Collapse multiple underscores into one
-    processed_type = re.sub(r"_+", "_", processed_type)
+    processed_type = _REPEATED_UNDERSCORES_RE.sub("_", processed_type)
 
     # Step 5: Remove leading/trailing underscores
     processed_type = processed_type.strip("_")
@@ -79,13 +120,29 @@ def standardize_relationship_type(rel_type: str) -> str:
     return result
 
 
+def _domain_flags(rel_type: str) -> List[bool]:
+    """Whether rel_type mentions a keyword of each domain in _DOMAIN_KEYWORDS"""
+    return [
+        any(keyword in rel_type for keyword in keywords)
+        for keywords in _DOMAIN_KEYWORDS.values()
+    ]
+
+
 class RelationshipTypeRegistry:
     """Registry of valid relationship types with their metadata for tech/development domain."""
 
+    # Queries scored per rapidfuzz.process.cdist call, bounds the score matrices
+    _SCORE_BLOCK_ROWS = 4096
+
     def __init__(self):
         """Initialize with the supported relationship types."""
         self.registry = {}
         self._initialize_registry()
+        # (lookup kind, raw relationship type) -> result, least recently used first
+        self._match_cache: OrderedDict[tuple, Any] = OrderedDict()
+        self._match_types: Optional[List[str]] = None
+        self._match_domains: Optional[np.ndarray] = None
+        self._match_lengths: Optional[np.ndarray] = None
 
     def _initialize_registry(self):
         """Initialize with tech/development focused relationship types."""
@@ -436,23 +493,50 @@ class RelationshipTypeRegistry:
         Returns:
             Neo4j-compatible relationship type string
         """
-        if not original_type:
-            return "RELATED"
+        return self.get_neo4j_types([original_type])[original_type]
 
-        # Convert to lowercase for case-insensitive lookup
-        original_type_lower = original_type.lower()
+    def get_neo4j_types(self, original_types: Iterable[str]) -> Dict[str, str]:
+        """
+        Get standardized Neo4j types for many relationship descriptions at once.
 
-        # Direct lookup
-        if original_type_lower in self.registry:
-            return self.registry[original_type_lower]["neo4j_type"]
+        Unmatched types are fuzzy matched against the registry in one batch.
 
-        # Find closest match
-        closest_match = self._find_closest_match(original_type_lower)
-        if closest_match:
-            return self.registry[closest_match]["neo4j_type"]
+        Args:
+            original_types: Original relationship type strings
 
-        # If no match found, standardize the original
-        return standardize_relationship_type(original_type)
+        Returns:
+            Mapping of each original type to its Neo4j-compatible type
+        """
+        results = {}
+        unmatched = []
+        for original_type in dict.fromkeys(original_types):
+            if not original_type:
+                results[original_type] = "RELATED"
+                continue
+
+            # Convert to lowercase for case-insensitive lookup
+            original_type_lower = original_type.lower()
+
+            # Direct lookup
+            if original_type_lower in self.registry:
+                results[original_type] = self.registry[original_type_lower][
+                    "neo4j_type"
+                ]
+            else:
+                unmatched.append(original_type)
+
+        # Find closest matches
+        closest_matches = self._find_closest_matches(
+            [original_type.lower() for original_type in unmatched]
+        )
+        for original_type in unmatched:
+            closest_match = closest_matches[original_type.lower()]
+            if closest_match:
+                results[original_type] = self.registry[closest_match]["neo4j_type"]
+            else:
+                # If no match found, standardize the original
+                results[original_type] = standardize_relationship_type(original_type)
+        return results
 
     def get_relationship_metadata(self, original_type: str) -> Dict[str, Any]:
         """
@@ -532,34 +616,104 @@ class RelationshipTypeRegistry:
         Returns:
             The closest matching relationship type or None if no good match found
         """
-        if not rel_type:
-            return None
+        return self._find_closest_matches([rel_type])[rel_type]
+
+    def _find_closest_matches(
+        self, rel_types: Iterable[str]
+    ) -> Dict[str, Optional[str]]:
+        """Batch version of _find_closest_match, fuzzy scores come from one cdist per block"""
+        results: Dict[str, Optional[str]] = {}
+        pending = []
+        for rel_type in dict.fromkeys(rel_types):
+            if not rel_type:
+                results[rel_type] = None
+                continue
+            found, cached = self._memo_get("closest", rel_type)
+            if found:
+                results[rel_type] = cached
+                continue
+
+            # Check for substring matches first (more precise)
+            substring_match = self._find_substring_match(rel_type)
+            if substring_match is not None:
+                logger.debug(
+                    f"Found substring match for '{rel_type}': '{substring_match}'"
+                )
+                results[rel_type] = self._memo_put("closest", rel_type, substring_match)
+            else:
+                pending.append(rel_type)
 
-        # Check for substring matches first (more precise)
-        for reg_type in self.registry:
+        # If no substring match, use fuzzy matching
+        registry_types = self._get_match_types()
+        for block, scores in self._score_blocks(pending, [fuzz.ratio]):
+            (ratio_scores,) = scores
+            best_indexes = ratio_scores.argmax(axis=1)
+            for row, rel_type in enumerate(block):
+                best_score = ratio_scores[row, best_indexes[row]]
+                best_match = None
+                # Minimum similarity threshold (0-100)
+                if best_score > 70:
+                    best_match = registry_types[best_indexes[row]]
+                    logger.debug(
+                        f"Found fuzzy match for '{rel_type}': '{best_match}' (score: {best_score})"
+                    )
+                results[rel_type] = self._memo_put("closest", rel_type, best_match)
+        return results
+
+    def _get_match_types(self) -> List[str]:
+        """Registry keys in registry order, refreshed (with the memo) when the registry changes"""
+        if self._match_types is None or len(self._match_types) != len(self.registry):
+            self._match_types = list(self.registry)
+            self._match_domains = np.array(
+                [_domain_flags(reg_type) for reg_type in self._match_types], dtype=bool
+            ).reshape(len(self._match_types), len(_DOMAIN_KEYWORDS))
+            self._match_lengths = np.array(
+                [len(reg_type) for reg_type in self._match_types], dtype=np.int64
+            )
+            self._match_cache.clear()
+        return self._match_types
+
+    def _memo_get(self, kind: str, rel_type: str) -> Tuple[bool, Any]:
+        self._get_match_types()
+        key = (kind, rel_type)
+        if key not in self._match_cache:
+            return False, None
+        self._match_cache.move_to_end(key)
+        return True, self._match_cache[key]
+
+    def _memo_put(self, kind: str, rel_type: str, value: Any) -> Any:
+        self._match_cache[(kind, rel_type)] = value
+        if len(self._match_cache) > DEFAULT_RELATIONSHIP_TYPE_CACHE_SIZE:
+            self._match_cache.popitem(last=False)
+        return value
+
+    def _find_substring_match(self, rel_type: str) -> Optional[str]:
+        for reg_type in self._get_match_types():
             # Check if one is a substring of the other
             if rel_type in reg_type or reg_type in rel_type:
-                logger.debug(f"Found substring match for '{rel_type}': '{reg_type}'")
                 return reg_type
-
-        # If no substring match, use fuzzy matching
-        best_match = None
-        best_score = 70  # Minimum similarity threshold (0-100)
-
-        for reg_type in self.registry:
-            # Calculate similarity score (0-100)
-            score = fuzz.ratio(rel_type, reg_type)
-            if score > best_score:
-                best_score = score
-                best_match = reg_type
-
-        if best_match:
-            logger.debug(
-                f"Found fuzzy match for '{rel_type}': '{best_match}' (score: {best_score})"
+        return None
+
+    def _score_blocks(self, queries: List[str], scorers: List[Any]):
+        """Yield (queries, [score matrix per scorer]) against all registry types"""
+        registry_types = self._get_match_types()
+        for start in range(0, len(queries), self._SCORE_BLOCK_ROWS):
+            block = queries[start : start + self._SCORE_BLOCK_ROWS]
+            lowered = [rel_type.lower() for rel_type in block]
+            yield (
+                block,
+                [
+                    process.cdist(
+                        lowered,
+                        registry_types,
+                        scorer=scorer,
+                        dtype=np.float64,
+                        workers=-1,
+                    )
+                    for scorer in scorers
+                ],
             )
 
-        return best_match
-
     def find_best_match_with_confidence(
         self, rel_type: str
     ) -> Tuple[Optional[str], float]:
@@ -572,52 +726,82 @@ class RelationshipTypeRegistry:
         Returns:
             Tuple of (best_match, confidence_score) where confidence is 0.0-1.0
         """
-        if not rel_type:
-            return None, 0.0
+        return self.find_best_matches_with_confidence([rel_type])[rel_type]
 
-        rel_type_lower = rel_type.lower()
+    def find_best_matches_with_confidence(
+        self, rel_types: Iterable[str]
+    ) -> Dict[str, Tuple[Optional[str], float]]:
+        """
+        Find the best matching relationship type for many types at once.
 
-        # Direct match gets highest confidence
-        if rel_type_lower in self.registry:
-            return rel_type_lower, 1.0
+        Results are memoized per raw type string, and the types that need fuzzy
+        matching are scored against the whole registry in one batch.
 
-        # Check for substring matches (high confidence)
-        for reg_type in self.registry:
-            if rel_type_lower in reg_type or reg_type in rel_type_lower:
+        Args:
+            rel_types: Relationship types to find matches for
+
+        Returns:
+            Mapping of each type to its (best_match, confidence_score) tuple
+        """
+        results: Dict[str, Tuple[Optional[str], float]] = {}
+        pending = []
+        for rel_type in dict.fromkeys(rel_types):
+            if not rel_type:
+                results[rel_type] = (None, 0.0)
+                continue
+            found, cached = self._memo_get("confidence", rel_type)
+            if found:
+                results[rel_type] = cached
+                continue
+
+            rel_type_lower = rel_type.lower()
+
+            # Direct match gets highest confidence
+            if rel_type_lower in self.registry:
+                results[rel_type] = self._memo_put(
+                    "confidence", rel_type, (rel_type_lower, 1.0)
+                )
+                continue
+
+            # Check for substring matches (high confidence)
+            reg_type = self._find_substring_match(rel_type_lower)
+            if reg_type is not None:
                 confidence = 0.9 + (
                     0.1
                     * max(len(rel_type_lower), len(reg_type))
                     / max(len(rel_type_lower) + len(reg_type), 1)
                 )
-                return reg_type, min(
-                    confidence, 0.99
-                )  # Cap at 0.99 for substring matches
+                # Cap at 0.99 for substring matches
+                results[rel_type] = self._memo_put(
+                    "confidence", rel_type, (reg_type, min(confidence, 0.99))
+                )
+                continue
+            pending.append(rel_type)
 
         # Fuzzy matching with normalized confidence
-        best_match = None
-        best_score = 0
-
-        for reg_type in self.registry:
-            # Use multiple similarity metrics for better accuracy
-            ratio_score = fuzz.ratio(rel_type_lower, reg_type)
-            token_sort_score = fuzz.token_sort_ratio(rel_type_lower, reg_type)
-            token_set_score = fuzz.token_set_ratio(rel_type_lower, reg_type)
-
+        registry_types = self._get_match_types()
+        for block, scores in self._score_blocks(
+            pending, [fuzz.ratio, fuzz.token_sort_ratio, fuzz.token_set_ratio]
+        ):
+            ratio_scores, token_sort_scores, token_set_scores = scores
             # Weighted average with emphasis on ratio score
-            combined_score = (
-                0.5 * ratio_score + 0.3 * token_sort_score + 0.2 * token_set_score
+            combined_scores = (
+                0.5 * ratio_scores + 0.3 * token_sort_scores + 0.2 * token_set_scores
             )
-
-            if combined_score > best_score:
-                best_score = combined_score
-                best_match = reg_type
-
-        # Convert score to confidence (0-1) with minimum threshold
-        if best_score >= 70:  # Minimum threshold
-            confidence = (best_score - 70) / 30.0  # Map 70-100 to 0.0-1.0
-            return best_match, min(confidence, 0.85)  # Cap fuzzy matches at 0.85
-
-        return None, 0.0
+            best_indexes = combined_scores.argmax(axis=1)
+            for row, rel_type in enumerate(block):
+                best_score = combined_scores[row, best_indexes[row]]
+                result = (None, 0.0)
+                # Convert score to confidence (0-1) with minimum threshold
+                if best_score >= 70:  # Minimum threshold
+                    confidence = (best_score - 70) / 30.0  # Map 70-100 to 0.0-1.0
+                    # Cap fuzzy matches at 0.85
+                    result = (
+                        registry_types[best_indexes[row]],
+                        float(min(confidence, 0.85)),
+                    )
+                results[rel_type] = self._memo_put("confidence", rel_type, result)
+        return results
 
     def get_relationship_suggestions(
         self, rel_type: str, max_suggestions: int = 3
@@ -632,44 +816,84 @@ class RelationshipTypeRegistry:
         Returns:
             List of (relationship_type, confidence) tuples, sorted by confidence
         """
-        if not rel_type:
-            return []
-
-        rel_type_lower = rel_type.lower()
-
-        # Direct match
-        if rel_type_lower in self.registry:
-            return [(rel_type_lower, 1.0)]
+        return self.get_relationship_suggestions_batch([rel_type], max_suggestions)[
+            rel_type
+        ]
 
-        suggestions = []
+    def get_relationship_suggestions_batch(
+        self, rel_types: Iterable[str], max_suggestions: int = 3
+    ) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Batch version of get_relationship_suggestions, memoized per raw type string.
 
-        for reg_type in self.registry:
-            # Use multiple similarity metrics
-            ratio_score = fuzz.ratio(rel_type_lower, reg_type)
-            token_sort_score = fuzz.token_sort_ratio(rel_type_lower, reg_type)
-            token_set_score = fuzz.token_set_ratio(rel_type_lower, reg_type)
-            partial_score = fuzz.partial_ratio(rel_type_lower, reg_type)
+        Args:
+            rel_types: Relationship types to find suggestions for
+            max_suggestions: Maximum number of suggestions per type
 
+        Returns:
+            Mapping of each type to its (relationship_type, confidence) suggestions
+        """
+        results: Dict[str, List[Tuple[str, float]]] = {}
+        memo_kind = f"suggestions:{max_suggestions}"
+        pending = []
+        for rel_type in dict.fromkeys(rel_types):
+            if not rel_type:
+                results[rel_type] = []
+                continue
+            found, cached = self._memo_get(memo_kind, rel_type)
+            if found:
+                results[rel_type] = list(cached)
+                continue
+
+            rel_type_lower = rel_type.lower()
+
+            # Direct match
+            if rel_type_lower in self.registry:
+                results[rel_type] = [(rel_type_lower, 1.0)]
+                continue
+            pending.append(rel_type)
+
+        registry_types = self._get_match_types()
+        for block, scores in self._score_blocks(
+            pending,
+            [
+                fuzz.ratio,
+                fuzz.token_sort_ratio,
+                fuzz.token_set_ratio,
+                fuzz.partial_ratio,
+            ],
+        ):
+            ratio_scores, token_sort_scores, token_set_scores, partial_scores = scores
             # Weighted average with domain-specific emphasis
-            combined_score = (
-                0.4 * ratio_score
-                + 0.25 * token_sort_score
-                + 0.25 * token_set_score
-                + 0.1 * partial_score
+            combined_scores = (
+                0.4 * ratio_scores
+                + 0.25 * token_sort_scores
+                + 0.25 * token_set_scores
+                + 0.1 * partial_scores
             )
 
             # Apply domain-specific boosts
-            domain_boost = self._calculate_domain_boost(rel_type_lower, reg_type)
-            combined_score = min(combined_score + domain_boost, 100)
-
-            # Convert to confidence score
-            if combined_score >= 50:  # Lower threshold for suggestions
-                confidence = (combined_score - 50) / 50.0
-                suggestions.append((reg_type, min(confidence, 0.95)))
+            lowered = [rel_type.lower() for rel_type in block]
+            combined_scores = np.minimum(
+                combined_scores + self._domain_boost_matrix(lowered), 100
+            )
 
-        # Sort by confidence and return top suggestions
-        suggestions.sort(key=lambda x: x[1], reverse=True)
-        return suggestions[:max_suggestions]
+            for row, rel_type in enumerate(block):
+                # Convert to confidence score, lower threshold for suggestions
+                suggestions = [
+                    (
+                        registry_types[column],
+                        float(min((combined_scores[row, column] - 50) / 50.0, 0.95)),
+                    )
+                    for column in np.flatnonzero(combined_scores[row] >= 50)
+                ]
+                # Sort by confidence and return top suggestions
+                suggestions.sort(key=lambda x: x[1], reverse=True)
+                top = self._memo_put(
+                    memo_kind, rel_type, tuple(suggestions[:max_suggestions])
+                )
+                results[rel_type] = list(top)
+        return results
 
     def _calculate_domain_boost(self, input_type: str, registry_type: str) -> float:
         """
@@ -684,25 +908,8 @@ class RelationshipTypeRegistry:
         """
         boost = 0.0
 
-        # Domain keyword mappings
-        domain_keywords = {
-            "api": ["call", "request", "endpoint", "webhook", "subscribe", "publish"],
-            "ai": ["train", "model", "embed", "generate", "llm", "prompt", "vector"],
-            "data": ["read", "write", "stream", "batch", "aggregate", "filter", "map"],
-            "frontend": ["render", "display", "route", "event", "style", "animate"],
-            "backend": [
-                "process",
-                "query",
-                "cache",
-                "validate",
-                "transform",
-                "schedule",
-            ],
-            "infra": ["deploy", "container", "scale", "host", "replicate", "monitor"],
-        }
-
         # Check for domain keyword matches
-        for domain, keywords in domain_keywords.items():
+        for domain, keywords in _DOMAIN_KEYWORDS.items():
             input_has_keyword = any(keyword in input_type for keyword in keywords)
             registry_has_keyword = any(keyword in registry_type for keyword in keywords)
 
@@ -720,6 +927,23 @@ class RelationshipTypeRegistry:
 
         return boost
 
+    def _domain_boost_matrix(self, input_types: List[str]) -> np.ndarray:
+        """_calculate_domain_boost of every input type against every registry type"""
+        self._get_match_types()
+        input_domains = np.array(
+            [_domain_flags(input_type) for input_type in input_types], dtype=bool
+        ).reshape(len(input_types), len(_DOMAIN_KEYWORDS))
+        both = input_domains[:, None, :] & self._match_domains[None, :, :]
+        either = input_domains[:, None, :] | self._match_domains[None, :, :]
+        # Strong domain match 5, partial domain match 2
+        boost = (5.0 * both + 2.0 * (either & ~both)).sum(axis=2)
+
+        # Length similarity boost (prefer similar lengths)
+        input_lengths = np.array([len(input_type) for input_type in input_types])
+        length_diff = np.abs(input_lengths[:, None] - self._match_lengths[None, :])
+        boost += np.where(length_diff <= 2, 3.0, np.where(length_diff <= 5, 1.0, 0.0))
+        return boost
+
     def validate_relationship_type(self, rel_type: str) -> Tuple[bool, Optional[str]]:
         """
         Validate if a relationship type is registered or similar to a registered type.
@@ -13,17 +13,23 @@ from typing import (
     Any,
     AsyncIterator,
     Callable,
+    Iterable,
     Iterator,
     cast,
     final,
     Literal,
     Optional,
-    List,
     Dict,
 )
 from lightrag.constants import (
     DEFAULT_MAX_TOKEN_SUMMARY,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
+    DEFAULT_MERGE_BATCH_SIZE,
+    DEFAULT_GRAPH_WRITE_MAX_ASYNC,
+    DEFAULT_CHUNK_CONTENT_CACHE_SIZE,
+    DEFAULT_PIPELINE_QUEUE_SIZE,
+    DEFAULT_EXTRACTION_WINDOW_SIZE,
+    DEFAULT_DOC_STATUS_PAGE_SIZE,
 )
 from lightrag.utils import get_env_value
 
@@ -33,6 +39,7 @@ from lightrag.kg import (
 )
 
 from lightrag.kg.shared_storage import (
+    get_graph_db_lock,
     get_namespace_data,
     get_pipeline_status_lock,
 )
@@ -49,9 +56,13 @@ from .base import (
     StoragesStatus,
 )
 from .namespace import NameSpace, make_namespace
+from .pipeline import PipelineStage, StagedPipeline
 from .operate import (
-    chunking_by_token_size,
-    extract_entities,
+    EdgeCollector,
+    _entities_to_vdb_data,
+    _relationships_to_vdb_data,
+    iter_chunks_by_token_size,
+    collect_entities,
     merge_nodes_and_edges,
     kg_query,
     naive_query,
@@ -67,6 +78,8 @@ from .utils import (
     convert_response_to_json,
     lazy_external_import,
     priority_limit_async_func_call,
+    use_prefetched_query_embeddings,
+    get_chunk_content_cache,
     get_content_summary,
     clean_text,
     check_storage_env_vars,
@@ -124,6 +137,13 @@ class LightRAG:
     entity_extract_max_gleaning: int = field(default=1)
     """Maximum number of entity extraction attempts for ambiguous content."""
 
+    extraction_window_size: int = field(
+        default=get_env_value(
+            "EXTRACTION_WINDOW_SIZE", DEFAULT_EXTRACTION_WINDOW_SIZE, int
+        )
+    )
+    """Maximum number of chunks of a document extracted or awaiting accumulation at once (at least llm_model_max_async)."""
+
     summary_to_max_tokens: int = field(
         default=get_env_value("MAX_TOKEN_SUMMARY", DEFAULT_MAX_TOKEN_SUMMARY, int)
     )
@@ -134,6 +154,18 @@ class LightRAG:
         )
     )
 
+    merge_batch_size: int = field(
+        default=get_env_value("MERGE_BATCH_SIZE", DEFAULT_MERGE_BATCH_SIZE, int)
+    )
+    """Number of entities/relations prefetched, locked and merged together in the merging stage."""
+
+    graph_write_max_async: int = field(
+        default=get_env_value(
+            "GRAPH_WRITE_MAX_ASYNC", DEFAULT_GRAPH_WRITE_MAX_ASYNC, int
+        )
+    )
+    """Maximum number of concurrent graph writes in the merging stage."""
+
     # Text chunking
     # ---
 
@@ -164,8 +196,8 @@ class LightRAG:
             int,
             int,
         ],
-        List[Dict[str, Any]],
-    ] = field(default_factory=lambda: chunking_by_token_size)
+        Iterable[Dict[str, Any]],
+    ] = field(default_factory=lambda: iter_chunks_by_token_size)
     """
     Custom chunking function for splitting text into chunks before processing.
 
@@ -178,11 +210,12 @@ class LightRAG:
         - `chunk_token_size`: The maximum number of tokens per chunk.
         - `chunk_overlap_token_size`: The number of overlapping tokens between consecutive chunks.
 
-    The function should return a list of dictionaries, where each dictionary contains the following keys:
+    The function should return a list (or a lazy iterable) of dictionaries, where each dictionary contains the following keys:
         - `tokens`: The number of tokens in the chunk.
         - `content`: The text content of the chunk.
 
-    Defaults to `chunking_by_token_size` if not specified.
+    Defaults to `iter_chunks_by_token_size`, which chunks the document in a single pass without tokenizing it as a whole.
+    The pipeline collects the returned chunks of a document before storing and extracting them.
     """
 
     # Embedding
@@ -252,6 +285,11 @@ class LightRAG:
     max_parallel_insert: int = field(default=int(os.getenv("MAX_PARALLEL_INSERT", 2)))
     """Maximum number of parallel insert operations."""
 
+    pipeline_queue_size: int = field(
+        default=get_env_value("PIPELINE_QUEUE_SIZE", DEFAULT_PIPELINE_QUEUE_SIZE, int)
+    )
+    """Maximum number of documents waiting between two stages of the indexing pipeline."""
+
     addon_params: dict[str, Any] = field(
         default_factory=lambda: {
             "language": get_env_value("SUMMARY_LANGUAGE", "English", str)
@@ -280,6 +318,13 @@ class LightRAG:
         default=float(os.getenv("COSINE_THRESHOLD", 0.2))
     )
 
+    chunk_content_cache_size: int = field(
+        default=get_env_value(
+            "CHUNK_CONTENT_CACHE_SIZE", DEFAULT_CHUNK_CONTENT_CACHE_SIZE, int
+        )
+    )
+    """Maximum number of text chunk records kept in the in-process LRU shared by queries."""
+
     _storages_status: StoragesStatus = field(default=StoragesStatus.NOT_CREATED)
 
     def __post_init__(self):
@@ -347,9 +392,11 @@ class LightRAG:
         logger.debug(f"LightRAG init with param:\n  {_print_config}\n")
 
         # Init Embedding
-        self.embedding_func = priority_limit_async_func_call(
-            self.embedding_func_max_async
-        )(self.embedding_func)
+        self.embedding_func = use_prefetched_query_embeddings(
+            priority_limit_async_func_call(self.embedding_func_max_async)(
+                self.embedding_func
+            )
+        )
 
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
@@ -391,6 +438,13 @@ class LightRAG:
             embedding_func=self.embedding_func,
         )
 
+        self.doc_provenance: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
+            namespace=make_namespace(
+                self.namespace_prefix, NameSpace.KV_STORE_DOC_PROVENANCE
+            ),
+            embedding_func=self.embedding_func,
+        )
+
         # TODO: deprecating, text_chunks is redundant with chunks_vdb
         self.text_chunks: BaseKVStorage = self.key_string_value_json_storage_cls(  # type: ignore
             namespace=make_namespace(
@@ -481,6 +535,7 @@ class LightRAG:
             for storage in (
                 self.full_docs,
                 self.text_chunks,
+                self.doc_provenance,
                 self.entities_vdb,
                 self.relationships_vdb,
                 self.chunks_vdb,
@@ -504,6 +559,7 @@ class LightRAG:
             for storage in (
                 self.full_docs,
                 self.text_chunks,
+                self.doc_provenance,
                 self.entities_vdb,
                 self.relationships_vdb,
                 self.chunks_vdb,
@@ -832,16 +888,7 @@ class LightRAG:
         async with pipeline_status_lock:
             # Ensure only one worker is processing documents
             if not pipeline_status.get("busy", False):
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
-                )
-
-                to_process_docs: dict[str, DocProcessingStatus] = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
+                to_process_docs = await self._get_docs_to_process()
 
                 if not to_process_docs:
                     logger.info("No documents to process")
@@ -857,6 +904,7 @@ class LightRAG:
                         "cur_batch": 0,  # Number of files already processed
                         "request_pending": False,  # Clear any previous request
                         "latest_message": "",
+                        "stages": {},
                     }
                 )
                 # Cleaning history_messages without breaking it as a shared list object
@@ -901,247 +949,215 @@ class LightRAG:
 
                 # Create a counter to track the number of processed files
                 processed_count = 0
-                # Create a semaphore to limit the number of concurrent file processing
-                semaphore = asyncio.Semaphore(self.max_parallel_insert)
-
-                async def process_document(
-                    doc_id: str,
-                    status_doc: DocProcessingStatus,
-                    split_by_character: str | None,
-                    split_by_character_only: bool,
-                    pipeline_status: dict,
-                    pipeline_status_lock: asyncio.Lock,
-                    semaphore: asyncio.Semaphore,
+
+                def doc_status_record(job: dict, status: DocStatus, **extra) -> dict:
+                    status_doc = job["status_doc"]
+                    return {
+                        job["doc_id"]: {
+                            "status": status,
+                            **extra,
+                            "content": job.get("content"),
+                            "content_summary": status_doc.content_summary,
+                            "content_length": status_doc.content_length,
+                            "created_at": status_doc.created_at,
+                            "updated_at": datetime.now(timezone.utc).isoformat(),
+                            "file_path": job["file_path"],
+                        }
+                    }
+
+                async def mark_failed(
+                    job: dict, error: Exception, error_trace: str, error_msg: str
                 ) -> None:
-                    """Process single document"""
-                    file_extraction_stage_ok = False
-                    async with semaphore:
-                        nonlocal processed_count
-                        current_file_number = 0
-                        try:
-                            # Get file path from status document
-                            file_path = getattr(
-                                status_doc, "file_path", "unknown_source"
-                            )
+                    """Log a failed document and record the failure in doc status"""
+                    logger.error(error_trace)
+                    logger.error(error_msg)
+                    async with pipeline_status_lock:
+                        pipeline_status["latest_message"] = error_msg
+                        pipeline_status["history_messages"].append(error_trace)
+                        pipeline_status["history_messages"].append(error_msg)
+
+                    # Cancel storage writes of the document as they are no longer meaningful
+                    for task in job.get("storage_tasks", []):
+                        if not task.done():
+                            task.cancel()
+
+                    # Persistent llm cache
+                    if self.llm_response_cache:
+                        await self.llm_response_cache.index_done_callback()
+
+                    # Update document status to failed
+                    await self.doc_status.upsert(
+                        doc_status_record(job, DocStatus.FAILED, error=str(error))
+                    )
 
-                            async with pipeline_status_lock:
-                                # Update processed file count and save current file number
-                                processed_count += 1
-                                current_file_number = (
-                                    processed_count  # Save the current file number
-                                )
-                                pipeline_status["cur_batch"] = processed_count
-
-                                log_message = f"Extracting stage {current_file_number}/{total_files}: {file_path}"
-                                logger.info(log_message)
-                                pipeline_status["history_messages"].append(log_message)
-                                log_message = f"Processing d-id: {doc_id}"
-                                logger.info(log_message)
-                                pipeline_status["latest_message"] = log_message
-                                pipeline_status["history_messages"].append(log_message)
-
-                            # Generate chunks from document
-                            chunks: dict[str, Any] = {
-                                compute_mdhash_id(dp["content"], prefix="chunk-"): {
-                                    **dp,
-                                    "full_doc_id": doc_id,
-                                    "file_path": file_path,  # Add file path to each chunk
-                                }
-                                for dp in self.chunking_func(
-                                    self.tokenizer,
-                                    status_doc.content,
-                                    split_by_character,
-                                    split_by_character_only,
-                                    self.chunk_overlap_token_size,
-                                    self.chunk_token_size,
-                                )
-                            }
+                async def chunking_stage(job: dict) -> dict | None:
+                    """Split the document into chunks and start writing them to storage"""
+                    nonlocal processed_count
+                    status_doc = job["status_doc"]
+                    # Get file path from status document
+                    job["file_path"] = getattr(status_doc, "file_path", "unknown_source")
+                    job["file_number"] = 0
+                    try:
+                        async with pipeline_status_lock:
+                            # Update processed file count and save current file number
+                            processed_count += 1
+                            job["file_number"] = processed_count
+                            pipeline_status["cur_batch"] = processed_count
+
+                            log_message = f"Extracting stage {job['file_number']}/{total_files}: {job['file_path']}"
+                            logger.info(log_message)
+                            pipeline_status["history_messages"].append(log_message)
+                            log_message = f"Processing d-id: {job['doc_id']}"
+                            logger.info(log_message)
+                            pipeline_status["latest_message"] = log_message
+                            pipeline_status["history_messages"].append(log_message)
+
+                        # Content is left out of the queue listing, load it per document
+                        job["content"] = await self._load_doc_content(
+                            job["doc_id"], status_doc
+                        )
 
-                            # Process document (text chunks and full docs) in parallel
-                            # Create tasks with references for potential cancellation
-                            doc_status_task = asyncio.create_task(
-                                self.doc_status.upsert(
-                                    {
-                                        doc_id: {
-                                            "status": DocStatus.PROCESSING,
-                                            "chunks_count": len(chunks),
-                                            "content": status_doc.content,
-                                            "content_summary": status_doc.content_summary,
-                                            "content_length": status_doc.content_length,
-                                            "created_at": status_doc.created_at,
-                                            "updated_at": datetime.now(
-                                                timezone.utc
-                                            ).isoformat(),
-                                            "file_path": file_path,
-                                        }
-                                    }
-                                )
-                            )
-                            chunks_vdb_task = asyncio.create_task(
-                                self.chunks_vdb.upsert(chunks)
+                        # Generate chunks from document
+                        chunks: dict[str, Any] = {
+                            compute_mdhash_id(dp["content"], prefix="chunk-"): {
+                                **dp,
+                                "full_doc_id": job["doc_id"],
+                                "file_path": job["file_path"],  # Add file path to each chunk
+                            }
+                            for dp in self.chunking_func(
+                                self.tokenizer,
+                                job["content"],
+                                split_by_character,
+                                split_by_character_only,
+                                self.chunk_overlap_token_size,
+                                self.chunk_token_size,
                             )
-                            entity_relation_task = asyncio.create_task(
-                                self._process_entity_relation_graph(
-                                    chunks, pipeline_status, pipeline_status_lock
-                                )
+                        }
+                        job["chunks"] = chunks
+
+                        await self.doc_status.upsert(
+                            doc_status_record(
+                                job, DocStatus.PROCESSING, chunks_count=len(chunks)
                             )
-                            full_docs_task = asyncio.create_task(
+                        )
+                        # Text chunks and full docs are written while the document is extracted
+                        job["storage_tasks"] = [
+                            asyncio.create_task(self.chunks_vdb.upsert(chunks)),
+                            asyncio.create_task(
                                 self.full_docs.upsert(
-                                    {doc_id: {"content": status_doc.content}}
-                                )
-                            )
-                            text_chunks_task = asyncio.create_task(
-                                self.text_chunks.upsert(chunks)
-                            )
-                            tasks = [
-                                doc_status_task,
-                                chunks_vdb_task,
-                                entity_relation_task,
-                                full_docs_task,
-                                text_chunks_task,
-                            ]
-                            await asyncio.gather(*tasks)
-                            file_extraction_stage_ok = True
-
-                        except Exception as e:
-                            # Log error and update pipeline status
-                            logger.error(traceback.format_exc())
-                            error_msg = f"Failed to extract document {current_file_number}/{total_files}: {file_path}"
-                            logger.error(error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(
-                                    traceback.format_exc()
+                                    {job["doc_id"]: {"content": job["content"]}}
                                 )
-                                pipeline_status["history_messages"].append(error_msg)
-
-                                # Cancel other tasks as they are no longer meaningful
-                                for task in [
-                                    chunks_vdb_task,
-                                    entity_relation_task,
-                                    full_docs_task,
-                                    text_chunks_task,
-                                ]:
-                                    if not task.done():
-                                        task.cancel()
-
-                            # Persistent llm cache
-                            if self.llm_response_cache:
-                                await self.llm_response_cache.index_done_callback()
-
-                            # Update document status to failed
-                            await self.doc_status.upsert(
-                                {
-                                    doc_id: {
-                                        "status": DocStatus.FAILED,
-                                        "error": str(e),
-                                        "content": status_doc.content,
-                                        "content_summary": status_doc.content_summary,
-                                        "content_length": status_doc.content_length,
-                                        "created_at": status_doc.created_at,
-                                        "updated_at": datetime.now(
-                                            timezone.utc
-                                        ).isoformat(),
-                                        "file_path": file_path,
-                                    }
-                                }
-                            )
-
-                    # Semphore released, concurrency controlled by graph_db_lock in merge_nodes_and_edges instead
-
-                    if file_extraction_stage_ok:
-                        try:
-                            # Get chunk_results from entity_relation_task
-                            chunk_results = await entity_relation_task
-                            await merge_nodes_and_edges(
-                                chunk_results=chunk_results,  # result collected from entity_relation_task
-                                knowledge_graph_inst=self.chunk_entity_relation_graph,
-                                entity_vdb=self.entities_vdb,
-                                relationships_vdb=self.relationships_vdb,
-                                global_config=asdict(self),
-                                pipeline_status=pipeline_status,
-                                pipeline_status_lock=pipeline_status_lock,
-                                llm_response_cache=self.llm_response_cache,
-                                current_file_number=current_file_number,
-                                total_files=total_files,
-                                file_path=file_path,
-                            )
-
-                            await self.doc_status.upsert(
-                                {
-                                    doc_id: {
-                                        "status": DocStatus.PROCESSED,
-                                        "chunks_count": len(chunks),
-                                        "content": status_doc.content,
-                                        "content_summary": status_doc.content_summary,
-                                        "content_length": status_doc.content_length,
-                                        "created_at": status_doc.created_at,
-                                        "updated_at": datetime.now(
-                                            timezone.utc
-                                        ).isoformat(),
-                                        "file_path": file_path,
-                                    }
-                                }
-                            )
+                            ),
+                            asyncio.create_task(self.text_chunks.upsert(chunks)),
+                        ]
+                        return job
+                    except Exception as e:
+                        await mark_failed(
+                            job,
+                            e,
+                            traceback.format_exc(),
+                            f"Failed to extract document {job['file_number']}/{total_files}: {job['file_path']}",
+                        )
+                        return None
 
-                            # Call _insert_done after processing each file
-                            await self._insert_done()
-
-                            async with pipeline_status_lock:
-                                log_message = f"Completed processing file {current_file_number}/{total_files}: {file_path}"
-                                logger.info(log_message)
-                                pipeline_status["latest_message"] = log_message
-                                pipeline_status["history_messages"].append(log_message)
-
-                        except Exception as e:
-                            # Log error and update pipeline status
-                            logger.error(traceback.format_exc())
-                            error_msg = f"Merging stage failed in document {current_file_number}/{total_files}: {file_path}"
-                            logger.error(error_msg)
-                            async with pipeline_status_lock:
-                                pipeline_status["latest_message"] = error_msg
-                                pipeline_status["history_messages"].append(
-                                    traceback.format_exc()
-                                )
-                                pipeline_status["history_messages"].append(error_msg)
-
-                            # Persistent llm cache
-                            if self.llm_response_cache:
-                                await self.llm_response_cache.index_done_callback()
-
-                            # Update document status to failed
-                            await self.doc_status.upsert(
-                                {
-                                    doc_id: {
-                                        "status": DocStatus.FAILED,
-                                        "error": str(e),
-                                        "content": status_doc.content,
-                                        "content_summary": status_doc.content_summary,
-                                        "content_length": status_doc.content_length,
-                                        "created_at": status_doc.created_at,
-                                        "updated_at": datetime.now().isoformat(),
-                                        "file_path": file_path,
-                                    }
-                                }
+                async def extraction_stage(job: dict) -> dict | None:
+                    """Extract entities and relations, post-processing each chunk as it finishes"""
+                    try:
+                        job["chunk_results"] = await self._process_entity_relation_graph(
+                            job["chunks"], pipeline_status, pipeline_status_lock
+                        )
+                        await asyncio.gather(*job["storage_tasks"])
+                        return job
+                    except Exception as e:
+                        await mark_failed(
+                            job,
+                            e,
+                            traceback.format_exc(),
+                            f"Failed to extract document {job['file_number']}/{total_files}: {job['file_path']}",
+                        )
+                        return None
+
+                async def merging_stage(job: dict) -> dict | None:
+                    """Merge the extraction results into the graph and entity/relation vectors"""
+                    try:
+                        await merge_nodes_and_edges(
+                            chunk_results=job["chunk_results"],
+                            knowledge_graph_inst=self.chunk_entity_relation_graph,
+                            entity_vdb=self.entities_vdb,
+                            relationships_vdb=self.relationships_vdb,
+                            global_config=asdict(self),
+                            pipeline_status=pipeline_status,
+                            pipeline_status_lock=pipeline_status_lock,
+                            llm_response_cache=self.llm_response_cache,
+                            current_file_number=job["file_number"],
+                            total_files=total_files,
+                            file_path=job["file_path"],
+                            doc_provenance=self.doc_provenance,
+                            doc_id=job["doc_id"],
+                            chunk_ids=list(job["chunks"]),
+                        )
+                        # Release extraction results before the document waits for finalizing
+                        job.pop("chunk_results", None)
+                        return job
+                    except Exception as e:
+                        await mark_failed(
+                            job,
+                            e,
+                            traceback.format_exc(),
+                            f"Merging stage failed in document {job['file_number']}/{total_files}: {job['file_path']}",
+                        )
+                        return None
+
+                async def finalizing_stage(job: dict) -> dict | None:
+                    """Mark the document as processed and persist all storages"""
+                    try:
+                        await self.doc_status.upsert(
+                            doc_status_record(
+                                job, DocStatus.PROCESSED, chunks_count=len(job["chunks"])
                             )
+                        )
 
-                # Create processing tasks for all documents
-                doc_tasks = []
-                for doc_id, status_doc in to_process_docs.items():
-                    doc_tasks.append(
-                        process_document(
-                            doc_id,
-                            status_doc,
-                            split_by_character,
-                            split_by_character_only,
-                            pipeline_status,
-                            pipeline_status_lock,
-                            semaphore,
+                        # Call _insert_done after processing each file
+                        await self._insert_done()
+
+                        async with pipeline_status_lock:
+                            log_message = f"Completed processing file {job['file_number']}/{total_files}: {job['file_path']}"
+                            logger.info(log_message)
+                            pipeline_status["latest_message"] = log_message
+                            pipeline_status["history_messages"].append(log_message)
+                        return job
+                    except Exception as e:
+                        await mark_failed(
+                            job,
+                            e,
+                            traceback.format_exc(),
+                            f"Finalizing stage failed in document {job['file_number']}/{total_files}: {job['file_path']}",
                         )
-                    )
+                        return None
+
+                # Documents flow through bounded queues between the stages, so LLM
+                # extraction keeps running while earlier documents merge
+                pipeline = StagedPipeline(
+                    [
+                        PipelineStage("chunking", chunking_stage, self.max_parallel_insert),
+                        PipelineStage(
+                            "extraction", extraction_stage, self.max_parallel_insert
+                        ),
+                        PipelineStage("merging", merging_stage, self.max_parallel_insert),
+                        PipelineStage(
+                            "finalizing", finalizing_stage, self.max_parallel_insert
+                        ),
+                    ],
+                    queue_size=self.pipeline_queue_size,
+                    pipeline_status=pipeline_status,
+                    pipeline_status_lock=pipeline_status_lock,
+                )
 
                 # Wait for all document processing to complete
-                await asyncio.gather(*doc_tasks)
+                await pipeline.run(
+                    {"doc_id": doc_id, "status_doc": status_doc}
+                    for doc_id, status_doc in to_process_docs.items()
+                )
 
                 # Check if there's a pending request to process more documents (with lock)
                 has_pending_request = False
@@ -1160,16 +1176,7 @@ class LightRAG:
                 pipeline_status["history_messages"].append(log_message)
 
                 # Check for pending documents again
-                processing_docs, failed_docs, pending_docs = await asyncio.gather(
-                    self.doc_status.get_docs_by_status(DocStatus.PROCESSING),
-                    self.doc_status.get_docs_by_status(DocStatus.FAILED),
-                    self.doc_status.get_docs_by_status(DocStatus.PENDING),
-                )
-
-                to_process_docs = {}
-                to_process_docs.update(processing_docs)
-                to_process_docs.update(failed_docs)
-                to_process_docs.update(pending_docs)
+                to_process_docs = await self._get_docs_to_process()
 
         finally:
             log_message = "Document processing pipeline completed"
@@ -1180,9 +1187,39 @@ class LightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+    async def _get_docs_to_process(self) -> dict[str, DocProcessingStatus]:
+        """Processing, failed and pending documents, listed page by page without content"""
+        to_process_docs: dict[str, DocProcessingStatus] = {}
+        for status in (DocStatus.PROCESSING, DocStatus.FAILED, DocStatus.PENDING):
+            cursor = None
+            while True:
+                page, cursor = await self.doc_status.iter_docs_by_status(
+                    status, cursor=cursor
+                )
+                to_process_docs.update(page)
+                if cursor is None:
+                    break
+        return to_process_docs
+
+    async def _load_doc_content(
+        self, doc_id: str, status_doc: DocProcessingStatus
+    ) -> str:
+        """Content of a queued document, read from doc status when it was not listed"""
+        if status_doc.content is not None:
+            return status_doc.content
+        stored = await self.doc_status.get_by_id(doc_id)
+        content = None
+        if stored:
+            content = stored.get("content")
+            if content is None:
+                content = stored.get("content_summary")
+        if content is None:
+            raise ValueError(f"Content of document {doc_id} not found in doc status")
+        return content
+
     async def _process_entity_relation_graph(
         self, chunk: dict[str, Any], pipeline_status=None, pipeline_status_lock=None
-    ) -> list:
+    ) -> EdgeCollector:
         try:
             # Create global_config with chunk post-processing settings
             global_config = asdict(self)
@@ -1209,13 +1246,13 @@ class LightRAG:
             if self.llm_response_cache is not None:
                 global_config["llm_response_cache"] = self.llm_response_cache
             
-            # Debug: Show what we're passing to extract_entities
-            logger.info(f"DEBUG: global_config keys being passed to extract_entities: {list(global_config.keys())}")
+            # Debug: Show what we're passing to collect_entities
+            logger.info(f"DEBUG: global_config keys being passed to collect_entities: {list(global_config.keys())}")
             logger.info(f"DEBUG: enable_chunk_post_processing in global_config: {'enable_chunk_post_processing' in global_config}")
             if 'enable_chunk_post_processing' in global_config:
                 logger.info(f"DEBUG: enable_chunk_post_processing value: {global_config['enable_chunk_post_processing']}")
             
-            chunk_results = await extract_entities(
+            chunk_results = await collect_entities(
                 chunk,
                 global_config=global_config,
                 pipeline_status=pipeline_status,
@@ -1239,6 +1276,7 @@ class LightRAG:
             for storage_inst in [  # type: ignore
                 self.full_docs,
                 self.text_chunks,
+                self.doc_provenance,
                 self.llm_response_cache,
                 self.entities_vdb,
                 self.relationships_vdb,
@@ -1305,6 +1343,9 @@ class LightRAG:
                     self.chunks_vdb.upsert(all_chunks_data),
                     self.text_chunks.upsert(all_chunks_data),
                 )
+                get_chunk_content_cache(self.text_chunks).invalidate(
+                    list(all_chunks_data.keys())
+                )
 
             # Insert entities into knowledge graph
             all_entities_data: list[dict[str, str]] = []
@@ -1503,6 +1544,7 @@ class LightRAG:
                 global_config,
                 hashing_kv=self.llm_response_cache,
                 system_prompt=system_prompt,
+                text_chunks_db=self.text_chunks,
             )
         elif param.mode == "bypass":
             # Bypass mode: directly use LLM without knowledge retrieval
@@ -1641,6 +1683,23 @@ class LightRAG:
         """
         return await self.doc_status.get_docs_by_status(status)
 
+    async def iter_docs_by_status(
+        self,
+        status: DocStatus,
+        limit: int = DEFAULT_DOC_STATUS_PAGE_SIZE,
+        cursor: str | None = None,
+        include_content: bool = False,
+    ) -> tuple[dict[str, DocProcessingStatus], str | None]:
+        """Get one page of documents by status, ordered by document id
+
+        Returns:
+            Dict with document id is keys and document status is values, and the
+            cursor of the next page (None on the last page)
+        """
+        return await self.doc_status.iter_docs_by_status(
+            status, limit=limit, cursor=cursor, include_content=include_content
+        )
+
     async def aget_docs_by_ids(
         self, ids: str | list[str]
     ) -> dict[str, DocProcessingStatus]:
@@ -1721,159 +1780,234 @@ class LightRAG:
 
             logger.debug(f"Starting deletion for document {doc_id}")
 
-            # 2. Get all chunks related to this document
-            # Find all chunks where full_doc_id equals the current doc_id
-            all_chunks = await self.text_chunks.get_all()
-            related_chunks = {
-                chunk_id: chunk_data
-                for chunk_id, chunk_data in all_chunks.items()
-                if isinstance(chunk_data, dict)
-                and chunk_data.get("full_doc_id") == doc_id
-            }
+            # 2. Find the chunks, entities and relations produced by this document.
+            # Documents indexed with provenance only need their own graph elements
+            # visited, older documents fall back to scanning every chunk and node.
+            provenance = await self.doc_provenance.get_by_id(doc_id)
+            if provenance:
+                chunk_ids = set(provenance.get("chunk_ids") or [])
+                candidate_entities = list(
+                    dict.fromkeys(provenance.get("entities") or [])
+                )
+                candidate_edges = list(
+                    dict.fromkeys(
+                        tuple(pair) for pair in provenance.get("relations") or []
+                    )
+                )
+                logger.debug(
+                    f"Using provenance of document {doc_id}: {len(chunk_ids)} chunks, "
+                    f"{len(candidate_entities)} entities, {len(candidate_edges)} relations"
+                )
+            else:
+                all_chunks = await self.text_chunks.get_all()
+                chunk_ids = {
+                    chunk_id
+                    for chunk_id, chunk_data in all_chunks.items()
+                    if isinstance(chunk_data, dict)
+                    and chunk_data.get("full_doc_id") == doc_id
+                }
+                candidate_entities = await self.chunk_entity_relation_graph.get_all_labels()
+                node_edges = await self.chunk_entity_relation_graph.get_nodes_edges_batch(
+                    candidate_entities
+                )
+                candidate_edges = list(
+                    dict.fromkeys(
+                        edge for edges in node_edges.values() for edge in edges or []
+                    )
+                )
 
-            if not related_chunks:
+            if not chunk_ids:
                 logger.warning(f"No chunks found for document {doc_id}")
                 return
 
-            # Get all related chunk IDs
-            chunk_ids = set(related_chunks.keys())
-            logger.debug(f"Found {len(chunk_ids)} chunks to delete")
-
-            # TODO: self.entities_vdb.client_storage only works for local storage, need to fix this
-
-            # 3. Before deleting, check the related entities and relationships for these chunks
-            for chunk_id in chunk_ids:
-                # Check entities
-                entities_storage = await self.entities_vdb.client_storage
-                entities = [
-                    dp
-                    for dp in entities_storage["data"]
-                    if chunk_id in dp.get("source_id")
+            # Chunk ids are content hashes, chunks also produced by another
+            # document stay together with the graph data they are a source of
+            chunk_records = dict(
+                zip(
+                    chunk_ids,
+                    await self.doc_provenance.get_by_ids(list(chunk_ids)),
+                )
+            )
+            chunk_provenance_updates = {}
+            for chunk_id, record in chunk_records.items():
+                other_doc_ids = [
+                    other_id
+                    for other_id in (record or {}).get("doc_ids") or []
+                    if other_id != doc_id
                 ]
-                logger.debug(f"Chunk {chunk_id} has {len(entities)} related entities")
+                if other_doc_ids:
+                    chunk_ids.discard(chunk_id)
+                    chunk_provenance_updates[chunk_id] = {"doc_ids": other_doc_ids}
+            if chunk_provenance_updates:
+                logger.debug(
+                    f"Keeping {len(chunk_provenance_updates)} chunks shared with other documents"
+                )
 
-                # Check relationships
-                relationships_storage = await self.relationships_vdb.client_storage
-                relations = [
-                    dp
-                    for dp in relationships_storage["data"]
-                    if chunk_id in dp.get("source_id")
-                ]
-                logger.debug(f"Chunk {chunk_id} has {len(relations)} related relations")
-
-            # Continue with the original deletion process...
-
-            # 4. Delete chunks from vector database
-            if chunk_ids:
-                await self.chunks_vdb.delete(chunk_ids)
-                await self.text_chunks.delete(chunk_ids)
-
-            # 5. Find and process entities and relationships that have these chunks as source
-            # Get all nodes and edges from the graph storage using storage-agnostic methods
-            entities_to_delete = set()
-            entities_to_update = {}  # entity_name -> new_source_id
-            relationships_to_delete = set()
-            relationships_to_update = {}  # (src, tgt) -> new_source_id
-
-            # Process entities - use storage-agnostic methods
-            all_labels = await self.chunk_entity_relation_graph.get_all_labels()
-            for node_label in all_labels:
-                node_data = await self.chunk_entity_relation_graph.get_node(node_label)
-                if node_data and "source_id" in node_data:
-                    # Split source_id using GRAPH_FIELD_SEP
-                    sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
-                    sources.difference_update(chunk_ids)
-                    if not sources:
-                        entities_to_delete.add(node_label)
-                        logger.debug(
-                            f"Entity {node_label} marked for deletion - no remaining sources"
-                        )
-                    else:
-                        new_source_id = GRAPH_FIELD_SEP.join(sources)
-                        entities_to_update[node_label] = new_source_id
-                        logger.debug(
-                            f"Entity {node_label} will be updated with new source_id: {new_source_id}"
-                        )
+            logger.debug(f"Found {len(chunk_ids)} chunks to delete")
 
-            # Process relationships
-            for node_label in all_labels:
-                node_edges = await self.chunk_entity_relation_graph.get_node_edges(
-                    node_label
+            # 3. Delete chunks from vector database
+            await self.chunks_vdb.delete(list(chunk_ids))
+            await self.text_chunks.delete(list(chunk_ids))
+            get_chunk_content_cache(self.text_chunks).invalidate(list(chunk_ids))
+
+            # 4. Find and process entities and relationships that have these chunks as source
+            # The read-modify-write of shared entities and relations is exclusive
+            # against concurrent merges and graph edits
+            async with get_graph_db_lock(enable_logging=False):
+                entities_to_delete = set()
+                entities_to_update = {}  # entity_name -> new_source_id
+                relationships_to_delete = set()
+                relationships_to_update = {}  # (src, tgt) -> new_source_id
+
+                nodes = await self.chunk_entity_relation_graph.get_nodes_batch(
+                    candidate_entities
                 )
-                if node_edges:
-                    for src, tgt in node_edges:
-                        edge_data = await self.chunk_entity_relation_graph.get_edge(
-                            src, tgt
-                        )
-                        if edge_data and "source_id" in edge_data:
-                            # Split source_id using GRAPH_FIELD_SEP
-                            sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
-                            sources.difference_update(chunk_ids)
-                            if not sources:
-                                relationships_to_delete.add((src, tgt))
-                                logger.debug(
-                                    f"Relationship {src}-{tgt} marked for deletion - no remaining sources"
-                                )
-                            else:
-                                new_source_id = GRAPH_FIELD_SEP.join(sources)
-                                relationships_to_update[(src, tgt)] = new_source_id
-                                logger.debug(
-                                    f"Relationship {src}-{tgt} will be updated with new source_id: {new_source_id}"
-                                )
+                for node_label, node_data in nodes.items():
+                    if node_data and "source_id" in node_data:
+                        # Split source_id using GRAPH_FIELD_SEP
+                        sources = set(node_data["source_id"].split(GRAPH_FIELD_SEP))
+                        if sources.isdisjoint(chunk_ids):
+                            continue
+                        sources.difference_update(chunk_ids)
+                        if not sources:
+                            entities_to_delete.add(node_label)
+                            logger.debug(
+                                f"Entity {node_label} marked for deletion - no remaining sources"
+                            )
+                        else:
+                            new_source_id = GRAPH_FIELD_SEP.join(sources)
+                            entities_to_update[node_label] = new_source_id
+                            logger.debug(
+                                f"Entity {node_label} will be updated with new source_id: {new_source_id}"
+                            )
 
-            # Delete entities
-            if entities_to_delete:
-                for entity in entities_to_delete:
-                    await self.entities_vdb.delete_entity(entity)
-                    logger.debug(f"Deleted entity {entity} from vector DB")
-                await self.chunk_entity_relation_graph.remove_nodes(
-                    list(entities_to_delete)
+                edges = await self.chunk_entity_relation_graph.get_edges_batch(
+                    [{"src": src, "tgt": tgt} for src, tgt in candidate_edges]
                 )
-                logger.debug(f"Deleted {len(entities_to_delete)} entities from graph")
-
-            # Update entities
-            for entity, new_source_id in entities_to_update.items():
-                node_data = await self.chunk_entity_relation_graph.get_node(entity)
-                if node_data:
-                    node_data["source_id"] = new_source_id
-                    await self.chunk_entity_relation_graph.upsert_node(
-                        entity, node_data
+                for (src, tgt), edge_data in edges.items():
+                    if edge_data and "source_id" in edge_data:
+                        # Split source_id using GRAPH_FIELD_SEP
+                        sources = set(edge_data["source_id"].split(GRAPH_FIELD_SEP))
+                        if sources.isdisjoint(chunk_ids):
+                            continue
+                        sources.difference_update(chunk_ids)
+                        if not sources:
+                            relationships_to_delete.add((src, tgt))
+                            logger.debug(
+                                f"Relationship {src}-{tgt} marked for deletion - no remaining sources"
+                            )
+                        else:
+                            new_source_id = GRAPH_FIELD_SEP.join(sources)
+                            relationships_to_update[(src, tgt)] = new_source_id
+                            logger.debug(
+                                f"Relationship {src}-{tgt} will be updated with new source_id: {new_source_id}"
+                            )
+
+                # Delete entities
+                if entities_to_delete:
+                    for entity in entities_to_delete:
+                        await self.entities_vdb.delete_entity(entity)
+                        logger.debug(f"Deleted entity {entity} from vector DB")
+                    await self.chunk_entity_relation_graph.remove_nodes(
+                        list(entities_to_delete)
                     )
                     logger.debug(
-                        f"Updated entity {entity} with new source_id: {new_source_id}"
+                        f"Deleted {len(entities_to_delete)} entities from graph"
                     )
 
-            # Delete relationships
-            if relationships_to_delete:
-                for src, tgt in relationships_to_delete:
-                    rel_id_0 = compute_mdhash_id(src + tgt, prefix="rel-")
-                    rel_id_1 = compute_mdhash_id(tgt + src, prefix="rel-")
-                    await self.relationships_vdb.delete([rel_id_0, rel_id_1])
-                    logger.debug(f"Deleted relationship {src}-{tgt} from vector DB")
-                await self.chunk_entity_relation_graph.remove_edges(
-                    list(relationships_to_delete)
-                )
-                logger.debug(
-                    f"Deleted {len(relationships_to_delete)} relationships from graph"
-                )
+                # Update entities, in the graph and in the vector DB
+                updated_entities = []
+                for entity, new_source_id in entities_to_update.items():
+                    node_data = await self.chunk_entity_relation_graph.get_node(entity)
+                    if node_data:
+                        node_data["source_id"] = new_source_id
+                        await self.chunk_entity_relation_graph.upsert_node(
+                            entity, node_data
+                        )
+                        updated_entities.append(
+                            {
+                                "entity_name": entity,
+                                "entity_type": node_data.get("entity_type", "UNKNOWN"),
+                                "description": node_data.get("description", ""),
+                                "source_id": new_source_id,
+                                "file_path": node_data.get(
+                                    "file_path", "unknown_source"
+                                ),
+                            }
+                        )
+                        logger.debug(
+                            f"Updated entity {entity} with new source_id: {new_source_id}"
+                        )
+                if updated_entities:
+                    await self.entities_vdb.upsert(
+                        _entities_to_vdb_data(updated_entities)
+                    )
 
-            # Update relationships
-            for (src, tgt), new_source_id in relationships_to_update.items():
-                edge_data = await self.chunk_entity_relation_graph.get_edge(src, tgt)
-                if edge_data:
-                    edge_data["source_id"] = new_source_id
-                    await self.chunk_entity_relation_graph.upsert_edge(
-                        src, tgt, edge_data
+                # Delete relationships
+                if relationships_to_delete:
+                    for src, tgt in relationships_to_delete:
+                        rel_id_0 = compute_mdhash_id(src + tgt, prefix="rel-")
+                        rel_id_1 = compute_mdhash_id(tgt + src, prefix="rel-")
+                        await self.relationships_vdb.delete([rel_id_0, rel_id_1])
+                        logger.debug(f"Deleted relationship {src}-{tgt} from vector DB")
+                    await self.chunk_entity_relation_graph.remove_edges(
+                        list(relationships_to_delete)
                     )
                     logger.debug(
-                        f"Updated relationship {src}-{tgt} with new source_id: {new_source_id}"
+                        f"Deleted {len(relationships_to_delete)} relationships from graph"
                     )
 
-            # 6. Delete original document and status
+                # Update relationships, in the graph and in the vector DB
+                updated_relationships = []
+                for (src, tgt), new_source_id in relationships_to_update.items():
+                    edge_data = await self.chunk_entity_relation_graph.get_edge(
+                        src, tgt
+                    )
+                    if edge_data:
+                        edge_data["source_id"] = new_source_id
+                        await self.chunk_entity_relation_graph.upsert_edge(
+                            src, tgt, edge_data
+                        )
+                        updated_relationships.append(
+                            {
+                                "src_id": src,
+                                "tgt_id": tgt,
+                                "keywords": edge_data.get("keywords", ""),
+                                "description": edge_data.get("description", ""),
+                                "source_id": new_source_id,
+                                "file_path": edge_data.get(
+                                    "file_path", "unknown_source"
+                                ),
+                            }
+                        )
+                        logger.debug(
+                            f"Updated relationship {src}-{tgt} with new source_id: {new_source_id}"
+                        )
+                if updated_relationships:
+                    # The record may have been stored under the reversed pair
+                    await self.relationships_vdb.delete(
+                        [
+                            compute_mdhash_id(
+                                dp["tgt_id"] + dp["src_id"], prefix="rel-"
+                            )
+                            for dp in updated_relationships
+                            if dp["src_id"] != dp["tgt_id"]
+                        ]
+                    )
+                    await self.relationships_vdb.upsert(
+                        _relationships_to_vdb_data(updated_relationships)
+                    )
+
+            # 5. Delete original document, status and provenance
             await self.full_docs.delete([doc_id])
             await self.doc_status.delete([doc_id])
+            await self.doc_provenance.delete(
+                [doc_id, *(c for c in chunk_ids if chunk_records.get(c))]
+            )
+            if chunk_provenance_updates:
+                await self.doc_provenance.upsert(chunk_provenance_updates)
 
-            # 7. Ensure all indexes are updated
+            # 6. Ensure all indexes are updated
             await self._insert_done()
 
             logger.info(
@@ -1938,25 +2072,26 @@ class LightRAG:
                     logger.warning(f"Document {doc_id} still exists in full_docs")
 
                 # Verify if chunks have been deleted
-                all_remaining_chunks = await self.text_chunks.get_all()
-                remaining_related_chunks = {
-                    chunk_id: chunk_data
-                    for chunk_id, chunk_data in all_remaining_chunks.items()
-                    if isinstance(chunk_data, dict)
-                    and chunk_data.get("full_doc_id") == doc_id
-                }
-
-                if remaining_related_chunks:
-                    logger.warning(
-                        f"Found {len(remaining_related_chunks)} remaining chunks"
-                    )
+                remaining_chunks = [
+                    chunk
+                    for chunk in await self.text_chunks.get_by_ids(list(chunk_ids))
+                    if chunk
+                ]
+                if remaining_chunks:
+                    logger.warning(f"Found {len(remaining_chunks)} remaining chunks")
 
-                # Verify entities and relationships
+                # Updated entities and relations were re-upserted above. Scanning the
+                # vector stores for leftovers is only possible for local storages, and
+                # only needed for documents indexed before provenance was recorded
+                if provenance:
+                    return
                 for chunk_id in chunk_ids:
-                    await process_data("entities", self.entities_vdb, chunk_id)
-                    await process_data(
-                        "relationships", self.relationships_vdb, chunk_id
-                    )
+                    for data_type, vdb in (
+                        ("entities", self.entities_vdb),
+                        ("relationships", self.relationships_vdb),
+                    ):
+                        if hasattr(vdb, "client_storage"):
+                            await process_data(data_type, vdb, chunk_id)
 
             await verify_deletion()
 
@@ -2056,7 +2191,7 @@ class LightRAG:
         """
         from .utils_graph import aedit_entity
 
-        return await aedit_entity(
+        result = await aedit_entity(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -2064,6 +2199,10 @@ class LightRAG:
             updated_data,
             allow_rename,
         )
+        new_entity_name = updated_data.get("entity_name", entity_name)
+        if allow_rename and new_entity_name != entity_name:
+            await self._retarget_doc_provenance([entity_name], new_entity_name)
+        return result
 
     def edit_entity(
         self, entity_name: str, updated_data: dict[str, str], allow_rename: bool = True
@@ -2200,7 +2339,7 @@ class LightRAG:
         """
         from .utils_graph import amerge_entities
 
-        return await amerge_entities(
+        result = await amerge_entities(
             self.chunk_entity_relation_graph,
             self.entities_vdb,
             self.relationships_vdb,
@@ -2209,6 +2348,58 @@ class LightRAG:
             merge_strategy,
             target_entity_data,
         )
+        await self._retarget_doc_provenance(source_entities, target_entity)
+        return result
+
+    async def _retarget_doc_provenance(
+        self, old_names: list[str], new_name: str
+    ) -> None:
+        """Point provenance records at an entity that was renamed or merged
+
+        The documents to update are found through the chunks in the entity's source_id.
+        """
+        renames = {name: new_name for name in old_names if name != new_name}
+        if not renames:
+            return
+        node = await self.chunk_entity_relation_graph.get_node(new_name)
+        if not node or not node.get("source_id"):
+            return
+
+        chunk_ids = [c for c in node["source_id"].split(GRAPH_FIELD_SEP) if c]
+        doc_ids = {
+            chunk.get("full_doc_id")
+            for chunk in await self.text_chunks.get_by_ids(chunk_ids)
+            if chunk and chunk.get("full_doc_id")
+        }
+        # A chunk shared by several documents names only one of them in full_doc_id
+        for record in await self.doc_provenance.get_by_ids(chunk_ids):
+            doc_ids.update((record or {}).get("doc_ids") or [])
+
+        updates = {}
+        for doc_id in doc_ids:
+            record = await self.doc_provenance.get_by_id(doc_id)
+            if not record:
+                continue
+            entities = [
+                renames.get(name, name) for name in record.get("entities") or []
+            ]
+            relations = [
+                [renames.get(src, src), renames.get(tgt, tgt)]
+                for src, tgt in record.get("relations") or []
+            ]
+            updates[doc_id] = {
+                "chunk_ids": record.get("chunk_ids") or [],
+                "entities": list(dict.fromkeys(entities)),
+                "relations": [
+                    list(pair)
+                    for pair in dict.fromkeys(
+                        tuple(pair) for pair in relations if pair[0] != pair[1]
+                    )
+                ],
+            }
+        if updates:
+            await self.doc_provenance.upsert(updates)
+            await self.doc_provenance.index_done_callback()
 
     def merge_entities(
         self,
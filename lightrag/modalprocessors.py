@@ -145,7 +145,7 @@ class BaseModalProcessor:
         await self.chunks_vdb.upsert(chunk_vdb_data)
 
         # Trigger extraction process
-        from lightrag.operate import extract_entities, merge_nodes_and_edges
+        from lightrag.operate import collect_entities, merge_nodes_and_edges
 
         pipeline_status = await get_namespace_data("pipeline_status")
         pipeline_status_lock = get_pipeline_status_lock()
@@ -154,7 +154,7 @@ class BaseModalProcessor:
         chunks = {chunk_id: chunk_data}
 
         # Extract entities and relationships
-        chunk_results = await extract_entities(
+        chunk_results = await collect_entities(
             chunks=chunks,
             global_config=self.global_config,
             pipeline_status=pipeline_status,
@@ -163,35 +163,34 @@ class BaseModalProcessor:
         )
 
         # Add "belongs_to" relationships for all extracted entities
-        for maybe_nodes, _ in chunk_results:
-            for entity_name in maybe_nodes.keys():
-                if entity_name != modal_entity_name:  # Skip self-relationship
-                    # Create belongs_to relationship
-                    relation_data = {
-                        "description": f"Entity {entity_name} belongs to {modal_entity_name}",
-                        "keywords": "belongs_to,part_of,contained_in",
+        for entity_name in chunk_results.nodes.keys():
+            if entity_name != modal_entity_name:  # Skip self-relationship
+                # Create belongs_to relationship
+                relation_data = {
+                    "description": f"Entity {entity_name} belongs to {modal_entity_name}",
+                    "keywords": "belongs_to,part_of,contained_in",
+                    "source_id": chunk_id,
+                    "weight": 10.0,
+                    "file_path": chunk_data.get("file_path", "manual_creation"),
+                }
+                await self.knowledge_graph_inst.upsert_edge(
+                    entity_name, modal_entity_name, relation_data
+                )
+
+                relation_id = compute_mdhash_id(
+                    entity_name + modal_entity_name, prefix="rel-"
+                )
+                relation_vdb_data = {
+                    relation_id: {
+                        "src_id": entity_name,
+                        "tgt_id": modal_entity_name,
+                        "keywords": relation_data["keywords"],
+                        "content": f"{relation_data['keywords']}\t{entity_name}\n{modal_entity_name}\n{relation_data['description']}",
                         "source_id": chunk_id,
-                        "weight": 10.0,
                         "file_path": chunk_data.get("file_path", "manual_creation"),
                     }
-                    await self.knowledge_graph_inst.upsert_edge(
-                        entity_name, modal_entity_name, relation_data
-                    )
-
-                    relation_id = compute_mdhash_id(
-                        entity_name + modal_entity_name, prefix="rel-"
-                    )
-                    relation_vdb_data = {
-                        relation_id: {
-                            "src_id": entity_name,
-                            "tgt_id": modal_entity_name,
-                            "keywords": relation_data["keywords"],
-                            "content": f"{relation_data['keywords']}\t{entity_name}\n{modal_entity_name}\n{relation_data['description']}",
-                            "source_id": chunk_id,
-                            "file_path": chunk_data.get("file_path", "manual_creation"),
-                        }
-                    }
-                    await self.relationships_vdb.upsert(relation_vdb_data)
+                }
+                await self.relationships_vdb.upsert(relation_vdb_data)
 
         await merge_nodes_and_edges(
             chunk_results=chunk_results,
@@ -8,6 +8,7 @@ This module provides comprehensive monitoring for:
 - Processing statistics and analytics
 - Debug logging and audit trails
 - Real-time status tracking
+- Database query template latencies
 """
 
 import time
@@ -242,6 +243,58 @@ class PerformanceMonitor:
             }
 
 
+class QueryTemplateMonitor:
+    """Latency counters per database query template"""
+
+    def __init__(self):
+        self.template_stats: Dict[str, Dict[str, float]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, template: str, duration: float, success: bool = True):
+        """Record one execution of a template"""
+        with self.lock:
+            stats = self.template_stats.get(template)
+            if stats is None:
+                stats = self.template_stats[template] = {
+                    "count": 0,
+                    "errors": 0,
+                    "total_seconds": 0.0,
+                    "max_seconds": 0.0,
+                }
+            stats["count"] += 1
+            if not success:
+                stats["errors"] += 1
+            stats["total_seconds"] += duration
+            stats["max_seconds"] = max(stats["max_seconds"], duration)
+
+    @contextmanager
+    def measure(self, template: str):
+        """Context manager timing one execution of a template"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.record(template, time.perf_counter() - start_time, success=False)
+            raise
+        self.record(template, time.perf_counter() - start_time)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get latency statistics of all templates"""
+        with self.lock:
+            return {
+                template: {
+                    **stats,
+                    "avg_seconds": stats["total_seconds"] / stats["count"],
+                }
+                for template, stats in self.template_stats.items()
+            }
+
+    def reset(self):
+        """Clear all counters"""
+        with self.lock:
+            self.template_stats.clear()
+
+
 class SystemHealthMonitor:
     """Monitor system health and resource usage"""
 
@@ -536,6 +589,7 @@ class EnhancedLogger:
 global_performance_monitor = PerformanceMonitor()
 global_health_monitor = SystemHealthMonitor()
 global_processing_monitor = ProcessingMonitor()
+global_query_template_monitor = QueryTemplateMonitor()
 
 
 def get_performance_monitor() -> PerformanceMonitor:
@@ -553,6 +607,11 @@ def get_processing_monitor() -> ProcessingMonitor:
     return global_processing_monitor
 
 
+def get_query_template_monitor() -> QueryTemplateMonitor:
+    """Get the global query template monitor instance"""
+    return global_query_template_monitor
+
+
 def get_enhanced_logger(name: str) -> EnhancedLogger:
     """Get an enhanced logger instance"""
     return EnhancedLogger(name)
@@ -577,4 +636,5 @@ def get_comprehensive_status() -> Dict[str, Any]:
         "performance": global_performance_monitor.get_all_stats(),
         "health": global_health_monitor.get_health_summary(),
         "processing": global_processing_monitor.get_session_summary(),
+        "query_templates": global_query_template_monitor.get_stats(),
     }
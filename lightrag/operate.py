@@ -5,7 +5,7 @@ import asyncio
 import json
 import re
 import os
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, NamedTuple
 from collections import Counter, defaultdict
 
 from .utils import (
@@ -24,6 +24,9 @@ from .utils import (
     CacheData,
     get_conversation_turns,
     use_llm_func_with_cache,
+    prefetch_query_embeddings,
+    get_chunks_by_ids_cached,
+    count_tokens_cached,
 )
 from .base import (
     BaseGraphStorage,
@@ -34,6 +37,7 @@ from .base import (
 )
 from .prompt import GRAPH_FIELD_SEP, PROMPTS
 from .validation import (
+    ContentSanitizer,
     DocumentValidator,
     EntityValidator,
     RelationshipValidator,
@@ -53,6 +57,9 @@ from .chunk_post_processor import _post_process_chunk_relationships
 from .constants import (
     DEFAULT_ENABLE_CHUNK_POST_PROCESSING,
     DEFAULT_ENABLE_ENTITY_CLEANUP,
+    DEFAULT_MERGE_BATCH_SIZE,
+    DEFAULT_GRAPH_WRITE_MAX_ASYNC,
+    DEFAULT_EXTRACTION_WINDOW_SIZE,
 )
 
 # use the .env that is inside the current folder
@@ -61,188 +68,286 @@ from .constants import (
 load_dotenv(dotenv_path=".env", override=False)
 
 
-def _chunk_by_tokens_only(
+# Characters of a document sanitized and tokenized at a time by the streaming chunker
+_CHUNK_SPAN_CHARS = 1 << 16
+
+
+def _iter_line_spans(content: str, span_chars: int = _CHUNK_SPAN_CHARS) -> Iterator[str]:
+    """Slice content into spans of about span_chars that end at a line boundary.
+
+    Spans are only cut after a newline followed by a non-whitespace character, which
+    is a pre-token boundary for BPE tokenizers, so encoding the spans one by one
+    gives the same tokens as encoding the whole document.
+    """
+    pos, length = 0, len(content)
+    while pos < length:
+        cut = content.find("\n", pos + span_chars)
+        while cut != -1 and cut + 1 < length and content[cut + 1].isspace():
+            cut = content.find("\n", cut + 1)
+        if cut == -1 or cut + 1 >= length:
+            yield content[pos:]
+            return
+        yield content[pos : cut + 1]
+        pos = cut + 1
+
+
+def _iter_sanitized_spans(content: str) -> Iterator[str]:
+    """Sanitize a document span by span, trimming only the ends of the whole document"""
+    pending = None
+    for span in _iter_line_spans(content):
+        span = ContentSanitizer.sanitize_span(span)
+        if pending is None:
+            span = span.lstrip()
+            if span:
+                pending = span
+            continue
+        if not span.strip():
+            # Whitespace is only kept if more content follows it
+            pending += span
+            continue
+        yield pending
+        pending = span
+    if pending is not None and pending.rstrip():
+        yield pending.rstrip()
+
+
+def _iter_lines(spans: Iterable[str]) -> Iterator[str]:
+    """Yield the lines of line-aligned spans, like "".join(spans).split("\\n")"""
+    carry = ""
+    for span in spans:
+        lines = (carry + span).split("\n")
+        carry = lines.pop()
+        yield from lines
+    yield carry
+
+
+def _iter_token_windows(
     tokenizer: Tokenizer,
-    content: str,
+    token_spans: Iterable[list[int]],
     overlap_token_size: int,
     max_token_size: int,
-) -> list[dict[str, Any]]:
-    """Split content by tokens only (no header detection)"""
-    tokens = tokenizer.encode(content)
-    chunks = []
-    
-    for start in range(0, len(tokens), max_token_size - overlap_token_size):
-        end = min(start + max_token_size, len(tokens))
-        chunk_tokens = tokens[start:end]
-        chunk_content = tokenizer.decode(chunk_tokens)
+) -> Iterator[tuple[int, str]]:
+    """Slide a max_token_size window over the tokens of consecutive encoded spans.
+
+    Callers pass tokens they already have (or encode spans lazily), so no text is
+    encoded twice. Only the tokens of the window being filled are kept in memory.
+    Yields (token_count, decoded_content) for every window whose content is not blank.
+    """
+    step = max_token_size - overlap_token_size
+    if step <= 0:
+        raise ValueError("Chunk overlap must be smaller than the chunk token size")
+
+    buffer: list[int] = []
+    offset = 0  # Token position of buffer[0] in the document
+    start = 0
+    for tokens in token_spans:
+        buffer.extend(tokens)
+        while start + max_token_size <= offset + len(buffer):
+            window = buffer[start - offset : start - offset + max_token_size]
+            chunk_content = tokenizer.decode(window)
+            if chunk_content.strip():
+                yield len(window), chunk_content
+            start += step
+            if start > offset:
+                del buffer[: start - offset]
+                offset = start
+    end = offset + len(buffer)
+    while start < end:
+        window = buffer[start - offset :]
+        chunk_content = tokenizer.decode(window)
         if chunk_content.strip():
-            chunks.append({
-                "content": chunk_content.strip(),
-                "tokens": len(chunk_tokens),
-                "chunk_order_index": len(chunks)
-            })
-    
-    return chunks
+            yield len(window), chunk_content
+        start += step
 
 
-def _chunk_by_headers(
+def _iter_chunks_by_headers(
     tokenizer: Tokenizer,
-    content: str,
+    spans: Iterable[str],
     max_token_size: int,
     overlap_token_size: int,
-) -> list[dict[str, Any]]:
-    """Split content by markdown headers (# and ##)"""
-    lines = content.split('\n')
-    chunks = []
-    current_chunk_lines = []
-    
-    for line in lines:
+) -> Iterator[tuple[int, str]]:
+    """Split content by markdown headers (# and ##), yielding (token_count, content)"""
+
+    def _section_chunks(section_lines: list[str]) -> Iterator[tuple[int, str]]:
+        chunk_content = "\n".join(section_lines).strip()
+        if not chunk_content:
+            return
+        chunk_tokens = tokenizer.encode(chunk_content)
+        if len(chunk_tokens) <= max_token_size:
+            yield len(chunk_tokens), chunk_content
+            return
+        # If too large, split the already encoded section by tokens only
+        for token_count, sub_content in _iter_token_windows(
+            tokenizer, [chunk_tokens], overlap_token_size, max_token_size
+        ):
+            yield token_count, sub_content.strip()
+
+    current_chunk_lines: list[str] = []
+    for line in _iter_lines(spans):
         # Check if this line is a header (starts with # or ##)
-        if line.strip().startswith('# ') or line.strip().startswith('## '):
-            # If we have accumulated content, process it as a chunk
-            if current_chunk_lines:
-                chunk_content = '\n'.join(current_chunk_lines).strip()
-                if chunk_content:
-                    chunk_tokens = tokenizer.encode(chunk_content)
-                    if len(chunk_tokens) > max_token_size:
-                        # If too large, split recursively with token-based method
-                        sub_chunks = _chunk_by_tokens_only(
-                            tokenizer, chunk_content, overlap_token_size, max_token_size
-                        )
-                        chunks.extend(sub_chunks)
-                    else:
-                        chunks.append({
-                            "content": chunk_content,
-                            "tokens": len(chunk_tokens),
-                            "chunk_order_index": len(chunks)
-                        })
-            
+        stripped = line.strip()
+        if stripped.startswith("# ") or stripped.startswith("## "):
+            yield from _section_chunks(current_chunk_lines)
             # Start new chunk with this header
             current_chunk_lines = [line]
         else:
-            # Add non-header line to current chunk
             current_chunk_lines.append(line)
-    
-    # Process the last chunk
-    if current_chunk_lines:
-        chunk_content = '\n'.join(current_chunk_lines).strip()
-        if chunk_content:
-            chunk_tokens = tokenizer.encode(chunk_content)
-            if len(chunk_tokens) > max_token_size:
-                sub_chunks = _chunk_by_tokens_only(
-                    tokenizer, chunk_content, overlap_token_size, max_token_size
-                )
-                chunks.extend(sub_chunks)
-            else:
-                chunks.append({
-                    "content": chunk_content,
-                    "tokens": len(chunk_tokens),
-                    "chunk_order_index": len(chunks)
-                })
-    
-    logger.info(f"Header-based chunking created {len(chunks)} chunks from content with headers")
-    return chunks
+    yield from _section_chunks(current_chunk_lines)
 
 
-def chunking_by_token_size(
+def _iter_split_pieces(spans: Iterable[str], split_by_character: str) -> Iterator[str]:
+    """Yield the pieces of "".join(spans).split(split_by_character) lazily"""
+    carry = ""
+    for span in spans:
+        pieces = (carry + span).split(split_by_character)
+        carry = pieces.pop()
+        yield from pieces
+    yield carry
+
+
+def _iter_raw_chunks(
+    tokenizer: Tokenizer,
+    spans: Iterable[str],
+    has_headers: bool,
+    split_by_character: str | None,
+    split_by_character_only: bool,
+    overlap_token_size: int,
+    max_token_size: int,
+) -> Iterator[tuple[int, str]]:
+    """Yield (token_count, content) for sanitized spans, before chunk validation"""
+    if split_by_character is None and has_headers:
+        yield from _iter_chunks_by_headers(
+            tokenizer, spans, max_token_size, overlap_token_size
+        )
+        return
+
+    if not split_by_character:
+        yield from _iter_token_windows(
+            tokenizer,
+            (tokenizer.encode(span) for span in spans),
+            overlap_token_size,
+            max_token_size,
+        )
+        return
+
+    for piece in _iter_split_pieces(spans, split_by_character):
+        piece_tokens = tokenizer.encode(piece)
+        if split_by_character_only or len(piece_tokens) <= max_token_size:
+            yield len(piece_tokens), piece
+            continue
+        # If the piece is still too large, split it again without the separator.
+        # Markdown sections are different text and get encoded on their own, plain
+        # pieces are windowed over the tokens encoded above.
+        if "# " in piece or "## " in piece:
+            yield from _iter_chunks_by_headers(
+                tokenizer, [piece], max_token_size, overlap_token_size
+            )
+        else:
+            yield from _iter_token_windows(
+                tokenizer, [piece_tokens], overlap_token_size, max_token_size
+            )
+
+
+def iter_chunks_by_token_size(
     tokenizer: Tokenizer,
     content: str,
     split_by_character: str | None = None,
     split_by_character_only: bool = False,
     overlap_token_size: int = 128,
     max_token_size: int = 1024,
-) -> list[dict[str, Any]]:
-    # Validate input content
-    validation_result = DocumentValidator.validate_content(content)
-    if not validation_result.is_valid:
+) -> Iterator[dict[str, Any]]:
+    """Split a document into chunks in a single pass over the content.
+
+    The document is sanitized and tokenized in line-aligned spans and only the
+    tokens of the current window (or markdown section) are held in memory, never
+    the token list of the whole document. Windows and oversized sections are cut
+    from tokens already encoded; only the header sections of a piece too large for
+    split_by_character are encoded again on their own. Chunks are yielded one by
+    one, but the indexing pipeline collects all chunks of a document before
+    storing and extracting them.
+    """
+    if not content:
         logger.error("Content validation failed during chunking")
-        log_validation_errors(validation_result.errors, "chunking")
-        # Use original content but log the issues
-
-    # Use sanitized content if available
-    if validation_result.sanitized_data:
-        content = validation_result.sanitized_data["content"]
-        logger.debug(
-            f"Using sanitized content: {validation_result.sanitized_data['original_length']} -> {validation_result.sanitized_data['sanitized_length']} chars"
+        log_validation_errors(
+            DocumentValidator.validate_content(content).errors, "chunking"
         )
 
-    tokens = tokenizer.encode(content)
-    results: list[dict[str, Any]] = []
-    
-    # First check if we should split by markdown headers
-    if split_by_character is None and ('# ' in content or '## ' in content):
+    has_headers = "# " in content or "## " in content
+    raw_chunks = _iter_raw_chunks(
+        tokenizer,
+        _iter_sanitized_spans(content or ""),
+        has_headers,
+        split_by_character,
+        split_by_character_only,
+        overlap_token_size,
+        max_token_size,
+    )
+
+    chunk_order_index = 0
+    if split_by_character is None and has_headers:
         logger.debug("Detecting markdown headers - using header-based chunking")
-        return _chunk_by_headers(tokenizer, content, max_token_size, overlap_token_size)
-    
-    if split_by_character:
-        raw_chunks = content.split(split_by_character)
-        new_chunks = []
-        if split_by_character_only:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                new_chunks.append((len(_tokens), chunk))
-        else:
-            for chunk in raw_chunks:
-                _tokens = tokenizer.encode(chunk)
-                if len(_tokens) <= max_token_size:
-                    new_chunks.append((len(_tokens), chunk))
-                else:
-                    # If chunk is still too large, split it recursively
-                    sub_chunks = chunking_by_token_size(
-                        tokenizer,
-                        chunk,
-                        None,
-                        False,
-                        overlap_token_size,
-                        max_token_size,
-                    )
-                    for sub_chunk in sub_chunks:
-                        new_chunks.append(
-                            (
-                                len(tokenizer.encode(sub_chunk["content"])),
-                                sub_chunk["content"],
-                            )
-                        )
-    else:
-        new_chunks = []
-        for start in range(0, len(tokens), max_token_size - overlap_token_size):
-            end = min(start + max_token_size, len(tokens))
-            chunk_tokens = tokens[start:end]
-            chunk_content = tokenizer.decode(chunk_tokens)
-            if chunk_content.strip():
-                new_chunks.append((len(chunk_tokens), chunk_content))
+        for token_count, chunk_content in raw_chunks:
+            yield {
+                "content": chunk_content,
+                "tokens": token_count,
+                "chunk_order_index": chunk_order_index,
+            }
+            chunk_order_index += 1
+        logger.info(
+            f"Header-based chunking created {chunk_order_index} chunks from content with headers"
+        )
+        return
 
-    for token_count, chunk_content in new_chunks:
+    for token_count, chunk_content in raw_chunks:
         # Validate each chunk
         chunk_data = {
             "content": chunk_content,
             "tokens": token_count,
-            "chunk_order_index": len(results),
+            "chunk_order_index": chunk_order_index,
         }
+        chunk_order_index += 1
 
         chunk_validation = DocumentValidator.validate_chunk(chunk_data)
         if chunk_validation.sanitized_data:
-            results.append(chunk_validation.sanitized_data)
+            yield chunk_validation.sanitized_data
         else:
             # Fall back to original data if validation fails
-            results.append(chunk_data)
+            yield chunk_data
             if chunk_validation.has_errors():
-                log_validation_errors(chunk_validation.errors, f"chunk_{len(results)}")
+                log_validation_errors(
+                    chunk_validation.errors, f"chunk_{chunk_order_index}"
+                )
 
-    if not results:
-        # Final fallback
+    if chunk_order_index == 0:
+        # Final fallback for documents without any content
         chunk_data = {
-            "content": content,
-            "tokens": len(tokens),
+            "content": "",
+            "tokens": 0,
             "chunk_order_index": 0,
         }
         chunk_validation = DocumentValidator.validate_chunk(chunk_data)
-        if chunk_validation.sanitized_data:
-            results.append(chunk_validation.sanitized_data)
-        else:
-            results.append(chunk_data)
+        yield chunk_validation.sanitized_data or chunk_data
 
-    return results
+
+def chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    """Split a document into chunks, see iter_chunks_by_token_size"""
+    return list(
+        iter_chunks_by_token_size(
+            tokenizer,
+            content,
+            split_by_character,
+            split_by_character_only,
+            overlap_token_size,
+            max_token_size,
+        )
+    )
 
 
 async def _handle_entity_relation_summary(
@@ -472,6 +577,264 @@ async def _handle_single_relationship_extraction(
     )
 
 
+def _prepare_node_merge(
+    entity_name: str,
+    nodes_data: list[dict],
+    already_node: dict | None,
+) -> tuple[dict, int, int]:
+    """Merge extracted entity instances with the existing graph node in memory.
+
+    Args:
+        entity_name: Name of the entity being merged
+        nodes_data: Entity instances extracted from the current document
+        already_node: Existing node properties from the graph, or None
+
+    Returns:
+        Tuple of (node_data, num_fragment, num_new_fragment). The description in
+        node_data is the raw GRAPH_FIELD_SEP joined description, not yet summarized.
+    """
+    # Data validation for input parameters
+    if not entity_name or not entity_name.strip():
+        logger.error(f"Invalid entity_name provided: '{entity_name}'")
+        raise ValueError("Entity name cannot be empty or None")
+
+    if not nodes_data or not isinstance(nodes_data, list):
+        logger.error(
+            f"Invalid nodes_data provided for entity '{entity_name}': {type(nodes_data)}"
+        )
+        raise ValueError("nodes_data must be a non-empty list")
+
+    # Validate that all nodes_data entries have required fields
+    for i, node_data in enumerate(nodes_data):
+        required_fields = [
+            "entity_type",
+            "description",
+            "source_id",
+            "file_path",
+        ]
+        for field in required_fields:
+            if field not in node_data:
+                logger.warning(
+                    f"Missing required field '{field}' in nodes_data[{i}] for entity '{entity_name}', using default"
+                )
+                # Set default values for missing fields
+                if field == "entity_type":
+                    node_data[field] = "UNKNOWN"
+                elif field == "description":
+                    node_data[field] = f"Entity: {entity_name}"
+                elif field == "source_id":
+                    node_data[field] = "unknown_source"
+                elif field == "file_path":
+                    node_data[field] = "unknown_file"
+
+    already_entity_types = []
+    already_source_ids = []
+    already_description = []
+    already_file_paths = []
+
+    if already_node is not None:
+        logger.debug(f"Found existing node for entity: {entity_name}")
+
+        # Validate existing node has required fields
+        if "entity_type" not in already_node:
+            logger.warning(
+                f"Existing node for '{entity_name}' missing entity_type, using 'UNKNOWN'"
+            )
+            already_node["entity_type"] = "UNKNOWN"
+
+        already_entity_types.append(already_node["entity_type"])
+
+        # Add data validation to prevent KeyError - get source_id with empty string default if missing
+        if already_node.get("source_id") is not None:
+            already_source_ids.extend(
+                split_string_by_multi_markers(
+                    already_node["source_id"], [GRAPH_FIELD_SEP]
+                )
+            )
+        else:
+            logger.debug(
+                f"No source_id found in existing node for entity '{entity_name}'"
+            )
+
+        # Add data validation to prevent KeyError - get file_path with empty string default if missing
+        if already_node.get("file_path") is not None:
+            already_file_paths.extend(
+                split_string_by_multi_markers(
+                    already_node["file_path"], [GRAPH_FIELD_SEP]
+                )
+            )
+        else:
+            logger.debug(
+                f"No file_path found in existing node for entity '{entity_name}'"
+            )
+
+        # Add data validation to prevent KeyError - get description with empty string default if missing
+        if already_node.get("description") is not None:
+            already_description.append(already_node["description"])
+        else:
+            logger.debug(
+                f"No description found in existing node for entity '{entity_name}'"
+            )
+    else:
+        logger.debug(f"No existing node found for entity: {entity_name}")
+
+    entity_type = sorted(
+        Counter(
+            [dp["entity_type"] for dp in nodes_data] + already_entity_types
+        ).items(),
+        key=lambda x: x[1],
+        reverse=True,
+    )[0][0]
+
+    description = GRAPH_FIELD_SEP.join(
+        sorted(set([dp["description"] for dp in nodes_data] + already_description))
+    )
+    source_id = GRAPH_FIELD_SEP.join(
+        set([dp["source_id"] for dp in nodes_data] + already_source_ids)
+    )
+    file_path = GRAPH_FIELD_SEP.join(
+        set([dp["file_path"] for dp in nodes_data] + already_file_paths)
+    )
+
+    num_fragment = description.count(GRAPH_FIELD_SEP) + 1
+    num_new_fragment = len(set([dp["description"] for dp in nodes_data]))
+
+    node_data = dict(
+        entity_id=entity_name,
+        entity_type=entity_type,
+        description=description,
+        source_id=source_id,
+        file_path=file_path,
+        created_at=int(time.time()),
+    )
+    return node_data, num_fragment, num_new_fragment
+
+
+async def _summarize_merged_node(
+    entity_name: str,
+    node_data: dict,
+    num_fragment: int,
+    num_new_fragment: int,
+    global_config: dict,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> None:
+    """Summarize the merged node description in place when it has too many fragments"""
+    if num_fragment <= 1:
+        return
+
+    force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
+    if num_fragment >= force_llm_summary_on_merge:
+        status_message = f"LLM merge N: {entity_name} | {num_new_fragment}+{num_fragment - num_new_fragment}"
+    else:
+        status_message = f"Merge N: {entity_name} | {num_new_fragment}+{num_fragment - num_new_fragment}"
+    logger.info(status_message)
+    if pipeline_status is not None and pipeline_status_lock is not None:
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = status_message
+            pipeline_status["history_messages"].append(status_message)
+
+    if num_fragment >= force_llm_summary_on_merge:
+        node_data["description"] = await _handle_entity_relation_summary(
+            entity_name,
+            node_data["description"],
+            global_config,
+            pipeline_status,
+            pipeline_status_lock,
+            llm_response_cache,
+        )
+
+
+def _set_description_tokens(data: dict, global_config: dict) -> None:
+    """Store the token count of the final description so queries need not re-encode it"""
+    tokenizer = global_config.get("tokenizer")
+    if tokenizer is not None and data.get("description") is not None:
+        data["description_tokens"] = count_tokens_cached(data["description"], tokenizer)
+
+
+def _validate_merged_node(entity_name: str, node_data: dict) -> None:
+    """Validate merged node data before a database upsert, raising ValueError on errors"""
+    db_validation_result = DatabaseValidator.validate_node_data(node_data)
+    if db_validation_result.has_errors():
+        logger.error(
+            f"Database validation failed for node '{entity_name}': {[e.message for e in db_validation_result.errors]}\""
+        )
+        raise ValueError(f"Node data validation failed for '{entity_name}'")
+
+    if db_validation_result.has_warnings():
+        logger.warning(
+            f"Database validation warnings for node '{entity_name}': {[w.message for w in db_validation_result.warnings]}"
+        )
+
+
+async def _upsert_merged_node(
+    entity_name: str,
+    node_data: dict,
+    knowledge_graph_inst: BaseGraphStorage,
+) -> dict:
+    """Validate and upsert a merged node, returning the node data for vector updates"""
+    perf_monitor = get_performance_monitor()
+    proc_monitor = get_processing_monitor()
+    enhanced_logger = get_enhanced_logger("lightrag.node_merge")
+
+    _validate_merged_node(entity_name, node_data)
+
+    # Monitor database upsert operation
+    with perf_monitor.measure("database_upsert_node", entity_name=entity_name):
+        try:
+            await knowledge_graph_inst.upsert_node(entity_name, node_data)
+            proc_monitor.record_database_operation(success=True)
+            enhanced_logger.debug(f"Successfully upserted node: {entity_name}")
+        except Exception as e:
+            proc_monitor.record_database_operation(success=False)
+            enhanced_logger.error(f"Failed to upsert node {entity_name}: {str(e)}")
+            raise
+
+    logger.debug(
+        f"Successfully upserted node for entity: {entity_name} with type: {node_data['entity_type']}"
+    )
+
+    node_data["entity_name"] = entity_name
+    return node_data
+
+
+async def _upsert_fallback_node(
+    entity_name: str,
+    nodes_data: list[dict],
+    knowledge_graph_inst: BaseGraphStorage,
+    error: Exception,
+) -> dict:
+    """Upsert a basic node after a failed merge so the pipeline can continue"""
+    logger.error(
+        f"Error merging entity '{entity_name}': {str(error)}"
+    )
+    logger.error(f"nodes_data: {nodes_data}")
+    # Return a basic node structure to prevent pipeline failure
+    basic_node_data = {
+        "entity_id": entity_name,
+        "entity_name": entity_name,
+        "entity_type": "UNKNOWN",
+        "description": f"Entity: {entity_name}",
+        "source_id": "error_recovery",
+        "file_path": "unknown_file",
+        "created_at": int(time.time()),
+    }
+
+    # Try to upsert the basic node structure
+    try:
+        await knowledge_graph_inst.upsert_node(entity_name, node_data=basic_node_data)
+        logger.info(
+            f"Created fallback node for entity '{entity_name}' after error recovery"
+        )
+        return basic_node_data
+    except Exception as fallback_error:
+        logger.error(
+            f"Failed to create fallback node for entity '{entity_name}': {str(fallback_error)}"
+        )
+        raise error  # Re-raise the original exception if fallback fails
+
+
 async def _merge_nodes_then_upsert(
     entity_name: str,
     nodes_data: list[dict],
@@ -483,7 +846,6 @@ async def _merge_nodes_then_upsert(
 ):
     # Initialize monitoring
     perf_monitor = get_performance_monitor()
-    proc_monitor = get_processing_monitor()
     enhanced_logger = get_enhanced_logger("lightrag.node_merge")
 
     with perf_monitor.measure(
@@ -497,246 +859,41 @@ async def _merge_nodes_then_upsert(
             logger.debug(
                 f"Starting node merge for entity: {entity_name} with {len(nodes_data)} data entries"
             )
-
-            # Data validation for input parameters
-            if not entity_name or not entity_name.strip():
-                logger.error(f"Invalid entity_name provided: '{entity_name}'")
-                raise ValueError("Entity name cannot be empty or None")
-
-            if not nodes_data or not isinstance(nodes_data, list):
-                logger.error(
-                    f"Invalid nodes_data provided for entity '{entity_name}': {type(nodes_data)}"
-                )
-                raise ValueError("nodes_data must be a non-empty list")
-
-            # Validate that all nodes_data entries have required fields
-            for i, node_data in enumerate(nodes_data):
-                required_fields = [
-                    "entity_type",
-                    "description",
-                    "source_id",
-                    "file_path",
-                ]
-                for field in required_fields:
-                    if field not in node_data:
-                        logger.warning(
-                            f"Missing required field '{field}' in nodes_data[{i}] for entity '{entity_name}', using default"
-                        )
-                        # Set default values for missing fields
-                        if field == "entity_type":
-                            node_data[field] = "UNKNOWN"
-                        elif field == "description":
-                            node_data[field] = f"Entity: {entity_name}"
-                        elif field == "source_id":
-                            node_data[field] = "unknown_source"
-                        elif field == "file_path":
-                            node_data[field] = "unknown_file"
-
-            already_entity_types = []
-            already_source_ids = []
-            already_description = []
-            already_file_paths = []
-
             already_node = await knowledge_graph_inst.get_node(entity_name)
-            if already_node is not None:
-                logger.debug(f"Found existing node for entity: {entity_name}")
-
-                # Validate existing node has required fields
-                if "entity_type" not in already_node:
-                    logger.warning(
-                        f"Existing node for '{entity_name}' missing entity_type, using 'UNKNOWN'"
-                    )
-                    already_node["entity_type"] = "UNKNOWN"
-
-                already_entity_types.append(already_node["entity_type"])
-
-                # Add data validation to prevent KeyError - get source_id with empty string default if missing
-                if already_node.get("source_id") is not None:
-                    already_source_ids.extend(
-                        split_string_by_multi_markers(
-                            already_node["source_id"], [GRAPH_FIELD_SEP]
-                        )
-                    )
-                else:
-                    logger.debug(
-                        f"No source_id found in existing node for entity '{entity_name}'"
-                    )
-
-                # Add data validation to prevent KeyError - get file_path with empty string default if missing
-                if already_node.get("file_path") is not None:
-                    already_file_paths.extend(
-                        split_string_by_multi_markers(
-                            already_node["file_path"], [GRAPH_FIELD_SEP]
-                        )
-                    )
-                else:
-                    logger.debug(
-                        f"No file_path found in existing node for entity '{entity_name}'"
-                    )
-
-                # Add data validation to prevent KeyError - get description with empty string default if missing
-                if already_node.get("description") is not None:
-                    already_description.append(already_node["description"])
-                else:
-                    logger.debug(
-                        f"No description found in existing node for entity '{entity_name}'"
-                    )
-            else:
-                logger.debug(f"No existing node found for entity: {entity_name}")
-
-            entity_type = sorted(
-                Counter(
-                    [dp["entity_type"] for dp in nodes_data] + already_entity_types
-                ).items(),
-                key=lambda x: x[1],
-                reverse=True,
-            )[0][0]
-
-            description = GRAPH_FIELD_SEP.join(
-                sorted(
-                    set([dp["description"] for dp in nodes_data] + already_description)
-                )
+            node_data, num_fragment, num_new_fragment = _prepare_node_merge(
+                entity_name, nodes_data, already_node
             )
-            source_id = GRAPH_FIELD_SEP.join(
-                set([dp["source_id"] for dp in nodes_data] + already_source_ids)
-            )
-            file_path = GRAPH_FIELD_SEP.join(
-                set([dp["file_path"] for dp in nodes_data] + already_file_paths)
-            )
-
-            force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
-
-            num_fragment = description.count(GRAPH_FIELD_SEP) + 1
-            num_new_fragment = len(set([dp["description"] for dp in nodes_data]))
-
-            if num_fragment > 1:
-                if num_fragment >= force_llm_summary_on_merge:
-                    status_message = f"LLM merge N: {entity_name} | {num_new_fragment}+{num_fragment - num_new_fragment}"
-                    logger.info(status_message)
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-                    description = await _handle_entity_relation_summary(
-                        entity_name,
-                        description,
-                        global_config,
-                        pipeline_status,
-                        pipeline_status_lock,
-                        llm_response_cache,
-                    )
-                else:
-                    status_message = f"Merge N: {entity_name} | {num_new_fragment}+{num_fragment - num_new_fragment}"
-                    logger.info(status_message)
-                    if pipeline_status is not None and pipeline_status_lock is not None:
-                        async with pipeline_status_lock:
-                            pipeline_status["latest_message"] = status_message
-                            pipeline_status["history_messages"].append(status_message)
-
-            node_data = dict(
-                entity_id=entity_name,
-                entity_type=entity_type,
-                description=description,
-                source_id=source_id,
-                file_path=file_path,
-                created_at=int(time.time()),
+            await _summarize_merged_node(
+                entity_name,
+                node_data,
+                num_fragment,
+                num_new_fragment,
+                global_config,
+                pipeline_status,
+                pipeline_status_lock,
+                llm_response_cache,
             )
-
-            # Validate node data before database upsert
-            db_validation_result = DatabaseValidator.validate_node_data(node_data)
-            if db_validation_result.has_errors():
-                logger.error(
-                    f"Database validation failed for node '{entity_name}': {[e.message for e in db_validation_result.errors]}\""
-                )
-                raise ValueError(f"Node data validation failed for '{entity_name}'")
-
-            if db_validation_result.has_warnings():
-                logger.warning(
-                    f"Database validation warnings for node '{entity_name}': {[w.message for w in db_validation_result.warnings]}"
-                )
-
-            # Monitor database upsert operation
-            with perf_monitor.measure("database_upsert_node", entity_name=entity_name):
-                try:
-                    await knowledge_graph_inst.upsert_node(entity_name, node_data)
-                    proc_monitor.record_database_operation(success=True)
-                    enhanced_logger.debug(f"Successfully upserted node: {entity_name}")
-                except Exception as e:
-                    proc_monitor.record_database_operation(success=False)
-                    enhanced_logger.error(
-                        f"Failed to upsert node {entity_name}: {str(e)}"
-                    )
-                    raise
-
-            logger.debug(
-                f"Successfully upserted node for entity: {entity_name} with type: {entity_type}"
+            _set_description_tokens(node_data, global_config)
+            return await _upsert_merged_node(
+                entity_name, node_data, knowledge_graph_inst
             )
-
-            node_data["entity_name"] = entity_name
-            return node_data
-
         except Exception as e:
-            logger.error(
-                f"Error in _merge_nodes_then_upsert for entity '{entity_name}': {str(e)}"
+            return await _upsert_fallback_node(
+                entity_name, nodes_data, knowledge_graph_inst, e
             )
-            logger.error(f"nodes_data: {nodes_data}")
-            # Return a basic node structure to prevent pipeline failure
-            basic_node_data = {
-                "entity_id": entity_name,
-                "entity_name": entity_name,
-                "entity_type": "UNKNOWN",
-                "description": f"Entity: {entity_name}",
-                "source_id": "error_recovery",
-                "file_path": "unknown_file",
-                "created_at": int(time.time()),
-            }
 
-            # Try to upsert the basic node structure
-            try:
-                await knowledge_graph_inst.upsert_node(
-                    entity_name, node_data=basic_node_data
-                )
-                logger.info(
-                    f"Created fallback node for entity '{entity_name}' after error recovery"
-                )
-                return basic_node_data
-            except Exception as fallback_error:
-                logger.error(
-                    f"Failed to create fallback node for entity '{entity_name}': {str(fallback_error)}"
-                )
-                raise e  # Re-raise the original exception if fallback fails
 
-
-async def _merge_edges_then_upsert(
-    src_id: str,
-    tgt_id: str,
-    edges: list[dict],  # List of edge dicts from extract_entities_with_types
-    knowledge_graph_inst: BaseGraphStorage,
-    global_config: dict[str, Any],
-    pipeline_status: dict = None,
-    pipeline_status_lock=None,
-    llm_response_cache: BaseKVStorage | None = None,
-) -> dict | None:
-    """
-    Merge and upsert a single edge relationship between two entities.
+def _prepare_edge_merge(src_id: str, tgt_id: str, edges: list[dict]) -> dict:
+    """Merge all extracted instances of one relationship into a single edge in memory.
 
     Args:
         src_id: Source entity ID
         tgt_id: Target entity ID
         edges: List of edge data dictionaries to merge
-        knowledge_graph_inst: Knowledge graph storage instance
-        global_config: Global configuration dictionary
-        pipeline_status: Pipeline status dictionary
-        pipeline_status_lock: Lock for pipeline status
-        llm_response_cache: LLM response cache
 
     Returns:
-        Merged edge data dictionary or None if merge fails
+        Merged edge data dictionary; the description is not summarized yet
     """
-    if not edges:
-        logger.warning(f"No edges provided to merge for {src_id} -> {tgt_id}")
-        return None
-
     logger.debug(f"Merging {len(edges)} edge instances for {src_id} -> {tgt_id}")
 
     # Initialize merged_edge with defaults that clearly indicate no specific type yet.
@@ -889,13 +1046,22 @@ async def _merge_edges_then_upsert(
         "_", " "
     )  # Human-readable from final Neo4j type
     merged_edge["rel_type"] = merged_edge["relationship_type"]  # Ensure consistency
+    return merged_edge
+
 
-    # Description summarization logic
+async def _summarize_merged_edge(
+    merged_edge: dict,
+    global_config: dict[str, Any],
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> None:
+    """Summarize the merged edge description in place when it has too many fragments"""
     force_llm_summary_on_merge = global_config.get("force_llm_summary_on_merge", 6)
     num_fragment = merged_edge["description"].count(GRAPH_FIELD_SEP) + 1
     if num_fragment > 1 and num_fragment >= force_llm_summary_on_merge:
         merged_edge["description"] = await _handle_entity_relation_summary(
-            f"({src_id}, {tgt_id})",
+            f"({merged_edge['src_id']}, {merged_edge['tgt_id']})",
             merged_edge["description"],
             global_config,
             pipeline_status,
@@ -903,6 +1069,13 @@ async def _merge_edges_then_upsert(
             llm_response_cache,
         )
 
+
+async def _upsert_merged_edge(
+    merged_edge: dict, knowledge_graph_inst: BaseGraphStorage
+) -> dict | None:
+    """Upsert a merged edge, returning it for vector updates or None on failure"""
+    src_id, tgt_id = merged_edge["src_id"], merged_edge["tgt_id"]
+
     # Final log before passing to upsert_edge
     logger.info(
         f"Final merged_edge for {src_id}->{tgt_id}: "
@@ -925,6 +1098,300 @@ async def _merge_edges_then_upsert(
         return None
 
 
+async def _merge_edges_then_upsert(
+    src_id: str,
+    tgt_id: str,
+    edges: list[dict],  # List of edge dicts from extract_entities_with_types
+    knowledge_graph_inst: BaseGraphStorage,
+    global_config: dict[str, Any],
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> dict | None:
+    """
+    Merge and upsert a single edge relationship between two entities.
+
+    Args:
+        src_id: Source entity ID
+        tgt_id: Target entity ID
+        edges: List of edge data dictionaries to merge
+        knowledge_graph_inst: Knowledge graph storage instance
+        global_config: Global configuration dictionary
+        pipeline_status: Pipeline status dictionary
+        pipeline_status_lock: Lock for pipeline status
+        llm_response_cache: LLM response cache
+
+    Returns:
+        Merged edge data dictionary or None if merge fails
+    """
+    if not edges:
+        logger.warning(f"No edges provided to merge for {src_id} -> {tgt_id}")
+        return None
+
+    merged_edge = _prepare_edge_merge(src_id, tgt_id, edges)
+    await _summarize_merged_edge(
+        merged_edge,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+    )
+    _set_description_tokens(merged_edge, global_config)
+    return await _upsert_merged_edge(merged_edge, knowledge_graph_inst)
+
+
+async def _gather_bounded(coros: list, max_async: int) -> list:
+    """Run coroutines concurrently with at most max_async in flight, preserving order"""
+    semaphore = asyncio.Semaphore(max(1, max_async))
+
+    async def _run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*[_run(coro) for coro in coros])
+
+
+def _entities_to_vdb_data(entities_data: list[dict]) -> dict[str, dict]:
+    """Build entity vector store records from merged node data"""
+    return {
+        compute_mdhash_id(dp["entity_name"], prefix="ent-"): {
+            "entity_name": dp["entity_name"],
+            "entity_type": dp["entity_type"],
+            "content": f"{dp['entity_name']}\n{dp['description']}",
+            "source_id": dp["source_id"],
+            "file_path": dp.get("file_path", "unknown_source"),
+        }
+        for dp in entities_data
+    }
+
+
+def _relationships_to_vdb_data(relationships_data: list[dict]) -> dict[str, dict]:
+    """Build relationship vector store records from merged edge data"""
+    return {
+        compute_mdhash_id(dp["src_id"] + dp["tgt_id"], prefix="rel-"): {
+            "src_id": dp["src_id"],
+            "tgt_id": dp["tgt_id"],
+            "keywords": dp["keywords"],
+            "content": f"{dp['src_id']}\t{dp['tgt_id']}\n{dp['keywords']}\n{dp['description']}",
+            "source_id": dp["source_id"],
+            "file_path": dp.get("file_path", "unknown_source"),
+        }
+        for dp in relationships_data
+    }
+
+
+async def _merge_nodes_batch(
+    all_nodes: dict[str, list[dict]],
+    knowledge_graph_inst: BaseGraphStorage,
+    entity_vdb: BaseVectorStorage | None,
+    global_config: dict,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> list[dict]:
+    """Merge and upsert all entities of a document batch by batch.
+
+    Each batch locks only its own entity names, prefetches the existing nodes with
+    one get_nodes_batch call and merges them in memory. Long descriptions are then
+    summarized concurrently (bounded by the LLM limiter) before the nodes are
+    written back with one upsert_nodes_batch call and mirrored into the entity
+    vector store. If the bulk write fails, nodes are retried one by one with
+    bounded concurrency.
+    """
+    from .kg.shared_storage import get_graph_db_keyed_lock
+
+    perf_monitor = get_performance_monitor()
+    proc_monitor = get_processing_monitor()
+    batch_size = max(1, global_config.get("merge_batch_size", DEFAULT_MERGE_BATCH_SIZE))
+    write_max_async = global_config.get(
+        "graph_write_max_async", DEFAULT_GRAPH_WRITE_MAX_ASYNC
+    )
+    entity_names = list(all_nodes.keys())
+    entities_data = []
+
+    async def _prepare_one(entity_name: str, already_node: dict | None):
+        try:
+            node_data, num_fragment, num_new_fragment = _prepare_node_merge(
+                entity_name, all_nodes[entity_name], already_node
+            )
+            await _summarize_merged_node(
+                entity_name,
+                node_data,
+                num_fragment,
+                num_new_fragment,
+                global_config,
+                pipeline_status,
+                pipeline_status_lock,
+                llm_response_cache,
+            )
+            _set_description_tokens(node_data, global_config)
+            return node_data, None
+        except Exception as e:
+            return None, e
+
+    async def _write_one(entity_name: str, node_data: dict | None, error):
+        if error is None:
+            try:
+                return await _upsert_merged_node(
+                    entity_name, node_data, knowledge_graph_inst
+                )
+            except Exception as e:
+                error = e
+        return await _upsert_fallback_node(
+            entity_name, all_nodes[entity_name], knowledge_graph_inst, error
+        )
+
+    async def _write_batch(batch_names: list[str], prepared: list) -> list[dict]:
+        valid_nodes, failed_nodes = [], []
+        for entity_name, (node_data, error) in zip(batch_names, prepared):
+            if error is None:
+                try:
+                    _validate_merged_node(entity_name, node_data)
+                    valid_nodes.append((entity_name, node_data))
+                    continue
+                except Exception as e:
+                    error = e
+            failed_nodes.append((entity_name, error))
+
+        try:
+            with perf_monitor.measure(
+                "database_upsert_nodes_batch", nodes_count=len(valid_nodes)
+            ):
+                await knowledge_graph_inst.upsert_nodes_batch(valid_nodes)
+            proc_monitor.record_database_operation(success=True)
+            for entity_name, node_data in valid_nodes:
+                node_data["entity_name"] = entity_name
+            written = [node_data for _, node_data in valid_nodes]
+        except Exception as e:
+            # Retry node by node so a single bad node does not fail the whole batch
+            proc_monitor.record_database_operation(success=False)
+            logger.warning(
+                f"Batch upsert of {len(valid_nodes)} nodes failed, retrying one by one: {str(e)}"
+            )
+            written = await _gather_bounded(
+                [
+                    _write_one(entity_name, node_data, None)
+                    for entity_name, node_data in valid_nodes
+                ],
+                write_max_async,
+            )
+
+        recovered = await _gather_bounded(
+            [
+                _write_one(entity_name, None, error)
+                for entity_name, error in failed_nodes
+            ],
+            write_max_async,
+        )
+        return written + recovered
+
+    for start in range(0, len(entity_names), batch_size):
+        batch_names = entity_names[start : start + batch_size]
+        with perf_monitor.measure("merge_nodes_batch", nodes_count=len(batch_names)):
+            async with get_graph_db_keyed_lock(batch_names, enable_logging=False):
+                already_nodes = await knowledge_graph_inst.get_nodes_batch(batch_names)
+                prepared = await asyncio.gather(
+                    *[
+                        _prepare_one(name, already_nodes.get(name))
+                        for name in batch_names
+                    ]
+                )
+                batch_entities = await _write_batch(batch_names, prepared)
+                # Update the vector store under the same keys so concurrent merges of
+                # an entity cannot reorder graph and vector writes
+                if entity_vdb is not None and batch_entities:
+                    await entity_vdb.upsert(_entities_to_vdb_data(batch_entities))
+                entities_data.extend(batch_entities)
+
+    return entities_data
+
+
+async def _merge_edges_batch(
+    all_edges: dict[tuple[str, str], list[dict]],
+    knowledge_graph_inst: BaseGraphStorage,
+    relationships_vdb: BaseVectorStorage | None,
+    global_config: dict,
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> list[dict]:
+    """Merge and upsert all relationships of a document batch by batch.
+
+    Edges are merged from the current document's instances only (the stored edge is
+    overwritten, as in _merge_edges_then_upsert), so no prefetch is needed. Each
+    batch locks its own edge keys, summarizes concurrently, writes back with one
+    upsert_edges_batch call (falling back to bounded per-edge upserts) and mirrors
+    the edges into the relationship vector store.
+    """
+    from .kg.shared_storage import get_graph_db_keyed_lock
+
+    perf_monitor = get_performance_monitor()
+    proc_monitor = get_processing_monitor()
+    batch_size = max(1, global_config.get("merge_batch_size", DEFAULT_MERGE_BATCH_SIZE))
+    write_max_async = global_config.get(
+        "graph_write_max_async", DEFAULT_GRAPH_WRITE_MAX_ASYNC
+    )
+    edge_keys = [key for key, edges in all_edges.items() if edges]
+    relationships_data = []
+
+    async def _prepare_one(edge_key: tuple[str, str]) -> dict:
+        merged_edge = _prepare_edge_merge(edge_key[0], edge_key[1], all_edges[edge_key])
+        await _summarize_merged_edge(
+            merged_edge,
+            global_config,
+            pipeline_status,
+            pipeline_status_lock,
+            llm_response_cache,
+        )
+        _set_description_tokens(merged_edge, global_config)
+        return merged_edge
+
+    async def _write_batch(merged_edges: list[dict]) -> list[dict]:
+        try:
+            with perf_monitor.measure(
+                "database_upsert_edges_batch", edges_count=len(merged_edges)
+            ):
+                await knowledge_graph_inst.upsert_edges_batch(
+                    [
+                        (merged_edge["src_id"], merged_edge["tgt_id"], merged_edge)
+                        for merged_edge in merged_edges
+                    ]
+                )
+            proc_monitor.record_database_operation(success=True)
+            return list(merged_edges)
+        except Exception as e:
+            # Retry edge by edge so a single bad edge does not fail the whole batch
+            proc_monitor.record_database_operation(success=False)
+            logger.warning(
+                f"Batch upsert of {len(merged_edges)} edges failed, retrying one by one: {str(e)}"
+            )
+            results = await _gather_bounded(
+                [
+                    _upsert_merged_edge(merged_edge, knowledge_graph_inst)
+                    for merged_edge in merged_edges
+                ],
+                write_max_async,
+            )
+            return [r for r in results if r is not None]
+
+    for start in range(0, len(edge_keys), batch_size):
+        batch_keys = edge_keys[start : start + batch_size]
+        lock_keys = [GRAPH_FIELD_SEP.join(key) for key in batch_keys]
+        with perf_monitor.measure("merge_edges_batch", edges_count=len(batch_keys)):
+            async with get_graph_db_keyed_lock(lock_keys, enable_logging=False):
+                merged_edges = await asyncio.gather(
+                    *[_prepare_one(key) for key in batch_keys]
+                )
+                batch_relationships = await _write_batch(merged_edges)
+                if relationships_vdb is not None and batch_relationships:
+                    await relationships_vdb.upsert(
+                        _relationships_to_vdb_data(batch_relationships)
+                    )
+                relationships_data.extend(batch_relationships)
+
+    return relationships_data
+
+
 def _calculate_string_similarity(str1: str, str2: str) -> float:
     """
     Calculate string similarity using simple character-based approach.
@@ -946,31 +1413,56 @@ def _calculate_string_similarity(str1: str, str2: str) -> float:
     return common_chars / total_chars if total_chars > 0 else 0.0
 
 
+# Only filter the most obviously abstract entities - be conservative
+_ABSTRACT_ENTITY_NAMES = frozenset(
+    {
+        "users",  # Generic user references only
+        "user",
+        "parallel technical tasks",  # Specific abstract concept
+        "business research",  # Specific abstract concept
+        "data transformations",  # Specific abstract concept
+    }
+)
+
+# Define synonym pairs to detect redundant relationships
+SYNONYM_CONCEPTS = [
+    {"web scraping", "data extraction"},
+    {"email communication", "gmail"},
+    {"client data management", "sail pos"},
+    {"information retrieval", "data processing"},
+    {"workflow automation", "automation"},
+    {"ai assistance", "google gemini chat model"},
+    {"screen sharing", "remote collaboration"},
+]
+
+# Every (src, tgt) pair that lies within one synonym group, for O(1) lookups
+_SYNONYM_PAIRS = frozenset(
+    (src, tgt) for group in SYNONYM_CONCEPTS for src in group for tgt in group
+)
+
+
 def _is_abstract_entity(entity_name: str) -> bool:
     """
     Check if an entity name represents an abstract concept rather than a concrete entity.
     """
-    name = entity_name.lower().strip()
-
-    # Only filter the most obviously abstract patterns - be conservative
-    ABSTRACT_ENTITY_PATTERNS = [
-        r"^(users|user)$",  # Generic user references only
-        r"^parallel technical tasks$",  # Specific abstract concept
-        r"^business research$",  # Specific abstract concept
-        r"^data transformations$",  # Specific abstract concept
-    ]
-
-    return any(re.match(pattern, name) for pattern in ABSTRACT_ENTITY_PATTERNS)
+    return entity_name.lower().strip() in _ABSTRACT_ENTITY_NAMES
 
 
 # Legacy confidence scoring removed - LLM provides more accurate quality assessment
 
 
 def _validate_relationship_context(
-    src_id: str, tgt_id: str, rel_type: str, description: str
+    src_id: str,
+    tgt_id: str,
+    rel_type: str,
+    description: str,
+    has_abstract_entity: bool | None = None,
 ) -> bool:
     """
     Validate relationship context to filter out low-quality or abstract relationships.
+
+    has_abstract_entity can pass an already computed _is_abstract_entity check of
+    src_id or tgt_id.
     """
     # Filter relationships where entities are too similar
     similarity = _calculate_string_similarity(src_id, tgt_id)
@@ -978,7 +1470,11 @@ def _validate_relationship_context(
         return False
 
     # Check if either entity is abstract
-    if _is_abstract_entity(src_id) or _is_abstract_entity(tgt_id):
+    if has_abstract_entity is None:
+        has_abstract_entity = _is_abstract_entity(src_id) or _is_abstract_entity(
+            tgt_id
+        )
+    if has_abstract_entity:
         # Require higher standards for abstract entities
         concrete_indicators = [
             "uses",
@@ -1050,10 +1546,10 @@ def _apply_relationship_quality_filter(
     if enable_enhanced_filter:
         try:
             from .kg.utils.enhanced_relationship_classifier import (
-                EnhancedRelationshipClassifier,
+                get_relationship_classifier,
             )
 
-            classifier = EnhancedRelationshipClassifier()
+            classifier = get_relationship_classifier()
             use_enhanced_classification = True
             logger.debug("Using enhanced type-specific relationship filtering")
         except ImportError as e:
@@ -1086,17 +1582,6 @@ def _apply_relationship_quality_filter(
         "facilitates",
     }
 
-    # Define synonym pairs to detect redundant relationships
-    SYNONYM_CONCEPTS = [
-        {"web scraping", "data extraction"},
-        {"email communication", "gmail"},
-        {"client data management", "sail pos"},
-        {"information retrieval", "data processing"},
-        {"workflow automation", "automation"},
-        {"ai assistance", "google gemini chat model"},
-        {"screen sharing", "remote collaboration"},
-    ]
-
     filtered_edges = {}
     filter_stats = {
         "abstract_relationships": 0,
@@ -1133,6 +1618,17 @@ def _apply_relationship_quality_filter(
             total_relationships, "enhanced" if use_enhanced_classification else "basic"
         )
 
+    # Classify every edge in one batch, types and duplicate edges are scored once
+    classifications = (
+        iter(
+            classifier.classify_batch(
+                edge for edges in all_edges.values() for edge in edges
+            )
+        )
+        if use_enhanced_classification
+        else None
+    )
+
     for edge_key, edges in all_edges.items():
         filter_stats["total_before"] += len(edges)
         filtered_edge_list = []
@@ -1146,9 +1642,7 @@ def _apply_relationship_quality_filter(
 
             # NEW: Enhanced type-specific filtering
             if use_enhanced_classification:
-                classification = classifier.classify_relationship(
-                    rel_type, src_id, tgt_id, description
-                )
+                classification = next(classifications)
 
                 category = classification["category"]
                 confidence = classification["confidence"]
@@ -1215,23 +1709,17 @@ def _apply_relationship_quality_filter(
                 continue
 
             # Filter 2: Remove relationships between synonymous concepts
-            is_synonym_relationship = False
-            for synonym_group in SYNONYM_CONCEPTS:
-                if src_id in synonym_group and tgt_id in synonym_group:
-                    filter_stats["synonym_relationships"] += 1
-                    logger.debug(
-                        f"Filtered synonym relationship: {src_id} -[{rel_type}]-> {tgt_id}"
-                    )
-                    is_synonym_relationship = True
-                    break
-
-            if is_synonym_relationship:
+            if (src_id, tgt_id) in _SYNONYM_PAIRS:
+                filter_stats["synonym_relationships"] += 1
+                logger.debug(
+                    f"Filtered synonym relationship: {src_id} -[{rel_type}]-> {tgt_id}"
+                )
                 continue
 
             # Filter 3: Remove relationships involving abstract entities
             if _is_abstract_entity(src_id) or _is_abstract_entity(tgt_id):
                 if not _validate_relationship_context(
-                    src_id, tgt_id, rel_type, description
+                    src_id, tgt_id, rel_type, description, has_abstract_entity=True
                 ):
                     filter_stats["abstract_entities"] += 1
                     logger.debug(
@@ -1776,8 +2264,150 @@ def _rebuild_edges_from_validated(validated_relationships: list) -> dict:
     return dict(edges_dict)
 
 
+class EdgeSignature(NamedTuple):
+    """Identity of an extracted edge, edges with equal signatures are duplicates"""
+
+    src_id: Any
+    tgt_id: Any
+    rel_type: Any
+    # Chunk the edge was extracted from, the same relationship from another chunk is kept
+    source_id: Any
+    # First 100 chars of the description, enough to tell apart distinct mentions
+    description: str
+
+    @classmethod
+    def of(cls, edge: dict) -> EdgeSignature:
+        return cls(
+            edge.get("src_id"),
+            edge.get("tgt_id"),
+            edge.get("rel_type"),
+            edge.get("source_id"),
+            edge.get("description", "")[:100],
+        )
+
+
+class NodeCollector:
+    """Fold chunk results into per-entity lists
+
+    Every entity record is kept by default: a record repeating one already collected
+    (e.g. re-extracted while gleaning) is still a vote for its entity type in
+    _merge_nodes_then_upsert. With dedup=True, records repeating the type,
+    description, source chunk and file of a collected record of the entity are
+    dropped as soon as their chunk is folded, at the cost of those votes.
+    """
+
+    __slots__ = ("nodes", "stats", "dedup", "_signatures")
+
+    def __init__(self, dedup: bool = False):
+        self.nodes: defaultdict[str, list] = defaultdict(list)
+        self.stats = {"nodes_seen": 0, "nodes_kept": 0}
+        self.dedup = dedup
+        self._signatures: dict[str, set[tuple]] = {}
+
+    def add(self, maybe_nodes: dict) -> None:
+        """Fold the entities of one chunk result into the collected lists"""
+        stats = self.stats
+        for entity_name, entities in maybe_nodes.items():
+            if not entities:
+                continue
+            collected = self.nodes[entity_name]
+            stats["nodes_seen"] += len(entities)
+            if not self.dedup:
+                collected.extend(entities)
+                stats["nodes_kept"] += len(entities)
+                continue
+            signatures = self._signatures.setdefault(entity_name, set())
+            for entity in entities:
+                signature = (
+                    entity.get("entity_type"),
+                    entity.get("description"),
+                    entity.get("source_id"),
+                    entity.get("file_path"),
+                )
+                if signature not in signatures:
+                    signatures.add(signature)
+                    collected.append(entity)
+                    stats["nodes_kept"] += 1
+
+
+class EdgeCollector:
+    """Fold chunk results into per-entity and per-edge lists, dropping duplicates
+
+    Edges are grouped by their sorted (src, tgt) key for the undirected graph. Each
+    key keeps the set of signatures collected so far, so checking an edge is O(1)
+    however often the same entity pair is mentioned. Entities are folded through a
+    NodeCollector, keeping every record unless dedup_nodes is set. Chunk results can be added one at a time as they arrive, the
+    collected lists match folding them all at once, and collect_entities hands the
+    collector it folded finished chunks into straight to merge_nodes_and_edges.
+    """
+
+    __slots__ = ("nodes", "edges", "stats", "_signatures", "_node_collector")
+
+    def __init__(self, dedup_nodes: bool = False):
+        self._node_collector = NodeCollector(dedup=dedup_nodes)
+        self.nodes = self._node_collector.nodes
+        self.edges: defaultdict[tuple, list] = defaultdict(list)
+        self.stats = {
+            "edges_seen": 0,
+            "edges_kept": 0,
+            "intra_chunk_duplicates": 0,
+            "cross_chunk_duplicates": 0,
+        }
+        self._signatures: dict[tuple, set[EdgeSignature]] = {}
+
+    @property
+    def node_stats(self) -> dict:
+        return self._node_collector.stats
+
+    def add(self, maybe_nodes: dict, maybe_edges: dict) -> None:
+        """Fold one chunk result (maybe_nodes, maybe_edges) into the collected lists"""
+        self._node_collector.add(maybe_nodes)
+
+        stats = self.stats
+        for edge_key, edges in maybe_edges.items():
+            if not edges:
+                continue
+            sorted_edge_key = tuple(sorted(edge_key))
+            collected = self.edges[sorted_edge_key]
+            signatures = self._signatures.setdefault(sorted_edge_key, set())
+            # Signatures added from this very list tell intra-chunk duplicates apart
+            added = set()
+            stats["edges_seen"] += len(edges)
+            for edge in edges:
+                signature = EdgeSignature.of(edge)
+                if signature not in signatures:
+                    signatures.add(signature)
+                    added.add(signature)
+                    collected.append(edge)
+                elif signature in added:
+                    stats["intra_chunk_duplicates"] += 1
+                    logger.debug(
+                        f"Skipping intra-batch duplicate relationship: {signature.src_id} -> {signature.tgt_id} ({signature.rel_type})"
+                    )
+                else:
+                    stats["cross_chunk_duplicates"] += 1
+                    logger.debug(
+                        f"Skipping cross-chunk duplicate relationship: {signature.src_id} -> {signature.tgt_id} ({signature.rel_type})"
+                    )
+            stats["edges_kept"] += len(added)
+
+    def log_stats(self) -> None:
+        stats = self.stats
+        duplicates = stats["intra_chunk_duplicates"] + stats["cross_chunk_duplicates"]
+        if duplicates:
+            logger.info(
+                f"Edge dedup kept {stats['edges_kept']}/{stats['edges_seen']} edges of {len(self.edges)} entity pairs "
+                f"({stats['intra_chunk_duplicates']} intra-chunk, {stats['cross_chunk_duplicates']} cross-chunk duplicates)"
+            )
+        node_stats = self.node_stats
+        if node_stats["nodes_kept"] < node_stats["nodes_seen"]:
+            logger.info(
+                f"Entity dedup kept {node_stats['nodes_kept']}/{node_stats['nodes_seen']} entity records of {len(self.nodes)} entities"
+            )
+
+
 async def merge_nodes_and_edges(
-    chunk_results: list,
+    chunk_results: EdgeCollector | Iterable,
     knowledge_graph_inst: BaseGraphStorage,
     entity_vdb: BaseVectorStorage,
     relationships_vdb: BaseVectorStorage,
@@ -1789,11 +2419,14 @@ async def merge_nodes_and_edges(
     total_files: int = 0,
     file_path: str = "unknown_source",
     document_text: str = None,  # Add document text parameter
+    doc_provenance: BaseKVStorage | None = None,
+    doc_id: str | None = None,
+    chunk_ids: list[str] | None = None,
 ) -> None:
     """Merge nodes and edges from extraction results
 
     Args:
-        chunk_results: List of tuples (maybe_nodes, maybe_edges) containing extracted entities and relationships
+        chunk_results: EdgeCollector returned by collect_entities, or tuples (e.g. from extract_entities) (maybe_nodes, maybe_edges) containing extracted entities and relationships, folded one at a time
         knowledge_graph_inst: Knowledge graph storage
         entity_vdb: Entity vector database
         relationships_vdb: Relationship vector database
@@ -1801,64 +2434,20 @@ async def merge_nodes_and_edges(
         pipeline_status: Pipeline status dictionary
         pipeline_status_lock: Lock for pipeline status
         llm_response_cache: LLM response cache
+        doc_provenance: KV storage recording which chunks, entities and relations a document produced
+        doc_id: Document the chunk results belong to, required to record provenance
+        chunk_ids: Chunks of the document, recorded with its provenance
     """
-    # Get lock manager from shared storage
-    from .kg.shared_storage import get_graph_db_lock
-
-    # Collect all nodes and edges from all chunks
-    all_nodes = defaultdict(list)
-    all_edges = defaultdict(list)
-
-    for maybe_nodes, maybe_edges in chunk_results:
-        # Collect nodes
-        for entity_name, entities in maybe_nodes.items():
-            all_nodes[entity_name].extend(entities)
-
-        # Collect edges with sorted keys for undirected graph
-        for edge_key, edges in maybe_edges.items():
-            sorted_edge_key = tuple(sorted(edge_key))
-            # Deduplicate edges based on relationship type and properties to prevent excessive processing
-            edge_signatures_seen = set()
-            for edge in edges:
-                # Create a more comprehensive signature for the edge to identify duplicates
-                # Include source_id (chunk) to prevent same relationship from same chunk being added twice
-                edge_signature = (
-                    edge.get("src_id"),
-                    edge.get("tgt_id"),
-                    edge.get("rel_type"),
-                    edge.get(
-                        "source_id"
-                    ),  # Include chunk ID to prevent intra-chunk duplicates
-                    edge.get("description", "")[
-                        :100
-                    ],  # More chars for better distinction
-                )
-
-                # Check if we've already seen this exact signature in this batch
-                if edge_signature not in edge_signatures_seen:
-                    # Also check if this relationship already exists in accumulated edges
-                    existing_sigs = {
-                        (
-                            e.get("src_id"),
-                            e.get("tgt_id"),
-                            e.get("rel_type"),
-                            e.get("source_id"),
-                            e.get("description", "")[:100],
-                        )
-                        for e in all_edges[sorted_edge_key]
-                    }
-
-                    if edge_signature not in existing_sigs:
-                        all_edges[sorted_edge_key].append(edge)
-                        edge_signatures_seen.add(edge_signature)
-                    else:
-                        logger.debug(
-                            f"Skipping cross-chunk duplicate relationship: {edge_signature[0]} -> {edge_signature[1]} ({edge_signature[2]})"
-                        )
-                else:
-                    logger.debug(
-                        f"Skipping intra-batch duplicate relationship: {edge_signature[0]} -> {edge_signature[1]} ({edge_signature[2]})"
-                    )
+    # Collect all nodes and edges from all chunks, dropping duplicates. Extraction
+    # already folded its chunks into a collector as they finished
+    if isinstance(chunk_results, EdgeCollector):
+        collector = chunk_results
+    else:
+        collector = EdgeCollector()
+        for maybe_nodes, maybe_edges in chunk_results:
+            collector.add(maybe_nodes, maybe_edges)
+    collector.log_stats()
+    all_nodes, all_edges = collector.nodes, collector.edges
 
     # Apply basic post-processing filters to remove redundant relationships
     # Note: Made more lenient since LLM post-processing will do the heavy lifting
@@ -1944,95 +2533,107 @@ async def merge_nodes_and_edges(
 
     # Legacy extraction quality logging removed - using more accurate LLM-based quality metrics instead
 
-    # Centralized processing of all nodes and edges
-    entities_data = []
-    relationships_data = []
-
     # Merge nodes and edges
-    # Use graph database lock to ensure atomic merges and updates
-    graph_db_lock = get_graph_db_lock(enable_logging=False)
-    async with graph_db_lock:
+    # Per-key graph locks (see _merge_nodes_batch/_merge_edges_batch) keep merges of
+    # different documents on disjoint entities from blocking each other
+    async with pipeline_status_lock:
+        log_message = f"Merging stage {current_file_number}/{total_files}: {file_path}"
+        logger.info(log_message)
+        pipeline_status["latest_message"] = log_message
+        pipeline_status["history_messages"].append(log_message)
+
+    # Process and update all entities at once
+    entities_data = await _merge_nodes_batch(
+        all_nodes,
+        knowledge_graph_inst,
+        entity_vdb,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+    )
+
+    # Process and update all relationships at once
+    relationships_data = await _merge_edges_batch(
+        all_edges,
+        knowledge_graph_inst,
+        relationships_vdb,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+    )
+
+    # Update total counts
+    total_entities_count = len(entities_data)
+    total_relations_count = len(relationships_data)
+
+    log_message = f"Updated {total_entities_count} entities  {current_file_number}/{total_files}: {file_path}"
+    logger.info(log_message)
+    if pipeline_status is not None:
         async with pipeline_status_lock:
-            log_message = (
-                f"Merging stage {current_file_number}/{total_files}: {file_path}"
-            )
-            logger.info(log_message)
             pipeline_status["latest_message"] = log_message
             pipeline_status["history_messages"].append(log_message)
 
-        # Process and update all entities at once
-        for entity_name, entities in all_nodes.items():
-            entity_data = await _merge_nodes_then_upsert(
-                entity_name,
-                entities,
-                knowledge_graph_inst,
-                global_config,
-                pipeline_status,
-                pipeline_status_lock,
-                llm_response_cache,
-            )
-            entities_data.append(entity_data)
-
-        # Process and update all relationships at once
-        for edge_key, edges in all_edges.items():
-            edge_data = await _merge_edges_then_upsert(
-                edge_key[0],
-                edge_key[1],
-                edges,
-                knowledge_graph_inst,
-                global_config,
-                pipeline_status,
-                pipeline_status_lock,
-                llm_response_cache,
-            )
-            if edge_data is not None:
-                relationships_data.append(edge_data)
+    log_message = f"Updated {total_relations_count} relations {current_file_number}/{total_files}: {file_path}"
+    logger.info(log_message)
+    if pipeline_status is not None:
+        async with pipeline_status_lock:
+            pipeline_status["latest_message"] = log_message
+            pipeline_status["history_messages"].append(log_message)
 
-        # Update total counts
-        total_entities_count = len(entities_data)
-        total_relations_count = len(relationships_data)
+    if doc_provenance is not None and doc_id:
+        await record_doc_provenance(
+            doc_provenance, doc_id, chunk_ids or [], entities_data, relationships_data
+        )
 
-        log_message = f"Updating {total_entities_count} entities  {current_file_number}/{total_files}: {file_path}"
-        logger.info(log_message)
-        if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
-
-        # Update vector databases with all collected data
-        if entity_vdb is not None and entities_data:
-            data_for_vdb = {
-                compute_mdhash_id(dp["entity_name"], prefix="ent-"): {
-                    "entity_name": dp["entity_name"],
-                    "entity_type": dp["entity_type"],
-                    "content": f"{dp['entity_name']}\n{dp['description']}",
-                    "source_id": dp["source_id"],
-                    "file_path": dp.get("file_path", "unknown_source"),
-                }
-                for dp in entities_data
-            }
-            await entity_vdb.upsert(data_for_vdb)
 
-        log_message = f"Updating {total_relations_count} relations {current_file_number}/{total_files}: {file_path}"
-        logger.info(log_message)
-        if pipeline_status is not None:
-            async with pipeline_status_lock:
-                pipeline_status["latest_message"] = log_message
-                pipeline_status["history_messages"].append(log_message)
-
-        if relationships_vdb is not None and relationships_data:
-            data_for_vdb = {
-                compute_mdhash_id(dp["src_id"] + dp["tgt_id"], prefix="rel-"): {
-                    "src_id": dp["src_id"],
-                    "tgt_id": dp["tgt_id"],
-                    "keywords": dp["keywords"],
-                    "content": f"{dp['src_id']}\t{dp['tgt_id']}\n{dp['keywords']}\n{dp['description']}",
-                    "source_id": dp["source_id"],
-                    "file_path": dp.get("file_path", "unknown_source"),
-                }
-                for dp in relationships_data
-            }
-            await relationships_vdb.upsert(data_for_vdb)
+async def record_doc_provenance(
+    doc_provenance: BaseKVStorage,
+    doc_id: str,
+    chunk_ids: list[str],
+    entities_data: list[dict],
+    relationships_data: list[dict],
+) -> None:
+    """Record the chunks, entities and relations produced by a document
+
+    The record is merged with any existing one, so a document reprocessed after a
+    failure keeps referencing everything it touched. Deleting the document then only
+    has to visit these graph elements instead of scanning the whole graph.
+
+    Chunk ids are content hashes and may be shared by documents, so every chunk
+    also gets a record listing the documents that produced it.
+    """
+    existing = await doc_provenance.get_by_id(doc_id) or {}
+
+    chunk_list = list(dict.fromkeys([*(existing.get("chunk_ids") or []), *chunk_ids]))
+    entity_list = list(
+        dict.fromkeys(
+            [
+                *(existing.get("entities") or []),
+                *(dp["entity_name"] for dp in entities_data if dp.get("entity_name")),
+            ]
+        )
+    )
+    relation_pairs = dict.fromkeys(
+        tuple(pair) for pair in existing.get("relations") or []
+    )
+    for dp in relationships_data:
+        if dp.get("src_id") and dp.get("tgt_id"):
+            relation_pairs[(dp["src_id"], dp["tgt_id"])] = None
+
+    updates = {}
+    chunk_records = await doc_provenance.get_by_ids(chunk_list) if chunk_list else []
+    for chunk_id, record in zip(chunk_list, chunk_records):
+        chunk_doc_ids = (record or {}).get("doc_ids") or []
+        if doc_id not in chunk_doc_ids:
+            updates[chunk_id] = {"doc_ids": [*chunk_doc_ids, doc_id]}
+    updates[doc_id] = {
+        "chunk_ids": chunk_list,
+        "entities": entity_list,
+        "relations": [list(pair) for pair in relation_pairs],
+    }
+    await doc_provenance.upsert(updates)
 
 
 async def extract_entities(
@@ -2042,6 +2643,58 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
 ) -> list:
+    """Extract entities and relationships from chunks
+
+    Returns one (maybe_nodes, maybe_edges) tuple per chunk, in chunk order.
+    collect_entities folds the chunks into an EdgeCollector as they finish instead
+    of keeping every chunk result until extraction ends.
+    """
+    chunk_results = []
+    await _extract_chunk_results(
+        chunks,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+        lambda maybe_nodes, maybe_edges: chunk_results.append(
+            (maybe_nodes, maybe_edges)
+        ),
+    )
+    return chunk_results
+
+
+async def collect_entities(
+    chunks: dict[str, TextChunkSchema],
+    global_config: dict[str, str],
+    pipeline_status: dict = None,
+    pipeline_status_lock=None,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> EdgeCollector:
+    """Extract entities and relationships from chunks into an EdgeCollector
+
+    Finished chunks are folded in chunk order as they arrive, and the collector can
+    be handed straight to merge_nodes_and_edges.
+    """
+    collector = EdgeCollector()
+    await _extract_chunk_results(
+        chunks,
+        global_config,
+        pipeline_status,
+        pipeline_status_lock,
+        llm_response_cache,
+        collector.add,
+    )
+    return collector
+
+
+async def _extract_chunk_results(
+    chunks: dict[str, TextChunkSchema],
+    global_config: dict[str, str],
+    pipeline_status: dict,
+    pipeline_status_lock,
+    llm_response_cache: BaseKVStorage | None,
+    add_result: Callable[[dict, dict], None],
+) -> None:
     # Initialize monitoring
     perf_monitor = get_performance_monitor()
     proc_monitor = get_processing_monitor()
@@ -2330,35 +2983,43 @@ async def extract_entities(
                         pipeline_status["latest_message"] = log_message
                         pipeline_status["history_messages"].append(log_message)
 
-                # Apply chunk-level relationship post-processing if enabled
-                chunk_post_processing_enabled = global_config.get(
-                    "enable_chunk_post_processing", DEFAULT_ENABLE_CHUNK_POST_PROCESSING
-                )
-                logger.info(f"DEBUG: Chunk post-processing check - enabled: {chunk_post_processing_enabled}, chunk: {chunk_key}")
-                
-                if chunk_post_processing_enabled:
-                    logger.info(f"DEBUG: Starting chunk post-processing for {chunk_key} with {len(maybe_edges)} relationships")
-                    try:
-                        maybe_edges = await _post_process_chunk_relationships(
-                            content,
-                            maybe_edges,
-                            maybe_nodes,
-                            use_llm_func,
-                            chunk_key,
-                            global_config,
-                        )
-                        logger.info(f"DEBUG: Chunk post-processing completed for {chunk_key}")
-                    except Exception as e:
-                        logger.warning(
-                            f"Chunk post-processing failed for {chunk_key}: {e}"
-                        )
-                        logger.info("Continuing with original relationships")
-                else:
-                    logger.info(f"DEBUG: Chunk post-processing disabled for {chunk_key}")
-
                 # Return the extracted nodes and edges for centralized processing
                 return maybe_nodes, maybe_edges
 
+        # Validation calls go through the LLM queue ahead of new extractions, so chunks
+        # already extracted are finished first
+        post_process_llm_func = partial(use_llm_func, _priority=9)
+
+        async def _post_process_single_content(
+            chunk_key_dp: tuple[str, TextChunkSchema], result: tuple
+        ):
+            chunk_key, chunk_dp = chunk_key_dp
+            maybe_nodes, maybe_edges = result
+
+            # Apply chunk-level relationship post-processing if enabled
+            chunk_post_processing_enabled = global_config.get(
+                "enable_chunk_post_processing", DEFAULT_ENABLE_CHUNK_POST_PROCESSING
+            )
+            if not chunk_post_processing_enabled:
+                return result
+
+            logger.debug(
+                f"Starting chunk post-processing for {chunk_key} with {len(maybe_edges)} relationships"
+            )
+            try:
+                maybe_edges = await _post_process_chunk_relationships(
+                    chunk_dp["content"],
+                    maybe_edges,
+                    maybe_nodes,
+                    post_process_llm_func,
+                    chunk_key,
+                    global_config,
+                )
+            except Exception as e:
+                logger.warning(f"Chunk post-processing failed for {chunk_key}: {e}")
+                logger.info("Continuing with original relationships")
+            return maybe_nodes, maybe_edges
+
         # Get max async tasks limit from global_config
         llm_model_max_async = global_config.get("llm_model_max_async", 4)
         semaphore = asyncio.Semaphore(llm_model_max_async)
@@ -2388,8 +3049,6 @@ async def extract_entities(
                         enhanced_logger.debug(
                             f"Completed chunk {chunk[0]} ({completed_chunks}/{len(chunks)})"
                         )
-
-                        return result
                     except Exception as e:
                         # Record failed chunk processing
                         proc_monitor.record_chunk_processing(processed=0, failed=1)
@@ -2398,112 +3057,112 @@ async def extract_entities(
                         )
                         raise
 
-        # Enhanced error handling for task processing
-        tasks = []
+            # Post-processing runs after the extraction slot is released, its batches
+            # are bounded by the LLM queue and the extraction window
+            return await _post_process_single_content(chunk, result)
+
+        # Windowed producer/consumer extraction: at most window_size chunks are in
+        # flight or waiting to be folded, and finished chunks are folded in chunk
+        # order into add_result, so neither tasks nor gleaning histories accumulate
+        # for the whole document
+        window_size = max(
+            llm_model_max_async,
+            global_config.get("extraction_window_size", DEFAULT_EXTRACTION_WINDOW_SIZE),
+        )
         failed_chunks = []
-        successful_results = []
         # Change default to fail-fast for all-or-nothing processing
         enable_graceful_degradation = global_config.get(
             "enable_graceful_degradation", False
         )
-
-        for c in ordered_chunks:
-            task = asyncio.create_task(_process_with_semaphore(c))
-            tasks.append(task)
-
-        # Process tasks with enhanced error handling and recovery
         if enable_graceful_degradation:
             # Graceful degradation mode: fail on ANY chunk failure (0% tolerance)
             logger.info(
-                f"Processing {len(tasks)} chunks with graceful degradation enabled (0% failure tolerance)"
+                f"Processing {total_chunks} chunks with graceful degradation enabled (0% failure tolerance, window {window_size})"
             )
-
-            # Wait for all tasks to complete
-            done, pending = await asyncio.wait(tasks, return_when=asyncio.ALL_COMPLETED)
-
-            for i, task in enumerate(done):
-                try:
-                    if task.exception():
-                        failed_chunks.append(
-                            (i, ordered_chunks[i], str(task.exception()))
-                        )
-                        logger.error(f"Chunk {i} failed: {str(task.exception())}")
-
-                    else:
-                        result = task.result()
-                        successful_results.append(result)
-
-                except Exception as e:
-                    logger.error(f"Error processing task {i}: {str(e)}")
-                    failed_chunks.append((i, ordered_chunks[i], str(e)))
-
-            # Fail immediately if ANY chunks failed (0% tolerance)
-            if failed_chunks:
-                failure_rate = len(failed_chunks) / len(tasks) * 100
-                logger.error(
-                    f"Pipeline failed: {len(failed_chunks)}/{len(tasks)} chunks failed ({failure_rate:.1f}% failure rate)"
-                )
-
-                # Log detailed failure information for debugging
-                failure_types = {}
-                for chunk_idx, chunk_data, error_msg in failed_chunks:
-                    error_type = "general"
-                    if "rate" in error_msg.lower() and "limit" in error_msg.lower():
-                        error_type = "rate_limit"
-                    elif "timeout" in error_msg.lower():
-                        error_type = "timeout"
-                    elif (
-                        "connection" in error_msg.lower()
-                        or "network" in error_msg.lower()
-                    ):
-                        error_type = "network"
-                    elif "total_chunks" in error_msg.lower():
-                        error_type = "variable_error"
-
-                    failure_types[error_type] = failure_types.get(error_type, 0) + 1
-
-                logger.error(f"Failure breakdown: {failure_types}")
-                raise RuntimeError(
-                    f"Entity extraction failed: {len(failed_chunks)}/{len(tasks)} chunks failed. All chunks must succeed for processing to continue."
-                )
-            else:
-                logger.info("All chunks processed successfully")
-
-            chunk_results = successful_results
-
         else:
             # Fail-fast mode: default behavior - stop on first failure
             logger.info(
-                f"Processing {len(tasks)} chunks with fail-fast mode (recommended)"
+                f"Processing {total_chunks} chunks with fail-fast mode (recommended, window {window_size})"
             )
 
-            # Wait for tasks to complete or for the first exception to occur
-            done, pending = await asyncio.wait(
-                tasks, return_when=asyncio.FIRST_EXCEPTION
-            )
+        running: dict[asyncio.Task, int] = {}
+        finished: dict[int, tuple | None] = {}
+        next_to_start = 0
+        next_to_fold = 0
+        while next_to_fold < total_chunks:
+            while (
+                next_to_start < total_chunks
+                and next_to_start < next_to_fold + window_size
+            ):
+                task = asyncio.create_task(
+                    _process_with_semaphore(ordered_chunks[next_to_start])
+                )
+                running[task] = next_to_start
+                next_to_start += 1
 
-            # Check if any task raised an exception
+            done, _ = await asyncio.wait(
+                running.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
             for task in done:
-                if task.exception():
+                index = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    finished[index] = task.result()
+                    continue
+                if not enable_graceful_degradation:
                     # If a task failed, cancel all pending tasks
-                    for pending_task in pending:
+                    for pending_task in running:
                         pending_task.cancel()
 
                     # Wait for cancellation to complete
-                    if pending:
-                        await asyncio.wait(pending)
+                    if running:
+                        await asyncio.wait(running.keys())
 
                     # Re-raise the exception to notify the caller
                     logger.error(
-                        f"Chunk processing failed in fail-fast mode: {str(task.exception())}"
+                        f"Chunk processing failed in fail-fast mode: {str(error)}"
                     )
-                    raise task.exception()
+                    raise error
+                failed_chunks.append((index, ordered_chunks[index], str(error)))
+                logger.error(f"Chunk {index} failed: {str(error)}")
+                finished[index] = None
+
+            # Fold finished chunks in chunk order so merge input stays deterministic
+            while next_to_fold in finished:
+                result = finished.pop(next_to_fold)
+                next_to_fold += 1
+                if result is None:
+                    continue
+                add_result(*result)
 
-            # If all tasks completed successfully, collect results
-            chunk_results = [task.result() for task in tasks]
+        # Fail if ANY chunks failed (0% tolerance)
+        if failed_chunks:
+            failure_rate = len(failed_chunks) / total_chunks * 100
+            logger.error(
+                f"Pipeline failed: {len(failed_chunks)}/{total_chunks} chunks failed ({failure_rate:.1f}% failure rate)"
+            )
 
-        # Return the chunk_results for later processing in merge_nodes_and_edges
-        return chunk_results
+            # Log detailed failure information for debugging
+            failure_types = {}
+            for chunk_idx, chunk_data, error_msg in failed_chunks:
+                error_type = "general"
+                if "rate" in error_msg.lower() and "limit" in error_msg.lower():
+                    error_type = "rate_limit"
+                elif "timeout" in error_msg.lower():
+                    error_type = "timeout"
+                elif "connection" in error_msg.lower() or "network" in error_msg.lower():
+                    error_type = "network"
+                elif "total_chunks" in error_msg.lower():
+                    error_type = "variable_error"
+
+                failure_types[error_type] = failure_types.get(error_type, 0) + 1
+
+            logger.error(f"Failure breakdown: {failure_types}")
+            raise RuntimeError(
+                f"Entity extraction failed: {len(failed_chunks)}/{total_chunks} chunks failed. All chunks must succeed for processing to continue."
+            )
+        elif enable_graceful_degradation:
+            logger.info("All chunks processed successfully")
 
 
 async def kg_query(
@@ -2782,6 +3441,7 @@ async def _get_vector_context(
     chunks_vdb: BaseVectorStorage,
     query_param: QueryParam,
     tokenizer: Tokenizer,
+    text_chunks_db: BaseKVStorage | None = None,
 ) -> tuple[list, list, list] | None:
     """
     Retrieve vector context from the vector database.
@@ -2794,6 +3454,8 @@ async def _get_vector_context(
         chunks_vdb: Vector database containing document chunks
         query_param: Query parameters including top_k and ids
         tokenizer: Tokenizer for counting tokens
+        text_chunks_db: Optional chunk storage used (through the shared chunk LRU)
+            for results whose vector record carries no content
 
     Returns:
         Tuple (empty_entities, empty_relations, text_units) for combine_contexts,
@@ -2806,6 +3468,21 @@ async def _get_vector_context(
         if not results:
             return [], [], []
 
+        # Backends that do not keep content in vector meta fields are served
+        # from the chunk storage in one cached bulk fetch
+        missing_ids = [
+            result["id"]
+            for result in results
+            if "content" not in result and result.get("id")
+        ]
+        if missing_ids and text_chunks_db is not None:
+            chunk_records = await get_chunks_by_ids_cached(text_chunks_db, missing_ids)
+            for result in results:
+                record = chunk_records.get(result.get("id"))
+                if "content" not in result and record and "content" in record:
+                    result["content"] = record["content"]
+                    result.setdefault("file_path", record.get("file_path"))
+
         valid_chunks = []
         for result in results:
             if "content" in result:
@@ -2858,6 +3535,15 @@ async def _get_vector_context(
         return [], [], []
 
 
+async def _timed_branch(name: str, coro, branch_timings: dict[str, float]):
+    """Await a retrieval branch and record its wall time in branch_timings"""
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        branch_timings[name] = round(time.perf_counter() - start, 4)
+
+
 async def _build_query_context(
     ll_keywords: str,
     hl_keywords: str,
@@ -2871,103 +3557,144 @@ async def _build_query_context(
     logger.info(f"Process {os.getpid()} building query context...")
     logger.info(f"🔍 kg_query_context - Query mode: '{query_param.mode}'")
 
-    # Handle local and global modes as before
+    context_start = time.perf_counter()
+    branch_timings: dict[str, float] = {}
+    use_vector_context = query_param.mode == "mix" and hasattr(
+        query_param, "original_query"
+    )
+
+    # Embed every query text the branches need in one batched call
     if query_param.mode == "local":
-        entities_context, relations_context, text_units_context = await _get_node_data(
-            ll_keywords,
-            knowledge_graph_inst,
-            entities_vdb,
-            text_chunks_db,
-            query_param,
-        )
+        embedding_texts = [ll_keywords]
     elif query_param.mode == "global":
-        entities_context, relations_context, text_units_context = await _get_edge_data_global(
-            hl_keywords,
-            knowledge_graph_inst,
-            relationships_vdb,
-            text_chunks_db,
-            query_param,
-        )
-    else:  # hybrid or mix mode
-        ll_data = await _get_node_data(
-            ll_keywords,
-            knowledge_graph_inst,
-            entities_vdb,
-            text_chunks_db,
-            query_param,
-        )
-        # Use hybrid-specific edge data function for better chunk retrieval
-        logger.info(f"🔍 Query mode detected: '{query_param.mode}' (type: {type(query_param.mode)})")
-        logger.info(f"🔍 Mode comparison: query_param.mode == 'hybrid' is {query_param.mode == 'hybrid'}")
-        if query_param.mode == "hybrid":
-            logger.info("✅ Using hybrid-specific edge data function")
-            hl_data = await _get_edge_data_hybrid(
-                hl_keywords,
-                knowledge_graph_inst,
-                relationships_vdb,
-                text_chunks_db,
-                query_param,
+        embedding_texts = [hl_keywords]
+    else:
+        embedding_texts = [ll_keywords, hl_keywords]
+        if use_vector_context:
+            embedding_texts.append(query_param.original_query)
+
+    async with prefetch_query_embeddings(entities_vdb.embedding_func, embedding_texts):
+        branch_timings["embedding"] = round(time.perf_counter() - context_start, 4)
+
+        # Handle local and global modes as before
+        if query_param.mode == "local":
+            entities_context, relations_context, text_units_context = await _timed_branch(
+                "local",
+                _get_node_data(
+                    ll_keywords,
+                    knowledge_graph_inst,
+                    entities_vdb,
+                    text_chunks_db,
+                    query_param,
+                ),
+                branch_timings,
             )
-        else:
-            logger.info("Using standard edge data function")
-            hl_data = await _get_edge_data(
-                hl_keywords,
-                knowledge_graph_inst,
-                relationships_vdb,
-                text_chunks_db,
-                query_param,
+        elif query_param.mode == "global":
+            entities_context, relations_context, text_units_context = await _timed_branch(
+                "global",
+                _get_edge_data_global(
+                    hl_keywords,
+                    knowledge_graph_inst,
+                    relationships_vdb,
+                    text_chunks_db,
+                    query_param,
+                ),
+                branch_timings,
             )
+        else:  # hybrid or mix mode
+            # Use hybrid-specific edge data function for better chunk retrieval
+            logger.info(f"🔍 Query mode detected: '{query_param.mode}' (type: {type(query_param.mode)})")
+            if query_param.mode == "hybrid":
+                logger.info("✅ Using hybrid-specific edge data function")
+                get_edge_data_func = _get_edge_data_hybrid
+            else:
+                logger.info("Using standard edge data function")
+                get_edge_data_func = _get_edge_data
+
+            # Local, global and vector retrieval only read the graph and use
+            # independent vector stores, so run them concurrently
+            branches = [
+                _timed_branch(
+                    "local",
+                    _get_node_data(
+                        ll_keywords,
+                        knowledge_graph_inst,
+                        entities_vdb,
+                        text_chunks_db,
+                        query_param,
+                    ),
+                    branch_timings,
+                ),
+                _timed_branch(
+                    "global",
+                    get_edge_data_func(
+                        hl_keywords,
+                        knowledge_graph_inst,
+                        relationships_vdb,
+                        text_chunks_db,
+                        query_param,
+                    ),
+                    branch_timings,
+                ),
+            ]
+            # Only get vector data if in mix mode
+            if use_vector_context:
+                branches.append(
+                    _timed_branch(
+                        "vector",
+                        _get_vector_context(
+                            query_param.original_query,  # We need to pass the original query
+                            chunks_vdb,
+                            query_param,
+                            text_chunks_db.global_config.get("tokenizer"),
+                            text_chunks_db,
+                        ),
+                        branch_timings,
+                    )
+                )
+            ll_data, hl_data, *vector_results = await asyncio.gather(*branches)
 
-        (
-            ll_entities_context,
-            ll_relations_context,
-            ll_text_units_context,
-        ) = ll_data
-
-        (
-            hl_entities_context,
-            hl_relations_context,
-            hl_text_units_context,
-        ) = hl_data
-
-        # Initialize vector data with empty lists
-        vector_entities_context, vector_relations_context, vector_text_units_context = (
-            [],
-            [],
-            [],
-        )
+            (
+                ll_entities_context,
+                ll_relations_context,
+                ll_text_units_context,
+            ) = ll_data
 
-        # Only get vector data if in mix mode
-        if query_param.mode == "mix" and hasattr(query_param, "original_query"):
-            # Get tokenizer from text_chunks_db
-            tokenizer = text_chunks_db.global_config.get("tokenizer")
-
-            # Get vector context in triple format
-            vector_data = await _get_vector_context(
-                query_param.original_query,  # We need to pass the original query
-                chunks_vdb,
-                query_param,
-                tokenizer,
+            (
+                hl_entities_context,
+                hl_relations_context,
+                hl_text_units_context,
+            ) = hl_data
+
+            # Initialize vector data with empty lists
+            vector_entities_context, vector_relations_context, vector_text_units_context = (
+                [],
+                [],
+                [],
             )
-
             # If vector_data is not None, unpack it
-            if vector_data is not None:
+            if vector_results and vector_results[0] is not None:
                 (
                     vector_entities_context,
                     vector_relations_context,
                     vector_text_units_context,
-                ) = vector_data
+                ) = vector_results[0]
+
+            # Combine and deduplicate the entities, relationships, and sources
+            entities_context = process_combine_contexts(
+                hl_entities_context, ll_entities_context, vector_entities_context
+            )
+            relations_context = process_combine_contexts(
+                hl_relations_context, ll_relations_context, vector_relations_context
+            )
+            text_units_context = process_combine_contexts(
+                hl_text_units_context, ll_text_units_context, vector_text_units_context
+            )
+
+    branch_timings["total"] = round(time.perf_counter() - context_start, 4)
+    query_param.context_metadata["branch_timings"] = branch_timings
+    logger.info(f"Query context branch timings (s): {branch_timings}")
 
-        # Combine and deduplicate the entities, relationships, and sources
-        entities_context = process_combine_contexts(
-            hl_entities_context, ll_entities_context, vector_entities_context
-        )
-        relations_context = process_combine_contexts(
-            hl_relations_context, ll_relations_context, vector_relations_context
-        )
-        text_units_context = process_combine_contexts(
-            hl_text_units_context, ll_text_units_context, vector_text_units_context
-        )
     # not necessary to use LLM to generate a response
     if not entities_context and not relations_context:
         return None
@@ -3062,6 +3789,7 @@ async def _get_node_data(
     node_datas = truncate_list_by_token_size(
         node_datas,
         key=lambda x: x["description"] if x["description"] is not None else "",
+        token_count_key=lambda x: x.get("description_tokens"),
         max_token_size=query_param.max_token_for_local_context,
         tokenizer=tokenizer,
     )
@@ -3189,20 +3917,14 @@ async def _find_most_related_text_unit_from_entities(
                 all_text_units_lookup[c_id] = index
                 tasks.append((c_id, index, this_edges))
 
-    # Process in batches tasks at a time to avoid overwhelming resources
-    batch_size = 5
-    results = []
-
-    for i in range(0, len(tasks), batch_size):
-        batch_tasks = tasks[i : i + batch_size]
-        batch_results = await asyncio.gather(
-            *[text_chunks_db.get_by_id(c_id) for c_id, _, _ in batch_tasks]
-        )
-        results.extend(batch_results)
+    # One bulk fetch for every referenced chunk, served from the shared LRU first
+    chunk_records = await get_chunks_by_ids_cached(
+        text_chunks_db, [c_id for c_id, _, _ in tasks]
+    )
 
-    for (c_id, index, this_edges), data in zip(tasks, results):
+    for c_id, index, this_edges in tasks:
         all_text_units_lookup[c_id] = {
-            "data": data,
+            "data": chunk_records.get(c_id),
             "order": index,
             "relation_counts": 0,
         }
@@ -3233,6 +3955,7 @@ async def _find_most_related_text_unit_from_entities(
     all_text_units = truncate_list_by_token_size(
         all_text_units,
         key=lambda x: x["data"]["content"],
+        token_count_key=lambda x: x["data"].get("tokens"),
         max_token_size=query_param.max_token_for_text_unit,
         tokenizer=tokenizer,
     )
@@ -3301,6 +4024,7 @@ async def _find_most_related_edges_from_entities(
     all_edges_data = truncate_list_by_token_size(
         all_edges_data,
         key=lambda x: x["description"] if x["description"] is not None else "",
+        token_count_key=lambda x: x.get("description_tokens"),
         max_token_size=query_param.max_token_for_global_context,
         tokenizer=tokenizer,
     )
@@ -3372,6 +4096,7 @@ async def _get_edge_data(
     edge_datas = truncate_list_by_token_size(
         edge_datas,
         key=lambda x: x["description"] if x["description"] is not None else "",
+        token_count_key=lambda x: x.get("description_tokens"),
         max_token_size=query_param.max_token_for_global_context,
         tokenizer=tokenizer,
     )
@@ -3489,6 +4214,7 @@ async def _find_most_related_entities_from_relationships(
     node_datas = truncate_list_by_token_size(
         node_datas,
         key=lambda x: x["description"] if x["description"] is not None else "",
+        token_count_key=lambda x: x.get("description_tokens"),
         max_token_size=query_param.max_token_for_local_context,
         tokenizer=tokenizer,
     )
@@ -3559,24 +4285,25 @@ async def _find_related_text_unit_from_relationships(
             test_split = split_string_by_multi_markers(clean_source_id(sample_source_ids[0]), [GRAPH_FIELD_SEP])
             logger.info(f"Chunk lookup: Test split of '{sample_source_ids[0]}' -> '{clean_source_id(sample_source_ids[0])}' with '{GRAPH_FIELD_SEP}' = {test_split}")
 
-    async def fetch_chunk_data(c_id, index):
-        if c_id not in all_text_units_lookup:
-            chunk_data = await text_chunks_db.get_by_id(c_id)
-            # Only store valid data
-            if chunk_data is not None and "content" in chunk_data:
-                all_text_units_lookup[c_id] = {
-                    "data": chunk_data,
-                    "order": index,
-                }
-            else:
-                logger.debug(f"Chunk {c_id} not found or missing content in text storage")
-
-    tasks = []
+    # Keep the first relationship referencing each chunk as its order
+    chunk_orders = {}
     for index, unit_list in enumerate(text_units):
         for c_id in unit_list:
-            tasks.append(fetch_chunk_data(c_id, index))
+            chunk_orders.setdefault(c_id, index)
 
-    await asyncio.gather(*tasks)
+    chunk_records = await get_chunks_by_ids_cached(
+        text_chunks_db, list(chunk_orders.keys())
+    )
+    for c_id, index in chunk_orders.items():
+        chunk_data = chunk_records.get(c_id)
+        # Only store valid data
+        if chunk_data is not None and "content" in chunk_data:
+            all_text_units_lookup[c_id] = {
+                "data": chunk_data,
+                "order": index,
+            }
+        else:
+            logger.debug(f"Chunk {c_id} not found or missing content in text storage")
     
     logger.info(f"Chunk lookup: Successfully fetched {len(all_text_units_lookup)} valid chunks")
 
@@ -3600,6 +4327,7 @@ async def _find_related_text_unit_from_relationships(
     truncated_text_units = truncate_list_by_token_size(
         valid_text_units,
         key=lambda x: x["data"]["content"],
+        token_count_key=lambda x: x["data"].get("tokens"),
         max_token_size=query_param.max_token_for_text_unit,
         tokenizer=tokenizer,
     )
@@ -3635,38 +4363,14 @@ async def get_relationships_by_chunk_ids(
         return {}
         
     logger.info(f"Chunk-based lookup: Querying {len(chunk_ids)} chunk_ids")
-    
-    # Build the Neo4j query to find relationships by chunk_ids
-    # Handle both single chunk_ids and multi-chunk source_ids separated by <SEP>
-    query = """
-    UNWIND $chunk_ids AS chunk_id
-    MATCH ()-[r]->() 
-    WHERE r.source_id = chunk_id 
-       OR r.source_id CONTAINS (chunk_id + $sep)
-       OR r.source_id CONTAINS ($sep + chunk_id)
-    RETURN chunk_id, 
-           properties(r) AS properties,
-           type(r) AS neo4j_type,
-           r.original_type AS original_type,
-           r.rel_type AS rel_type,
-           startNode(r).entity_name AS src_id,
-           endNode(r).entity_name AS tgt_id
-    """
-    
+
     try:
-        # Execute the query
-        if hasattr(knowledge_graph_inst, '_driver') and knowledge_graph_inst._driver:
-            # Direct Neo4j driver access
-            async with knowledge_graph_inst._driver.session() as session:
-                result = await session.run(
-                    query, 
-                    chunk_ids=chunk_ids, 
-                    sep=GRAPH_FIELD_SEP
-                )
-                records = await result.data()
+        # Graph storages look chunks up through their chunk index, scanning the
+        # relationships of chunks written before the index existed
+        if hasattr(knowledge_graph_inst, "get_edges_by_chunk_ids"):
+            records = await knowledge_graph_inst.get_edges_by_chunk_ids(chunk_ids)
         else:
-            # Fallback to custom query method if available
-            logger.warning("Using fallback method for Neo4j query")
+            logger.warning("Graph storage has no chunk index, skipping chunk-based lookup")
             return {}
             
         # Process results into the expected format
@@ -3810,6 +4514,7 @@ async def _get_edge_data_hybrid(
     edge_datas = truncate_list_by_token_size(
         edge_datas,
         key=lambda x: x["description"] if x["description"] is not None else "",
+        token_count_key=lambda x: x.get("description_tokens"),
         max_token_size=query_param.max_token_for_global_context,
         tokenizer=tokenizer,
     )
@@ -3993,6 +4698,7 @@ async def _get_edge_data_global(
     edge_datas = truncate_list_by_token_size(
         edge_datas,
         key=lambda x: x["description"] if x["description"] is not None else "",
+        token_count_key=lambda x: x.get("description_tokens"),
         max_token_size=query_param.max_token_for_global_context,
         tokenizer=tokenizer,
     )
@@ -4078,6 +4784,7 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    text_chunks_db: BaseKVStorage | None = None,
 ) -> str | AsyncIterator[str]:
     if query_param.model_func:
         use_model_func = query_param.model_func
@@ -4097,7 +4804,7 @@ async def naive_query(
     tokenizer: Tokenizer = global_config["tokenizer"]
 
     _, _, text_units_context = await _get_vector_context(
-        query, chunks_vdb, query_param, tokenizer
+        query, chunks_vdb, query_param, tokenizer, text_chunks_db
     )
 
     if text_units_context is None or len(text_units_context) == 0:
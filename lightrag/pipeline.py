@@ -0,0 +1,144 @@
+"""
+Staged document pipeline for LightRAG indexing.
+
+Documents flow through a chain of stages connected by bounded asyncio queues. Every
+stage runs its own pool of workers, so a document can be extracted while earlier
+documents are still merging, and the bounded queues apply backpressure instead of
+letting finished stages pile up work in memory. Per-stage statistics are published
+into pipeline_status["stages"].
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterable
+
+from .utils import logger
+
+# Marks the end of the input for one worker of a stage
+_STOP = object()
+
+
+@dataclass
+class PipelineStage:
+    """One stage of a StagedPipeline.
+
+    handler receives an item and returns the item for the next stage, or None to
+    drop it (e.g. a document that failed and was already marked as such).
+    """
+
+    name: str
+    handler: Callable[[Any], Awaitable[Any]]
+    workers: int = 1
+
+    running: int = 0
+    done: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    queue: asyncio.Queue | None = field(default=None, repr=False)
+
+    def snapshot(self, elapsed: float) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "running": self.running,
+            "done": self.done,
+            "failed": self.failed,
+            "avg_seconds": round(self.busy_seconds / self.done, 3)
+            if self.done
+            else 0.0,
+            "per_minute": round(self.done * 60 / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+class StagedPipeline:
+    """Run items through stages connected by bounded queues"""
+
+    def __init__(
+        self,
+        stages: list[PipelineStage],
+        queue_size: int = 1,
+        pipeline_status: dict | None = None,
+        pipeline_status_lock=None,
+    ):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.pipeline_status = pipeline_status
+        self.pipeline_status_lock = pipeline_status_lock
+        self._start_time = time.perf_counter()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Current queue depth and throughput of every stage"""
+        elapsed = time.perf_counter() - self._start_time
+        return {stage.name: stage.snapshot(elapsed) for stage in self.stages}
+
+    async def _publish_stats(self) -> None:
+        if self.pipeline_status is None:
+            return
+        stats = self.stats()
+        if self.pipeline_status_lock is not None:
+            async with self.pipeline_status_lock:
+                self.pipeline_status["stages"] = stats
+        else:
+            self.pipeline_status["stages"] = stats
+
+    async def _worker(self, index: int) -> None:
+        stage = self.stages[index]
+        next_queue = (
+            self.stages[index + 1].queue if index + 1 < len(self.stages) else None
+        )
+        while True:
+            item = await stage.queue.get()
+            if item is _STOP:
+                return
+            stage.running += 1
+            start = time.perf_counter()
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                # Handlers record their own failures, this only keeps the stage alive
+                logger.error(f"Pipeline stage '{stage.name}' failed: {e}")
+                result = None
+            finally:
+                stage.running -= 1
+                stage.busy_seconds += time.perf_counter() - start
+            if result is None:
+                stage.failed += 1
+            else:
+                stage.done += 1
+            await self._publish_stats()
+            if result is not None and next_queue is not None:
+                await next_queue.put(result)
+
+    async def run(self, items: Iterable[Any]) -> None:
+        """Feed items into the first stage and wait until every stage has drained"""
+        self._start_time = time.perf_counter()
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=self.queue_size)
+
+        stage_workers = [
+            [
+                asyncio.create_task(self._worker(index))
+                for _ in range(max(1, stage.workers))
+            ]
+            for index, stage in enumerate(self.stages)
+        ]
+        try:
+            first_queue = self.stages[0].queue
+            for item in items:
+                await first_queue.put(item)
+                await self._publish_stats()
+
+            # Stop each stage only after the previous one has finished feeding it
+            for stage, workers in zip(self.stages, stage_workers):
+                for _ in workers:
+                    await stage.queue.put(_STOP)
+                await asyncio.gather(*workers)
+        finally:
+            for workers in stage_workers:
+                for worker in workers:
+                    if not worker.done():
+                        worker.cancel()
+            await self._publish_stats()
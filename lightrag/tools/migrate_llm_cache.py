@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Convert kv_store_llm_response_cache.json files from the legacy mode-keyed layout
+({mode: {args_hash: entry}}) to per-entry keys ("{mode}:{args_hash}").
+
+JsonKVStorage also upgrades legacy files when it loads them, this tool does the
+conversion offline so large caches are not rewritten on the first server start.
+
+Usage:
+    python -m lightrag.tools.migrate_llm_cache ./rag_storage
+    python -m lightrag.tools.migrate_llm_cache ./rag_storage/kv_store_llm_response_cache.json --dry-run
+"""
+
+import argparse
+import os
+import shutil
+import sys
+
+from lightrag.utils import flatten_llm_cache, load_json, write_json
+
+CACHE_FILE_NAME = "kv_store_llm_response_cache.json"
+
+
+def migrate_cache_file(path: str, dry_run: bool = False, backup: bool = True) -> int:
+    """Flatten one cache file in place, returning the number of migrated entries"""
+    data = load_json(path)
+    if data is None:
+        raise FileNotFoundError(path)
+
+    flattened, migrated = flatten_llm_cache(data)
+    if not migrated:
+        print(f"{path}: already uses per-entry keys ({len(data)} entries)")
+        return 0
+
+    print(f"{path}: {migrated} legacy entries -> {len(flattened)} per-entry keys")
+    if dry_run:
+        return migrated
+
+    if backup:
+        backup_path = path + ".bak"
+        shutil.copy2(path, backup_path)
+        print(f"{path}: backup written to {backup_path}")
+    write_json(flattened, path)
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Migrate LightRAG LLM cache JSON files to per-entry keys"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help=f"Cache files or working directories containing {CACHE_FILE_NAME}",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without writing files"
+    )
+    parser.add_argument(
+        "--no-backup", action="store_true", help="Do not keep a .bak copy"
+    )
+    args = parser.parse_args()
+
+    total = 0
+    for path in args.paths:
+        if os.path.isdir(path):
+            path = os.path.join(path, CACHE_FILE_NAME)
+        try:
+            total += migrate_cache_file(
+                path, dry_run=args.dry_run, backup=not args.no_backup
+            )
+        except FileNotFoundError:
+            print(f"{path}: not found", file=sys.stderr)
+            sys.exit(1)
+
+    print(f"Migrated {total} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,13 @@ import logging
 import logging.handlers
 import os
 import re
+import struct
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
 from hashlib import md5
 from typing import Any, Protocol, Callable, TYPE_CHECKING, List
 import numpy as np
@@ -20,6 +25,10 @@ from lightrag.constants import (
     DEFAULT_LOG_MAX_BYTES,
     DEFAULT_LOG_BACKUP_COUNT,
     DEFAULT_LOG_FILENAME,
+    DEFAULT_CHUNK_CONTENT_CACHE_SIZE,
+    DEFAULT_TOKEN_COUNT_CACHE_SIZE,
+    DEFAULT_VECTOR_DB_MAX_ASYNC,
+    DEFAULT_VECTOR_DB_UPSERT_BATCH_SIZE,
 )
 
 
@@ -241,6 +250,55 @@ class EmbeddingFunc:
         return await self.func(*args, **kwargs)
 
 
+# Embeddings computed ahead of time for the query being answered in this context
+_prefetched_query_embeddings: ContextVar[dict[str, np.ndarray] | None] = ContextVar(
+    "prefetched_query_embeddings", default=None
+)
+
+
+def use_prefetched_query_embeddings(func):
+    """Serve embedding calls from embeddings prefetched by prefetch_query_embeddings
+
+    Must wrap the outermost embedding function handed to the storages, so the
+    lookup runs in the caller's context rather than in a limiter worker task.
+    """
+
+    @wraps(func)
+    async def wrapper(texts, *args, **kwargs):
+        prefetched = _prefetched_query_embeddings.get()
+        if (
+            prefetched
+            and texts
+            and all(isinstance(text, str) and text in prefetched for text in texts)
+        ):
+            return np.array([prefetched[text] for text in texts])
+        return await func(texts, *args, **kwargs)
+
+    return wrapper
+
+
+@asynccontextmanager
+async def prefetch_query_embeddings(embedding_func, texts: list[str]):
+    """Embed all query texts with one batched call for the duration of the block
+
+    Vector storage queries issued inside the block (including tasks started by
+    asyncio.gather) reuse these embeddings instead of embedding one text each.
+    """
+    unique_texts = list(dict.fromkeys(text for text in texts if text))
+    prefetched = {}
+    if unique_texts:
+        try:
+            embeddings = await embedding_func(unique_texts, _priority=5)
+            prefetched = dict(zip(unique_texts, embeddings))
+        except Exception as e:
+            logger.warning(f"Query embedding prefetch failed, embedding per query: {e}")
+    token = _prefetched_query_embeddings.set(prefetched)
+    try:
+        yield
+    finally:
+        _prefetched_query_embeddings.reset(token)
+
+
 def locate_json_string_body_from_string(content: str) -> str | None:
     """Locate the JSON string body from a string"""
     try:
@@ -735,18 +793,48 @@ def is_float_regex(value: str) -> bool:
     return bool(re.match(r"^[-+]?[0-9]*\.?[0-9]+$", value))
 
 
+# (tokenizer model name, content md5 digest) -> token count, least recently used first
+_token_count_memo: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+
+
+def count_tokens_cached(content: str, tokenizer: Tokenizer) -> int:
+    """Count the tokens of content, memoized by content hash in a bounded LRU"""
+    memo_key = (
+        getattr(tokenizer, "model_name", ""),
+        md5(content.encode("utf-8")).digest(),
+    )
+    count = _token_count_memo.get(memo_key)
+    if count is not None:
+        _token_count_memo.move_to_end(memo_key)
+        return count
+    count = len(tokenizer.encode(content))
+    _token_count_memo[memo_key] = count
+    if len(_token_count_memo) > DEFAULT_TOKEN_COUNT_CACHE_SIZE:
+        _token_count_memo.popitem(last=False)
+    return count
+
+
 def truncate_list_by_token_size(
     list_data: list[Any],
     key: Callable[[Any], str],
     max_token_size: int,
     tokenizer: Tokenizer,
+    token_count_key: Callable[[Any], int | None] | None = None,
 ) -> list[int]:
-    """Truncate a list of data by token size"""
+    """Truncate a list of data by token size
+
+    token_count_key returns the token count stored with an item at ingest time
+    (e.g. a chunk's "tokens"); items without one are counted through the
+    content-hash memo instead of being re-encoded on every query.
+    """
     if max_token_size <= 0:
         return []
     tokens = 0
     for i, data in enumerate(list_data):
-        tokens += len(tokenizer.encode(key(data)))
+        count = token_count_key(data) if token_count_key is not None else None
+        if not isinstance(count, int) or isinstance(count, bool):
+            count = count_tokens_cached(key(data), tokenizer)
+        tokens += count
         if tokens > max_token_size:
             return list_data[:i]
     return list_data
@@ -794,6 +882,528 @@ def process_combine_contexts(*context_lists):
     return combined_data
 
 
+class ChunkContentCache:
+    """LRU of text chunk records keyed by chunk id.
+
+    Chunk ids are content hashes, so a cached record never goes stale while
+    the chunk exists; deleted chunks are dropped through invalidate().
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CHUNK_CONTENT_CACHE_SIZE):
+        self.max_size = max_size
+        self._records: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get_many(self, chunk_ids: list[str]) -> dict[str, dict[str, Any]]:
+        found = {}
+        for chunk_id in chunk_ids:
+            record = self._records.get(chunk_id)
+            if record is None:
+                self.misses += 1
+                continue
+            self._records.move_to_end(chunk_id)
+            found[chunk_id] = record
+            self.hits += 1
+        return found
+
+    def put(self, chunk_id: str, record: dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        self._records[chunk_id] = record
+        self._records.move_to_end(chunk_id)
+        while len(self._records) > self.max_size:
+            self._records.popitem(last=False)
+
+    def invalidate(self, chunk_ids: list[str]) -> None:
+        for chunk_id in chunk_ids:
+            self._records.pop(chunk_id, None)
+
+
+# (working_dir, namespace) of a text chunk storage -> its content cache
+_chunk_content_caches: dict[tuple, ChunkContentCache] = {}
+
+
+def get_chunk_content_cache(text_chunks_db) -> ChunkContentCache:
+    """Get the process-wide chunk content LRU shared by all queries on a chunk storage"""
+    global_config = getattr(text_chunks_db, "global_config", None) or {}
+    key = (global_config.get("working_dir"), getattr(text_chunks_db, "namespace", ""))
+    cache = _chunk_content_caches.get(key)
+    if cache is None:
+        cache = ChunkContentCache(
+            global_config.get(
+                "chunk_content_cache_size", DEFAULT_CHUNK_CONTENT_CACHE_SIZE
+            )
+        )
+        _chunk_content_caches[key] = cache
+    return cache
+
+
+async def get_chunks_by_ids_cached(
+    text_chunks_db, chunk_ids: list[str]
+) -> dict[str, dict[str, Any]]:
+    """Fetch chunk records through the shared LRU, with one get_by_ids for all misses
+
+    Returns:
+        Mapping of chunk id to chunk record for the chunks that exist
+    """
+    cache = get_chunk_content_cache(text_chunks_db)
+    unique_ids = list(dict.fromkeys(chunk_ids))
+    records = cache.get_many(unique_ids)
+    missing_ids = [chunk_id for chunk_id in unique_ids if chunk_id not in records]
+    if missing_ids:
+        rows = await text_chunks_db.get_by_ids(missing_ids)
+        for position, row in enumerate(rows or []):
+            if not row:
+                continue
+            # Some backends return only the rows found, identified by id
+            chunk_id = row.get("id") or row.get("_id")
+            if chunk_id is None and position < len(missing_ids):
+                chunk_id = missing_ids[position]
+            if chunk_id is None:
+                continue
+            records[chunk_id] = row
+            cache.put(chunk_id, row)
+    return records
+
+
+class BlockingClientExecutor:
+    """Run calls of a synchronous storage client without blocking the event loop
+
+    Calls go to a dedicated thread pool, so a slow database cannot starve the default
+    executor, and at most max_workers requests of the storage are in flight.
+    """
+
+    def __init__(self, max_workers: int, name: str):
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix=name
+        )
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def get_vector_db_io_settings(storage_kwargs: dict[str, Any]) -> tuple[int, int]:
+    """Upsert batch size and max parallel requests for remote vector storages
+
+    Values in vector_db_storage_cls_kwargs win over the environment.
+    """
+    batch_size = storage_kwargs.get("upsert_batch_size") or get_env_value(
+        "VECTOR_DB_UPSERT_BATCH_SIZE", DEFAULT_VECTOR_DB_UPSERT_BATCH_SIZE, int
+    )
+    max_async = storage_kwargs.get("max_async") or get_env_value(
+        "VECTOR_DB_MAX_ASYNC", DEFAULT_VECTOR_DB_MAX_ASYNC, int
+    )
+    return max(1, int(batch_size)), max(1, int(max_async))
+
+
+async def run_in_batches(
+    items: list[Any],
+    batch_size: int,
+    handler: Callable[[list[Any]], Any],
+    max_async: int,
+) -> list[Any]:
+    """Call the async handler on consecutive batches of items, max_async at a time"""
+    semaphore = asyncio.Semaphore(max(1, max_async))
+
+    async def _run(batch):
+        async with semaphore:
+            return await handler(batch)
+
+    return await asyncio.gather(
+        *[
+            _run(items[i : i + batch_size])
+            for i in range(0, len(items), max(1, batch_size))
+        ]
+    )
+
+
+class CacheEmbeddingIndex:
+    """Similarity index over the cached prompt embeddings of one (mode, cache_type).
+
+    Embeddings are dequantized and L2-normalized once and kept in a contiguous
+    float32 matrix, so a lookup is a single matrix-vector product plus argmax.
+
+    For the local JSON KV storage, entries are appended to a binary sidecar log
+    instead of storing hex strings in the cache JSON. Records appended by other
+    processes are picked up on the next lookup. Once the log holds more than twice
+    as many records as live entries (overwritten or removed entries), it is
+    compacted; records another process appends while compaction rewrites the log
+    are lost, which only costs a cache miss.
+    """
+
+    # record layout: id length (uint16), dimension (uint32), id bytes, float32 vector
+    _RECORD_HEADER = struct.Struct("<HI")
+    _INITIAL_CAPACITY = 64
+    _COMPACT_MIN_RECORDS = 1024
+
+    def __init__(self, sidecar_path: str | None = None):
+        self.sidecar_path = sidecar_path
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._size = 0
+        self._sidecar_offset = 0
+        self._sidecar_inode = None
+        self._sidecar_records = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, cache_id: str) -> bool:
+        return cache_id in self._positions
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if not np.isfinite(norm) or norm == 0:
+            return None
+        return vector / norm
+
+    def _set_row(self, cache_id: str, vector: np.ndarray) -> bool:
+        dim = vector.shape[0]
+        if self._size == 0 and self._matrix.shape[1] != dim:
+            self._matrix = np.empty((self._INITIAL_CAPACITY, dim), dtype=np.float32)
+        elif self._matrix.shape[1] != dim:
+            logger.warning(
+                f"Skipping cached embedding {cache_id}: dimension {dim} != {self._matrix.shape[1]}"
+            )
+            return False
+
+        position = self._positions.get(cache_id)
+        if position is None:
+            if self._size == self._matrix.shape[0]:
+                grown = np.empty((self._size * 2, dim), dtype=np.float32)
+                grown[: self._size] = self._matrix[: self._size]
+                self._matrix = grown
+            position = self._size
+            self._size += 1
+            self._ids.append(cache_id)
+            self._positions[cache_id] = position
+        self._matrix[position] = vector
+        return True
+
+    def _reset(self) -> None:
+        self._ids, self._positions, self._size = [], {}, 0
+        self._sidecar_offset = 0
+        self._sidecar_inode = None
+        self._sidecar_records = 0
+
+    def add(self, cache_id: str, embedding, persist: bool = True) -> None:
+        """Add or replace the embedding of a cache entry"""
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        if self._set_row(cache_id, vector) and persist and self.sidecar_path:
+            self._append_record(cache_id, vector)
+
+    def remove(self, cache_id: str) -> None:
+        """Drop an entry from the in-memory index (e.g. after the cache was cleared)"""
+        position = self._positions.pop(cache_id, None)
+        if position is None:
+            return
+        last = self._size - 1
+        if position != last:
+            last_id = self._ids[last]
+            self._matrix[position] = self._matrix[last]
+            self._ids[position] = last_id
+            self._positions[last_id] = position
+        self._ids.pop()
+        self._size -= 1
+
+    def clear(self) -> None:
+        """Drop all entries and empty the sidecar"""
+        self._reset()
+        if self.sidecar_path:
+            self._replace_sidecar([])
+
+    def search(self, embedding, top_k: int = 1) -> list[tuple[str, float]]:
+        """Return up to top_k (cache_id, cosine similarity) pairs, best first"""
+        self.refresh()
+        if self._size == 0:
+            return []
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != self._matrix.shape[1]:
+            return []
+
+        scores = self._matrix[: self._size] @ query
+        k = min(top_k, self._size)
+        if k == 1:
+            best = int(np.argmax(scores))
+            return [(self._ids[best], float(scores[best]))]
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[i], float(scores[i])) for i in top]
+
+    @classmethod
+    def _encode_record(cls, cache_id: str, vector: np.ndarray) -> bytes:
+        id_bytes = cache_id.encode("utf-8")
+        return (
+            cls._RECORD_HEADER.pack(len(id_bytes), vector.shape[0])
+            + id_bytes
+            + vector.astype("<f4").tobytes()
+        )
+
+    def _append_record(self, cache_id: str, vector: np.ndarray) -> None:
+        record = self._encode_record(cache_id, vector)
+        try:
+            with open(self.sidecar_path, "ab") as f:
+                start = f.tell()
+                f.write(record)
+                inode = os.fstat(f.fileno()).st_ino
+            # Skip re-reading our own record unless other writers appended before it
+            if start == self._sidecar_offset:
+                self._sidecar_offset = start + len(record)
+                self._sidecar_inode = inode
+            self._sidecar_records += 1
+        except OSError as e:
+            logger.warning(f"Failed to persist cache embedding {cache_id}: {e}")
+            return
+        if self._sidecar_records > max(self._COMPACT_MIN_RECORDS, 2 * self._size):
+            self.compact()
+
+    def _replace_sidecar(self, records: list[bytes]) -> None:
+        tmp_path = f"{self.sidecar_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.writelines(records)
+                size = f.tell()
+                inode = os.fstat(f.fileno()).st_ino
+            os.replace(tmp_path, self.sidecar_path)
+        except OSError as e:
+            logger.warning(
+                f"Failed to rewrite cache embeddings {self.sidecar_path}: {e}"
+            )
+            return
+        self._sidecar_offset = size
+        self._sidecar_inode = inode
+        self._sidecar_records = len(records)
+
+    def compact(self) -> None:
+        """Rewrite the sidecar with only the live entries"""
+        if not self.sidecar_path:
+            return
+        self.refresh()
+        self._replace_sidecar(
+            [
+                self._encode_record(cache_id, self._matrix[position])
+                for cache_id, position in self._positions.items()
+            ]
+        )
+        logger.debug(
+            f"Compacted cache embeddings {self.sidecar_path} to {self._size} records"
+        )
+
+    def refresh(self) -> None:
+        """Load records appended to the sidecar since the last read"""
+        if not self.sidecar_path:
+            return
+        try:
+            stat = os.stat(self.sidecar_path)
+        except OSError:
+            if self._sidecar_inode is not None:
+                # Sidecar was removed, nothing of it is valid anymore
+                self._reset()
+            return
+        if stat.st_size < self._sidecar_offset or (
+            self._sidecar_inode is not None and stat.st_ino != self._sidecar_inode
+        ):
+            # Sidecar was compacted, cleared or replaced, rebuild from scratch
+            self._reset()
+        self._sidecar_inode = stat.st_ino
+        if stat.st_size == self._sidecar_offset:
+            return
+
+        with open(self.sidecar_path, "rb") as f:
+            f.seek(self._sidecar_offset)
+            data = f.read(stat.st_size - self._sidecar_offset)
+
+        header_size = self._RECORD_HEADER.size
+        pos = 0
+        while pos + header_size <= len(data):
+            id_len, dim = self._RECORD_HEADER.unpack_from(data, pos)
+            id_start = pos + header_size
+            vector_start = id_start + id_len
+            end = vector_start + dim * 4
+            if end > len(data):
+                break  # partially written record, read it next time
+            cache_id = data[id_start:vector_start].decode("utf-8")
+            vector = np.frombuffer(data, dtype="<f4", count=dim, offset=vector_start)
+            self._set_row(cache_id, vector.astype(np.float32))
+            self._sidecar_records += 1
+            pos = end
+        self._sidecar_offset += pos
+
+
+# (working_dir, namespace, mode, cache_type) -> index
+_cache_embedding_indexes: dict[tuple, CacheEmbeddingIndex] = {}
+# (working_dir, namespace, mode) -> watermark of the KV embeddings indexed so far
+_cache_embedding_watermarks: dict[tuple, Any] = {}
+
+
+def _cache_index_scope(hashing_kv) -> tuple[str | None, str]:
+    global_config = getattr(hashing_kv, "global_config", None) or {}
+    return global_config.get("working_dir"), getattr(
+        hashing_kv, "namespace", "llm_response_cache"
+    )
+
+
+def _uses_cache_embedding_sidecar(hashing_kv) -> bool:
+    """Whether cache embeddings of this storage live in a local sidecar
+
+    Only local storages (JsonKVStorage) opt in. Shared backends (Redis, PostgreSQL,
+    MongoDB) keep the quantized embedding with the cache entry, so every host sees
+    it, and hand out new ones through get_cache_embeddings_since.
+    """
+    working_dir, _ = _cache_index_scope(hashing_kv)
+    return bool(working_dir) and getattr(hashing_kv, "cache_embedding_sidecar", False)
+
+
+def _cache_embedding_sidecar_prefix(hashing_kv, mode: str) -> str:
+    _, namespace = _cache_index_scope(hashing_kv)
+    return f"kv_store_{namespace}_{mode}_"
+
+
+def get_cache_embedding_index(
+    hashing_kv, mode: str, cache_type: str | None
+) -> CacheEmbeddingIndex:
+    """Get (or create) the process-wide embedding index for a cache mode and type"""
+    working_dir, namespace = _cache_index_scope(hashing_kv)
+    key = (working_dir, namespace, mode, cache_type)
+    index = _cache_embedding_indexes.get(key)
+    if index is None:
+        sidecar_path = (
+            os.path.join(
+                working_dir,
+                f"{_cache_embedding_sidecar_prefix(hashing_kv, mode)}{cache_type}.emb",
+            )
+            if _uses_cache_embedding_sidecar(hashing_kv)
+            else None
+        )
+        index = CacheEmbeddingIndex(sidecar_path)
+        _cache_embedding_indexes[key] = index
+    return index
+
+
+def clear_cache_embedding_indexes(hashing_kv, modes: list[str] | None = None) -> None:
+    """Empty the embedding indexes (and sidecars) of the given cache modes, or all"""
+    working_dir, namespace = _cache_index_scope(hashing_kv)
+    for (index_dir, index_namespace, index_mode, _), index in list(
+        _cache_embedding_indexes.items()
+    ):
+        if (index_dir, index_namespace) == (working_dir, namespace) and (
+            modes is None or index_mode in modes
+        ):
+            index.clear()
+    for scope in list(_cache_embedding_watermarks):
+        if scope[:2] == (working_dir, namespace) and (
+            modes is None or scope[2] in modes
+        ):
+            del _cache_embedding_watermarks[scope]
+    if not _uses_cache_embedding_sidecar(hashing_kv) or not os.path.isdir(working_dir):
+        return
+    # Sidecars written by earlier runs that this process never indexed
+    prefixes = (
+        tuple(_cache_embedding_sidecar_prefix(hashing_kv, mode) for mode in modes)
+        if modes is not None
+        else (f"kv_store_{namespace}_",)
+    )
+    for file_name in os.listdir(working_dir):
+        if file_name.startswith(prefixes) and file_name.endswith(".emb"):
+            try:
+                os.remove(os.path.join(working_dir, file_name))
+            except OSError as e:
+                logger.warning(f"Failed to remove cache embeddings {file_name}: {e}")
+
+
+async def _index_kv_cache_embeddings(hashing_kv, mode: str) -> None:
+    """Index the quantized embeddings stored with the cache entries of a mode
+
+    These are entries of shared backends and legacy JSON entries written before
+    the sidecar existed. Only entries written since the previous call are fetched
+    (see BaseKVStorage.get_cache_embeddings_since), so a lookup does not grow with
+    the size of the cache.
+    """
+    working_dir, namespace = _cache_index_scope(hashing_kv)
+    scope = (working_dir, namespace, mode)
+    entries, watermark = await hashing_kv.get_cache_embeddings_since(
+        mode, _cache_embedding_watermarks.get(scope)
+    )
+    _cache_embedding_watermarks[scope] = watermark
+    for cache_id, cache_data in entries.items():
+        embedding_min = cache_data.get("embedding_min")
+        embedding_max = cache_data.get("embedding_max")
+        if (
+            embedding_min is None
+            or embedding_max is None
+            or embedding_min >= embedding_max
+        ):
+            logger.warning(
+                f"Invalid embedding min/max values: min={embedding_min}, max={embedding_max}"
+            )
+            continue
+        try:
+            cached_quantized = np.frombuffer(
+                bytes.fromhex(cache_data["embedding"]), dtype=np.uint8
+            ).reshape(cache_data["embedding_shape"])
+            cached_embedding = dequantize_embedding(
+                cached_quantized, embedding_min, embedding_max
+            )
+        except Exception as e:
+            logger.warning(f"Error processing cached embedding: {str(e)}")
+            continue
+        get_cache_embedding_index(hashing_kv, mode, cache_data.get("cache_type")).add(
+            cache_id, cached_embedding, persist=False
+        )
+
+
+async def _get_mode_embedding_indexes(
+    hashing_kv, mode: str, cache_type: str | None
+) -> list[CacheEmbeddingIndex]:
+    """Indexes to search for a lookup
+
+    Embeddings stored with the cache entries since the previous lookup are indexed
+    first, so entries saved by other hosts of a shared backend are found. Sidecar
+    storages also register the sidecars written by earlier runs, once.
+    """
+    working_dir, namespace = _cache_index_scope(hashing_kv)
+    scope = (working_dir, namespace, mode)
+    if (
+        scope not in _cache_embedding_watermarks
+        and _uses_cache_embedding_sidecar(hashing_kv)
+        and os.path.isdir(working_dir)
+    ):
+        # Register sidecars written by earlier runs so untyped lookups see them
+        prefix = _cache_embedding_sidecar_prefix(hashing_kv, mode)
+        for file_name in os.listdir(working_dir):
+            if file_name.startswith(prefix) and file_name.endswith(".emb"):
+                get_cache_embedding_index(
+                    hashing_kv, mode, file_name[len(prefix) : -len(".emb")]
+                )
+    await _index_kv_cache_embeddings(hashing_kv, mode)
+
+    if cache_type:
+        return [get_cache_embedding_index(hashing_kv, mode, cache_type)]
+    return [
+        index
+        for (index_dir, index_namespace, index_mode, _), index in (
+            _cache_embedding_indexes.items()
+        )
+        if (index_dir, index_namespace, index_mode) == scope
+    ]
+
+
 async def get_best_cached_response(
     hashing_kv,
     current_embedding,
@@ -807,60 +1417,31 @@ async def get_best_cached_response(
     logger.debug(
         f"get_best_cached_response:  mode={mode} cache_type={cache_type} use_llm_check={use_llm_check}"
     )
-    mode_cache = await hashing_kv.get_by_id(mode)
-    if not mode_cache:
-        return None
-
     best_similarity = -1
     best_response = None
     best_prompt = None
     best_cache_id = None
 
-    # Only iterate through cache entries for this mode
-    for cache_id, cache_data in mode_cache.items():
-        # Skip if cache_type doesn't match
-        if cache_type and cache_data.get("cache_type") != cache_type:
-            continue
-
-        # Check if cache data is valid
-        if cache_data["embedding"] is None:
-            continue
-
-        try:
-            # Safely convert cached embedding
-            cached_quantized = np.frombuffer(
-                bytes.fromhex(cache_data["embedding"]), dtype=np.uint8
-            ).reshape(cache_data["embedding_shape"])
-
-            # Ensure min_val and max_val are valid float values
-            embedding_min = cache_data.get("embedding_min")
-            embedding_max = cache_data.get("embedding_max")
-
-            if (
-                embedding_min is None
-                or embedding_max is None
-                or embedding_min >= embedding_max
-            ):
-                logger.warning(
-                    f"Invalid embedding min/max values: min={embedding_min}, max={embedding_max}"
-                )
-                continue
+    # A few candidates per index so entries dropped from the cache can be skipped
+    candidates = []
+    for index in await _get_mode_embedding_indexes(hashing_kv, mode, cache_type):
+        candidates.extend(
+            (similarity, cache_id, index)
+            for cache_id, similarity in index.search(current_embedding, top_k=8)
+        )
+    candidates.sort(key=lambda candidate: candidate[0], reverse=True)
 
-            cached_embedding = dequantize_embedding(
-                cached_quantized,
-                embedding_min,
-                embedding_max,
-            )
-        except Exception as e:
-            logger.warning(f"Error processing cached embedding: {str(e)}")
+    for similarity, cache_id, index in candidates:
+        cached = await hashing_kv.get_by_mode_and_id(mode, cache_id)
+        cache_data = (cached or {}).get(cache_id)
+        if not cache_data:
+            index.remove(cache_id)
             continue
-
-        similarity = cosine_similarity(current_embedding, cached_embedding)
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_response = cache_data["return"]
-            best_prompt = cache_data["original_prompt"]
-            best_cache_id = cache_id
+        best_similarity = similarity
+        best_response = cache_data["return"]
+        best_prompt = cache_data["original_prompt"]
+        best_cache_id = cache_id
+        break
 
     if best_similarity > similarity_threshold:
         # If LLM check is enabled and all required parameters are provided
@@ -983,10 +1564,7 @@ async def handle_cache(
         if not hashing_kv.global_config.get("enable_llm_cache_for_entity_extract"):
             return None, None, None, None
 
-    if exists_func(hashing_kv, "get_by_mode_and_id"):
-        mode_cache = await hashing_kv.get_by_mode_and_id(mode, args_hash) or {}
-    else:
-        mode_cache = await hashing_kv.get_by_id(mode) or {}
+    mode_cache = await hashing_kv.get_by_mode_and_id(mode, args_hash) or {}
     if args_hash in mode_cache:
         logger.debug(f"Non-embedding cached hit(mode:{mode} type:{cache_type})")
         return mode_cache[args_hash]["return"], None, None, None
@@ -995,6 +1573,34 @@ async def handle_cache(
     return None, None, None, None
 
 
+def make_llm_cache_key(mode: str, args_hash: str) -> str:
+    """Flat storage key of an LLM cache entry"""
+    return f"{mode}:{args_hash}"
+
+
+def is_legacy_llm_cache_bucket(key: str, value: Any) -> bool:
+    """Whether a cache record is a legacy {args_hash: entry} dict stored under its mode"""
+    return ":" not in key and isinstance(value, dict) and "return" not in value
+
+
+def flatten_llm_cache(data: dict[str, Any]) -> tuple[dict[str, Any], int]:
+    """Convert legacy mode-keyed cache buckets into flat (mode, args_hash) entries
+
+    Returns:
+        The flattened cache and the number of entries moved out of legacy buckets
+    """
+    flattened = {}
+    migrated = 0
+    for key, value in data.items():
+        if is_legacy_llm_cache_bucket(key, value):
+            for args_hash, entry in value.items():
+                flattened[make_llm_cache_key(key, args_hash)] = entry
+                migrated += 1
+        else:
+            flattened[key] = value
+    return flattened, migrated
+
+
 @dataclass
 class CacheData:
     args_hash: str
@@ -1023,14 +1629,10 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
         logger.debug("Streaming response detected, skipping cache")
         return
 
-    # Get existing cache data
-    if exists_func(hashing_kv, "get_by_mode_and_id"):
-        mode_cache = (
-            await hashing_kv.get_by_mode_and_id(cache_data.mode, cache_data.args_hash)
-            or {}
-        )
-    else:
-        mode_cache = await hashing_kv.get_by_id(cache_data.mode) or {}
+    # Get the existing entry only, never the whole mode cache
+    mode_cache = (
+        await hashing_kv.get_by_mode_and_id(cache_data.mode, cache_data.args_hash) or {}
+    )
 
     # Check if we already have identical content cached
     if cache_data.args_hash in mode_cache:
@@ -1041,27 +1643,42 @@ async def save_to_cache(hashing_kv, cache_data: CacheData):
             )
             return
 
-    # Update cache with new content
-    mode_cache[cache_data.args_hash] = {
+    # Update cache with new content. Local storages keep embeddings in the binary
+    # sidecar index, shared backends in the entry so that other hosts can use them
+    entry = {
         "return": cache_data.content,
         "cache_type": cache_data.cache_type,
-        "embedding": (
-            cache_data.quantized.tobytes().hex()
-            if cache_data.quantized is not None
-            else None
-        ),
-        "embedding_shape": (
-            cache_data.quantized.shape if cache_data.quantized is not None else None
-        ),
-        "embedding_min": cache_data.min_val,
-        "embedding_max": cache_data.max_val,
+        "embedding": None,
+        "embedding_shape": None,
+        "embedding_min": None,
+        "embedding_max": None,
         "original_prompt": cache_data.prompt,
     }
+    if cache_data.quantized is not None:
+        uses_sidecar = _uses_cache_embedding_sidecar(hashing_kv)
+        if not uses_sidecar:
+            entry.update(
+                {
+                    "embedding": cache_data.quantized.tobytes().hex(),
+                    "embedding_shape": list(cache_data.quantized.shape),
+                    "embedding_min": float(cache_data.min_val),
+                    "embedding_max": float(cache_data.max_val),
+                }
+            )
+        get_cache_embedding_index(
+            hashing_kv, cache_data.mode, cache_data.cache_type
+        ).add(
+            cache_data.args_hash,
+            dequantize_embedding(
+                cache_data.quantized, cache_data.min_val, cache_data.max_val
+            ),
+            persist=uses_sidecar,
+        )
 
     logger.info(f" == LLM cache == saving {cache_data.mode}: {cache_data.args_hash}")
 
     # Only upsert if there's actual new content
-    await hashing_kv.upsert({cache_data.mode: mode_cache})
+    await hashing_kv.upsert_cache_entry(cache_data.mode, cache_data.args_hash, entry)
 
 
 def safe_unicode_decode(content):
@@ -1589,11 +2206,13 @@ async def use_llm_func_with_cache(
                 logger.debug(f"Found cache for {arg_hash}")
             statistic_data["llm_cache"] += 1
             return cached_return
-        
+
         # Cache miss - log for post-processing
         if cache_type == "post_process":
-            logger.info(f"Cache MISS for chunk post-processing: {arg_hash} - Processing with LLM")
-        
+            logger.info(
+                f"Cache MISS for chunk post-processing: {arg_hash} - Processing with LLM"
+            )
+
         statistic_data["llm_call"] += 1
 
         # Call LLM
@@ -1695,7 +2314,7 @@ def normalize_extracted_info(name: str, is_entity=False) -> str:
         # remove English queotes in and around chinese
         name = re.sub(r"['\"]+(?=[\u4e00-\u9fa5])", "", name)
         name = re.sub(r"(?<=[\u4e00-\u9fa5])['\"]+", "", name)
-        
+
         # Jason-specific identity normalization
         if name.strip().lower() == "jason cox":
             name = "Jason"
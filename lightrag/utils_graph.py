@@ -6,10 +6,20 @@ from typing import Any, cast
 
 from .kg.shared_storage import get_graph_db_lock
 from .prompt import GRAPH_FIELD_SEP
-from .utils import compute_mdhash_id, logger
+from .utils import compute_mdhash_id, count_tokens_cached, logger
 from .base import StorageNameSpace
 
 
+def _refresh_description_tokens(chunk_entity_relation_graph, data: dict) -> None:
+    """Recount the stored description token count after a description change"""
+    global_config = getattr(chunk_entity_relation_graph, "global_config", None) or {}
+    tokenizer = global_config.get("tokenizer")
+    if tokenizer is not None and data.get("description") is not None:
+        data["description_tokens"] = count_tokens_cached(data["description"], tokenizer)
+    else:
+        data.pop("description_tokens", None)
+
+
 async def adelete_by_entity(
     chunk_entity_relation_graph, entities_vdb, relationships_vdb, entity_name: str
 ) -> None:
@@ -172,6 +182,7 @@ async def aedit_entity(
             # 2. Update entity information in the graph
             new_node_data = {**node_data, **updated_data}
             new_node_data["entity_id"] = new_entity_name
+            _refresh_description_tokens(chunk_entity_relation_graph, new_node_data)
 
             if "entity_name" in new_node_data:
                 del new_node_data[
@@ -378,6 +389,7 @@ async def aedit_relation(
 
             # 2. Update relation information in the graph
             new_edge_data = {**edge_data, **updated_data}
+            _refresh_description_tokens(chunk_entity_relation_graph, new_edge_data)
             await chunk_entity_relation_graph.upsert_edge(
                 source_entity, target_entity, new_edge_data
             )
@@ -739,6 +751,7 @@ async def amerge_entities(
 
             # 5. Create or update the target entity
             merged_entity_data["entity_id"] = target_entity
+            _refresh_description_tokens(chunk_entity_relation_graph, merged_entity_data)
             if not target_exists:
                 await chunk_entity_relation_graph.upsert_node(
                     target_entity, merged_entity_data
@@ -794,6 +807,9 @@ async def amerge_entities(
 
             # Apply relationship updates
             for rel_data in relation_updates.values():
+                _refresh_description_tokens(
+                    chunk_entity_relation_graph, rel_data["data"]
+                )
                 await chunk_entity_relation_graph.upsert_edge(
                     rel_data["src"], rel_data["tgt"], rel_data["data"]
                 )
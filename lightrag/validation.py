@@ -59,11 +59,11 @@ class ContentSanitizer:
     """Sanitize and clean content for safe processing"""
 
     @staticmethod
-    def sanitize_text(text: str, max_length: int = 100000) -> str:
-        """Sanitize text content for safe processing"""
-        if not isinstance(text, str):
-            return str(text) if text is not None else ""
+    def sanitize_span(text: str) -> str:
+        """Sanitize a span of a larger text without trimming or truncating it
 
+        Spans cut at line starts sanitize to the same text as the whole document.
+        """
         # Remove or escape HTML/XML tags
         text = html.escape(text)
 
@@ -71,12 +71,20 @@ class ContentSanitizer:
         text = unicodedata.normalize("NFKC", text)
 
         # Remove control characters except common whitespace
-        text = "".join(
+        return "".join(
             char
             for char in text
             if unicodedata.category(char) != "Cc" or char in "\n\r\t "
         )
 
+    @staticmethod
+    def sanitize_text(text: str, max_length: int = 100000) -> str:
+        """Sanitize text content for safe processing"""
+        if not isinstance(text, str):
+            return str(text) if text is not None else ""
+
+        text = ContentSanitizer.sanitize_span(text)
+
         # Limit length
         if len(text) > max_length:
             text = text[:max_length] + "..."
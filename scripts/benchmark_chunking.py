@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming chunker against the previous list-based chunker.
+
+Every document in the input directory is chunked by both implementations, once as
+is and once repeated --scale times to simulate very large transcripts. The script
+reports wall time, peak Python memory (tracemalloc) and whether both produced the
+same chunk contents and token counts. The previous chunker truncated documents to
+100k characters while sanitizing them, so larger runs are expected to differ.
+
+Usage:
+    python scripts/benchmark_chunking.py
+    python scripts/benchmark_chunking.py --input-dir ExampleDocuments --scale 200 --split "\n\n"
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+from lightrag.operate import iter_chunks_by_token_size
+from lightrag.utils import TiktokenTokenizer, Tokenizer, logger
+from lightrag.validation import DocumentValidator, log_validation_errors
+
+
+# Previous implementation, kept verbatim as the baseline
+
+
+def _legacy_chunk_by_tokens_only(
+    tokenizer: Tokenizer,
+    content: str,
+    overlap_token_size: int,
+    max_token_size: int,
+) -> list[dict[str, Any]]:
+    """Split content by tokens only (no header detection)"""
+    tokens = tokenizer.encode(content)
+    chunks = []
+
+    for start in range(0, len(tokens), max_token_size - overlap_token_size):
+        end = min(start + max_token_size, len(tokens))
+        chunk_tokens = tokens[start:end]
+        chunk_content = tokenizer.decode(chunk_tokens)
+        if chunk_content.strip():
+            chunks.append(
+                {
+                    "content": chunk_content.strip(),
+                    "tokens": len(chunk_tokens),
+                    "chunk_order_index": len(chunks),
+                }
+            )
+
+    return chunks
+
+
+def _legacy_chunk_by_headers(
+    tokenizer: Tokenizer,
+    content: str,
+    max_token_size: int,
+    overlap_token_size: int,
+) -> list[dict[str, Any]]:
+    """Split content by markdown headers (# and ##)"""
+    lines = content.split("\n")
+    chunks = []
+    current_chunk_lines = []
+
+    for line in lines:
+        # Check if this line is a header (starts with # or ##)
+        if line.strip().startswith("# ") or line.strip().startswith("## "):
+            # If we have accumulated content, process it as a chunk
+            if current_chunk_lines:
+                chunk_content = "\n".join(current_chunk_lines).strip()
+                if chunk_content:
+                    chunk_tokens = tokenizer.encode(chunk_content)
+                    if len(chunk_tokens) > max_token_size:
+                        # If too large, split recursively with token-based method
+                        sub_chunks = _legacy_chunk_by_tokens_only(
+                            tokenizer, chunk_content, overlap_token_size, max_token_size
+                        )
+                        chunks.extend(sub_chunks)
+                    else:
+                        chunks.append(
+                            {
+                                "content": chunk_content,
+                                "tokens": len(chunk_tokens),
+                                "chunk_order_index": len(chunks),
+                            }
+                        )
+
+            # Start new chunk with this header
+            current_chunk_lines = [line]
+        else:
+            # Add non-header line to current chunk
+            current_chunk_lines.append(line)
+
+    # Process the last chunk
+    if current_chunk_lines:
+        chunk_content = "\n".join(current_chunk_lines).strip()
+        if chunk_content:
+            chunk_tokens = tokenizer.encode(chunk_content)
+            if len(chunk_tokens) > max_token_size:
+                sub_chunks = _legacy_chunk_by_tokens_only(
+                    tokenizer, chunk_content, overlap_token_size, max_token_size
+                )
+                chunks.extend(sub_chunks)
+            else:
+                chunks.append(
+                    {
+                        "content": chunk_content,
+                        "tokens": len(chunk_tokens),
+                        "chunk_order_index": len(chunks),
+                    }
+                )
+
+    logger.info(
+        f"Header-based chunking created {len(chunks)} chunks from content with headers"
+    )
+    return chunks
+
+
+def legacy_chunking_by_token_size(
+    tokenizer: Tokenizer,
+    content: str,
+    split_by_character: str | None = None,
+    split_by_character_only: bool = False,
+    overlap_token_size: int = 128,
+    max_token_size: int = 1024,
+) -> list[dict[str, Any]]:
+    # Validate input content
+    validation_result = DocumentValidator.validate_content(content)
+    if not validation_result.is_valid:
+        logger.error("Content validation failed during chunking")
+        log_validation_errors(validation_result.errors, "chunking")
+        # Use original content but log the issues
+
+    # Use sanitized content if available
+    if validation_result.sanitized_data:
+        content = validation_result.sanitized_data["content"]
+        logger.debug(
+            f"Using sanitized content: {validation_result.sanitized_data['original_length']} -> {validation_result.sanitized_data['sanitized_length']} chars"
+        )
+
+    tokens = tokenizer.encode(content)
+    results: list[dict[str, Any]] = []
+
+    # First check if we should split by markdown headers
+    if split_by_character is None and ("# " in content or "## " in content):
+        logger.debug("Detecting markdown headers - using header-based chunking")
+        return _legacy_chunk_by_headers(
+            tokenizer, content, max_token_size, overlap_token_size
+        )
+
+    if split_by_character:
+        raw_chunks = content.split(split_by_character)
+        new_chunks = []
+        if split_by_character_only:
+            for chunk in raw_chunks:
+                _tokens = tokenizer.encode(chunk)
+                new_chunks.append((len(_tokens), chunk))
+        else:
+            for chunk in raw_chunks:
+                _tokens = tokenizer.encode(chunk)
+                if len(_tokens) <= max_token_size:
+                    new_chunks.append((len(_tokens), chunk))
+                else:
+                    # If chunk is still too large, split it recursively
+                    sub_chunks = legacy_chunking_by_token_size(
+                        tokenizer,
+                        chunk,
+                        None,
+                        False,
+                        overlap_token_size,
+                        max_token_size,
+                    )
+                    for sub_chunk in sub_chunks:
+                        new_chunks.append(
+                            (
+                                len(tokenizer.encode(sub_chunk["content"])),
+                                sub_chunk["content"],
+                            )
+                        )
+    else:
+        new_chunks = []
+        for start in range(0, len(tokens), max_token_size - overlap_token_size):
+            end = min(start + max_token_size, len(tokens))
+            chunk_tokens = tokens[start:end]
+            chunk_content = tokenizer.decode(chunk_tokens)
+            if chunk_content.strip():
+                new_chunks.append((len(chunk_tokens), chunk_content))
+
+    for token_count, chunk_content in new_chunks:
+        # Validate each chunk
+        chunk_data = {
+            "content": chunk_content,
+            "tokens": token_count,
+            "chunk_order_index": len(results),
+        }
+
+        chunk_validation = DocumentValidator.validate_chunk(chunk_data)
+        if chunk_validation.sanitized_data:
+            results.append(chunk_validation.sanitized_data)
+        else:
+            # Fall back to original data if validation fails
+            results.append(chunk_data)
+            if chunk_validation.has_errors():
+                log_validation_errors(chunk_validation.errors, f"chunk_{len(results)}")
+
+    if not results:
+        # Final fallback
+        chunk_data = {
+            "content": content,
+            "tokens": len(tokens),
+            "chunk_order_index": 0,
+        }
+        chunk_validation = DocumentValidator.validate_chunk(chunk_data)
+        if chunk_validation.sanitized_data:
+            results.append(chunk_validation.sanitized_data)
+        else:
+            results.append(chunk_data)
+
+    return results
+
+
+def run_chunker(
+    chunker, tokenizer: Tokenizer, content: str, args
+) -> tuple[list, float, int]:
+    """Chunk content and return (chunks, seconds, peak traced bytes)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    chunks = [
+        chunk
+        for chunk in chunker(
+            tokenizer,
+            content,
+            args.split,
+            args.split_only,
+            args.overlap,
+            args.chunk_size,
+        )
+    ]
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return chunks, elapsed, peak
+
+
+def same_chunks(left: list[dict[str, Any]], right: list[dict[str, Any]]) -> bool:
+    return [(c["content"], c["tokens"]) for c in left] == [
+        (c["content"], c["tokens"]) for c in right
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LightRAG chunkers")
+    parser.add_argument("--input-dir", default="ExampleDocuments")
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=50,
+        help="Number of copies concatenated for the large-document run",
+    )
+    parser.add_argument("--chunk-size", type=int, default=1200)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--split", default=None, help="split_by_character")
+    parser.add_argument("--split-only", action="store_true")
+    args = parser.parse_args()
+    if args.split is not None:
+        args.split = args.split.encode().decode("unicode_escape")
+
+    # Keep the per-chunk logging of both chunkers out of the timings
+    logger.setLevel("WARNING")
+    tokenizer = TiktokenTokenizer()
+
+    paths = sorted(p for p in Path(args.input_dir).iterdir() if p.is_file())
+    print(
+        f"{'document':<40} {'chars':>10} {'legacy s':>9} {'stream s':>9} "
+        f"{'legacy MB':>10} {'stream MB':>10} {'chunks':>7}  same"
+    )
+    for path in paths:
+        text = path.read_text(encoding="utf-8")
+        for label, content in (
+            (path.name[:32], text),
+            (f"{path.name[:28]} x{args.scale}", "\n".join([text] * args.scale)),
+        ):
+            legacy, legacy_s, legacy_peak = run_chunker(
+                legacy_chunking_by_token_size, tokenizer, content, args
+            )
+            stream, stream_s, stream_peak = run_chunker(
+                iter_chunks_by_token_size, tokenizer, content, args
+            )
+            print(
+                f"{label:<40} {len(content):>10} {legacy_s:>9.3f} {stream_s:>9.3f} "
+                f"{legacy_peak / 2**20:>10.1f} {stream_peak / 2**20:>10.1f} "
+                f"{len(stream):>7}  {same_chunks(legacy, stream)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
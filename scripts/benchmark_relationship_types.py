@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of relationship-type normalization and fuzzy matching.
+
+Replays the relationship types of an extraction log (one edge per entry) through
+three strategies and reports the time per strategy:
+
+  per-edge legacy   standardization and registry scoring recomputed for every edge,
+                    one fuzz.* call per registry entry (the pre-memoization behavior)
+  per-edge memo     the registry's single-type API, memoized on the raw type string
+  batch             find_best_matches_with_confidence / get_neo4j_types, all unique
+                    types scored in one rapidfuzz.process.cdist call per block
+
+All strategies must resolve every edge to the same result, which is checked.
+
+The log is either a text file with one relationship type per line or a JSON-lines
+file whose records carry "rel_type", "relationship_type" or "keywords". Without
+--log a 100k-edge log is synthesized: types follow a Zipf distribution over the
+registry entries and their casing/spelling variants, plus a tail of one-off types
+as produced by LLM extraction.
+
+Usage:
+    python scripts/benchmark_relationship_types.py
+    python scripts/benchmark_relationship_types.py --log extraction_log.jsonl --legacy-sample 5000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from rapidfuzz import fuzz
+
+from lightrag.kg.utils.relationship_registry import (
+    RelationshipTypeRegistry,
+    _standardize_uncached,
+    standardize_relationship_type,
+)
+
+# Words of the one-off relationship types in a synthesized log
+_FILLER_WORDS = (
+    "uses calls depends on integrates with runs hosted by stores reads writes "
+    "manages triggers extends api data model deployed in via config owns creates"
+).split()
+
+
+def _variants(rel_type: str, rng: random.Random) -> list[str]:
+    words = rel_type.split()
+    variants = [
+        rel_type,
+        rel_type.upper().replace(" ", "_"),
+        words[0] + "".join(w.capitalize() for w in words[1:]),
+        rel_type.replace(" ", "-"),
+    ]
+    if len(rel_type) > 4:
+        # A typo, as LLMs occasionally produce
+        chars = list(rel_type)
+        chars[rng.randrange(len(chars))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        variants.append("".join(chars))
+    return variants
+
+
+def synthesize_log(
+    registry: RelationshipTypeRegistry, edges: int, seed: int
+) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = [
+        variant
+        for rel_type in registry.registry
+        for variant in _variants(rel_type, rng)
+    ]
+    rng.shuffle(vocabulary)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocabulary))]
+    log = rng.choices(vocabulary, weights=weights, k=edges)
+    # About 2% of the edges carry a type that shows up only once
+    for index in rng.sample(range(edges), edges // 50):
+        log[index] = " ".join(
+            rng.choice(_FILLER_WORDS) for _ in range(rng.randint(2, 4))
+        )
+    return log
+
+
+def load_log(path: str) -> list[str]:
+    rel_types = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("{"):
+                rel_types.append(line)
+                continue
+            record = json.loads(line)
+            rel_type = record.get("rel_type") or record.get("relationship_type")
+            if rel_type is None and record.get("keywords"):
+                rel_type = str(record["keywords"]).split(",")[0]
+            if rel_type is not None:
+                rel_types.append(str(rel_type))
+    return rel_types
+
+
+def legacy_best_match(registry: dict, rel_type: str):
+    """find_best_match_with_confidence without memo or batching"""
+    if not rel_type:
+        return None, 0.0
+    rel_type_lower = rel_type.lower()
+    if rel_type_lower in registry:
+        return rel_type_lower, 1.0
+    for reg_type in registry:
+        if rel_type_lower in reg_type or reg_type in rel_type_lower:
+            confidence = 0.9 + (
+                0.1
+                * max(len(rel_type_lower), len(reg_type))
+                / max(len(rel_type_lower) + len(reg_type), 1)
+            )
+            return reg_type, min(confidence, 0.99)
+    best_match, best_score = None, 0
+    for reg_type in registry:
+        combined_score = (
+            0.5 * fuzz.ratio(rel_type_lower, reg_type)
+            + 0.3 * fuzz.token_sort_ratio(rel_type_lower, reg_type)
+            + 0.2 * fuzz.token_set_ratio(rel_type_lower, reg_type)
+        )
+        if combined_score > best_score:
+            best_score, best_match = combined_score, reg_type
+    if best_score >= 70:
+        return best_match, min((best_score - 70) / 30.0, 0.85)
+    return None, 0.0
+
+
+def _timed(label: str, edges: int, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<22} edges={edges:<7} total={elapsed * 1000:10.1f}ms "
+        f"per_edge={elapsed / max(edges, 1) * 1e6:8.2f}us"
+    )
+    return result, elapsed
+
+
+def run(args):
+    registry = RelationshipTypeRegistry()
+    if args.log:
+        log = load_log(args.log)
+    else:
+        log = synthesize_log(registry, args.edges, args.seed)
+    print(
+        f"{len(log)} edges, {len(set(log))} unique relationship types, "
+        f"{len(registry.registry)} registry types"
+    )
+
+    # Legacy scoring is slow, it runs on a sample and is extrapolated
+    sample = log[: args.legacy_sample] if args.legacy_sample else log
+    legacy, legacy_seconds = _timed(
+        "per-edge legacy",
+        len(sample),
+        lambda: [
+            (
+                _standardize_uncached(t) if t else "RELATED",
+                legacy_best_match(registry.registry, t),
+            )
+            for t in sample
+        ],
+    )
+    if len(sample) < len(log):
+        print(
+            f"{'':<22} extrapolated to {len(log)} edges: "
+            f"{legacy_seconds * len(log) / len(sample):.1f}s"
+        )
+
+    memo_registry = RelationshipTypeRegistry()
+    memo, _ = _timed(
+        "per-edge memo",
+        len(log),
+        lambda: [
+            (
+                standardize_relationship_type(t),
+                memo_registry.find_best_match_with_confidence(t),
+            )
+            for t in log
+        ],
+    )
+
+    batch_registry = RelationshipTypeRegistry()
+
+    def batch():
+        matches = batch_registry.find_best_matches_with_confidence(log)
+        return [(standardize_relationship_type(t), matches[t]) for t in log]
+
+    batched, _ = _timed("batch", len(log), batch)
+
+    neo4j_registry = RelationshipTypeRegistry()
+    _timed(
+        "batch get_neo4j_types", len(log), lambda: neo4j_registry.get_neo4j_types(log)
+    )
+
+    def same(left, right):
+        return (
+            left[0] == right[0]
+            and left[1][0] == right[1][0]
+            and abs(left[1][1] - right[1][1]) < 1e-9
+        )
+
+    mismatches = sum(not same(a, b) for a, b in zip(legacy, memo))
+    mismatches += sum(not same(a, b) for a, b in zip(memo, batched))
+    print(
+        "results identical" if mismatches == 0 else f"{mismatches} MISMATCHED results"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark relationship-type normalization and fuzzy matching"
+    )
+    parser.add_argument("--log", default=None, help="extraction log to replay")
+    parser.add_argument(
+        "--edges", type=int, default=100000, help="edges of a synthesized log"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--legacy-sample",
+        type=int,
+        default=10000,
+        help="edges timed with legacy scoring (0 for all)",
+    )
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Measure query latency of a vector storage while a bulk ingest runs.
+
+The script queries the storage on an idle event loop, then again while a bulk
+upsert is in flight, and reports p50/p95/max query latency plus event loop lag
+(how late a 10 ms timer fires). A storage that blocks the event loop shows large
+loop lag and query latencies that grow with the ingest; a non-blocking one keeps
+both roughly flat. Embeddings are random vectors so only the storage is measured.
+
+The storage is configured the same way as the server (QDRANT_URL, MILVUS_URI,
+vector_db_storage_cls_kwargs, ...), so the matching service has to be running.
+
+Usage:
+    python scripts/benchmark_vector_concurrency.py --storage QdrantVectorDBStorage
+    python scripts/benchmark_vector_concurrency.py --storage MilvusVectorDBStorage --ingest 50000 --max-async 16
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from lightrag.kg import STORAGES
+from lightrag.kg.shared_storage import initialize_share_data
+from lightrag.utils import EmbeddingFunc
+
+
+def _make_embedding_func(dim: int) -> EmbeddingFunc:
+    async def _embed(texts: list[str], **kwargs) -> np.ndarray:
+        rng = np.random.default_rng(abs(hash(texts[0])) % (2**32))
+        return rng.random((len(texts), dim), dtype=np.float32)
+
+    return EmbeddingFunc(embedding_dim=dim, max_token_size=8192, func=_embed)
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _summary(name: str, latencies: list[float], lags: list[float]) -> str:
+    return (
+        f"{name:<14} queries={len(latencies):<5} "
+        f"p50={_percentile(latencies, 0.5) * 1000:8.1f}ms "
+        f"p95={_percentile(latencies, 0.95) * 1000:8.1f}ms "
+        f"max={max(latencies, default=0) * 1000:8.1f}ms "
+        f"loop_lag_p95={_percentile(lags, 0.95) * 1000:7.1f}ms "
+        f"loop_lag_max={max(lags, default=0) * 1000:7.1f}ms"
+    )
+
+
+async def _query_loop(storage, stop: asyncio.Event, latencies: list[float]):
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await storage.query(f"benchmark query {i}", top_k=10)
+        latencies.append(time.perf_counter() - start)
+        i += 1
+        # Local storages may complete without suspending, let the ingest progress
+        await asyncio.sleep(0)
+
+
+async def _lag_loop(stop: asyncio.Event, lags: list[float], interval: float = 0.01):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, time.perf_counter() - start - interval))
+
+
+async def _measure(storage, duration: float | None, ingest=None):
+    latencies: list[float] = []
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probes = [
+        asyncio.create_task(_query_loop(storage, stop, latencies)),
+        asyncio.create_task(_lag_loop(stop, lags)),
+    ]
+    start = time.perf_counter()
+    if ingest is not None:
+        await ingest
+    else:
+        await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*probes)
+    return latencies, lags, elapsed
+
+
+async def run(args):
+    initialize_share_data()
+    if args.storage not in STORAGES:
+        raise SystemExit(f"Unknown storage: {args.storage}")
+    module = importlib.import_module(STORAGES[args.storage], package="lightrag")
+    storage_cls = getattr(module, args.storage)
+
+    storage_kwargs = {"cosine_better_than_threshold": 0.0}
+    if args.batch_size:
+        storage_kwargs["upsert_batch_size"] = args.batch_size
+    if args.max_async:
+        storage_kwargs["max_async"] = args.max_async
+
+    storage = storage_cls(
+        namespace=args.namespace,
+        global_config={
+            "working_dir": args.working_dir or tempfile.mkdtemp(),
+            "embedding_batch_num": 64,
+            "vector_db_storage_cls_kwargs": storage_kwargs,
+        },
+        embedding_func=_make_embedding_func(args.dim),
+        meta_fields={"content"},
+    )
+    await storage.initialize()
+    try:
+        await storage.drop()
+        await storage.upsert(
+            {f"seed-{i}": {"content": f"seed {i}"} for i in range(args.seed)}
+        )
+
+        latencies, lags, _ = await _measure(storage, args.idle_seconds)
+        print(_summary("idle", latencies, lags))
+
+        documents = {
+            f"doc-{i}": {"content": f"bulk document {i}"} for i in range(args.ingest)
+        }
+        latencies, lags, elapsed = await _measure(
+            storage, None, ingest=storage.upsert(documents)
+        )
+        print(_summary("during ingest", latencies, lags))
+        print(
+            f"ingested {args.ingest} vectors in {elapsed:.2f}s "
+            f"({args.ingest / elapsed:.0f}/s)"
+        )
+        if latencies:
+            print(
+                f"mean query latency during ingest: {statistics.mean(latencies) * 1000:.1f}ms"
+            )
+    finally:
+        await storage.drop()
+        await storage.finalize()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark vector storage query latency under bulk ingest"
+    )
+    parser.add_argument("--storage", default="QdrantVectorDBStorage")
+    parser.add_argument("--namespace", default="benchmark_vectors")
+    parser.add_argument("--working-dir", default=None)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument(
+        "--seed", type=int, default=1000, help="vectors stored before measuring"
+    )
+    parser.add_argument(
+        "--ingest", type=int, default=20000, help="vectors in the bulk upsert"
+    )
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--batch-size", type=int, default=None, help="upsert_batch_size"
+    )
+    parser.add_argument("--max-async", type=int, default=None, help="max_async")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
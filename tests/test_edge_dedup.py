@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""
+Edge deduplication of merge_nodes_and_edges when collecting chunk results.
+
+EdgeCollector must collect exactly what the previous quadratic implementation
+collected (same keys, same edges, same order), reproduced here as the reference.
+Dropping duplicate entity records is opt-in.
+
+Usage:
+    python -m pytest tests/test_edge_dedup.py -q
+"""
+
+import os
+import random
+import sys
+from collections import defaultdict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.operate import EdgeCollector, EdgeSignature, NodeCollector
+
+
+def legacy_collect(chunk_results):
+    """The collection loop of merge_nodes_and_edges before EdgeCollector"""
+    all_nodes = defaultdict(list)
+    all_edges = defaultdict(list)
+    for maybe_nodes, maybe_edges in chunk_results:
+        for entity_name, entities in maybe_nodes.items():
+            all_nodes[entity_name].extend(entities)
+        for edge_key, edges in maybe_edges.items():
+            sorted_edge_key = tuple(sorted(edge_key))
+            edge_signatures_seen = set()
+            for edge in edges:
+                edge_signature = (
+                    edge.get("src_id"),
+                    edge.get("tgt_id"),
+                    edge.get("rel_type"),
+                    edge.get("source_id"),
+                    edge.get("description", "")[:100],
+                )
+                if edge_signature not in edge_signatures_seen:
+                    existing_sigs = {
+                        (
+                            e.get("src_id"),
+                            e.get("tgt_id"),
+                            e.get("rel_type"),
+                            e.get("source_id"),
+                            e.get("description", "")[:100],
+                        )
+                        for e in all_edges[sorted_edge_key]
+                    }
+                    if edge_signature not in existing_sigs:
+                        all_edges[sorted_edge_key].append(edge)
+                        edge_signatures_seen.add(edge_signature)
+    return all_nodes, all_edges
+
+
+def node(name, entity_type="tool", chunk="chunk-1", description="desc"):
+    return {
+        "entity_name": name,
+        "entity_type": entity_type,
+        "description": description,
+        "source_id": chunk,
+        "file_path": "doc.md",
+    }
+
+
+def collect(chunk_results):
+    collector = EdgeCollector()
+    for maybe_nodes, maybe_edges in chunk_results:
+        collector.add(maybe_nodes, maybe_edges)
+    return collector
+
+
+def edge(src, tgt, rel_type="uses", chunk="chunk-1", description="desc", **extra):
+    return {
+        "src_id": src,
+        "tgt_id": tgt,
+        "rel_type": rel_type,
+        "source_id": chunk,
+        "description": description,
+        **extra,
+    }
+
+
+def random_chunk_results(seed, chunks=40):
+    rng = random.Random(seed)
+    entities = ["n8n", "Redis", "Postgres", "Docker", "Claude"]
+    rel_types = ["uses", "integrates_with", "runs_on"]
+    descriptions = ["short", "x" * 100, "x" * 100 + "tail", "x" * 150, ""]
+    results = []
+    for chunk in range(chunks):
+        maybe_nodes = defaultdict(list)
+        maybe_edges = defaultdict(list)
+        for _ in range(rng.randint(0, 30)):
+            src, tgt = rng.sample(entities, 2)
+            # Gleaning re-extracts entities of the same chunk
+            maybe_nodes[src].append(
+                node(
+                    src,
+                    rng.choice(["tool", "service"]),
+                    f"chunk-{chunk}",
+                    rng.choice(descriptions[:2]),
+                )
+            )
+            maybe_edges[(src, tgt)].append(
+                edge(
+                    src,
+                    tgt,
+                    rng.choice(rel_types),
+                    # Chunk ids repeat, as gleaning re-extracts the same chunk
+                    f"chunk-{rng.randint(0, chunks // 4)}",
+                    rng.choice(descriptions),
+                    weight=rng.random(),
+                )
+            )
+        if rng.random() < 0.1:
+            maybe_edges[("n8n", "Redis")] = []
+        results.append((dict(maybe_nodes), dict(maybe_edges)))
+    return results
+
+
+def as_comparable(all_edges):
+    # Same keys in the same order, each holding the very same edge dicts in order
+    return [(key, [id(e) for e in edges]) for key, edges in all_edges.items()]
+
+
+def test_identical_to_legacy_collection():
+    for seed in range(20):
+        chunk_results = random_chunk_results(seed)
+        legacy_nodes, legacy_edges = legacy_collect(chunk_results)
+        collector = collect(chunk_results)
+        assert as_comparable(collector.edges) == as_comparable(legacy_edges)
+        assert dict(collector.nodes) == dict(legacy_nodes)
+
+
+def test_streaming_matches_single_fold():
+    chunk_results = random_chunk_results(7)
+    streamed = EdgeCollector()
+    for result in chunk_results:
+        streamed.add(*result)
+    # A collect_entities style accumulation delivers one folded chunk result
+    folded_edges = defaultdict(list)
+    for _, maybe_edges in chunk_results:
+        for edge_key, edges in maybe_edges.items():
+            folded_edges[edge_key].extend(edges)
+    folded = collect([({}, folded_edges)])
+    _, legacy_edges = legacy_collect([({}, folded_edges)])
+    assert as_comparable(folded.edges) == as_comparable(legacy_edges)
+    assert sum(map(len, folded.edges.values())) == streamed.stats["edges_kept"]
+
+
+def test_reversed_keys_share_one_group():
+    collector = collect(
+        [
+            ({}, {("B", "A"): [edge("B", "A", chunk="chunk-1")]}),
+            ({}, {("A", "B"): [edge("A", "B", chunk="chunk-2")]}),
+        ]
+    )
+    assert list(collector.edges) == [("A", "B")]
+    assert [e["src_id"] for e in collector.edges[("A", "B")]] == ["B", "A"]
+
+
+def test_dedup_statistics():
+    same = edge("A", "B")
+    collector = collect(
+        [
+            ({}, {("A", "B"): [same, dict(same), edge("A", "B", "runs_on")]}),
+            (
+                {},
+                {
+                    ("A", "B"): [
+                        dict(same),
+                        edge("A", "B", chunk="chunk-2"),
+                        # Same first 100 description chars
+                        edge("A", "B", description="x" * 100 + "a"),
+                        edge("A", "B", description="x" * 100 + "b"),
+                    ]
+                },
+            ),
+        ]
+    )
+    assert collector.stats == {
+        "edges_seen": 7,
+        "edges_kept": 4,
+        "intra_chunk_duplicates": 2,
+        "cross_chunk_duplicates": 1,
+    }
+    assert len(collector.edges[("A", "B")]) == 4
+
+
+def test_empty_edge_lists_create_no_group():
+    collector = collect([({}, {("A", "B"): []})])
+    assert dict(collector.edges) == {}
+
+
+def test_signature_fields():
+    signature = EdgeSignature.of(edge("A", "B", description="y" * 300))
+    assert signature == ("A", "B", "uses", "chunk-1", "y" * 100)
+    assert signature.description == "y" * 100
+
+
+def test_duplicate_entity_records_kept_by_default():
+    # Repeated records are votes for the entity type in the node merge
+    collector = NodeCollector()
+    collector.add({"A": [node("A"), node("A"), node("A", "service")]})
+    assert collector.nodes["A"] == [node("A"), node("A"), node("A", "service")]
+    assert collector.stats == {"nodes_seen": 3, "nodes_kept": 3}
+
+
+def test_duplicate_entity_records_dropped():
+    collector = NodeCollector(dedup=True)
+    collector.add({"A": [node("A"), node("A"), node("A", "service")]})
+    collector.add({"A": [node("A", chunk="chunk-2")], "B": []})
+    assert collector.nodes["A"] == [
+        node("A"),
+        node("A", "service"),
+        node("A", chunk="chunk-2"),
+    ]
+    # Empty lists would fail the node merge, they create no entity
+    assert "B" not in collector.nodes
+    assert collector.stats == {"nodes_seen": 4, "nodes_kept": 3}
+
+
+def test_edge_collector_folds_nodes():
+    collector = EdgeCollector(dedup_nodes=True)
+    collector.add({"A": [node("A"), node("A")]}, {})
+    assert collector.nodes["A"] == [node("A")]
+    assert collector.node_stats == {"nodes_seen": 2, "nodes_kept": 1}
@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+"""
+Crash-recovery tests for the write-behind journal of the JSON storages.
+
+Every test simulates a process crash by dropping the shared in-memory data
+without flushing, then loads a fresh storage from the files on disk.
+
+Usage:
+    python -m pytest tests/test_json_journal.py -q
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lightrag.base import DocStatus
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture(autouse=True)
+def shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+def crash():
+    """Lose everything held in memory, as a killed worker would"""
+    finalize_share_data()
+    initialize_share_data()
+
+
+async def open_storage(working_dir, cls=JsonKVStorage, namespace="full_docs"):
+    storage = cls(
+        namespace=namespace,
+        global_config={"working_dir": str(working_dir)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+def read_journal(working_dir, namespace="full_docs"):
+    path = os.path.join(working_dir, f"kv_store_{namespace}.journal")
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_flush_appends_only_dirty_records(tmp_path):
+    async def scenario():
+        storage = await open_storage(tmp_path)
+        await storage.upsert({"a": {"content": "A"}, "b": {"content": "B"}})
+        await storage.index_done_callback()
+        await storage.upsert({"b": {"content": "B2"}})
+        await storage.delete(["a", "missing"])
+        await storage.index_done_callback()
+        # Nothing changed since the last flush
+        await storage.index_done_callback()
+
+    run(scenario())
+    records = read_journal(tmp_path)
+    assert sorted(map(tuple, records[:2]), key=lambda r: r[1]) == [
+        ("u", "a", {"content": "A"}),
+        ("u", "b", {"content": "B"}),
+    ]
+    assert sorted(map(tuple, records[2:]), key=lambda r: r[1]) == [
+        ("d", "a"),
+        ("u", "b", {"content": "B2"}),
+    ]
+    assert not os.path.exists(tmp_path / "kv_store_full_docs.json")
+
+
+def test_crash_recovers_flushed_records_only(tmp_path):
+    async def write():
+        storage = await open_storage(tmp_path)
+        await storage.upsert({"a": {"content": "A"}, "b": {"content": "B"}})
+        await storage.delete(["a"])
+        await storage.index_done_callback()
+        # Never flushed, lost by the crash
+        await storage.upsert({"c": {"content": "C"}})
+
+    async def recover():
+        storage = await open_storage(tmp_path)
+        return await storage.get_all()
+
+    run(write())
+    crash()
+    assert run(recover()) == {"b": {"content": "B"}}
+
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    async def write():
+        storage = await open_storage(tmp_path)
+        await storage.upsert({"a": {"content": "A"}})
+        await storage.index_done_callback()
+
+    run(write())
+    journal = tmp_path / "kv_store_full_docs.journal"
+    with open(journal, "a", encoding="utf-8") as f:
+        f.write('["u", "b", {"content": "B')
+    crash()
+
+    async def recover_and_write():
+        storage = await open_storage(tmp_path)
+        data = await storage.get_all()
+        await storage.upsert({"c": {"content": "C"}})
+        await storage.index_done_callback()
+        return data
+
+    assert run(recover_and_write()) == {"a": {"content": "A"}}
+    # The torn line was cut, so the next record starts on its own line
+    assert [r[1] for r in read_journal(tmp_path)] == ["a", "c"]
+    crash()
+
+    async def recover():
+        storage = await open_storage(tmp_path)
+        return await storage.get_all()
+
+    assert run(recover()) == {"a": {"content": "A"}, "c": {"content": "C"}}
+
+
+def test_compaction_writes_snapshot_and_truncates_journal(tmp_path, monkeypatch):
+    monkeypatch.setenv("JSON_JOURNAL_COMPACT_MIN_BYTES", "64")
+
+    async def write():
+        storage = await open_storage(tmp_path)
+        for i in range(10):
+            await storage.upsert({f"doc-{i}": {"content": "x" * 32}})
+            await storage.index_done_callback()
+        await storage.delete(["doc-0"])
+        await storage.index_done_callback()
+
+    run(write())
+    with open(tmp_path / "kv_store_full_docs.json", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    assert len(snapshot) >= 1
+    assert os.path.getsize(tmp_path / "kv_store_full_docs.journal") < 1024
+    crash()
+
+    async def recover():
+        storage = await open_storage(tmp_path)
+        return await storage.get_all()
+
+    assert run(recover()) == {f"doc-{i}": {"content": "x" * 32} for i in range(1, 10)}
+
+
+def test_crash_between_snapshot_and_truncate(tmp_path):
+    async def write():
+        storage = await open_storage(tmp_path)
+        await storage.upsert({"a": {"content": "A1"}, "b": {"content": "B"}})
+        await storage.index_done_callback()
+        await storage.upsert({"a": {"content": "A2"}})
+        await storage.index_done_callback()
+
+    run(write())
+    journal = tmp_path / "kv_store_full_docs.journal"
+    stale_journal = journal.read_bytes()
+    # A snapshot that already contains every journaled record, journal not yet cut
+    with open(tmp_path / "kv_store_full_docs.json", "w", encoding="utf-8") as f:
+        json.dump({"a": {"content": "A2"}, "b": {"content": "B"}}, f)
+    journal.write_bytes(stale_journal)
+    crash()
+
+    async def recover():
+        storage = await open_storage(tmp_path)
+        return await storage.get_all()
+
+    assert run(recover()) == {"a": {"content": "A2"}, "b": {"content": "B"}}
+
+
+def test_drop_survives_crash(tmp_path):
+    async def write():
+        storage = await open_storage(tmp_path)
+        await storage.upsert({"a": {"content": "A"}})
+        await storage.index_done_callback()
+        await storage.drop()
+
+    async def recover():
+        storage = await open_storage(tmp_path)
+        return await storage.get_all()
+
+    run(write())
+    crash()
+    assert run(recover()) == {}
+    assert os.path.getsize(tmp_path / "kv_store_full_docs.journal") == 0
+
+
+def test_legacy_snapshot_without_journal_loads(tmp_path):
+    with open(tmp_path / "kv_store_full_docs.json", "w", encoding="utf-8") as f:
+        json.dump({"a": {"content": "A"}}, f)
+
+    async def recover():
+        storage = await open_storage(tmp_path)
+        return await storage.get_all()
+
+    assert run(recover()) == {"a": {"content": "A"}}
+
+
+def test_doc_status_recovers_from_journal(tmp_path):
+    def status(value):
+        return {
+            "status": value,
+            "content_summary": "summary",
+            "content_length": 7,
+            "created_at": "2025-01-01T00:00:00",
+            "updated_at": "2025-01-01T00:00:00",
+            "file_path": "doc.txt",
+        }
+
+    async def write():
+        storage = await open_storage(tmp_path, JsonDocStatusStorage, "doc_status")
+        # Doc status upserts are flushed immediately
+        await storage.upsert({"doc-1": status(DocStatus.PENDING.value)})
+        await storage.upsert({"doc-1": status(DocStatus.PROCESSED.value)})
+        await storage.upsert({"doc-2": status(DocStatus.FAILED.value)})
+
+    async def recover():
+        storage = await open_storage(tmp_path, JsonDocStatusStorage, "doc_status")
+        return await storage.get_status_counts()
+
+    run(write())
+    crash()
+    counts = run(recover())
+    assert counts[DocStatus.PROCESSED.value] == 1
+    assert counts[DocStatus.FAILED.value] == 1
+    assert counts[DocStatus.PENDING.value] == 0